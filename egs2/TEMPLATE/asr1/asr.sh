@@ -147,6 +147,7 @@ cleaner=none     # Text cleaner.
 g2p=none         # g2p method (needed if token_type=phn).
 lang=noinfo      # The language type of corpus.
 score_opts=                # The options given to sclite scoring
+use_sclite=true            # Use sclite for scoring. If false, use espnet2.bin.asr_scoring instead.
 local_score_opts=          # The options given to local/score.sh.
 asr_speech_fold_length=800 # fold_length for speech data during ASR training.
 asr_text_fold_length=150   # fold_length for text data during ASR training.
@@ -254,6 +255,7 @@ Options:
     --g2p           # g2p method (default="${g2p}").
     --lang          # The language type of corpus (default=${lang}).
     --score_opts             # The options given to sclite scoring (default="{score_opts}").
+    --use_sclite             # Use sclite for scoring. If false, use espnet2.bin.asr_scoring instead (default="${use_sclite}").
     --local_score_opts       # The options given to local/score.sh (default="{local_score_opts}").
     --asr_speech_fold_length # fold_length for speech data during ASR training (default="${asr_speech_fold_length}").
     --asr_text_fold_length   # fold_length for text data during ASR training (default="${asr_text_fold_length}").
@@ -1466,11 +1468,19 @@ if ! "${skip_eval}"; then
                         --results-dir ${_scoredir}
                 fi
 
-                sclite \
-                    ${score_opts} \
-                    -r "${_scoredir}/ref.trn" trn \
-                    -h "${_scoredir}/hyp.trn" trn \
-                    -i rm -o all stdout > "${_scoredir}/result.txt"
+                if "${use_sclite}"; then
+                    sclite \
+                        ${score_opts} \
+                        -r "${_scoredir}/ref.trn" trn \
+                        -h "${_scoredir}/hyp.trn" trn \
+                        -i rm -o all stdout > "${_scoredir}/result.txt"
+                else
+                    ${python} -m espnet2.bin.asr_scoring \
+                        --nj "${nj}" \
+                        --ref "${_scoredir}/ref.trn" \
+                        --hyp "${_scoredir}/hyp.trn" \
+                        --output_dir "${_scoredir}"
+                fi
 
                 log "Write ${_type} result in ${_scoredir}/result.txt"
                 grep -e Avg -e SPKR -m 2 "${_scoredir}/result.txt"
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import argparse
 import logging
-from io import BytesIO
+import multiprocessing
+import time
+from io import BytesIO, StringIO
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import humanfriendly
 import kaldiio
@@ -14,7 +16,6 @@ from tqdm import tqdm
 from typeguard import check_argument_types
 
 from espnet2.fileio.read_text import read_2column_text
-from espnet2.fileio.sound_scp import SoundScpWriter
 from espnet.utils.cli_utils import get_commandline_args
 
 
@@ -37,6 +38,187 @@ def str2int_tuple(integers: str) -> Optional[Tuple[int, ...]]:
     return tuple(map(int, integers.strip().split(",")))
 
 
+def read_segments(path: str) -> Dict[str, Tuple[str, float, float]]:
+    segments = {}
+    with open(path, "r") as f:
+        for line in f:
+            sps = line.rstrip().split()
+            if len(sps) != 4:
+                raise RuntimeError(f"Format is invalid: {line}")
+            uttid, recodeid, st, et = sps
+            segments[uttid] = (recodeid, float(st), float(et))
+    return segments
+
+
+def read_wave(wavpath: str) -> Tuple[np.ndarray, int]:
+    if wavpath.endswith("|"):
+        # Streaming input e.g. cat a.wav |
+        with kaldiio.open_like_kaldi(wavpath, "rb") as f:
+            with BytesIO(f.read()) as g:
+                wave, rate = soundfile.read(g, dtype=np.int16)
+    else:
+        wave, rate = soundfile.read(wavpath, dtype=np.int16)
+    return wave, rate
+
+
+class Formatter:
+    """Format the waves of utterances in a process.
+
+    If the audio format is "*.ark", each process appends the waves to its own
+    ark file, i.e. a shard of the packed data, to avoid the locks among
+    the processes.
+    """
+
+    def __init__(
+        self,
+        outdir: str,
+        name: str,
+        audio_format: str,
+        fs: Optional[int],
+        ref_channels: Optional[Tuple[int, ...]],
+        utt2ref_channels: Optional[Dict[str, str]],
+    ):
+        self.outdir = Path(outdir)
+        self.name = name
+        self.audio_format = audio_format
+        self.fs = fs
+        self.ref_channels = ref_channels
+        self.utt2ref_channels = utt2ref_channels
+        self.fark = None
+
+        if audio_format.endswith("ark"):
+            if "flac" in audio_format:
+                self.suffix = "flac"
+            elif "wav" in audio_format:
+                self.suffix = "wav"
+            else:
+                raise RuntimeError("wav.ark or flac")
+        else:
+            self.wavdir = self.outdir / f"data_{name}"
+            self.wavdir.mkdir(parents=True, exist_ok=True)
+
+    def open_ark(self, shard: Optional[int] = None):
+        if shard is None:
+            arkpath = self.outdir / f"data_{self.name}.ark"
+        else:
+            arkpath = self.outdir / f"data_{self.name}.{shard}.ark"
+        self.fark = open(arkpath, "wb")
+
+    def close(self):
+        if self.fark is not None:
+            self.fark.close()
+
+    def select_channels(self, uttid: str, wave: np.ndarray) -> np.ndarray:
+        # wave: (Time,) or (Time, Nmic)
+        if wave.ndim == 2:
+            if self.ref_channels is not None:
+                return wave[:, self.ref_channels]
+            elif self.utt2ref_channels is not None:
+                chs = tuple(map(int, self.utt2ref_channels[uttid].split()))
+                return wave[:, chs]
+        return wave
+
+    def write(self, uttid: str, wave: np.ndarray, rate: int) -> Tuple[str, int]:
+        """Write the wave and return the value of the scp line and the length."""
+        if self.fs is not None and self.fs != rate:
+            # FIXME(kamo): To use sox?
+            wave = resampy.resample(wave.astype(np.float64), rate, self.fs, axis=0)
+            wave = wave.astype(np.int16)
+            rate = self.fs
+
+        if self.fark is not None:
+            # NOTE(kamo): Using extended ark format style here.
+            # This format is incompatible with Kaldi
+            fscp = StringIO()
+            kaldiio.save_ark(
+                self.fark,
+                {uttid: (wave, rate)},
+                scp=fscp,
+                append=True,
+                write_function="soundfile",
+                write_kwargs={"format": self.suffix},
+            )
+            # Flush for each utterance because the workers of multiprocessing.Pool
+            # are terminated without closing the file
+            self.fark.flush()
+            return fscp.getvalue().strip().split(None, 1)[1], len(wave)
+        else:
+            owavpath = str(self.wavdir / f"{uttid}.{self.audio_format}")
+            soundfile.write(owavpath, wave, rate)
+            return owavpath, len(wave)
+
+    def format_utterance(self, task: Tuple[str, str]) -> List[Tuple[str, str, int]]:
+        uttid, wavpath = task
+        if not wavpath.endswith("|") and self.fark is None:
+            info = soundfile.info(wavpath)
+            select_channels = info.channels > 1 and (
+                self.ref_channels is not None or self.utt2ref_channels is not None
+            )
+            if (
+                Path(wavpath).suffix == "." + self.audio_format
+                and (self.fs is None or self.fs == info.samplerate)
+                and not select_channels
+            ):
+                # Neither --segments nor --fs are specified and
+                # the line doesn't end with "|",
+                # i.e. not using unix-pipe,
+                # only in this case,
+                # just using the original file as is.
+                return [(uttid, wavpath, info.frames)]
+
+        wave, rate = read_wave(wavpath)
+        wave = self.select_channels(uttid, wave)
+        return [(uttid, *self.write(uttid, wave, rate))]
+
+    def format_recording(
+        self, task: Tuple[str, List[Tuple[str, float, float]]]
+    ) -> List[Tuple[str, str, int]]:
+        """Cut all the segments of a recording with opening it only once."""
+        wavpath, segments = task
+        # Read the segments sequentially
+        segments = sorted(segments, key=lambda x: x[1])
+        retval = []
+        if wavpath.endswith("|") or not Path(wavpath).exists():
+            # Unix-pipe or ark: Load the whole recording
+            if wavpath.endswith("|"):
+                wave, rate = read_wave(wavpath)
+            else:
+                rate, wave = kaldiio.load_mat(wavpath)
+            for uttid, st, et in segments:
+                end = int(et * rate) if et != -1 else None
+                seg = self.select_channels(uttid, wave[int(st * rate) : end])
+                retval.append((uttid, *self.write(uttid, seg, rate)))
+        else:
+            with soundfile.SoundFile(wavpath) as f:
+                rate = f.samplerate
+                for uttid, st, et in segments:
+                    start = int(st * rate)
+                    frames = int(et * rate) - start if et != -1 else -1
+                    f.seek(start)
+                    seg = f.read(frames, dtype=np.int16)
+                    seg = self.select_channels(uttid, seg)
+                    retval.append((uttid, *self.write(uttid, seg, rate)))
+        return retval
+
+
+_formatter = None
+
+
+def _init_worker(kwargs: dict, shard_queue):
+    global _formatter
+    _formatter = Formatter(**kwargs)
+    if _formatter.audio_format.endswith("ark"):
+        _formatter.open_ark(shard_queue.get() if shard_queue is not None else None)
+
+
+def _format_utterance(task):
+    return _formatter.format_utterance(task)
+
+
+def _format_recording(task):
+    return _formatter.format_recording(task)
+
+
 def main():
     logfmt = "%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s"
     logging.basicConfig(level=logging.INFO, format=logfmt)
@@ -60,183 +242,95 @@ def main():
         default=None,
         help="If the sampling rate specified, " "Change the sampling rate.",
     )
-    parser.add_argument("--audio-format", default="wav")
+    parser.add_argument(
+        "--audio-format",
+        default="wav",
+        help='The output format, e.g. "wav" and "flac", or "wav.ark" and '
+        '"flac.ark" to pack the waves into the ark files',
+    )
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of processes. With --audio-format *.ark, each process "
+        "writes its own ark file",
+    )
     group = parser.add_mutually_exclusive_group()
     group.add_argument("--ref-channels", default=None, type=str2int_tuple)
     group.add_argument("--utt2ref-channels", default=None, type=str)
     args = parser.parse_args()
 
-    out_num_samples = Path(args.outdir) / f"utt2num_samples"
-
-    if args.ref_channels is not None:
-
-        def utt2ref_channels(x) -> Tuple[int, ...]:
-            return args.ref_channels
-
-    elif args.utt2ref_channels is not None:
-        utt2ref_channels_dict = read_2column_text(args.utt2ref_channels)
-
-        def utt2ref_channels(x, d=utt2ref_channels_dict) -> Tuple[int, ...]:
-            chs_str = d[x]
-            return tuple(map(int, chs_str.split()))
-
-    else:
-        utt2ref_channels = None
-
+    start_time = time.perf_counter()
     Path(args.outdir).mkdir(parents=True, exist_ok=True)
+    out_num_samples = Path(args.outdir) / "utt2num_samples"
     out_wavscp = Path(args.outdir) / f"{args.name}.scp"
-    if args.segments is not None:
-        # Note: kaldiio supports only wav-pcm-int16le file.
-        loader = kaldiio.load_scp_sequential(args.scp, segments=args.segments)
-        if args.audio_format.endswith("ark"):
-            fark = open(Path(args.outdir) / f"data_{args.name}.ark", "wb")
-            fscp = out_wavscp.open("w")
-        else:
-            writer = SoundScpWriter(
-                args.outdir,
-                out_wavscp,
-                format=args.audio_format,
-            )
+    formatter_kwargs = dict(
+        outdir=args.outdir,
+        name=args.name,
+        audio_format=args.audio_format,
+        fs=args.fs,
+        ref_channels=args.ref_channels,
+        utt2ref_channels=read_2column_text(args.utt2ref_channels)
+        if args.utt2ref_channels is not None
+        else None,
+    )
 
-        with out_num_samples.open("w") as fnum_samples:
-            for uttid, (rate, wave) in tqdm(loader):
-                # wave: (Time,) or (Time, Nmic)
-                if wave.ndim == 2 and utt2ref_channels is not None:
-                    wave = wave[:, utt2ref_channels(uttid)]
-
-                if args.fs is not None and args.fs != rate:
-                    # FIXME(kamo): To use sox?
-                    wave = resampy.resample(
-                        wave.astype(np.float64), rate, args.fs, axis=0
-                    )
-                    wave = wave.astype(np.int16)
-                    rate = args.fs
-                if args.audio_format.endswith("ark"):
-                    if "flac" in args.audio_format:
-                        suf = "flac"
-                    elif "wav" in args.audio_format:
-                        suf = "wav"
-                    else:
-                        raise RuntimeError("wav.ark or flac")
-
-                    # NOTE(kamo): Using extended ark format style here.
-                    # This format is incompatible with Kaldi
-                    kaldiio.save_ark(
-                        fark,
-                        {uttid: (wave, rate)},
-                        scp=fscp,
-                        append=True,
-                        write_function=f"soundfile_{suf}",
-                    )
-
-                else:
-                    writer[uttid] = rate, wave
-                fnum_samples.write(f"{uttid} {len(wave)}\n")
+    wavscp = read_2column_text(args.scp)
+    if args.segments is not None:
+        # Group the segments by the recording
+        segments = read_segments(args.segments)
+        rec2segments = {}
+        for uttid, (recodeid, st, et) in segments.items():
+            if recodeid not in wavscp:
+                raise RuntimeError(f'Not found "{recodeid}" in {args.scp}')
+            rec2segments.setdefault(recodeid, []).append((uttid, st, et))
+        tasks = [(wavscp[k], v) for k, v in rec2segments.items()]
+        func = _format_recording
+        uttids = list(segments)
     else:
-        if args.audio_format.endswith("ark"):
-            fark = open(Path(args.outdir) / f"data_{args.name}.ark", "wb")
-        else:
-            wavdir = Path(args.outdir) / f"data_{args.name}"
-            wavdir.mkdir(parents=True, exist_ok=True)
-
-        with Path(args.scp).open("r") as fscp, out_wavscp.open(
-            "w"
-        ) as fout, out_num_samples.open("w") as fnum_samples:
-            for line in tqdm(fscp):
-                uttid, wavpath = line.strip().split(None, 1)
-
-                if wavpath.endswith("|"):
-                    # Streaming input e.g. cat a.wav |
-                    with kaldiio.open_like_kaldi(wavpath, "rb") as f:
-                        with BytesIO(f.read()) as g:
-                            wave, rate = soundfile.read(g, dtype=np.int16)
-                            if wave.ndim == 2 and utt2ref_channels is not None:
-                                wave = wave[:, utt2ref_channels(uttid)]
-
-                        if args.fs is not None and args.fs != rate:
-                            # FIXME(kamo): To use sox?
-                            wave = resampy.resample(
-                                wave.astype(np.float64), rate, args.fs, axis=0
-                            )
-                            wave = wave.astype(np.int16)
-                            rate = args.fs
-
-                        if args.audio_format.endswith("ark"):
-                            if "flac" in args.audio_format:
-                                suf = "flac"
-                            elif "wav" in args.audio_format:
-                                suf = "wav"
-                            else:
-                                raise RuntimeError("wav.ark or flac")
-
-                            # NOTE(kamo): Using extended ark format style here.
-                            # This format is incompatible with Kaldi
-                            kaldiio.save_ark(
-                                fark,
-                                {uttid: (wave, rate)},
-                                scp=fout,
-                                append=True,
-                                write_function=f"soundfile_{suf}",
-                            )
-                        else:
-                            owavpath = str(wavdir / f"{uttid}.{args.audio_format}")
-                            soundfile.write(owavpath, wave, rate)
-                            fout.write(f"{uttid} {owavpath}\n")
-                else:
-                    wave, rate = soundfile.read(wavpath, dtype=np.int16)
-                    if wave.ndim == 2 and utt2ref_channels is not None:
-                        wave = wave[:, utt2ref_channels(uttid)]
-                        save_asis = False
-
-                    elif args.audio_format.endswith("ark"):
-                        save_asis = False
-
-                    elif Path(wavpath).suffix == "." + args.audio_format and (
-                        args.fs is None or args.fs == rate
-                    ):
-                        save_asis = True
-
-                    else:
-                        save_asis = False
-
-                    if save_asis:
-                        # Neither --segments nor --fs are specified and
-                        # the line doesn't end with "|",
-                        # i.e. not using unix-pipe,
-                        # only in this case,
-                        # just using the original file as is.
-                        fout.write(f"{uttid} {wavpath}\n")
-                    else:
-                        if args.fs is not None and args.fs != rate:
-                            # FIXME(kamo): To use sox?
-                            wave = resampy.resample(
-                                wave.astype(np.float64), rate, args.fs, axis=0
-                            )
-                            wave = wave.astype(np.int16)
-                            rate = args.fs
-
-                        if args.audio_format.endswith("ark"):
-                            if "flac" in args.audio_format:
-                                suf = "flac"
-                            elif "wav" in args.audio_format:
-                                suf = "wav"
-                            else:
-                                raise RuntimeError("wav.ark or flac")
-
-                            # NOTE(kamo): Using extended ark format style here.
-                            # This format is not supported in Kaldi.
-                            kaldiio.save_ark(
-                                fark,
-                                {uttid: (wave, rate)},
-                                scp=fout,
-                                append=True,
-                                write_function=f"soundfile_{suf}",
-                            )
-                        else:
-                            owavpath = str(wavdir / f"{uttid}.{args.audio_format}")
-                            soundfile.write(owavpath, wave, rate)
-                            fout.write(f"{uttid} {owavpath}\n")
-                fnum_samples.write(f"{uttid} {len(wave)}\n")
+        tasks = list(wavscp.items())
+        func = _format_utterance
+        uttids = list(wavscp)
+
+    results = {}
+    if args.nj > 1:
+        shard_queue = multiprocessing.Manager().Queue()
+        for shard in range(1, args.nj + 1):
+            shard_queue.put(shard)
+        with multiprocessing.Pool(
+            args.nj, initializer=_init_worker, initargs=(formatter_kwargs, shard_queue)
+        ) as pool:
+            for retval in tqdm(pool.imap_unordered(func, tasks), total=len(tasks)):
+                for uttid, value, num_samples in retval:
+                    results[uttid] = (value, num_samples)
+    else:
+        _init_worker(formatter_kwargs, None)
+        for task in tqdm(tasks):
+            for uttid, value, num_samples in func(task):
+                results[uttid] = (value, num_samples)
+        _formatter.close()
+
+    # Keep the order of the input
+    total_samples = 0
+    with out_wavscp.open("w") as fout, out_num_samples.open("w") as fnum_samples:
+        for uttid in uttids:
+            value, num_samples = results[uttid]
+            fout.write(f"{uttid} {value}\n")
+            fnum_samples.write(f"{uttid} {num_samples}\n")
+            total_samples += num_samples
+
+    elapsed = time.perf_counter() - start_time
+    if args.fs is not None:
+        hours = total_samples / args.fs / 3600
+        logging.info(
+            f"Processed {len(uttids)} utterances ({hours:.2f} hours) "
+            f"in {elapsed:.1f} seconds: {hours * 3600 / elapsed:.1f}x real time"
+        )
+    else:
+        logging.info(
+            f"Processed {len(uttids)} utterances ({total_samples} samples) "
+            f"in {elapsed:.1f} seconds: {len(uttids) / elapsed:.1f} utterances/s"
+        )
 
 
 if __name__ == "__main__":
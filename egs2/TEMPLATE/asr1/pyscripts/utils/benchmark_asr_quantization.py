@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+#  Apache 2.0  (http://www.apache.org/licenses/LICENSE-2.0)
+
+"""Benchmark the RTF and the error rates of the quantized ASR models on CPU."""
+
+import argparse
+import itertools
+import logging
+import time
+from typing import Iterator, Tuple
+
+import editdistance
+import numpy as np
+import torch
+
+from espnet2.bin.asr_inference import Speech2Text
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.tasks.asr import ASRTask
+
+
+def iterate_speech(
+    speech2text: Speech2Text, wav_scp: str, num_utts: int
+) -> Iterator[Tuple[str, np.ndarray]]:
+    """Iterate over the speech in the same way as asr_inference.py.
+
+    Args:
+        speech2text (Speech2Text): Speech2Text providing the training args.
+        wav_scp (str): Path of wav.scp.
+        num_utts (int): Maximum number of the utterances.
+
+    Yields:
+        str: Utterance ID.
+        ndarray: Speech (T_wav,).
+
+    """
+    loader = ASRTask.build_streaming_iterator(
+        [(wav_scp, "speech", "sound")],
+        dtype="float32",
+        batch_size=1,
+        preprocess_fn=ASRTask.build_preprocess_fn(speech2text.asr_train_args, False),
+        collate_fn=ASRTask.build_collate_fn(speech2text.asr_train_args, False),
+        inference=True,
+    )
+    for keys, batch in itertools.islice(loader, num_utts):
+        yield keys[0], batch["speech"][0].numpy()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the real time factor and the error rates of the ASR"
+        " model on CPU without quantization, with dynamic quantization, and with"
+        " static quantization."
+    )
+    parser.add_argument("--asr_train_config", type=str, required=True)
+    parser.add_argument("--asr_model_file", type=str, required=True)
+    parser.add_argument(
+        "--wav_scp", type=str, required=True, help="wav.scp of the evaluation data."
+    )
+    parser.add_argument(
+        "--text", type=str, required=True, help="Reference text of the evaluation."
+    )
+    parser.add_argument(
+        "--calibration_scp",
+        type=str,
+        required=True,
+        help="wav.scp of the calibration data, which should differ from --wav_scp.",
+    )
+    parser.add_argument(
+        "--num_calibration_utts",
+        type=int,
+        default=200,
+        help="Number of the calibration utterances.",
+    )
+    parser.add_argument(
+        "--num_utts", type=int, default=100, help="Number of the evaluation utterances."
+    )
+    parser.add_argument("--fs", type=int, default=16000, help="Sampling rate.")
+    parser.add_argument("--beam_size", type=int, default=10)
+    parser.add_argument("--ctc_weight", type=float, default=0.3)
+    parser.add_argument(
+        "--num_threads", type=int, default=1, help="Number of the CPU threads."
+    )
+    parser.add_argument(
+        "--modes",
+        type=str,
+        nargs="+",
+        default=["float", "dynamic", "static"],
+        choices=["float", "dynamic", "static"],
+        help="Models to be compared.",
+    )
+    return parser
+
+
+def main():
+    """Run the benchmark."""
+    args = get_parser().parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    torch.set_num_threads(args.num_threads)
+    refs = read_2column_text(args.text)
+
+    for mode in args.modes:
+        speech2text = Speech2Text(
+            asr_train_config=args.asr_train_config,
+            asr_model_file=args.asr_model_file,
+            beam_size=args.beam_size,
+            ctc_weight=args.ctc_weight,
+            quantize_asr_model=mode == "dynamic",
+        )
+        if mode == "static":
+            speech2text.static_quantize(
+                speech
+                for _, speech in iterate_speech(
+                    speech2text, args.calibration_scp, args.num_calibration_utts
+                )
+            )
+
+        elapsed, duration = 0.0, 0.0
+        char_errs, char_total, word_errs, word_total = 0, 0, 0, 0
+        for key, speech in iterate_speech(speech2text, args.wav_scp, args.num_utts):
+            start_time = time.perf_counter()
+            text = speech2text(speech)[0][0] or ""
+            elapsed += time.perf_counter() - start_time
+            duration += len(speech) / args.fs
+
+            ref = refs[key]
+            char_errs += editdistance.eval(text.replace(" ", ""), ref.replace(" ", ""))
+            char_total += len(ref.replace(" ", ""))
+            word_errs += editdistance.eval(text.split(), ref.split())
+            word_total += len(ref.split())
+
+        logging.info(
+            f"{mode}: RTF = {elapsed / duration:.4f}, "
+            f"CER = {100 * char_errs / char_total:.2f}%, "
+            f"WER = {100 * word_errs / word_total:.2f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+#  Apache 2.0  (http://www.apache.org/licenses/LICENSE-2.0)
+
+"""Benchmark the real time factor of the vocoders before and after the export."""
+
+import argparse
+import copy
+import logging
+import time
+from typing import Callable
+
+import torch
+import yaml
+
+from espnet2.gan_tts.joint.joint_text2wav import AVAILABLE_VOCODER
+from espnet2.gan_tts.utils import fuse_for_inference, trace_for_inference
+
+
+def measure_rtf(
+    inference: Callable[[torch.Tensor], torch.Tensor],
+    c: torch.Tensor,
+    fs: int,
+    num_repeats: int,
+) -> float:
+    """Measure the real time factor of the inference function.
+
+    Args:
+        inference (Callable): Function mapping the features (T_feats, odim) into
+            the waveform (T_wav, 1).
+        c (Tensor): Input features (T_feats, odim).
+        fs (int): Sampling rate.
+        num_repeats (int): Number of the measured runs after a warm-up run.
+
+    Returns:
+        float: Real time factor.
+
+    """
+    with torch.no_grad():
+        wav = inference(c)
+        start_time = time.perf_counter()
+        for _ in range(num_repeats):
+            inference(c)
+        elapsed = (time.perf_counter() - start_time) / num_repeats
+    return elapsed / (wav.size(0) / fs)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the real time factor of the vocoders on CPU. "
+        "The weights are randomly initialized since they do not affect the speed."
+    )
+    parser.add_argument(
+        "--vocoder_type",
+        type=str,
+        default="hifigan_generator",
+        choices=list(AVAILABLE_VOCODER),
+        help="Type of the vocoder.",
+    )
+    parser.add_argument(
+        "--vocoder_params",
+        type=yaml.safe_load,
+        default={},
+        help='Parameters of the vocoder in YAML, e.g. "{upsample_scales: [8, 8, 4]}".',
+    )
+    parser.add_argument(
+        "--odim", type=int, default=80, help="Dimension of the input features."
+    )
+    parser.add_argument(
+        "--num_frames", type=int, default=500, help="Number of the input frames."
+    )
+    parser.add_argument("--fs", type=int, default=22050, help="Sampling rate.")
+    parser.add_argument(
+        "--num_threads", type=int, default=1, help="Number of the CPU threads."
+    )
+    parser.add_argument(
+        "--num_repeats", type=int, default=5, help="Number of the measured runs."
+    )
+    return parser
+
+
+def main():
+    """Run the benchmark."""
+    args = get_parser().parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    torch.set_num_threads(args.num_threads)
+
+    vocoder_params = dict(args.vocoder_params)
+    if args.vocoder_type in ["hifigan_generator", "melgan_generator"]:
+        vocoder_params.update(in_channels=args.odim)
+    else:
+        vocoder_params.update(aux_channels=args.odim)
+    vocoder = AVAILABLE_VOCODER[args.vocoder_type](**vocoder_params).eval()
+    c = torch.randn(args.num_frames, args.odim)
+
+    def _inference(model: torch.nn.Module) -> Callable[[torch.Tensor], torch.Tensor]:
+        def _run(c: torch.Tensor) -> torch.Tensor:
+            # NOTE: Fix the noise inputs of Parallel WaveGAN and StyleMelGAN
+            torch.manual_seed(0)
+            return model.inference(c)
+
+        return _run
+
+    with torch.no_grad():
+        ref = _inference(vocoder)(c)
+    rtf = measure_rtf(_inference(vocoder), c, args.fs, args.num_repeats)
+    logging.info(f"original: RTF = {rtf:.4f}")
+
+    fused = fuse_for_inference(copy.deepcopy(vocoder))
+    with torch.no_grad():
+        diff = (_inference(fused)(c) - ref).abs().max()
+    rtf = measure_rtf(_inference(fused), c, args.fs, args.num_repeats)
+    logging.info(f"fused: RTF = {rtf:.4f} (max abs diff = {diff:.3e})")
+
+    if args.vocoder_type == "style_melgan_generator":
+        logging.info("Skip TorchScript since the noise length is fixed in tracing.")
+        return
+
+    # NOTE: Trace with a different length to check that the length is not fixed
+    traced = trace_for_inference(fused, (c[: args.num_frames // 2],))
+    with torch.no_grad():
+        diff = (_inference(traced)(c) - ref).abs().max()
+    rtf = measure_rtf(_inference(traced), c, args.fs, args.num_repeats)
+    logging.info(f"fused + TorchScript: RTF = {rtf:.4f} (max abs diff = {diff:.3e})")
+
+
+if __name__ == "__main__":
+    main()
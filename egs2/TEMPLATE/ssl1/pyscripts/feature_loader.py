@@ -13,7 +13,6 @@ import logging
 import os
 import sys
 
-import fairseq
 import soundfile as sf
 import torch
 import torchaudio
@@ -37,9 +36,11 @@ class MfccFeatureReader(object):
         return wav
 
     def get_feats(self, path):
-        x = self.load_audio(path)
+        return self.get_feats_from_wav(self.load_audio(path))
+
+    def get_feats_from_wav(self, x):
         with torch.no_grad():
-            x = torch.from_numpy(x).view(1, -1).float()
+            x = torch.as_tensor(x).view(1, -1).float()
 
             mfcc = torchaudio.compliance.kaldi.mfcc(
                 waveform=x,
@@ -55,6 +56,10 @@ class MfccFeatureReader(object):
             )
             return concat
 
+    def get_feats_batch(self, wavs):
+        # MFCC is cheap enough to be computed utterance by utterance
+        return [self.get_feats_from_wav(x) for x in wavs]
+
 
 class HubertFeatureReader(object):
     def __init__(self, fs, hubert_url, hubert_dir_path, layer, max_chunk=1600000):
@@ -70,6 +75,14 @@ class HubertFeatureReader(object):
         self.max_chunk = max_chunk
         logger.info(f" max_chunk = {self.max_chunk}")
 
+        # NOTE: GroupNorm of the conv feature extractor in the default mode, e.g.,
+        #   HuBERT Base, normalizes over the whole time axis including the padding,
+        #   so the features can't be extracted in padded mini-batches
+        self.batchable = not any(
+            isinstance(m, torch.nn.GroupNorm)
+            for m in self.model.feature_extractor.modules()
+        )
+
     def load_audio(self, path):
         wav, sr = sf.read(path)
         assert sr == self.fs, sr
@@ -78,9 +91,11 @@ class HubertFeatureReader(object):
         return wav
 
     def get_feats(self, path):
-        x = self.load_audio(path)
+        return self.get_feats_from_wav(self.load_audio(path))
+
+    def get_feats_from_wav(self, x):
         with torch.no_grad():
-            x = torch.from_numpy(x).float().to(self.device)
+            x = torch.as_tensor(x).float().to(self.device)
             x = x.view(1, -1)
 
             feat = []
@@ -94,3 +109,38 @@ class HubertFeatureReader(object):
                 )
                 feat.append(feat_chunk)
             return torch.cat(feat, 1).squeeze(0).cpu()
+
+    def get_feats_batch(self, wavs):
+        """Extract the features of the utterances at once with the padding mask.
+
+        The features are the same as those of get_feats_from_wav(). The utterances
+        are processed one by one if the conv feature extractor uses GroupNorm or
+        if they are longer than max_chunk. The utterances should have similar
+        lengths to reduce the padding.
+        """
+        lengths = [len(x) for x in wavs]
+        if not self.batchable or max(lengths) > self.max_chunk:
+            return [self.get_feats_from_wav(x) for x in wavs]
+        with torch.no_grad():
+            out_lengths = [self._get_out_length(n) for n in lengths]
+            # HubertModel downsamples the padding mask by blocks of samples, so mark
+            # the frames by blocks to get the exact output lengths of the convs
+            block = max(lengths) // self._get_out_length(max(lengths))
+            x = torch.zeros(len(wavs), max(lengths), device=self.device)
+            padding_mask = torch.ones_like(x, dtype=torch.bool)
+            for i, wav in enumerate(wavs):
+                x[i, : len(wav)] = torch.as_tensor(wav).float()
+                padding_mask[i, : out_lengths[i] * block] = False
+            feats, _ = self.model.extract_features(
+                source=x,
+                padding_mask=padding_mask,
+                mask=False,
+                output_layer=self.layer,
+            )
+            return [f[:n].cpu() for f, n in zip(feats, out_lengths)]
+
+    def _get_out_length(self, length):
+        for conv_layer in self.model.feature_extractor.conv_layers:
+            conv = conv_layer[0]
+            length = (length - conv.kernel_size[0]) // conv.stride[0] + 1
+        return length
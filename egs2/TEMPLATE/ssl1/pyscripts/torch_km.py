@@ -0,0 +1,220 @@
+"""K-means pseudo-labeling without loading all the features in memory.
+
+Unlike sklearn_km.py and dump_km_label.py, the features are extracted only
+once in mini-batches and spilled to the memory-mapped shards, from which the
+k-means model is learned and the labels are dumped:
+
+    # 1. Extract the features of each shard (can be run as parallel jobs)
+    python torch_km.py dump_feats --feats-dir data/train \
+        --out-dir dump/km_feats/train --nshard 4 --shard-id 1
+    # 2. Learn k-means on a portion of the utterances
+    python torch_km.py learn --shards-dir dump/km_feats/train --km-path km.pth
+    # 3. Dump the labels in the format of the "text" file for HubertTask
+    python torch_km.py dump_labels --shards-dir dump/km_feats/train \
+        --km-path km.pth --label-path data/train_km/text --nj 4
+"""
+
+import argparse
+import logging
+import random
+from pathlib import Path
+
+import joblib
+import soundfile as sf
+import torch
+import tqdm
+
+from espnet2.hubert.kmeans import FeatureShards, FeatureShardWriter, MiniBatchKMeans
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+)
+logger = logging.getLogger("torch_km")
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("dump_feats", help="Extract the features to a shard.")
+    p.add_argument("--feats-dir", required=True, help="folder contains wav.scp")
+    p.add_argument("--out-dir", required=True, help="folder to write the shards")
+    p.add_argument("--nshard", type=int, default=1)
+    p.add_argument("--shard-id", type=int, default=1, help="1-based shard index")
+    p.add_argument("--fs", type=int, default=16000)
+    p.add_argument("--feature-type", type=str, default="mfcc")
+    p.add_argument("--hubert-model-url", type=str, default=None)
+    p.add_argument("--hubert-model-path", type=str, default=None)
+    p.add_argument(
+        "--max-batch-samples",
+        type=int,
+        default=1600000,
+        help="The maximum number of the samples of the waveforms in a mini-batch",
+    )
+    p.add_argument("--num-workers", type=int, default=2, help="for audio loading")
+
+    p = subparsers.add_parser("learn", help="Learn k-means from the shards.")
+    p.add_argument("--shards-dir", required=True)
+    p.add_argument("--km-path", required=True)
+    p.add_argument("--n-clusters", type=int, default=100)
+    p.add_argument(
+        "--portion", type=float, default=1.0, help="Using a subset of the data."
+    )
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--batch-size", type=int, default=10000)
+    p.add_argument("--max-iter", type=int, default=100)
+    p.add_argument("--max-no-improvement", type=int, default=100)
+    p.add_argument("--n-init", type=int, default=3)
+    p.add_argument("--device", type=str, default=None, help="cuda if available")
+
+    p = subparsers.add_parser("dump_labels", help="Dump the k-means labels.")
+    p.add_argument("--shards-dir", required=True)
+    p.add_argument("--km-path", required=True)
+    p.add_argument("--label-path", required=True)
+    p.add_argument("--nj", type=int, default=1, help="The number of processes")
+    p.add_argument("--device", type=str, default="cpu")
+    return parser
+
+
+def list_shards(shards_dir):
+    """Return the prefixes of the shards in the order of the shard ids."""
+    paths = sorted(
+        Path(shards_dir).glob("feats.*.index"),
+        key=lambda p: int(p.name.split(".")[1]),
+    )
+    if len(paths) == 0:
+        raise RuntimeError(f"No shards are found in {shards_dir}")
+    return [str(p)[: -len(".index")] for p in paths]
+
+
+class WavBatches(torch.utils.data.Dataset):
+    def __init__(self, batches, reader):
+        self.batches = batches
+        self.reader = reader
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __getitem__(self, i):
+        return [
+            (utt_id, self.reader.load_audio(path)) for utt_id, path in self.batches[i]
+        ]
+
+
+def dump_feats(args):
+    with open(Path(args.feats_dir) / "wav.scp", "r") as f:
+        lines = [line.rstrip().split(" ") for line in f]
+    start = len(lines) * (args.shard_id - 1) // args.nshard
+    end = len(lines) * args.shard_id // args.nshard
+    lines = lines[start:end]
+
+    # Sort by the length to reduce the padding in the mini-batches
+    lengths = {utt_id: sf.info(path).frames for utt_id, path in lines}
+    lines.sort(key=lambda x: -lengths[x[0]])
+    batches, batch = [], []
+    for utt_id, path in lines:
+        # The padded size of the mini-batch is decided by the first utterance
+        if len(batch) > 0:
+            padded_size = (len(batch) + 1) * lengths[batch[0][0]]
+            if padded_size > args.max_batch_samples:
+                batches.append(batch)
+                batch = []
+        batch.append((utt_id, path))
+    if len(batch) > 0:
+        batches.append(batch)
+
+    feature_type = args.feature_type.lower()
+    if feature_type == "mfcc":
+        from feature_loader import MfccFeatureReader
+
+        reader = MfccFeatureReader(args.fs)
+    elif "hubert" in feature_type:
+        from feature_loader import HubertFeatureReader
+
+        hlayer = int(feature_type.replace("hubert", ""))
+        reader = HubertFeatureReader(
+            args.fs, args.hubert_model_url, args.hubert_model_path, hlayer
+        )
+    else:
+        raise ValueError(f"feature_type: {feature_type}")
+
+    loader = torch.utils.data.DataLoader(
+        WavBatches(batches, reader),
+        batch_size=None,
+        num_workers=args.num_workers,
+    )
+    prefix = Path(args.out_dir) / f"feats.{args.shard_id}"
+    with FeatureShardWriter(prefix) as writer:
+        for batch in tqdm.tqdm(loader, total=len(batches)):
+            utt_ids = [utt_id for utt_id, _ in batch]
+            feats = reader.get_feats_batch([wav for _, wav in batch])
+            for utt_id, feat in zip(utt_ids, feats):
+                writer[utt_id] = feat
+    logger.info(f"Dumped {len(lines)} utterances to {prefix}")
+
+
+def learn(args):
+    prefixes = list_shards(args.shards_dir)
+    keys = None
+    if args.portion < 1.0:
+        utts = FeatureShards(prefixes).utts
+        random.seed(args.seed)
+        keys = set(random.sample(utts, int(args.portion * len(utts))))
+    feats = FeatureShards(prefixes, keys=keys)
+    logger.info(f"Learning k-means on {len(feats)} frames of {len(feats.utts)} utts")
+
+    device = args.device
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    km_model = MiniBatchKMeans(
+        n_clusters=args.n_clusters,
+        batch_size=args.batch_size,
+        max_iter=args.max_iter,
+        max_no_improvement=args.max_no_improvement,
+        n_init=args.n_init,
+        seed=args.seed,
+        device=device,
+    ).fit(feats)
+    Path(args.km_path).parent.mkdir(parents=True, exist_ok=True)
+    km_model.save(args.km_path)
+    logger.info("total inertia: %.5f", km_model.score(feats))
+    logger.info("K-means training successfully")
+
+
+def dump_shard_labels(prefix, km_path, label_path, device):
+    km_model = MiniBatchKMeans.load(km_path, device=device)
+    with open(label_path, "w") as f:
+        for utt_id, feat in FeatureShards([prefix]).items():
+            labels = km_model.predict(feat)
+            f.write(utt_id + " " + " ".join(map(str, labels.tolist())) + "\n")
+
+
+def dump_labels(args):
+    prefixes = list_shards(args.shards_dir)
+    label_path = Path(args.label_path)
+    label_path.parent.mkdir(parents=True, exist_ok=True)
+    outputs = [f"{label_path}.{i + 1}" for i in range(len(prefixes))]
+    joblib.Parallel(n_jobs=args.nj)(
+        joblib.delayed(dump_shard_labels)(prefix, args.km_path, out, args.device)
+        for prefix, out in zip(prefixes, outputs)
+    )
+    with label_path.open("w") as f:
+        for out in outputs:
+            with open(out) as fin:
+                f.write(fin.read())
+            Path(out).unlink()
+    logger.info(f"Dumped the labels to {label_path}")
+
+
+if __name__ == "__main__":
+    parser = get_parser()
+    args = parser.parse_args()
+    logging.info(str(args))
+
+    if args.command == "dump_feats":
+        dump_feats(args)
+    elif args.command == "learn":
+        learn(args)
+    else:
+        dump_labels(args)
@@ -34,6 +34,12 @@ portion=0.1
 nj=1
 python=python3       # Specify python to execute espnet commands.
 
+# sklearn: Load the features in memory and learn k-means by scikit-learn.
+# torch: Extract the features in mini-batches to memory-mapped shards once,
+#        learn k-means on them by torch and dump the labels in parallel.
+km_backend=sklearn
+max_batch_samples=1600000 # The maximum number of samples in a mini-batch (torch).
+
 log "$0 $*"
 . utils/parse_options.sh
 
@@ -49,7 +55,42 @@ fi
 km_path="${kmrootdir}/km_${train_set}_${feature_type}/km_${nclusters}clusters.mdl"
 mkdir -p "$(dirname ${km_path})"
 
-if [ ${stage} -le 1 ] && [ ${stop_stage} -ge 1 ]; then
+feats_shards_dir="$(dirname ${km_path})/feats"
+
+if [ ${stage} -le 1 ] && [ ${stop_stage} -ge 1 ] && [ "${km_backend}" = torch ]; then
+    log "stage 1: Learn K-means with ${feature_type} feature based on torch"
+
+    if [ "${feature_type}" = mfcc ]; then
+        _cmd="${train_cmd}"
+    else
+        # HuBERT features are extracted on GPU
+        _cmd="${cuda_cmd} --gpu 1"
+    fi
+
+    for task in ${train_set} ${dev_set} ${test_set}; do
+        # Remove the shards of the previous run, which may have a different ${nj}
+        rm -rf "${feats_shards_dir}/${task}"
+        _logdir="${feats_shards_dir}/${task}/log"
+        mkdir -p "${_logdir}"
+        ${_cmd} JOB=1:"${nj}" "${_logdir}"/dump_feats.JOB.log \
+            ${python} pyscripts/torch_km.py dump_feats \
+                --feats-dir "${datadir}/${task}" \
+                --out-dir "${feats_shards_dir}/${task}" \
+                --nshard "${nj}" \
+                --shard-id JOB \
+                --feature-type "${feature_type}" \
+                --hubert-model-url "${hubert_url}" \
+                --hubert-model-path "${hubert_dir_path}" \
+                --max-batch-samples "${max_batch_samples}"
+    done
+
+    ${python} pyscripts/torch_km.py learn \
+              --shards-dir "${feats_shards_dir}/${train_set}" \
+              --km-path "${km_path}" \
+              --n-clusters "${nclusters}" \
+              --portion ${portion}
+
+elif [ ${stage} -le 1 ] && [ ${stop_stage} -ge 1 ]; then
     log "stage 1: Learn K-means with ${feature_type} feature based on scikit-learn"
 
     ${python} pyscripts/sklearn_km.py \
@@ -76,14 +117,22 @@ if [ ${stage} -le 2 ] && [ ${stop_stage} -ge 2 ]; then
         mkdir -p ${plabel_dir}
         cp -r ${datadir}/${task}/* ${plabel_dir}
         
-        ${python} pyscripts/dump_km_label.py \
-                  --km-path "${km_path}" \
-                  --label-path "${plabel_dir}/text" \
-                  --recog-set "${plabel_dir}" \
-                  --feature "${feature_type}" \
-                  --hurl "${hubert_url}" \
-                  --hdir "${hubert_dir_path}" \
-                  --nj ${nj}
+        if [ "${km_backend}" = torch ]; then
+            ${python} pyscripts/torch_km.py dump_labels \
+                      --shards-dir "${feats_shards_dir}/${task}" \
+                      --km-path "${km_path}" \
+                      --label-path "${plabel_dir}/text" \
+                      --nj ${nj}
+        else
+            ${python} pyscripts/dump_km_label.py \
+                      --km-path "${km_path}" \
+                      --label-path "${plabel_dir}/text" \
+                      --recog-set "${plabel_dir}" \
+                      --feature "${feature_type}" \
+                      --hurl "${hubert_url}" \
+                      --hdir "${hubert_dir_path}" \
+                      --nj ${nj}
+        fi
         
         utils/fix_data_dir.sh ${plabel_dir}
     done
@@ -31,8 +31,6 @@ def recog_v2(args):
 
     """
     logging.warning("experimental API for custom LMs is selected by --api v2")
-    if args.batchsize > 1:
-        raise NotImplementedError("multi-utt batch decoding is not implemented")
     if args.streaming_mode is not None:
         raise NotImplementedError("streaming mode is not implemented")
     if args.word_rnnlm:
@@ -128,7 +126,7 @@ def recog_v2(args):
         pre_beam_score_key=None if args.ctc_weight == 1.0 else "full",
     )
     # TODO(karita): make all scorers batchfied
-    if args.batchsize == 1:
+    if args.batchsize > 0:
         non_batch = [
             k
             for k, v in beam_search.full_scorers.items()
@@ -157,22 +155,43 @@ def recog_v2(args):
     # read json data
     with open(args.recog_json, "rb") as f:
         js = json.load(f)["utts"]
+    keys = list(js.keys())
+    if args.batchsize > 1:
+        # Sort the utterances by the input length to reduce the padding
+        keys.sort(key=lambda k: -js[k]["input"][0]["shape"][0])
+        batches = [
+            keys[i : i + args.batchsize] for i in range(0, len(keys), args.batchsize)
+        ]
+    else:
+        batches = [[k] for k in keys]
+
     new_js = {}
+    idx = 0
     with torch.no_grad():
-        for idx, name in enumerate(js.keys(), 1):
-            logging.info("(%d/%d) decoding " + name, idx, len(js.keys()))
-            batch = [(name, js[name])]
-            feat = load_inputs_and_targets(batch)[0][0]
-            enc = model.encode(torch.as_tensor(feat).to(device=device, dtype=dtype))
-            nbest_hyps = beam_search(
-                x=enc, maxlenratio=args.maxlenratio, minlenratio=args.minlenratio
-            )
-            nbest_hyps = [
-                h.asdict() for h in nbest_hyps[: min(len(nbest_hyps), args.nbest)]
+        for names in batches:
+            batch = [(name, js[name]) for name in names]
+            feats = [
+                torch.as_tensor(feat).to(device=device, dtype=dtype)
+                for feat in load_inputs_and_targets(batch)[0]
             ]
-            new_js[name] = add_results_to_json(
-                js[name], nbest_hyps, train_args.char_list
-            )
+            if len(feats) > 1:
+                # Encode the utterances at once and search them one by one
+                encs = model.encode_batch(feats)
+            else:
+                encs = [model.encode(feats[0])]
+
+            for name, enc in zip(names, encs):
+                idx += 1
+                logging.info("(%d/%d) decoding " + name, idx, len(keys))
+                nbest_hyps = beam_search(
+                    x=enc, maxlenratio=args.maxlenratio, minlenratio=args.minlenratio
+                )
+                nbest_hyps = [
+                    h.asdict() for h in nbest_hyps[: min(len(nbest_hyps), args.nbest)]
+                ]
+                new_js[name] = add_results_to_json(
+                    js[name], nbest_hyps, train_args.char_list
+                )
 
     with open(args.result_label, "wb") as f:
         f.write(
@@ -130,6 +130,17 @@ class ASRInterface:
         """
         raise NotImplementedError("encode method is not implemented")
 
+    def encode_batch(self, xs):
+        """Encode a batch of features in `beam_search` (optional).
+
+        Args:
+            xs (list of numpy.ndarray or torch.Tensor): input features [(T_i, D)]
+        Returns:
+            list of torch.Tensor for pytorch: encoded features [(T_i', D)]
+
+        """
+        return [self.encode(x) for x in xs]
+
     def scorers(self):
         """Get scorers for `beam_search` (optional).
 
@@ -0,0 +1,277 @@
+"""Parallel time synchronous beam search module."""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+import torch
+
+from espnet.nets.beam_search import Hypothesis
+from espnet.nets.beam_search_timesync import BeamSearchTimeSync, CacheItem
+from espnet.nets.scorer_interface import BatchScorerInterface, ScorerInterface
+
+
+class BatchBeamSearchTimeSync(BeamSearchTimeSync):
+    """Batch time synchronous beam search implementation.
+
+    All the prefixes expanded at a frame are processed at once:
+    the CTC prefix probabilities are updated as tensors,
+    and the new prefixes of the attentional decoder and LM are scored
+    with a single ``batch_score`` call for each prefix length.
+    The prefix caches only keep the entries reachable from the current beam,
+    so that the memory does not grow with the length of the utterance.
+
+    """
+
+    def reset(self, enc_output: torch.Tensor):
+        """Reset object for a new utterance."""
+        super().reset(enc_output)
+        # The states of batch_score may differ from those of score,
+        # e.g. the transformer decoder, so compute the initial ones again
+        for cache, scorer in (
+            (self.attn_cache, self.decoder),
+            (self.lm_cache, self.lm),
+        ):
+            if isinstance(scorer, BatchScorerInterface):
+                scores, states = scorer.batch_score(
+                    self.sos_th.unsqueeze(0),
+                    [scorer.batch_init_state(enc_output)],
+                    enc_output.unsqueeze(0),
+                )
+                cache[(self.sos,)] = CacheItem(
+                    state=states[0], scores=scores[0], log_sum=0.0
+                )
+
+    def batch_cached_score(
+        self, roots: List[Tuple[int]], cache: dict, scorer: ScorerInterface
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Retrieve decoder/LM scores of the roots, scoring the missing ones.
+
+        Args:
+            roots (List[Tuple[int]]): The prefixes to be extended
+            cache (dict): The cache of the scorer
+            scorer (ScorerInterface): The decoder or LM
+
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: The scores for the next token
+                with shape `(n_roots, n_vocab)` and the log sums of the roots
+                with shape `(n_roots,)`.
+
+        """
+        missing = defaultdict(list)
+        for root in roots:
+            if root not in cache:
+                missing[len(root)].append(root)
+        # NOTE: The states of the transformer decoder depend on the prefix length,
+        # so only the prefixes with the same length are batched together
+        for group in missing.values():
+            parents = [cache[root[:-1]] for root in group]
+            ys = torch.tensor(group, device=self.enc_output.device).long()
+            if isinstance(scorer, BatchScorerInterface):
+                xs = self.enc_output.expand(len(group), *self.enc_output.shape)
+                scores, states = scorer.batch_score(
+                    ys, [parent.state for parent in parents], xs
+                )
+            else:
+                scores, states = zip(
+                    *[
+                        scorer.score(y, parent.state, self.enc_output)
+                        for y, parent in zip(ys, parents)
+                    ]
+                )
+                scores = torch.stack(scores)
+            parent_scores = torch.stack([parent.scores for parent in parents])
+            log_sums = (
+                torch.tensor(
+                    [parent.log_sum for parent in parents], dtype=torch.float64
+                )
+                + parent_scores[torch.arange(len(group)), ys[:, -1]].double().cpu()
+            )
+            for root, score, state, log_sum in zip(
+                group, scores, states, log_sums.tolist()
+            ):
+                cache[root] = CacheItem(state=state, scores=score, log_sum=log_sum)
+
+        return (
+            torch.stack([cache[root].scores for root in roots]),
+            torch.tensor([cache[root].log_sum for root in roots], dtype=torch.float64),
+        )
+
+    def batch_prefix_score(
+        self, prefixes: List[Tuple[int]], cache: dict, scorer: ScorerInterface
+    ) -> torch.Tensor:
+        """Calculate decoder/LM scores of the prefixes with shape `(n_prefixes,)`."""
+        root_ids = dict()
+        ids, tokens, valid = [], [], []
+        for i, h in enumerate(prefixes):
+            if len(h) > 1:
+                ids.append(root_ids.setdefault(h[:-1], len(root_ids)))
+                tokens.append(h[-1])
+                valid.append(i)
+        ret = torch.zeros(len(prefixes), dtype=torch.float64)
+        if len(valid) > 0:
+            scores, log_sums = self.batch_cached_score(list(root_ids), cache, scorer)
+            ids = torch.tensor(ids)
+            tokens = torch.tensor(tokens)
+            ret[valid] = (
+                log_sums[ids]
+                + scores[ids.to(scores.device), tokens.to(scores.device)].double().cpu()
+            )
+        return ret
+
+    def batch_joint_score(self, prefixes: List[Tuple[int]], ctc_score: torch.Tensor):
+        """Calculate joint scores of the prefixes with shape `(n_prefixes,)`."""
+        scores = self.ctc_weight * ctc_score
+        if self.decoder is not None and self.decoder_weight > 0:
+            scores += self.decoder_weight * self.batch_prefix_score(
+                prefixes, self.attn_cache, self.decoder
+            )
+        if self.lm is not None and self.lm_weight > 0:
+            scores += self.lm_weight * self.batch_prefix_score(
+                prefixes, self.lm_cache, self.lm
+            )
+        lengths = torch.tensor([len(h) for h in prefixes], dtype=torch.float64)
+        scores += self.penalty * (lengths - 1)
+        return scores
+
+    def prune_cache(self, hyps: List[Tuple[int]]):
+        """Remove the cache entries which can not be referred any more.
+
+        The next frame only extends the hypotheses in the beam, so that
+        only the hypotheses and their parents are required.
+
+        """
+        keep = set(hyps) | set(h[:-1] for h in hyps)
+        self.attn_cache = {k: v for k, v in self.attn_cache.items() if k in keep}
+        self.lm_cache = {k: v for k, v in self.lm_cache.items() if k in keep}
+
+    def time_step(
+        self,
+        p_ctc: torch.Tensor,
+        ctc_score_dp: Tuple[Dict[Tuple[int], int], torch.Tensor, torch.Tensor],
+        hyps: List[Tuple[int]],
+    ) -> Any:
+        """Execute a single time step for all the hypotheses at once.
+
+        Args:
+            p_ctc (torch.Tensor): CTC log probabilities of the frame (n_vocab,)
+            ctc_score_dp (tuple): The index of the prefixes
+                and their (p_nb, p_b) at the previous frame
+            hyps (List[Tuple[int]]): The hypotheses in the beam
+
+        """
+        prefix_index, prev_nb, prev_b = ctc_score_dp
+        pre_beam_size = min(self.pre_beam_size, p_ctc.size(0))
+        pre_beam_threshold = p_ctc.topk(pre_beam_size)[0][-1]
+        cands = torch.nonzero(p_ctc >= pre_beam_threshold).view(-1).tolist()
+        if len(cands) == 0:
+            cands = [int(p_ctc.argmax())]
+        use_blank = self.blank in cands
+        tokens = torch.tensor([c for c in cands if c != self.blank], dtype=torch.long)
+        ninf = torch.tensor(float("-inf"), dtype=p_ctc.dtype)
+
+        prev_ids = [prefix_index[h] for h in hyps]
+        p_nb, p_b = prev_nb[prev_ids], prev_b[prev_ids]
+        p_prev = torch.logaddexp(p_nb, p_b)
+        last = torch.tensor([h[-1] for h in hyps], dtype=torch.long)
+        repeat = last[:, None] == tokens[None, :]  # (n_hyps, n_tokens)
+
+        # The hypotheses emitting blank or repeating the last token
+        stay_b = p_ctc[self.blank] + p_prev if use_blank else ninf.expand_as(p_prev)
+        stay_nb = torch.where(repeat.any(1), p_ctc[last] + p_nb, ninf)
+        # The hypotheses extended by a non-blank token
+        ext_nb = p_ctc[tokens][None, :] + torch.where(
+            repeat, p_b[:, None], p_prev[:, None]
+        )
+        ext_nb = ext_nb.view(-1)
+        ext_b = ninf.expand_as(ext_nb).clone()
+        extended = [h + (c,) for h in hyps for c in tokens.tolist()]
+
+        hyp_index = {h: i for i, h in enumerate(hyps)}
+        merge_src, merge_tgt, revive_src, revive_tgt, new_ids = [], [], [], [], []
+        for k, h in enumerate(extended):
+            if h in hyp_index:
+                # Already in the beam
+                merge_src.append(k)
+                merge_tgt.append(hyp_index[h])
+            else:
+                if h in prefix_index:
+                    # Pruned at the previous frame
+                    revive_src.append(prefix_index[h])
+                    revive_tgt.append(k)
+                new_ids.append(k)
+        if len(revive_tgt) > 0:
+            ext_b[revive_tgt] = p_ctc[self.blank] + torch.logaddexp(
+                prev_nb[revive_src], prev_b[revive_src]
+            )
+            ext_nb[revive_tgt] = torch.logaddexp(
+                ext_nb[revive_tgt],
+                p_ctc[tokens.repeat(len(hyps))[revive_tgt]] + prev_nb[revive_src],
+            )
+        if len(merge_tgt) > 0:
+            stay_nb = stay_nb.clone()
+            stay_b = stay_b.clone()
+            stay_nb[merge_tgt] = torch.logaddexp(stay_nb[merge_tgt], ext_nb[merge_src])
+            stay_b[merge_tgt] = torch.logaddexp(stay_b[merge_tgt], ext_b[merge_src])
+
+        # NOTE: The hypotheses without any path are kept with (-inf, -inf),
+        # which does not change the probabilities of the next frame
+        prefixes = hyps + [extended[k] for k in new_ids]
+        next_nb = torch.cat([stay_nb, ext_nb[new_ids]])
+        next_b = torch.cat([stay_b, ext_b[new_ids]])
+        if use_blank:
+            cand_ids = list(range(len(prefixes)))
+        else:
+            cand_ids = sorted(merge_tgt) + list(range(len(hyps), len(prefixes)))
+
+        new_hyps = [prefixes[i] for i in cand_ids]
+        scores = self.batch_joint_score(
+            new_hyps, torch.logaddexp(next_nb[cand_ids], next_b[cand_ids])
+        )
+        best = torch.argsort(scores, descending=True)[: self.beam_size].tolist()
+        hyps = [new_hyps[i] for i in best]
+        scores = dict(zip(hyps, scores[best].tolist()))
+        self.prune_cache(hyps)
+
+        ctc_score_dp = ({h: i for i, h in enumerate(prefixes)}, next_nb, next_b)
+        return ctc_score_dp, hyps, scores
+
+    def forward(
+        self, x: torch.Tensor, maxlenratio: float = 0.0, minlenratio: float = 0.0
+    ) -> List[Hypothesis]:
+        """Perform beam search.
+
+        Args:
+            enc_output (torch.Tensor)
+
+        Return:
+            list[Hypothesis]
+
+        """
+        logging.info("decoder input lengths: " + str(x.shape[0]))
+        lpz = self.ctc.log_softmax(x.unsqueeze(0))
+        lpz = lpz.squeeze(0).detach().cpu().double()
+        self.reset(x)
+
+        hyps = [(self.sos,)]
+        ctc_score_dp = (
+            {(self.sos,): 0},
+            torch.tensor([float("-inf")], dtype=lpz.dtype),
+            torch.tensor([0.0], dtype=lpz.dtype),
+        )  # (index, p_nb, p_b) - dp object tracking p_ctc
+        for t in range(lpz.shape[0]):
+            logging.debug("position " + str(t))
+            ctc_score_dp, hyps, scores = self.time_step(lpz[t], ctc_score_dp, hyps)
+
+        ret = [
+            Hypothesis(yseq=torch.tensor(list(h) + [self.sos]), score=scores[h])
+            for h in hyps
+        ]
+        best_hyp = "".join([self.token_list[x] for x in ret[0].yseq.tolist()])
+        best_hyp_len = len(ret[0].yseq)
+        best_score = ret[0].score
+        logging.info(f"output length: {best_hyp_len}")
+        logging.info(f"total log probability: {best_score:.2f}")
+        logging.info(f"best hypo: {best_hyp}")
+
+        return ret
@@ -0,0 +1,528 @@
+"""Frame synchronous CTC prefix beam search.
+
+Unlike BeamSearch with CTCPrefixScorer, which expands the hypotheses
+label-synchronously, the hypotheses are expanded along the frames,
+which is much cheaper for the models decoded only with CTC.
+The search is vectorized over the hypotheses and the utterances in a mini-batch.
+References: https://arxiv.org/abs/1408.2873
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+import torch
+
+from espnet.nets.beam_search import Hypothesis
+from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
+from espnet.nets.scorer_interface import (
+    BatchScorerInterface,
+    PartialScorerInterface,
+    ScorerInterface,
+)
+
+# The prefixes are identified by the pair of the rolling hashes of the tokens
+HASH_BASES = (1000003, 999983)
+HASH_MODULI = (2147483647, 2147483629)
+
+
+class CTCGreedySearch(torch.nn.Module):
+    """CTC greedy search, i.e. best path decoding."""
+
+    def __init__(
+        self,
+        ctc: torch.nn.Module,
+        sos: int,
+        eos: int,
+        blank: int = 0,
+        token_list: List[str] = None,
+    ):
+        """Initialize CTC greedy search.
+
+        Args:
+            ctc (torch.nn.Module): CTC module with ``log_softmax``
+            sos (int): Start of sequence id
+            eos (int): End of sequence id
+            blank (int): Blank id
+            token_list (List[str]): List of tokens for debug log
+
+        """
+        super().__init__()
+        self.ctc = ctc
+        self.sos = sos
+        self.eos = eos
+        self.blank = blank
+        self.token_list = token_list
+
+    def forward(
+        self, x: torch.Tensor, maxlenratio: float = 0.0, minlenratio: float = 0.0
+    ) -> List[Hypothesis]:
+        """Perform the search for an utterance.
+
+        Args:
+            x (torch.Tensor): Encoded speech feature (T, D)
+            maxlenratio (float): Not used, only for the compatibility with BeamSearch
+            minlenratio (float): Not used, only for the compatibility with BeamSearch
+
+        Returns:
+            list[Hypothesis]: N-best decoding results
+
+        """
+        logging.info("decoder input length: " + str(x.shape[0]))
+        xlens = torch.full([1], x.size(0), dtype=torch.long, device=x.device)
+        nbest_hyps = self.batch_decode(x.unsqueeze(0), xlens)[0]
+        best = nbest_hyps[0]
+        logging.info(f"output length: {len(best.yseq)}")
+        logging.info(f"total log probability: {float(best.score):.2f}")
+        if self.token_list is not None:
+            logging.info(
+                "best hypo: "
+                + "".join([self.token_list[y] for y in best.yseq[1:-1].tolist()])
+            )
+        return nbest_hyps
+
+    def batch_decode(
+        self, xs: torch.Tensor, xlens: torch.Tensor
+    ) -> List[List[Hypothesis]]:
+        """Perform the search for a mini-batch.
+
+        Args:
+            xs (torch.Tensor): Encoded speech features (B, T, D)
+            xlens (torch.Tensor): Lengths of the features (B,)
+
+        Returns:
+            List[List[Hypothesis]]: N-best decoding results of the utterances
+
+        """
+        lpz = self.ctc.log_softmax(xs)
+        best_scores, best_ids = lpz.max(-1)
+        best_scores = best_scores.masked_fill(make_pad_mask(xlens, best_scores), 0.0)
+        best_scores = best_scores.sum(-1).tolist()
+        best_ids = best_ids.cpu()
+
+        ret = []
+        for ids, xlen, score in zip(best_ids, xlens.tolist(), best_scores):
+            ys = torch.unique_consecutive(ids[:xlen])
+            yseq = torch.cat(
+                [
+                    torch.tensor([self.sos]),
+                    ys[ys != self.blank],
+                    torch.tensor([self.eos]),
+                ]
+            )
+            ret.append([Hypothesis(yseq=yseq, score=score, scores={"ctc": score})])
+        return ret
+
+
+class CTCPrefixBeamSearch(CTCGreedySearch):
+    """Batch CTC prefix beam search.
+
+    The hypotheses of all the utterances in a mini-batch are expanded together
+    at each frame, and the extended prefixes which are already in the beam
+    are merged with tensor operations.
+    Language models, e.g. RNNLM or N-gram, can be fused via full scorers,
+    and the hypotheses including the hotwords can be boosted.
+
+    """
+
+    def __init__(
+        self,
+        ctc: torch.nn.Module,
+        sos: int,
+        eos: int,
+        beam_size: int,
+        scorers: Dict[str, ScorerInterface] = None,
+        weights: Dict[str, float] = None,
+        penalty: float = 0.0,
+        pre_beam_ratio: float = 1.5,
+        blank: int = 0,
+        token_list: List[str] = None,
+        hotwords: Sequence[Sequence[int]] = None,
+        hotword_weight: float = 2.0,
+    ):
+        """Initialize CTC prefix beam search.
+
+        Args:
+            ctc (torch.nn.Module): CTC module with ``log_softmax``
+            sos (int): Start of sequence id
+            eos (int): End of sequence id
+            beam_size (int): The number of hypotheses kept during search
+            scorers (Dict[str, ScorerInterface]): Full scorers fused with CTC,
+                e.g. language models. They are not fed with the encoder output.
+            weights (Dict[str, float]): Weights of the scorers
+            penalty (float): Insertion bonus for each token
+            pre_beam_ratio (float): The number of the tokens tried for each
+                hypothesis at a frame is `pre_beam_ratio * beam_size`
+            blank (int): Blank id
+            token_list (List[str]): List of tokens for debug log
+            hotwords (Sequence[Sequence[int]]): Token ids of the hotwords
+            hotword_weight (float): Bonus for each token matched with a hotword
+
+        """
+        super().__init__(ctc, sos, eos, blank=blank, token_list=token_list)
+        self.beam_size = beam_size
+        self.pre_beam_size = int(pre_beam_ratio * beam_size)
+        self.penalty = penalty
+        self.scorers = dict()
+        self.weights = dict()
+        for k, v in (scorers or dict()).items():
+            w = (weights or dict()).get(k, 0)
+            if v is None or w == 0:
+                continue
+            if isinstance(v, PartialScorerInterface) and not isinstance(
+                v, BatchScorerInterface
+            ):
+                raise ValueError(f"Partial scorer is not supported: {k}")
+            self.scorers[k] = v
+            self.weights[k] = w
+        self.hotword_tables = None
+        if hotwords is not None and len(hotwords) > 0:
+            self.hotword_tables = self.build_hotword_tables(hotwords, hotword_weight)
+
+    @staticmethod
+    def build_hotword_tables(
+        hotwords: Sequence[Sequence[int]], weight: float
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Build the transition tables of the trie of the hotwords.
+
+        Each matched token gives the bonus, which is canceled
+        when the match fails before a hotword is completed.
+
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+                The next node (n_node, n_vocab), the bonus of the transition
+                (n_node, n_vocab) and the bonus to be canceled at each node (n_node,).
+
+        """
+        children = [dict()]
+        partial = [0]  # The number of the matched tokens of an unfinished hotword
+        for hotword in hotwords:
+            node = 0
+            for token in hotword:
+                if token not in children[node]:
+                    children[node][token] = len(children)
+                    children.append(dict())
+                    partial.append(partial[node] + 1)
+                node = children[node][token]
+            partial[node] = 0
+        # The nodes of the completed hotwords and their descendants
+        for node, child in enumerate(children):
+            for token, c in child.items():
+                partial[c] = min(partial[c], partial[node] + 1)
+
+        n_vocab = max(max(c) for c in children if len(c) > 0) + 1
+        partial = torch.tensor(partial, dtype=torch.float) * weight
+        # Restart the match from the root
+        next_node = torch.zeros(len(children), n_vocab, dtype=torch.long)
+        for token, c in children[0].items():
+            next_node[:, token] = c
+        bonus = (next_node > 0).float() * weight - partial[:, None]
+        for node, child in enumerate(children):
+            for token, c in child.items():
+                next_node[node, token] = c
+                bonus[node, token] = weight
+        return next_node, bonus, partial
+
+    def score_prefixes(
+        self, ys: torch.Tensor, states: Dict[str, List[Any]]
+    ) -> Tuple[Dict[str, torch.Tensor], Dict[str, List[Any]]]:
+        """Score the next tokens of the prefixes with the same length.
+
+        Args:
+            ys (torch.Tensor): The prefixes starting with <sos> (n_batch, ylen)
+            states (Dict[str, List[Any]]): The states of the scorers for ys[:, :-1]
+
+        Returns:
+            Tuple[Dict[str, torch.Tensor], Dict[str, List[Any]]]: The scores of
+                the next tokens with shape `(n_batch, n_vocab)` and the new states.
+
+        """
+        # NOTE: The scorers are language models, which do not refer to the encoder
+        # output. An empty tensor is given only to specify the batch size.
+        xs = ys.new_zeros(len(ys), 0)
+        scores, new_states = dict(), dict()
+        for k, scorer in self.scorers.items():
+            if isinstance(scorer, BatchScorerInterface):
+                scores[k], new_states[k] = scorer.batch_score(ys, states[k], xs)
+            else:
+                scores[k], new_states[k] = zip(
+                    *[scorer.score(y, s, x) for y, s, x in zip(ys, states[k], xs)]
+                )
+                scores[k] = torch.stack(scores[k])
+        return scores, new_states
+
+    def batch_decode(
+        self, xs: torch.Tensor, xlens: torch.Tensor
+    ) -> List[List[Hypothesis]]:
+        """Perform the search for a mini-batch.
+
+        Args:
+            xs (torch.Tensor): Encoded speech features (B, T, D)
+            xlens (torch.Tensor): Lengths of the features (B,)
+
+        Returns:
+            List[List[Hypothesis]]: N-best decoding results of the utterances
+
+        """
+        lpz = self.ctc.log_softmax(xs).float()
+        n_batch, maxlen, n_vocab = lpz.shape
+        beam = self.beam_size
+        n_tokens = min(self.pre_beam_size, n_vocab - 1)
+        device = lpz.device
+        ninf = float("-inf")
+
+        # The padded frames emit blank with probability 1, which keeps the hypotheses
+        pad = make_pad_mask(xlens, maxlen=maxlen).to(device)
+        lpz = lpz.masked_fill(pad.unsqueeze(-1), ninf)
+        lpz[:, :, self.blank] = lpz[:, :, self.blank].masked_fill(pad, 0.0)
+
+        # Only the first hypothesis, i.e. the empty prefix, is alive at first
+        p_b = lpz.new_full((n_batch, beam), ninf)
+        p_b[:, 0] = 0.0
+        p_nb = lpz.new_full((n_batch, beam), ninf)
+        yseq = torch.zeros(n_batch, beam, maxlen, dtype=torch.long, device=device)
+        length = torch.zeros(n_batch, beam, dtype=torch.long, device=device)
+        last = torch.full((n_batch, beam), -1, dtype=torch.long, device=device)
+        hashes = [torch.zeros_like(length) for _ in HASH_BASES]
+        for h in hashes:
+            h[:, 1:] = -1
+        # The scores fused with CTC except the insertion bonus
+        fusion_score = lpz.new_zeros(n_batch, beam)
+        scorer_scores = {k: lpz.new_zeros(n_batch, beam) for k in self.scorers}
+
+        if self.hotword_tables is not None:
+            hot_next, hot_bonus, hot_partial = [
+                v.to(device) for v in self.hotword_tables
+            ]
+            n_pad = n_vocab - hot_next.size(1)
+            if n_pad > 0:
+                # The tokens out of the hotwords restart the match from the root
+                hot_next = torch.nn.functional.pad(hot_next, (0, n_pad))
+                hot_bonus = torch.cat(
+                    [hot_bonus, -hot_partial[:, None].expand(-1, n_pad)], dim=1
+                )
+            hot_node = torch.zeros_like(length)
+
+        # The scores of the next tokens (B, beam, V) and the list of B * beam states
+        next_scores, states = dict(), dict()
+        if len(self.scorers) > 0:
+            ys = torch.full((n_batch, 1), self.sos, dtype=torch.long, device=device)
+            next_scores, states = self.score_prefixes(
+                ys,
+                {
+                    k: [
+                        v.batch_init_state(x)
+                        if isinstance(v, BatchScorerInterface)
+                        else v.init_state(x)
+                        for x in xs
+                    ]
+                    for k, v in self.scorers.items()
+                },
+            )
+            next_scores = {
+                k: v.unsqueeze(1).expand(-1, beam, -1).contiguous()
+                for k, v in next_scores.items()
+            }
+            states = {k: [s for s in v for _ in range(beam)] for k, v in states.items()}
+
+        batch_ids = torch.arange(n_batch, device=device).unsqueeze(1)
+        for t in range(maxlen):
+            logp = lpz[:, t]  # (B, V)
+            tokens = logp.index_fill(1, torch.tensor([self.blank], device=device), ninf)
+            tokens = tokens.topk(n_tokens, dim=-1)[1]  # (B, C)
+
+            # 1. Keep the prefixes by emitting blank or repeating the last token
+            p_total = torch.logaddexp(p_b, p_nb)
+            stay_b = p_total + logp[:, self.blank : self.blank + 1]
+            stay_nb = p_nb + logp.gather(1, last.clamp(min=0)).masked_fill(
+                last < 0, ninf
+            )
+
+            # 2. Extend the prefixes with the pre-beam tokens: (B, beam * C)
+            repeat = last.unsqueeze(-1) == tokens.unsqueeze(1)
+            ext_nb = logp.gather(1, tokens).unsqueeze(1) + torch.where(
+                repeat, p_b.unsqueeze(-1), p_total.unsqueeze(-1)
+            )
+            ext_nb = ext_nb.view(n_batch, -1)
+            ext_hashes = [
+                ((h.unsqueeze(-1) * base + tokens.unsqueeze(1) + 1) % mod).view(
+                    n_batch, -1
+                )
+                for h, base, mod in zip(hashes, HASH_BASES, HASH_MODULI)
+            ]
+
+            # 3. Merge the extended prefixes which are already in the beam
+            same = None
+            for h, eh in zip(hashes, ext_hashes):
+                eq = h.unsqueeze(-1) == eh.unsqueeze(1)  # (B, beam, beam * C)
+                same = eq if same is None else same & eq
+            stay_nb = torch.logaddexp(
+                stay_nb, ext_nb.unsqueeze(1).masked_fill(~same, ninf).logsumexp(-1)
+            )
+            ext_nb = ext_nb.masked_fill(same.any(1), ninf)
+
+            # 4. Prune the hypotheses with the fused scores
+            ext_fusion = fusion_score.repeat_interleave(n_tokens, dim=1)
+            ext_tokens = tokens.repeat(1, beam)  # (B, beam * C)
+            if len(self.scorers) > 0:
+                ext_scorer_scores = {
+                    k: v.gather(2, tokens.unsqueeze(1).expand(-1, beam, -1)).view(
+                        n_batch, -1
+                    )
+                    for k, v in next_scores.items()
+                }
+                for k, v in ext_scorer_scores.items():
+                    ext_fusion = ext_fusion + self.weights[k] * v
+            if self.hotword_tables is not None:
+                ext_bonus = hot_bonus[
+                    hot_node.repeat_interleave(n_tokens, dim=1), ext_tokens
+                ]
+                ext_fusion = ext_fusion + ext_bonus
+            scores = torch.cat(
+                [
+                    torch.logaddexp(stay_b, stay_nb)
+                    + fusion_score
+                    + self.penalty * length,
+                    ext_nb
+                    + ext_fusion
+                    + self.penalty * (length + 1).repeat_interleave(n_tokens, dim=1),
+                ],
+                dim=1,
+            )
+            top_scores, top_ids = scores.topk(beam, dim=1)  # (B, beam)
+            alive = torch.isfinite(top_scores)
+            is_ext = top_ids >= beam
+            ext_ids = (top_ids - beam).clamp(min=0)
+            src = torch.where(is_ext, ext_ids // n_tokens, top_ids)
+            token = ext_tokens.gather(1, ext_ids)
+
+            p_b = stay_b.gather(1, src).masked_fill(is_ext, ninf)
+            p_nb = torch.where(
+                is_ext, ext_nb.gather(1, ext_ids), stay_nb.gather(1, src)
+            )
+            fusion_score = torch.where(
+                is_ext, ext_fusion.gather(1, ext_ids), fusion_score.gather(1, src)
+            )
+            yseq = yseq[batch_ids, src]
+            length = length.gather(1, src)
+            pos = length.unsqueeze(-1)
+            token_at_pos = yseq.gather(2, pos).squeeze(-1)
+            yseq.scatter_(
+                2, pos, torch.where(is_ext, token, token_at_pos).unsqueeze(-1)
+            )
+            length = length + is_ext
+            last = torch.where(is_ext, token, last.gather(1, src))
+            hashes = [
+                torch.where(
+                    is_ext, eh.gather(1, ext_ids), h.gather(1, src)
+                ).masked_fill(~alive, -1)
+                for h, eh in zip(hashes, ext_hashes)
+            ]
+            if self.hotword_tables is not None:
+                hot_node = hot_node.gather(1, src)
+                hot_node = torch.where(is_ext, hot_next[hot_node, token], hot_node)
+
+            if len(self.scorers) > 0:
+                for k in self.scorers:
+                    delta = ext_scorer_scores[k].gather(1, ext_ids)
+                    scorer_scores[k] = scorer_scores[k].gather(1, src)
+                    scorer_scores[k] += delta.masked_fill(~is_ext, 0.0)
+                    next_scores[k] = next_scores[k][batch_ids, src]
+                flat_src = (batch_ids * beam + src).view(-1).tolist()
+                states = {k: [v[i] for i in flat_src] for k, v in states.items()}
+                self.update_scorers(
+                    (is_ext & alive).nonzero().tolist(),
+                    length,
+                    yseq,
+                    next_scores,
+                    states,
+                )
+
+        # Finalize the hypotheses
+        ctc_score = torch.logaddexp(p_b, p_nb)
+        final_score = ctc_score + fusion_score + self.penalty * length
+        for k, v in next_scores.items():
+            scorer_scores[k] = scorer_scores[k] + v[:, :, self.eos]
+            final_score = final_score + self.weights[k] * v[:, :, self.eos]
+        if self.hotword_tables is not None:
+            final_score = final_score - hot_partial[hot_node]
+        order = final_score.argsort(dim=1, descending=True)
+        final_score = final_score.gather(1, order).tolist()
+        ctc_score = ctc_score.gather(1, order).tolist()
+        scorer_scores = {
+            k: v.gather(1, order).tolist() for k, v in scorer_scores.items()
+        }
+        length = length.gather(1, order).tolist()
+        yseq = yseq[batch_ids, order].cpu()
+
+        ret = []
+        for b in range(n_batch):
+            nbest_hyps = []
+            for i in range(beam):
+                if final_score[b][i] == ninf:
+                    continue
+                nbest_hyps.append(
+                    Hypothesis(
+                        yseq=torch.cat(
+                            [
+                                torch.tensor([self.sos]),
+                                yseq[b, i, : length[b][i]],
+                                torch.tensor([self.eos]),
+                            ]
+                        ),
+                        score=final_score[b][i],
+                        scores=dict(
+                            ctc=ctc_score[b][i],
+                            **{k: v[b][i] for k, v in scorer_scores.items()},
+                        ),
+                    )
+                )
+            ret.append(nbest_hyps)
+        return ret
+
+    def update_scorers(
+        self,
+        indices: List[Tuple[int, int]],
+        length: torch.Tensor,
+        yseq: torch.Tensor,
+        next_scores: Dict[str, torch.Tensor],
+        states: Dict[str, List[Any]],
+    ):
+        """Score the next tokens of the extended prefixes in place.
+
+        Args:
+            indices (List[Tuple[int, int]]): (utterance, hypothesis) of the
+                extended prefixes
+            length (torch.Tensor): Lengths of the prefixes (B, beam)
+            yseq (torch.Tensor): Prefixes (B, beam, maxlen)
+            next_scores (Dict[str, torch.Tensor]): Scores of the next tokens
+                (B, beam, V)
+            states (Dict[str, List[Any]]): The list of B * beam states
+
+        """
+        if len(indices) == 0:
+            return
+        beam = length.size(1)
+        groups = defaultdict(list)
+        lengths = length.cpu()
+        for b, i in indices:
+            groups[int(lengths[b, i])].append((b, i))
+        # NOTE: The states of some scorers, e.g. transformer LM,
+        # depend on the prefix length, so the same length prefixes are batched
+        for ylen, group in groups.items():
+            bs, ids = [torch.tensor(v, device=yseq.device) for v in zip(*group)]
+            flat = [b * beam + i for b, i in group]
+            ys = torch.cat(
+                [
+                    torch.full_like(bs, self.sos).unsqueeze(-1),
+                    yseq[bs, ids, :ylen],
+                ],
+                dim=1,
+            )
+            scores, new_states = self.score_prefixes(
+                ys, {k: [v[j] for j in flat] for k, v in states.items()}
+            )
+            for k in self.scorers:
+                next_scores[k][bs, ids] = scores[k].to(next_scores[k].dtype)
+                for j, s in zip(flat, new_states[k]):
+                    states[k][j] = s
@@ -18,9 +18,12 @@ from espnet.nets.pytorch_backend.e2e_asr import CTC_LOSS_THRESHOLD, Reporter
 from espnet.nets.pytorch_backend.nets_utils import (
     get_subsample,
     make_non_pad_mask,
+    make_pad_mask,
+    pad_list,
     th_accuracy,
 )
 from espnet.nets.pytorch_backend.rnn.decoders import CTC_SCORING_RATIO
+from espnet.nets.pytorch_backend.transducer.vgg2l import VGG2L
 from espnet.nets.pytorch_backend.transformer.add_sos_eos import add_sos_eos
 from espnet.nets.pytorch_backend.transformer.argument import (  # noqa: H301
     add_arguments_transformer_common,
@@ -39,6 +42,7 @@ from espnet.nets.pytorch_backend.transformer.label_smoothing_loss import (  # no
 )
 from espnet.nets.pytorch_backend.transformer.mask import subsequent_mask, target_mask
 from espnet.nets.pytorch_backend.transformer.plot import PlotAttentionReport
+from espnet.nets.pytorch_backend.transformer.subsampling import check_short_utt
 from espnet.nets.scorers.ctc import CTCPrefixScorer
 from espnet.utils.fill_missing_args import fill_missing_args
 
@@ -297,6 +301,31 @@ class E2E(ASRInterface, torch.nn.Module):
         enc_output, *_ = self.encoder(x, None)
         return enc_output.squeeze(0)
 
+    def encode_batch(self, xs):
+        """Encode a batch of acoustic features at once with the padding mask.
+
+        The outputs are the same as those of encode() for the transformer encoder,
+        while they can slightly differ with the convolution module of conformer,
+        which also sees the padded frames as in training.
+
+        :param list xs: source acoustic features [(T_1, D), (T_2, D), ...]
+        :return: encoder outputs without the padding [(T_1', D), (T_2', D), ...]
+        :rtype: list
+        """
+        if isinstance(self.encoder.embed, VGG2L):
+            return super().encode_batch(xs)
+        self.eval()
+        xs = [torch.as_tensor(x) for x in xs]
+        xs_pad = pad_list(xs, 0.0)
+        # Also mask the last frames whose receptive fields of the subsampling
+        # exceed the utterance, so that the outputs are the same as encode()
+        _, limit = check_short_utt(self.encoder.embed, 0)
+        ilens = [len(x) - max(limit - 1, 0) for x in xs]
+        src_mask = ~make_pad_mask(ilens, maxlen=xs_pad.size(1)).unsqueeze(-2)
+        hs_pad, hs_mask, *_ = self.encoder(xs_pad, src_mask.to(xs_pad.device))
+        hlens = hs_mask.squeeze(1).sum(-1).tolist()
+        return [h[:hlen] for h, hlen in zip(hs_pad, hlens)]
+
     def recognize(self, x, recog_args, char_list=None, rnnlm=None, use_jit=False):
         """Recognize input speech.
 
@@ -4,6 +4,18 @@ import logging
 import numpy as np
 
 
+def _get_lengths(sorted_data, key, axis=0):
+    """Gather the lengths of the samples into an array in a single pass
+
+    :param List[Tuple[str, dict]] sorted_data: list of (uttid, info)
+    :param str key: key to access the lengths, e.g. "input" or "output"
+    :param int axis: dimension to access the lengths
+    :return: np.ndarray (len(sorted_data),) of the lengths
+    """
+    lengths = (int(info[key][axis]["shape"][0]) for _, info in sorted_data)
+    return np.fromiter(lengths, dtype=np.int64, count=len(sorted_data))
+
+
 def batchfy_by_seq(
     sorted_data,
     batch_size,
@@ -93,6 +105,8 @@ def batchfy_by_bin(
     shortest_first=False,
     ikey="input",
     okey="output",
+    ilens=None,
+    olens=None,
 ):
     """Make variably sized batch set, which maximizes
 
@@ -108,6 +122,8 @@ def batchfy_by_bin(
 
     :param str ikey: key to access input (for ASR ikey="input", for TTS ikey="output".)
     :param str okey: key to access output (for ASR okey="output". for TTS okey="input".)
+    :param np.ndarray ilens: lengths of input gathered in advance (optional)
+    :param np.ndarray olens: lengths of output gathered in advance (optional)
 
     :return: List[Tuple[str, Dict[str, List[Dict[str, Any]]]] list of batches
     """
@@ -117,6 +133,11 @@ def batchfy_by_bin(
     idim = int(sorted_data[0][1][ikey][0]["shape"][1])
     odim = int(sorted_data[0][1][okey][0]["shape"][1])
     logging.info("# utts: " + str(len(sorted_data)))
+    if ilens is None:
+        ilens = _get_lengths(sorted_data, ikey)
+    if olens is None:
+        olens = _get_lengths(sorted_data, okey)
+    ilens, olens = ilens.tolist(), olens.tolist()
     minibatches = []
     start = 0
     n = 0
@@ -126,8 +147,8 @@ def batchfy_by_bin(
         next_size = 0
         max_olen = 0
         while next_size < batch_bins and (start + b) < length:
-            ilen = int(sorted_data[start + b][1][ikey][0]["shape"][0]) * idim
-            olen = int(sorted_data[start + b][1][okey][0]["shape"][0]) * odim
+            ilen = ilens[start + b] * idim
+            olen = olens[start + b] * odim
             if olen > max_olen:
                 max_olen = olen
             next_size = (max_olen + ilen) * (b + 1)
@@ -186,6 +207,8 @@ def batchfy_by_frame(
     shortest_first=False,
     ikey="input",
     okey="output",
+    ilens=None,
+    olens=None,
 ):
     """Make variable batch set, which maximizes the number of frames to max_batch_frame.
 
@@ -201,6 +224,8 @@ def batchfy_by_frame(
 
     :param str ikey: key to access input (for ASR ikey="input", for TTS ikey="output".)
     :param str okey: key to access output (for ASR okey="output". for TTS okey="input".)
+    :param np.ndarray ilens: lengths of input gathered in advance (optional)
+    :param np.ndarray olens: lengths of output gathered in advance (optional)
 
     :return: List[Tuple[str, Dict[str, List[Dict[str, Any]]]] list of batches
     """
@@ -210,6 +235,11 @@ def batchfy_by_frame(
             "`--batch-frames-inout` should be > 0"
         )
     length = len(sorted_data)
+    if ilens is None:
+        ilens = _get_lengths(sorted_data, ikey)
+    if olens is None:
+        olens = _get_lengths(sorted_data, okey)
+    ilens, olens = ilens.tolist(), olens.tolist()
     minibatches = []
     start = 0
     end = 0
@@ -219,13 +249,13 @@ def batchfy_by_frame(
         max_olen = 0
         max_ilen = 0
         while (start + b) < length:
-            ilen = int(sorted_data[start + b][1][ikey][0]["shape"][0])
+            ilen = ilens[start + b]
             if ilen > max_frames_in and max_frames_in != 0:
                 raise ValueError(
                     f"Can't fit one sample in --batch-frames-in ({max_frames_in}): "
                     f"Please increase the value"
                 )
-            olen = int(sorted_data[start + b][1][okey][0]["shape"][0])
+            olen = olens[start + b]
             if olen > max_frames_out and max_frames_out != 0:
                 raise ValueError(
                     f"Can't fit one sample in --batch-frames-out ({max_frames_out}): "
@@ -448,12 +478,23 @@ def make_batchset(
             batches_list.append(batches)
             continue
 
+        items = list(d.items())
+        lengths = {}
+
+        def get_lengths(key, axis=0):
+            # NOTE: Gathering the lengths before sorting is much faster than after
+            # for the large data thanks to the memory locality of the dicts
+            if (key, axis) not in lengths:
+                lengths[key, axis] = _get_lengths(items, key, axis)
+            return lengths[key, axis]
+
         # sort it by input lengths (long to short)
-        sorted_data = sorted(
-            d.items(),
-            key=lambda data: int(data[1][batch_sort_key][batch_sort_axis]["shape"][0]),
-            reverse=not shortest_first,
+        # NOTE: The stable sort keeps the order of the samples of the same length
+        sort_lengths = get_lengths(batch_sort_key, batch_sort_axis)
+        order = np.argsort(
+            sort_lengths if shortest_first else -sort_lengths, kind="stable"
         )
+        sorted_data = [items[i] for i in order]
         logging.info("# utts: " + str(len(sorted_data)))
         if count == "seq":
             batches = batchfy_by_seq(
@@ -476,6 +517,8 @@ def make_batchset(
                 shortest_first=shortest_first,
                 ikey=ikey,
                 okey=okey,
+                ilens=get_lengths(ikey)[order],
+                olens=get_lengths(okey)[order],
             )
         if count == "frame":
             batches = batchfy_by_frame(
@@ -487,6 +530,8 @@ def make_batchset(
                 shortest_first=shortest_first,
                 ikey=ikey,
                 okey=okey,
+                ilens=get_lengths(ikey)[order],
+                olens=get_lengths(okey)[order],
             )
         batches_list.append(batches)
 
@@ -1,9 +1,7 @@
 import logging
 from contextlib import contextmanager
-from itertools import groupby
 from typing import Dict, List, Optional, Tuple, Union
 
-import numpy
 import torch
 from packaging.version import parse as V
 from typeguard import check_argument_types
@@ -22,7 +20,7 @@ from espnet2.torch_utils.device_funcs import force_gatherable
 from espnet.nets.beam_search import Hypothesis
 from espnet.nets.e2e_asr_common import ErrorCalculator
 from espnet.nets.pytorch_backend.maskctc.add_mask_token import mask_uniform
-from espnet.nets.pytorch_backend.nets_utils import th_accuracy
+from espnet.nets.pytorch_backend.nets_utils import make_pad_mask, th_accuracy
 from espnet.nets.pytorch_backend.transformer.label_smoothing_loss import (  # noqa: H301
     LabelSmoothingLoss,
 )
@@ -281,66 +279,123 @@ class MaskCTCInference(torch.nn.Module):
         text = "".join(self.converter.ids2tokens(ids))
         return text.replace("<mask>", "_").replace("<space>", " ")
 
-    def forward(self, enc_out: torch.Tensor) -> List[Hypothesis]:
+    def forward(self, enc_out: torch.Tensor) -> Hypothesis:
         """Perform Mask-CTC inference"""
-        # greedy ctc outputs
-        enc_out = enc_out.unsqueeze(0)
-        ctc_probs, ctc_ids = torch.exp(self.ctc.log_softmax(enc_out)).max(dim=-1)
-        y_hat = torch.stack([x[0] for x in groupby(ctc_ids[0])])
-        y_idx = torch.nonzero(y_hat != 0).squeeze(-1)
-
-        logging.info("ctc:{}".format(self.ids2text(y_hat[y_idx].tolist())))
-
-        # calculate token-level ctc probabilities by taking
-        # the maximum probability of consecutive frames with
-        # the same ctc symbols
-        probs_hat = []
-        cnt = 0
-        for i, y in enumerate(y_hat.tolist()):
-            probs_hat.append(-1)
-            while cnt < ctc_ids.shape[1] and y == ctc_ids[0][cnt]:
-                if probs_hat[i] < ctc_probs[0][cnt]:
-                    probs_hat[i] = ctc_probs[0][cnt].item()
-                cnt += 1
-        probs_hat = torch.from_numpy(numpy.array(probs_hat))
-
-        # mask ctc outputs based on ctc probabilities
-        p_thres = self.threshold_probability
-        mask_idx = torch.nonzero(probs_hat[y_idx] < p_thres).squeeze(-1)
-        confident_idx = torch.nonzero(probs_hat[y_idx] >= p_thres).squeeze(-1)
-        mask_num = len(mask_idx)
-
-        y_in = (
-            torch.zeros(1, len(y_idx), dtype=torch.long).to(enc_out.device)
-            + self.mask_token
+        enc_lens = torch.full(
+            [1], enc_out.size(0), dtype=torch.long, device=enc_out.device
         )
-        y_in[0][confident_idx] = y_hat[y_idx][confident_idx]
+        return self.batch_forward(enc_out.unsqueeze(0), enc_lens)[0]
 
-        logging.info("msk:{}".format(self.ids2text(y_in[0].tolist())))
+    def ctc_greedy(
+        self, enc_out: torch.Tensor, enc_lens: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Collapse the greedy CTC outputs of a padded batch.
 
-        # iterative decoding
-        if not mask_num == 0:
-            K = self.n_iterations
-            num_iter = K if mask_num >= K and K > 0 else mask_num
+        Args:
+            enc_out: Encoder outputs (B, T, D)
+            enc_lens: Lengths of the encoder outputs (B,)
 
-            for t in range(num_iter - 1):
-                pred, _ = self.mlm(enc_out, [enc_out.size(1)], y_in, [y_in.size(1)])
-                pred_score, pred_id = pred[0][mask_idx].max(dim=-1)
-                cand = torch.topk(pred_score, mask_num // num_iter, -1)[1]
-                y_in[0][mask_idx[cand]] = pred_id[cand]
-                mask_idx = torch.nonzero(y_in[0] == self.mask_token).squeeze(-1)
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The non-blank tokens
+                (B, L), their probabilities (B, L) and the numbers of them (B,).
+                The token-level probability is the maximum probability of
+                the consecutive frames with the same ctc symbol.
 
-                logging.info("msk:{}".format(self.ids2text(y_in[0].tolist())))
+        """
+        ctc_probs, ctc_ids = torch.exp(self.ctc.log_softmax(enc_out)).max(dim=-1)
+        pad = make_pad_mask(enc_lens, ctc_ids, 1)
+        ctc_ids = ctc_ids.masked_fill(pad, -1)
+        n_batch, n_frames = ctc_ids.shape
+
+        # The segments of the consecutive frames with the same ctc symbol
+        start = torch.ones_like(pad)
+        start[:, 1:] = ctc_ids[:, 1:] != ctc_ids[:, :-1]
+        end = torch.ones_like(pad)
+        end[:, :-1] = start[:, 1:]
+        segment = start.long().cumsum(dim=-1) - 1
+
+        # Segmented cumulative max, i.e. the last frame of each segment
+        # has the maximum probability of the segment
+        shift = 1
+        while shift < n_frames:
+            same = segment[:, shift:] == segment[:, :-shift]
+            shifted = torch.max(ctc_probs[:, shift:], ctc_probs[:, :-shift])
+            ctc_probs = torch.cat(
+                [
+                    ctc_probs[:, :shift],
+                    torch.where(same, shifted, ctc_probs[:, shift:]),
+                ],
+                dim=1,
+            )
+            shift *= 2
+
+        # Compact the non-blank tokens to the left
+        keep = end & (ctc_ids > 0)
+        y_lens = keep.sum(dim=-1)
+        pos = (keep.long().cumsum(dim=-1) - 1).masked_fill(~keep, n_frames)
+        y_hat = ctc_ids.new_zeros(n_batch, n_frames + 1).scatter_(
+            1, pos, ctc_ids.masked_fill(~keep, 0)
+        )
+        probs_hat = ctc_probs.new_zeros(n_batch, n_frames + 1).scatter_(
+            1, pos, ctc_probs
+        )
+        max_len = int(y_lens.max()) if n_batch > 0 else 0
+        return y_hat[:, :max_len], probs_hat[:, :max_len], y_lens
 
-            # predict leftover masks (|masks| < mask_num // num_iter)
-            pred, _ = self.mlm(enc_out, [enc_out.size(1)], y_in, [y_in.size(1)])
-            y_in[0][mask_idx] = pred[0][mask_idx].argmax(dim=-1)
+    def batch_forward(
+        self, enc_out: torch.Tensor, enc_lens: torch.Tensor
+    ) -> List[Hypothesis]:
+        """Perform Mask-CTC inference for a padded batch
 
-            logging.info("msk:{}".format(self.ids2text(y_in[0].tolist())))
+        Args:
+            enc_out: Encoder outputs (B, T, D)
+            enc_lens: Lengths of the encoder outputs (B,)
 
-        # pad with mask tokens to ensure compatibility with sos/eos tokens
-        yseq = torch.tensor(
-            [self.mask_token] + y_in.tolist()[0] + [self.mask_token], device=y_in.device
-        )
+        Returns:
+            List[Hypothesis]: The hypotheses of the utterances
+
+        """
+        # greedy ctc outputs
+        y_hat, probs_hat, y_lens = self.ctc_greedy(enc_out, enc_lens)
+        valid = ~make_pad_mask(y_lens, y_hat, 1)
+        for b in range(len(y_hat)):
+            logging.info("ctc:{}".format(self.ids2text(y_hat[b, : y_lens[b]].tolist())))
 
-        return Hypothesis(yseq=yseq)
+        # mask ctc outputs based on ctc probabilities
+        masked = valid & (probs_hat < self.threshold_probability)
+        y_in = y_hat.masked_fill(masked, self.mask_token)
+        mask_num = masked.sum(dim=-1)
+
+        # iterative decoding
+        K = self.n_iterations
+        num_iter = mask_num if K <= 0 else mask_num.clamp(max=K)
+        num_update = mask_num // num_iter.clamp(min=1)
+        for t in range(int(num_iter.max()) - 1 if len(num_iter) > 0 else 0):
+            k = num_update.masked_fill(num_iter - 1 <= t, 0)
+            pred, _ = self.mlm(enc_out, enc_lens, y_in, y_lens)
+            pred_score, pred_id = pred.max(dim=-1)
+            pred_score = pred_score.masked_fill(~masked, float("-inf"))
+            cand = torch.topk(pred_score, int(k.max()), -1)[1]
+            update = torch.arange(cand.size(1), device=cand.device) < k.unsqueeze(-1)
+            y_in.scatter_(
+                1,
+                cand,
+                torch.where(update, pred_id.gather(1, cand), y_in.gather(1, cand)),
+            )
+            masked = valid & (y_in == self.mask_token)
+
+        # predict leftover masks (|masks| < mask_num // num_iter)
+        if masked.any():
+            pred, _ = self.mlm(enc_out, enc_lens, y_in, y_lens)
+            y_in = torch.where(masked, pred.argmax(dim=-1), y_in)
+
+        hyps = []
+        for b in range(len(y_in)):
+            y = y_in[b, : y_lens[b]].tolist()
+            logging.info("msk:{}".format(self.ids2text(y)))
+            # pad with mask tokens to ensure compatibility with sos/eos tokens
+            yseq = torch.tensor(
+                [self.mask_token] + y + [self.mask_token], device=y_in.device
+            )
+            hyps.append(Hypothesis(yseq=yseq))
+        return hyps
@@ -29,6 +29,7 @@ from espnet2.utils import config_argparse
 from espnet2.utils.types import str2bool, str_or_none
 
 # imports for inference
+from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet.utils.cli_utils import get_commandline_args
 
 
@@ -166,6 +167,9 @@ class CTCSegmentation:
 
     fs = 16000
     samples_to_frames_ratio = None
+    frame_stride = None
+    chunk_length = 0.0
+    chunk_context = 2.0
     time_stamps = "auto"
     choices_time_stamps = ["auto", "fixed"]
     text_converter = "tokenize"
@@ -195,7 +199,9 @@ class CTCSegmentation:
             ngpu: Number of GPUs. Set 0 for processing on CPU, set to 1 for
                 processing on GPU. Multi-GPU aligning is currently not
                 implemented. Default: 0.
-            batch_size: Currently, only batch size == 1 is implemented.
+            batch_size: Number of audio chunks that are encoded at once if
+                the audio is split into chunks (see ``chunk_length``).
+                Default: 1.
             dtype: Data type used for inference. Set dtype according to
                 the ASR model.
             kaldi_style_text: A kaldi-style text file includes the name of the
@@ -220,8 +226,6 @@ class CTCSegmentation:
         assert check_argument_types()
 
         # Basic settings
-        if batch_size > 1:
-            raise NotImplementedError("Batch decoding is not implemented")
         device = "cpu"
         if ngpu == 1:
             device = "cuda"
@@ -244,12 +248,16 @@ class CTCSegmentation:
         logging.info(f"Encoder module: {encoder_module}")
         logging.info(f"CTC module:     {asr_model.ctc.__class__.__module__}")
         if "rnn" not in encoder_module.lower():
-            logging.warning("No RNN model detected; memory consumption may be high.")
+            logging.warning(
+                "No RNN model detected; memory consumption may be high."
+                " Set chunk_length to encode long audio files in chunks."
+            )
 
         self.asr_model = asr_model
         self.asr_train_args = asr_train_args
         self.device = device
         self.dtype = dtype
+        self.batch_size = batch_size
         self.ctc = asr_model.ctc
 
         self.kaldi_style_text = kaldi_style_text
@@ -279,6 +287,18 @@ class CTCSegmentation:
                 ESPnet 1, set this parameter to:
                 ``subsampling_factor * frame_duration / 1000``.
 
+        Parameters for long audio files:
+            chunk_length: Length of the audio chunks in seconds. If set, the
+                audio is split into chunks that are encoded separately, so that
+                the memory consumption of the encoder is bounded by the chunk
+                length instead of the audio length. The chunks are batched with
+                ``batch_size``. Set 0 to encode the whole audio at once.
+                Default: 0.
+            chunk_context: Length of the audio in seconds that is appended to
+                both sides of each chunk. The CTC posteriors of the context
+                are discarded, so it should cover the receptive field of the
+                encoder. Default: 2.
+
         Parameters for text preparation:
             set_blank: Index of blank in token list. Default: 0.
             replace_spaces_with_blanks: Inserts blanks between words, which is
@@ -317,6 +337,13 @@ class CTCSegmentation:
             self.fs = float(kwargs["fs"])
         if "samples_to_frames_ratio" in kwargs:
             self.samples_to_frames_ratio = float(kwargs["samples_to_frames_ratio"])
+        # Parameters for long audio files
+        if "chunk_length" in kwargs:
+            assert kwargs["chunk_length"] >= 0
+            self.chunk_length = float(kwargs["chunk_length"])
+        if "chunk_context" in kwargs:
+            assert kwargs["chunk_context"] >= 0
+            self.chunk_context = float(kwargs["chunk_context"])
         # Parameters for text preparation
         if "set_blank" in kwargs:
             assert isinstance(kwargs["set_blank"], int)
@@ -405,6 +432,12 @@ class CTCSegmentation:
     def get_lpz(self, speech: Union[torch.Tensor, np.ndarray]):
         """Obtain CTC posterior log probabilities for given speech data.
 
+        If ``chunk_length`` is set, the speech is split into chunks with
+        ``chunk_context`` on both sides. The chunks start at multiples of the
+        frame stride of the encoder, so the posteriors of the chunks without
+        the context are concatenated to the same number of frames as if the
+        speech were encoded at once.
+
         Args:
             speech: Speech audio input.
 
@@ -413,20 +446,108 @@ class CTCSegmentation:
         """
         if isinstance(speech, np.ndarray):
             speech = torch.tensor(speech)
-        # data: (Nsamples,) -> (1, Nsamples)
-        speech = speech.unsqueeze(0).to(getattr(torch, self.dtype))
-        # lengths: (1,)
-        lengths = speech.new_full([1], dtype=torch.long, fill_value=speech.size(1))
+        chunk_length = int(self.chunk_length * self.fs)
+        chunk_context = int(self.chunk_context * self.fs)
+        if chunk_length == 0 or speech.size(0) <= chunk_length + chunk_context:
+            lpz, _ = self._encode_chunks([speech])
+            return lpz[0]
+
+        # Align the chunks with the encoded frames
+        stride = self.get_frame_stride()
+        chunk_frames = max(chunk_length // stride, 1)
+        context_frames = chunk_context // stride
+        chunk_length = chunk_frames * stride
+        chunk_context = context_frames * stride
+        starts = list(range(0, speech.size(0), chunk_length))
+        lpz = []
+        for i in range(0, len(starts), self.batch_size):
+            chunks, offsets = [], []
+            for start in starts[i : i + self.batch_size]:
+                left = min(chunk_context, start)
+                chunks.append(
+                    speech[start - left : start + chunk_length + chunk_context]
+                )
+                offsets.append(left // stride)
+            chunk_lpz, chunk_lpz_lens = self._encode_chunks(chunks)
+            for j, (offset, lpz_len) in enumerate(zip(offsets, chunk_lpz_lens)):
+                if i + j == len(starts) - 1:
+                    # The last chunk keeps the trailing frames
+                    end = lpz_len
+                else:
+                    end = offset + chunk_frames
+                    if end > lpz_len:
+                        raise ValueError(
+                            "Too few frames are encoded from a chunk; increase the"
+                            f" parameter chunk_context ({self.chunk_context})."
+                        )
+                lpz.append(chunk_lpz[j, offset:end])
+        return np.concatenate(lpz)
+
+    def get_frame_stride(self) -> int:
+        """Determine the number of sample points per encoded frame.
+
+        The number of encoded frames increases by one every ``frame_stride``
+        sample points. This function searches the distance between two
+        successive increases with some inferences on short random inputs,
+        which is only needed once.
+
+        Returns:
+            frame_stride: Exact number of sample points per encoded frame.
+        """
+        if self.frame_stride is not None:
+            return self.frame_stride
+
+        def num_frames(speech_len):
+            _, lpz_lens = self._encode_chunks([torch.rand(speech_len)])
+            return lpz_lens[0]
+
+        def next_increase(speech_len):
+            # Find the shortest length with more frames than speech_len
+            frames = num_frames(speech_len)
+            lower, upper = 0, 1
+            while num_frames(speech_len + upper) == frames:
+                lower, upper = upper, upper * 2
+            while upper - lower > 1:
+                middle = (lower + upper) // 2
+                if num_frames(speech_len + middle) == frames:
+                    lower = middle
+                else:
+                    upper = middle
+            return speech_len + upper
+
+        first_increase = next_increase(int(self.fs))
+        self.frame_stride = next_increase(first_increase) - first_increase
+        return self.frame_stride
+
+    def _encode_chunks(self, chunks: List[torch.Tensor]):
+        """Obtain CTC posterior log probabilities for a batch of speech chunks.
+
+        Args:
+            chunks: List of speech chunks with different lengths.
+
+        Returns:
+            lpz: Padded numpy array with CTC log posterior probabilities
+                (B, T, V).
+            lpz_lens: Numpy array with the number of frames of each chunk (B,).
+        """
+        # Sort by length, as RNN encoders require decreasing lengths
+        order = np.argsort([-len(chunk) for chunk in chunks], kind="stable")
+        chunks = [chunks[i] for i in order]
+        # data: (B, Nsamples)
+        speech = pad_list(chunks, 0.0).to(getattr(torch, self.dtype))
+        # lengths: (B,)
+        lengths = torch.tensor([len(chunk) for chunk in chunks], dtype=torch.long)
         batch = {"speech": speech, "speech_lengths": lengths}
         batch = to_device(batch, device=self.device)
         # Encode input
-        enc, _ = self.asr_model.encode(**batch)
-        assert len(enc) == 1, len(enc)
+        enc, enc_lens = self.asr_model.encode(**batch)
+        assert len(enc) == len(chunks), len(enc)
         # Apply ctc layer to obtain log character probabilities
         lpz = self.ctc.log_softmax(enc).detach()
-        #  Shape should be ( <time steps>, <classes> )
-        lpz = lpz.squeeze(0).cpu().numpy()
-        return lpz
+        #  Shape should be ( <batch>, <time steps>, <classes> )
+        inverse_order = np.argsort(order)
+        lpz = lpz.cpu().numpy()[inverse_order]
+        return lpz, enc_lens.cpu().numpy()[inverse_order]
 
     def _split_text(self, text):
         """Convert text to list and extract utterance IDs."""
@@ -762,6 +883,26 @@ def get_parser():
         choices=CTCSegmentation.choices_text_converter,
         help="How CTC segmentation handles text.",
     )
+    group.add_argument(
+        "--chunk_length",
+        type=float,
+        default=None,
+        help="Length of the audio chunks in seconds that are encoded separately."
+        " This bounds the memory consumption for long audio files."
+        " If not given, the whole audio is encoded at once.",
+    )
+    group.add_argument(
+        "--chunk_context",
+        type=float,
+        default=None,
+        help="Length of the audio in seconds appended to both sides of each chunk.",
+    )
+    group.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="Number of the audio chunks that are encoded at once.",
+    )
 
     group = parser.add_argument_group("Input/output arguments")
     group.add_argument(
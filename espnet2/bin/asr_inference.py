@@ -1,17 +1,20 @@
 #!/usr/bin/env python3
 import argparse
+import itertools
 import logging
 import sys
 from distutils.version import LooseVersion
 from pathlib import Path
-from typing import Any, List, Optional, Sequence, Tuple, Union
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
 import torch.quantization
 from typeguard import check_argument_types, check_return_type
 
-from espnet2.asr.transducer.beam_search_transducer import BeamSearchTransducer
+from espnet2.asr.transducer.beam_search_transducer import (
+    BeamSearchTransducer,
+)
 from espnet2.asr.transducer.beam_search_transducer import (
     ExtendedHypothesis as ExtTransHypothesis,
 )
@@ -23,13 +26,19 @@ from espnet2.tasks.lm import LMTask
 from espnet2.text.build_tokenizer import build_tokenizer
 from espnet2.text.token_id_converter import TokenIDConverter
 from espnet2.torch_utils.device_funcs import to_device
+from espnet2.torch_utils.quantization import (
+    convert_static_quantization,
+    prepare_static_quantization,
+)
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.utils import config_argparse
 from espnet2.utils.types import str2bool, str2triple_str, str_or_none
 from espnet.nets.batch_beam_search import BatchBeamSearch
 from espnet.nets.batch_beam_search_online_sim import BatchBeamSearchOnlineSim
+from espnet.nets.batch_beam_search_timesync import BatchBeamSearchTimeSync
 from espnet.nets.beam_search import BeamSearch, Hypothesis
 from espnet.nets.beam_search_timesync import BeamSearchTimeSync
+from espnet.nets.ctc_prefix_beam_search import CTCGreedySearch, CTCPrefixBeamSearch
 from espnet.nets.pytorch_backend.transformer.subsampling import TooShortUttError
 from espnet.nets.scorer_interface import BatchScorerInterface
 from espnet.nets.scorers.ctc import CTCPrefixScorer
@@ -89,6 +98,9 @@ class Speech2Text:
         hugging_face_decoder_max_length: int = 256,
         time_sync: bool = False,
         multi_asr: bool = False,
+        ctc_search: Optional[str] = None,
+        hotword_list: Optional[str] = None,
+        hotword_weight: float = 2.0,
     ):
         assert check_argument_types()
 
@@ -220,6 +232,21 @@ class Speech2Text:
 
             beam_search = None
             beam_search_transducer = None
+        elif ctc_search is not None:
+            if ctc_search not in ("greedy", "prefix_beam"):
+                raise ValueError(f"Unknown ctc_search: {ctc_search}")
+            if getattr(asr_model, "ctc", None) is None:
+                raise NotImplementedError(f"{ctc_search} search without CTC")
+            # NOTE: Built after the tokenizer, which is required for the hotwords
+            beam_search = None
+            beam_search_transducer = None
+            hugging_face_model = None
+            hugging_face_linear_in = None
+
+            for scorer in scorers.values():
+                if isinstance(scorer, torch.nn.Module):
+                    scorer.to(device=device, dtype=getattr(torch, dtype)).eval()
+            logging.info(f"Decoding device={device}, dtype={dtype}")
         else:
             beam_search_transducer = None
             hugging_face_model = None
@@ -242,8 +269,6 @@ class Speech2Text:
                     raise NotImplementedError(
                         "BeamSearchTimeSync with batching is not yet supported."
                     )
-                logging.info("BeamSearchTimeSync implementation is selected.")
-
                 scorers["ctc"] = asr_model.ctc
                 beam_search = BeamSearchTimeSync(
                     beam_size=beam_size,
@@ -252,6 +277,20 @@ class Speech2Text:
                     sos=asr_model.sos,
                     token_list=token_list,
                 )
+                non_batch = [
+                    k
+                    for k in ("decoder", "lm")
+                    if k in scorers and not isinstance(scorers[k], BatchScorerInterface)
+                ]
+                if len(non_batch) == 0:
+                    beam_search.__class__ = BatchBeamSearchTimeSync
+                    logging.info("BatchBeamSearchTimeSync implementation is selected.")
+                else:
+                    logging.warning(
+                        f"As non-batch scorers {non_batch} are found, "
+                        f"fall back to non-batch implementation."
+                    )
+                    logging.info("BeamSearchTimeSync implementation is selected.")
             else:
                 beam_search = BeamSearch(
                     beam_size=beam_size,
@@ -312,6 +351,40 @@ class Speech2Text:
         converter = TokenIDConverter(token_list=token_list)
         logging.info(f"Text tokenizer: {tokenizer}")
 
+        # 6. [Optional] Build CTC search
+        if ctc_search == "greedy":
+            beam_search = CTCGreedySearch(
+                ctc=asr_model.ctc,
+                sos=asr_model.sos,
+                eos=asr_model.eos,
+                token_list=token_list,
+            )
+            logging.info("CTCGreedySearch implementation is selected.")
+        elif ctc_search == "prefix_beam":
+            hotwords = None
+            if hotword_list is not None:
+                if tokenizer is None:
+                    raise ValueError("The tokenizer is required for the hotwords")
+                with open(hotword_list, "r", encoding="utf-8") as f:
+                    hotwords = [
+                        converter.tokens2ids(tokenizer.text2tokens(line.strip()))
+                        for line in f
+                        if line.strip() != ""
+                    ]
+            beam_search = CTCPrefixBeamSearch(
+                ctc=asr_model.ctc,
+                sos=asr_model.sos,
+                eos=asr_model.eos,
+                beam_size=beam_size,
+                scorers={k: scorers.get(k) for k in ("lm", "ngram")},
+                weights=dict(lm=lm_weight, ngram=ngram_weight),
+                penalty=penalty,
+                token_list=token_list,
+                hotwords=hotwords,
+                hotword_weight=hotword_weight,
+            )
+            logging.info("CTCPrefixBeamSearch implementation is selected.")
+
         self.asr_model = asr_model
         self.asr_train_args = asr_train_args
         self.converter = converter
@@ -402,6 +475,56 @@ class Speech2Text:
 
         return results
 
+    @torch.no_grad()
+    def static_quantize(
+        self,
+        calibration_speech: Iterable[Union[torch.Tensor, np.ndarray]],
+        modules: Sequence[str] = ("Linear", "Conv1d", "Conv2d"),
+        backend: str = "fbgemm",
+    ):
+        """Apply static int8 quantization to the encoder and the decoder in place.
+
+        Unlike the dynamic quantization, the convolutions, e.g., in the
+        subsampling and the convolution module of conformer, are also quantized,
+        and the quantization parameters of the activations are fixed beforehand
+        by decoding the calibration data. The decoder is quantized only if it is
+        used in the beam search. The attention matmuls remain in float.
+
+        Args:
+            calibration_speech: Speech data for the calibration. A few hundred
+                utterances from the target domain are usually enough.
+            modules: Names of the layer types to be quantized.
+            backend: Quantization backend, e.g., "fbgemm" for x86 and "qnnpack"
+                for ARM.
+
+        """
+        if self.device != "cpu" or self.dtype != "float32":
+            raise ValueError("Static quantization is supported for float32 on CPU")
+        targets = [self.asr_model.encoder]
+        if (
+            isinstance(self.beam_search, BeamSearch)
+            and "decoder" in self.beam_search.full_scorers
+        ):
+            targets.append(self.asr_model.decoder)
+        for target in targets:
+            prepare_static_quantization(target, modules=modules, backend=backend)
+
+        num_utts = 0
+        for speech in calibration_speech:
+            try:
+                self(speech)
+            except TooShortUttError as e:
+                logging.warning(f"Skip an utterance for calibration: {e}")
+                continue
+            num_utts += 1
+        if num_utts == 0:
+            raise ValueError("No utterance is given for calibration")
+        logging.info(f"Calibrated with {num_utts} utterances.")
+
+        for target in targets:
+            convert_static_quantization(target)
+        logging.info("Use statically quantized asr model for decoding.")
+
     def _decode_single_sample(self, enc: torch.Tensor):
         if self.beam_search_transducer:
             logging.info("encoder output length: " + str(enc.shape[0]))
@@ -439,6 +562,46 @@ class Speech2Text:
                 x=enc, maxlenratio=self.maxlenratio, minlenratio=self.minlenratio
             )
 
+        return self._postprocess(nbest_hyps)
+
+    @torch.no_grad()
+    def batch_decode(
+        self, speech: torch.Tensor, speech_lengths: torch.Tensor
+    ) -> List[List[Tuple[Optional[str], List[str], List[int], Hypothesis]]]:
+        """Inference for a mini-batch with the CTC search
+
+        Args:
+            speech: Input speech data (B, Nsamples)
+            speech_lengths: Lengths of the input speech data (B,)
+        Returns:
+            The list of text, token, token_int, hyp for each utterance
+
+        """
+        assert check_argument_types()
+        if not isinstance(self.beam_search, CTCGreedySearch):
+            raise NotImplementedError(
+                "batch decoding is only implemented for --ctc_search"
+            )
+
+        batch = {
+            "speech": speech.to(getattr(torch, self.dtype)),
+            "speech_lengths": speech_lengths,
+        }
+        logging.info("speech length: " + str(speech.size(1)))
+
+        # a. To device
+        batch = to_device(batch, device=self.device)
+
+        # b. Forward Encoder
+        enc, enc_lens = self.asr_model.encode(**batch)
+        if isinstance(enc, tuple):
+            enc = enc[0]
+
+        # c. Passed the encoder result and the CTC search
+        nbest_hyps_list = self.beam_search.batch_decode(enc, enc_lens)
+        return [self._postprocess(nbest_hyps) for nbest_hyps in nbest_hyps_list]
+
+    def _postprocess(self, nbest_hyps: List[Any]):
         nbest_hyps = nbest_hyps[: self.nbest]
 
         results = []
@@ -497,6 +660,45 @@ class Speech2Text:
         return Speech2Text(**kwargs)
 
 
+def write_results(
+    writer: DatadirWriter,
+    key: str,
+    results: List[Any],
+    nbest: int,
+    enh_s2t_task: bool,
+    multi_asr: bool,
+):
+    if enh_s2t_task or multi_asr:
+        # Enh+ASR joint task
+        for spk, ret in enumerate(results, 1):
+            for n, (text, token, token_int, hyp) in zip(range(1, nbest + 1), ret):
+                # Create a directory: outdir/{n}best_recog_spk?
+                ibest_writer = writer[f"{n}best_recog"]
+
+                # Write the result to each file
+                ibest_writer[f"token_spk{spk}"][key] = " ".join(token)
+                ibest_writer[f"token_int_spk{spk}"][key] = " ".join(map(str, token_int))
+                ibest_writer[f"score_spk{spk}"][key] = str(hyp.score)
+
+                if text is not None:
+                    ibest_writer[f"text_spk{spk}"][key] = text
+
+    else:
+
+        # Normal ASR
+        for n, (text, token, token_int, hyp) in zip(range(1, nbest + 1), results):
+            # Create a directory: outdir/{n}best_recog
+            ibest_writer = writer[f"{n}best_recog"]
+
+            # Write the result to each file
+            ibest_writer["token"][key] = " ".join(token)
+            ibest_writer["token_int"][key] = " ".join(map(str, token_int))
+            ibest_writer["score"][key] = str(hyp.score)
+
+            if text is not None:
+                ibest_writer["text"][key] = text
+
+
 def inference(
     output_dir: str,
     maxlenratio: float,
@@ -533,14 +735,29 @@ def inference(
     quantize_lm: bool,
     quantize_modules: List[str],
     quantize_dtype: str,
+    static_quantize_asr_model: bool,
+    calibration_scp: Optional[str],
+    num_calibration_utts: int,
     hugging_face_decoder: bool,
     hugging_face_decoder_max_length: int,
     time_sync: bool,
     multi_asr: bool,
+    ctc_search: Optional[str],
+    hotword_list: Optional[str],
+    hotword_weight: float,
 ):
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
+    if static_quantize_asr_model:
+        if quantize_asr_model:
+            raise ValueError(
+                "--quantize_asr_model and --static_quantize_asr_model are exclusive"
+            )
+        if calibration_scp is None:
+            raise ValueError("--static_quantize_asr_model requires --calibration_scp")
+    if batch_size > 1 and (ctc_search is None or enh_s2t_task or multi_asr):
+        raise NotImplementedError(
+            "batch decoding is only implemented for --ctc_search of ASR task"
+        )
     if word_lm_train_config is not None:
         raise NotImplementedError("Word LM is not implemented")
     if ngpu > 1:
@@ -589,11 +806,30 @@ def inference(
         hugging_face_decoder=hugging_face_decoder,
         hugging_face_decoder_max_length=hugging_face_decoder_max_length,
         time_sync=time_sync,
+        ctc_search=ctc_search,
+        hotword_list=hotword_list,
+        hotword_weight=hotword_weight,
     )
     speech2text = Speech2Text.from_pretrained(
         model_tag=model_tag,
         **speech2text_kwargs,
     )
+    if static_quantize_asr_model:
+        calibration_loader = ASRTask.build_streaming_iterator(
+            [(calibration_scp, "speech", "sound")],
+            dtype=dtype,
+            batch_size=1,
+            num_workers=num_workers,
+            preprocess_fn=ASRTask.build_preprocess_fn(
+                speech2text.asr_train_args, False
+            ),
+            collate_fn=ASRTask.build_collate_fn(speech2text.asr_train_args, False),
+            inference=True,
+        )
+        speech2text.static_quantize(
+            batch["speech"][0]
+            for _, batch in itertools.islice(calibration_loader, num_calibration_utts)
+        )
 
     # 3. Build data-iterator
     loader = ASRTask.build_streaming_iterator(
@@ -616,6 +852,20 @@ def inference(
             assert all(isinstance(s, str) for s in keys), keys
             _bs = len(next(iter(batch.values())))
             assert len(keys) == _bs, f"{len(keys)} != {_bs}"
+            if batch_size > 1:
+                # N-best lists of (text, token, token_int, hyp_object)
+                try:
+                    batch_results = speech2text.batch_decode(
+                        batch["speech"], batch["speech_lengths"]
+                    )
+                except TooShortUttError as e:
+                    logging.warning(f"Utterance {keys} {e}")
+                    hyp = Hypothesis(score=0.0, scores={}, states={}, yseq=[])
+                    batch_results = [[[" ", ["<space>"], [2], hyp]] * nbest] * _bs
+                for key, results in zip(keys, batch_results):
+                    write_results(writer, key, results, nbest, enh_s2t_task, multi_asr)
+                continue
+
             batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
 
             # N-best list of (text, token, token_int, hyp_object)
@@ -629,43 +879,7 @@ def inference(
                     num_spk = getattr(speech2text.asr_model.enh_model, "num_spk", 1)
                     results = [results for _ in range(num_spk)]
 
-            # Only supporting batch_size==1
-            key = keys[0]
-            if enh_s2t_task or multi_asr:
-                # Enh+ASR joint task
-                for spk, ret in enumerate(results, 1):
-                    for n, (text, token, token_int, hyp) in zip(
-                        range(1, nbest + 1), ret
-                    ):
-                        # Create a directory: outdir/{n}best_recog_spk?
-                        ibest_writer = writer[f"{n}best_recog"]
-
-                        # Write the result to each file
-                        ibest_writer[f"token_spk{spk}"][key] = " ".join(token)
-                        ibest_writer[f"token_int_spk{spk}"][key] = " ".join(
-                            map(str, token_int)
-                        )
-                        ibest_writer[f"score_spk{spk}"][key] = str(hyp.score)
-
-                        if text is not None:
-                            ibest_writer[f"text_spk{spk}"][key] = text
-
-            else:
-
-                # Normal ASR
-                for n, (text, token, token_int, hyp) in zip(
-                    range(1, nbest + 1), results
-                ):
-                    # Create a directory: outdir/{n}best_recog
-                    ibest_writer = writer[f"{n}best_recog"]
-
-                    # Write the result to each file
-                    ibest_writer["token"][key] = " ".join(token)
-                    ibest_writer["token_int"][key] = " ".join(map(str, token_int))
-                    ibest_writer["score"][key] = str(hyp.score)
-
-                    if text is not None:
-                        ibest_writer["text"][key] = text
+            write_results(writer, keys[0], results, nbest, enh_s2t_task, multi_asr)
 
 
 def get_parser():
@@ -800,6 +1014,25 @@ def get_parser():
         choices=["float16", "qint8"],
         help="Dtype for dynamic quantization.",
     )
+    group.add_argument(
+        "--static_quantize_asr_model",
+        type=str2bool,
+        default=False,
+        help="Apply static int8 quantization to the encoder and the decoder of ASR"
+        " model, which is calibrated with --calibration_scp. Only for CPU.",
+    )
+    group.add_argument(
+        "--calibration_scp",
+        type=str_or_none,
+        default=None,
+        help="wav.scp of the calibration data for static quantization.",
+    )
+    group.add_argument(
+        "--num_calibration_utts",
+        type=int,
+        default=200,
+        help="The number of utterances used for calibration.",
+    )
 
     group = parser.add_argument_group("Beam-search related")
     group.add_argument(
@@ -845,6 +1078,28 @@ def get_parser():
         default=None,
         help="The keyword arguments for transducer beam search.",
     )
+    group.add_argument(
+        "--ctc_search",
+        type=str_or_none,
+        default=None,
+        choices=["greedy", "prefix_beam", None],
+        help="Decode only with CTC by greedy search or frame synchronous "
+        "prefix beam search instead of the joint CTC/attention beam search. "
+        "The decoder is not used and --batch_size > 1 is supported",
+    )
+    group.add_argument(
+        "--hotword_list",
+        type=str_or_none,
+        default=None,
+        help="The text file of the hotwords, one per line, "
+        "boosted in --ctc_search prefix_beam",
+    )
+    group.add_argument(
+        "--hotword_weight",
+        type=float,
+        default=2.0,
+        help="The bonus for each token matched with a hotword",
+    )
 
     group = parser.add_argument_group("Text converter related")
     group.add_argument(
@@ -126,6 +126,45 @@ class Speech2Text:
         hyp = self.s2t(enc[0])
         assert isinstance(hyp, Hypothesis), type(hyp)
 
+        results = [self._postprocess(hyp)]
+        assert check_return_type(results)
+        return results
+
+    @torch.no_grad()
+    def batch_decode(
+        self, speech: torch.Tensor, speech_lengths: torch.Tensor
+    ) -> List[List[Tuple[Optional[str], List[str], List[int], Hypothesis]]]:
+        """Inference for a mini-batch
+
+        Args:
+            speech: Input speech data (B, Nsamples)
+            speech_lengths: Lengths of the input speech data (B,)
+        Returns:
+            The list of text, token, token_int, hyp for each utterance
+
+        """
+        assert check_argument_types()
+
+        batch = {
+            "speech": speech.to(getattr(torch, self.dtype)),
+            "speech_lengths": speech_lengths,
+        }
+
+        # a. To device
+        batch = to_device(batch, device=self.device)
+
+        # b. Forward Encoder
+        enc, enc_lens = self.asr_model.encode(**batch)
+        if isinstance(enc, tuple):
+            enc = enc[0]
+
+        # c. Passed the encoder result and the inference algorithm
+        hyps = self.s2t.batch_forward(enc, enc_lens)
+        return [[self._postprocess(hyp)] for hyp in hyps]
+
+    def _postprocess(
+        self, hyp: Hypothesis
+    ) -> Tuple[Optional[str], List[str], List[int], Hypothesis]:
         # remove sos/eos and get results
         token_int = hyp.yseq[1:-1].tolist()
 
@@ -139,10 +178,7 @@ class Speech2Text:
             text = self.tokenizer.tokens2text(token)
         else:
             text = None
-        results = [(text, token, token_int, hyp)]
-
-        assert check_return_type(results)
-        return results
+        return text, token, token_int, hyp
 
     @staticmethod
     def from_pretrained(
@@ -195,8 +231,6 @@ def inference(
     maskctc_threshold_probability: float,
 ):
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
 
@@ -250,29 +284,29 @@ def inference(
             assert all(isinstance(s, str) for s in keys), keys
             _bs = len(next(iter(batch.values())))
             assert len(keys) == _bs, f"{len(keys)} != {_bs}"
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
+            # N-best lists of (text, token, token_int, hyp_object)
             try:
-                results = speech2text(**batch)
+                batch_results = speech2text.batch_decode(
+                    batch["speech"], batch["speech_lengths"]
+                )
             except TooShortUttError as e:
                 logging.warning(f"Utterance {keys} {e}")
                 hyp = Hypothesis(score=0.0, scores={}, states={}, yseq=[])
-                results = [[" ", ["<space>"], [2], hyp]]
+                batch_results = [[[" ", ["<space>"], [2], hyp]]] * _bs
 
-            # Only supporting batch_size==1
-            key = keys[0]
-            (text, token, token_int, hyp) = results[0]
+            for key, results in zip(keys, batch_results):
+                (text, token, token_int, hyp) = results[0]
 
-            # Create a directory: outdir/{n}best_recog
-            ibest_writer = writer["1best_recog"]
+                # Create a directory: outdir/{n}best_recog
+                ibest_writer = writer["1best_recog"]
 
-            # Write the result to each file
-            ibest_writer["token"][key] = " ".join(token)
-            ibest_writer["token_int"][key] = " ".join(map(str, token_int))
-            ibest_writer["score"][key] = str(hyp.score)
+                # Write the result to each file
+                ibest_writer["token"][key] = " ".join(token)
+                ibest_writer["token_int"][key] = " ".join(map(str, token_int))
+                ibest_writer["score"][key] = str(hyp.score)
 
-            if text is not None:
-                ibest_writer["text"][key] = text
+                if text is not None:
+                    ibest_writer["text"][key] = text
 
 
 def get_parser():
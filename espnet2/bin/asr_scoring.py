@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import sys
+import time
+from collections import OrderedDict
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from typeguard import check_argument_types
+
+from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.text.build_tokenizer import build_tokenizer
+from espnet2.utils import config_argparse
+from espnet2.utils.edit_distance import ErrorCounts, edit_distance_counts
+from espnet2.utils.types import str2bool, str_or_none
+from espnet.utils.cli_utils import get_commandline_args
+
+
+def read_trn(path: Union[Path, str]) -> Dict[str, Tuple[str, List[str]]]:
+    """Read a trn file as used by sclite.
+
+    Examples:
+        ref.trn:
+            H E L L O <space> W O R L D (spk1-utt1)
+
+        >>> read_trn('ref.trn')
+        {'spk1-utt1': ('spk1', ['H', 'E', 'L', 'L', 'O', '<space>', ...])}
+
+    """
+    data = OrderedDict()
+    with Path(path).open("r", encoding="utf-8") as f:
+        for linenum, line in enumerate(f, 1):
+            line = line.rstrip()
+            if not line.endswith(")") or "(" not in line:
+                raise RuntimeError(f"The utterance id is not found ({path}:{linenum})")
+            idx = line.rindex("(")
+            key = line[idx + 1 : -1]
+            if key in data:
+                raise RuntimeError(f"{key} is duplicated ({path}:{linenum})")
+            # NOTE: sclite regards the prefix before the first "-" as the speaker
+            data[key] = (key.split("-", maxsplit=1)[0], line[:idx].split())
+    return data
+
+
+def _align_chunk(args):
+    refs, hyps, batch_size = args
+    return edit_distance_counts(refs, hyps, batch_size=batch_size)
+
+
+def align(
+    refs: List[List[str]],
+    hyps: List[List[str]],
+    nj: int = 1,
+    batch_size: int = 256,
+) -> List[ErrorCounts]:
+    """Align (ref, hyp) pairs with the batched edit-distance in a process pool."""
+    if nj <= 1 or len(refs) <= batch_size:
+        return edit_distance_counts(refs, hyps, batch_size=batch_size)
+
+    # Sort the pairs before splitting so that each worker gets dense batches
+    order = sorted(range(len(refs)), key=lambda i: (len(refs[i]), len(hyps[i])))
+    chunk_size = max(batch_size, -(-len(order) // (nj * 4)))
+    chunks = [order[i : i + chunk_size] for i in range(0, len(order), chunk_size)]
+    results = [None] * len(refs)
+    with Pool(nj) as pool:
+        for chunk, counts in zip(
+            chunks,
+            pool.imap(
+                _align_chunk,
+                [
+                    ([refs[i] for i in c], [hyps[i] for i in c], batch_size)
+                    for c in chunks
+                ],
+            ),
+        ):
+            for i, c in zip(chunk, counts):
+                results[i] = c
+    return results
+
+
+def _summary_row(name: str, counts: List[ErrorCounts]) -> str:
+    snt = len(counts)
+    wrd = sum(c.ref_len for c in counts)
+    denom = max(wrd, 1)
+    cor = 100.0 * sum(c.cor for c in counts) / denom
+    sub = 100.0 * sum(c.sub for c in counts) / denom
+    dele = 100.0 * sum(c.dele for c in counts) / denom
+    ins = 100.0 * sum(c.ins for c in counts) / denom
+    err = sub + dele + ins
+    serr = 100.0 * sum(c.err > 0 for c in counts) / max(snt, 1)
+    return (
+        f"| {name:<7} | {snt:>5} {wrd:>7} | {cor:5.1f}  {sub:5.1f}  {dele:5.1f}  "
+        f"{ins:5.1f}  {err:5.1f}  {serr:5.1f} |"
+    )
+
+
+def format_summary(
+    title: str, counts: List[ErrorCounts], speakers: Optional[List[str]] = None
+) -> str:
+    """Format the results like the sclite "SYSTEM SUMMARY PERCENTAGES" table."""
+    width = len(_summary_row("", [])) - 2
+    lines = [
+        "SYSTEM SUMMARY PERCENTAGES by SPEAKER".center(width + 2),
+        "",
+        "," + "-" * width + ".",
+        "|" + title.center(width) + "|",
+        "|" + "-" * width + "|",
+        f"| {'SPKR':<7} | {'# Snt':>5} {'# Wrd':>7} | {'Corr':>5}  {'Sub':>5}  "
+        f"{'Del':>5}  {'Ins':>5}  {'Err':>5}  {'S.Err':>5} |",
+        "|---------+---------------+" + "-" * (width - 26) + "|",
+    ]
+    if speakers is not None:
+        per_spk = OrderedDict()
+        for spk, c in zip(speakers, counts):
+            per_spk.setdefault(spk, []).append(c)
+        for spk, spk_counts in per_spk.items():
+            lines.append(_summary_row(spk, spk_counts))
+        lines.append("|" + "=" * width + "|")
+    lines.append(_summary_row("Sum/Avg", counts))
+    lines.append("`" + "-" * width + "'")
+    return "\n".join(lines) + "\n"
+
+
+def scoring(
+    output_dir: str,
+    log_level: Union[int, str],
+    ref: str,
+    hyp: str,
+    input_format: str,
+    token_type: Optional[str],
+    bpemodel: Optional[str],
+    non_linguistic_symbols: Optional[str],
+    remove_non_linguistic_symbols: bool,
+    utt2spk: Optional[str],
+    nj: int,
+    batch_size: int,
+):
+    assert check_argument_types()
+
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    start_time = time.perf_counter()
+
+    # 1. Load the reference and hypothesis
+    if input_format == "trn":
+        ref_data = read_trn(ref)
+        hyp_data = read_trn(hyp)
+        keys = list(ref_data)
+        speakers = [ref_data[k][0] for k in keys]
+        refs = [ref_data[k][1] for k in keys]
+        hyps = [hyp_data[k][1] if k in hyp_data else [] for k in keys]
+    elif input_format == "text":
+        if token_type is None:
+            tokenizer = None
+        else:
+            tokenizer = build_tokenizer(
+                token_type=token_type,
+                bpemodel=bpemodel,
+                non_linguistic_symbols=non_linguistic_symbols,
+                remove_non_linguistic_symbols=remove_non_linguistic_symbols,
+            )
+
+        def _tokenize(line: str) -> List[str]:
+            if tokenizer is None:
+                return line.split()
+            return tokenizer.text2tokens(line)
+
+        ref_data = read_2column_text(ref)
+        hyp_data = read_2column_text(hyp)
+        keys = list(ref_data)
+        if utt2spk is not None:
+            spk_data = read_2column_text(utt2spk)
+            speakers = [spk_data[k] for k in keys]
+        else:
+            speakers = None
+        refs = [_tokenize(ref_data[k]) for k in keys]
+        hyps = [_tokenize(hyp_data.get(k, "")) for k in keys]
+    else:
+        raise ValueError(f"Not supported: input_format={input_format}")
+
+    missing = [k for k in keys if k not in hyp_data]
+    if len(missing) > 0:
+        logging.warning(
+            f"{len(missing)} utterances are not found in {hyp} "
+            "and are scored as empty hypotheses"
+        )
+
+    # 2. Align all the pairs
+    counts = align(refs, hyps, nj=nj, batch_size=batch_size)
+
+    # 3. Write the results
+    with DatadirWriter(output_dir) as writer:
+        for key, c in zip(keys, counts):
+            # utt_id #ref #hyp #cor #sub #del #ins
+            writer["utt_errors"][key] = " ".join(map(str, c))
+    summary = format_summary(Path(hyp).name, counts, speakers)
+    with (Path(output_dir) / "result.txt").open("w", encoding="utf-8") as f:
+        f.write(summary)
+
+    elapsed = time.perf_counter() - start_time
+    num_tokens = sum(len(r) + len(h) for r, h in zip(refs, hyps))
+    logging.info(
+        f"Scored {len(keys)} utterances in {elapsed:.2f} sec "
+        f"({num_tokens / max(elapsed, 1e-6):.0f} tokens/sec)\n{summary}"
+    )
+
+
+def get_parser():
+    parser = config_argparse.ArgumentParser(
+        description="Calculate WER/CER with a sclite compatible summary",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    # Note(kamo): Use '_' instead of '-' as separator.
+    # '-' is confusing if written in yaml.
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+
+    parser.add_argument("--output_dir", type=str, required=True)
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of processes used for the alignment",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=256,
+        help="The number of sentence pairs aligned at once",
+    )
+
+    group = parser.add_argument_group("Input data related")
+    group.add_argument("--ref", type=str, required=True, help="Reference file")
+    group.add_argument("--hyp", type=str, required=True, help="Hypothesis file")
+    group.add_argument(
+        "--input_format",
+        type=str,
+        default="trn",
+        choices=["trn", "text"],
+        help="trn: Tokenized sentences followed by (spk-uttid), as used by sclite. "
+        "text: Kaldi style text file, i.e. uttid followed by a sentence",
+    )
+    group.add_argument(
+        "--utt2spk",
+        type=str_or_none,
+        default=None,
+        help="utt2spk file for the per-speaker summary. Used for --input_format text",
+    )
+
+    group = parser.add_argument_group("Text converter related")
+    group.add_argument(
+        "--token_type",
+        type=str_or_none,
+        default=None,
+        choices=["char", "word", "bpe", None],
+        help="The unit of the error rate for --input_format text. "
+        "If not given, the sentences are split by whitespace",
+    )
+    group.add_argument("--bpemodel", type=str_or_none, default=None)
+    group.add_argument("--non_linguistic_symbols", type=str_or_none, default=None)
+    group.add_argument("--remove_non_linguistic_symbols", type=str2bool, default=False)
+
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    kwargs.pop("config", None)
+    scoring(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
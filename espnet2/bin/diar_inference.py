@@ -3,13 +3,13 @@
 import argparse
 import logging
 import sys
-from itertools import permutations
 from pathlib import Path
 from typing import Any, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
 import torch.nn.functional as F
+from scipy.optimize import linear_sum_assignment
 from tqdm import trange
 from typeguard import check_argument_types
 
@@ -371,31 +371,46 @@ class DiarizeSpeech:
         return DiarizeSpeech(**kwargs)
 
     def permute_diar(self, waves, spk_prediction):
-        # Permute the diarization result using the correlation
-        # between wav and spk_prediction
-        # FIXME(YushiUeda): batch_size > 1 is not considered
-        num_spk = len(waves)
-        permute_list = [np.array(p) for p in permutations(range(num_spk))]
-        corr_list = []
+        """Permute the diarization result using the correlation
+        between wav and spk_prediction.
+
+        Args:
+            waves (List[torch.Tensor]): [(Batch, Nsamples)]
+            spk_prediction (torch.Tensor): (Batch, Nframes, num_spk)
+        Returns:
+            spk_prediction (torch.Tensor): the permuted (Batch, Nframes, num_spk)
+            interp_prediction (torch.Tensor): the permuted (Batch, Nsamples, num_spk)
+            perm (torch.Tensor): the speaker assigned to each wave (Batch, num_spk)
+        """
         interp_prediction = F.interpolate(
             torch.sigmoid(spk_prediction).transpose(1, 2),
             size=waves[0].size(1),
             mode="linear",
         ).transpose(1, 2)
-        for p in permute_list:
-            diar_perm = interp_prediction[:, :, p]
-            corr_perm = [0]
-            for q in range(num_spk):
-                corr_perm += np.corrcoef(
-                    torch.squeeze(abs(waves[q])).cpu().numpy(),
-                    torch.squeeze(diar_perm[:, :, q]).cpu().numpy(),
-                )[0, 1]
-            corr_list.append(corr_perm)
-        max_corr, max_idx = torch.max(torch.from_numpy(np.array(corr_list)), dim=0)
+        # Pearson correlation between each pair of the wave and the prediction
+        # (Batch, num_spk, Nsamples)
+        amp = torch.stack([abs(w) for w in waves], dim=1).double()
+        amp = amp - amp.mean(dim=2, keepdim=True)
+        # (Batch, num_spk, Nsamples)
+        diar = interp_prediction.transpose(1, 2).double()
+        diar = diar - diar.mean(dim=2, keepdim=True)
+        # (Batch, num_spk, num_spk)
+        corr = torch.bmm(amp, diar.transpose(1, 2)) / (
+            amp.norm(dim=2).unsqueeze(2) * diar.norm(dim=2).unsqueeze(1)
+        )
+        # hungarian algorithm maximizing the sum of the correlations
+        # NOTE: the correlation is NaN for a silent wave or a constant prediction,
+        #   so it is regarded as 0, the same as no correlation
+        perm = [linear_sum_assignment(-np.nan_to_num(c))[1] for c in corr.cpu().numpy()]
+        perm = torch.as_tensor(np.array(perm), device=spk_prediction.device)
         return (
-            spk_prediction[:, :, permute_list[max_idx]],
-            interp_prediction[:, :, permute_list[max_idx]],
-            permute_list[max_idx],
+            spk_prediction.gather(
+                2, perm.unsqueeze(1).expand(-1, spk_prediction.size(1), -1)
+            ),
+            interp_prediction.gather(
+                2, perm.unsqueeze(1).expand(-1, interp_prediction.size(1), -1)
+            ),
+            perm,
         )
 
     def encode(self, speech, lengths):
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+import argparse
+import dataclasses
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+from typeguard import check_argument_types
+
+from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.tasks.lm import LMTask
+from espnet2.torch_utils.device_funcs import to_device
+from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
+from espnet2.utils import config_argparse
+from espnet2.utils.types import str_or_none
+from espnet.nets.pytorch_backend.nets_utils import pad_list
+from espnet.utils.cli_utils import get_commandline_args
+
+
+class LMRescorer:
+    """Second-pass N-best rescoring with a neural language model
+
+    The hypotheses of all the given utterances are flattened, sorted by length
+    and scored in large padded batches with ``ESPnetLanguageModel.batchify_nll``,
+    so that the LM cost is amortized over many utterances instead of being paid
+    at every step of the beam search (shallow fusion).
+
+    Examples:
+        >>> rescorer = LMRescorer("lm_config.yaml", "lm.pth", lm_weight=0.5)
+        >>> rescorer.score({"utt1": [[3, 4, 5], [3, 4]], "utt2": [[7]]})
+        {'utt1': array([-7.21, -5.03]), 'utt2': array([-2.68])}
+        >>> # Re-rank the outputs of Speech2Text
+        >>> nbest = {key: speech2text(speech) for key, speech in data.items()}
+        >>> rescored = rescorer(nbest)
+
+    """
+
+    def __init__(
+        self,
+        lm_train_config: Union[Path, str] = None,
+        lm_file: Union[Path, str] = None,
+        device: str = "cpu",
+        dtype: str = "float32",
+        batch_size: int = 256,
+        lm_weight: float = 1.0,
+        penalty: float = 0.0,
+    ):
+        assert check_argument_types()
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1: {batch_size}")
+
+        lm, lm_train_args = LMTask.build_model_from_file(
+            lm_train_config, lm_file, device
+        )
+        lm.to(dtype=getattr(torch, dtype)).eval()
+        logging.info(f"LM: {lm}")
+
+        self.lm = lm
+        self.lm_train_args = lm_train_args
+        self.device = device
+        self.dtype = dtype
+        self.batch_size = batch_size
+        self.lm_weight = lm_weight
+        self.penalty = penalty
+
+    @torch.no_grad()
+    def score(self, nbest: Dict[str, List[Sequence[int]]]) -> Dict[str, np.ndarray]:
+        """Compute the LM log-likelihood of every hypothesis
+
+        Args:
+            nbest: Mapping from an utterance id to its N-best token id sequences,
+                which must not contain <sos>/<eos>.
+        Returns:
+            Mapping from an utterance id to the log-likelihoods (N,)
+
+        """
+        flat = [
+            (key, n, torch.as_tensor(list(token_int), dtype=torch.long))
+            for key, hyps in nbest.items()
+            for n, token_int in enumerate(hyps)
+        ]
+        # Sort by length to minimize the padding in each mini-batch
+        order = sorted(range(len(flat)), key=lambda i: len(flat[i][2]), reverse=True)
+
+        lm_scores = {key: np.zeros(len(hyps)) for key, hyps in nbest.items()}
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start : start + self.batch_size]
+            text = pad_list([flat[i][2] for i in indices], 0)
+            text_lengths = torch.tensor([len(flat[i][2]) for i in indices])
+            text, text_lengths = to_device((text, text_lengths), device=self.device)
+
+            # nll: (B, L) -> (B,)
+            nll, _ = self.lm.batchify_nll(
+                text, text_lengths, batch_size=self.batch_size
+            )
+            nll = nll.sum(1).float().cpu().numpy()
+            for i, _nll in zip(indices, nll):
+                key, n, _ = flat[i]
+                lm_scores[key][n] = -_nll
+        return lm_scores
+
+    def __call__(
+        self, nbest: Dict[str, List[Tuple[Optional[str], List[str], List[int], Any]]]
+    ) -> Dict[str, List[Tuple[Optional[str], List[str], List[int], Any]]]:
+        """Re-rank the outputs of Speech2Text
+
+        Args:
+            nbest: Mapping from an utterance id to the list of
+                (text, token, token_int, hyp) returned by Speech2Text
+        Returns:
+            The same lists sorted by the rescored score. The score of each hyp
+            object is replaced with the combined score.
+
+        """
+        lm_scores = self.score(
+            {
+                key: [token_int for _, _, token_int, _ in ret]
+                for key, ret in nbest.items()
+            }
+        )
+
+        rescored = {}
+        for key, ret in nbest.items():
+            results = []
+            for (text, token, token_int, hyp), lm_score in zip(ret, lm_scores[key]):
+                score = self.combine(float(hyp.score), lm_score, len(token_int))
+                results.append((text, token, token_int, _replace_score(hyp, score)))
+            rescored[key] = sorted(
+                results, key=lambda x: float(x[3].score), reverse=True
+            )
+        return rescored
+
+    def combine(self, asr_score: float, lm_score: float, length: int) -> float:
+        return asr_score + self.lm_weight * lm_score + self.penalty * length
+
+
+def _replace_score(hyp, score: float):
+    if dataclasses.is_dataclass(hyp):
+        # e.g. Hypothesis of BeamSearchTransducer
+        return dataclasses.replace(hyp, score=score)
+    else:
+        # e.g. Hypothesis of BeamSearch (NamedTuple)
+        return hyp._replace(score=score)
+
+
+def _parse_score(score: str) -> float:
+    # asr_inference.py writes str(hyp.score), e.g. "tensor(-62.1655)" or
+    # "tensor(-62.1655, device='cuda:0')" for the tensor scores of BeamSearch
+    match = re.match(r"^tensor\((.*?)(,.*)?\)$", score.strip())
+    if match is not None:
+        score = match.group(1)
+    return float(score)
+
+
+def rescore(
+    output_dir: str,
+    batch_size: int,
+    dtype: str,
+    ngpu: int,
+    seed: int,
+    log_level: Union[int, str],
+    nbest_dir: str,
+    nbest: Optional[int],
+    lm_train_config: Optional[str],
+    lm_file: Optional[str],
+    lm_weight: float,
+    penalty: float,
+):
+    assert check_argument_types()
+    if ngpu > 1:
+        raise NotImplementedError("only single GPU decoding is supported")
+
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+
+    if ngpu >= 1:
+        device = "cuda"
+    else:
+        device = "cpu"
+
+    # 1. Set random-seed
+    set_all_random_seed(seed)
+
+    # 2. Build LMRescorer
+    rescorer = LMRescorer(
+        lm_train_config=lm_train_config,
+        lm_file=lm_file,
+        device=device,
+        dtype=dtype,
+        batch_size=batch_size,
+        lm_weight=lm_weight,
+        penalty=penalty,
+    )
+
+    # 3. Load N-best lists written by asr_inference.py: {nbest_dir}/{n}best_recog/
+    nbest_dirs = []
+    n = 1
+    while (Path(nbest_dir) / f"{n}best_recog" / "token_int").exists():
+        if nbest is not None and n > nbest:
+            break
+        nbest_dirs.append(Path(nbest_dir) / f"{n}best_recog")
+        n += 1
+    if len(nbest_dirs) == 0:
+        raise RuntimeError(f"{nbest_dir}/1best_recog/token_int is not found")
+    logging.info(f"Rescoring {len(nbest_dirs)}-best lists in {nbest_dir}")
+
+    # hyps: {utt_id: [{"token_int": "3 4 5", "score": "-1.2", ...}, ...]}
+    hyps = {}
+    for d in nbest_dirs:
+        fields = {
+            name: read_2column_text(d / name)
+            for name in ("token", "token_int", "score", "text")
+            if (d / name).exists()
+        }
+        for key in fields["token_int"]:
+            hyps.setdefault(key, []).append(
+                {name: v[key] for name, v in fields.items() if key in v}
+            )
+
+    # 4. Rescore all the hypotheses at once
+    lm_scores = rescorer.score(
+        {
+            key: [[int(t) for t in h["token_int"].split()] for h in ret]
+            for key, ret in hyps.items()
+        }
+    )
+
+    # 5. Write the re-ranked N-best lists
+    with DatadirWriter(output_dir) as writer:
+        for key, ret in hyps.items():
+            results = []
+            for h, lm_score in zip(ret, lm_scores[key]):
+                asr_score = _parse_score(h.get("score", "0.0"))
+                score = rescorer.combine(
+                    asr_score, lm_score, len(h["token_int"].split())
+                )
+                results.append((score, lm_score, asr_score, h))
+            results.sort(key=lambda x: x[0], reverse=True)
+
+            for n, (score, lm_score, asr_score, h) in enumerate(results, 1):
+                # Create a directory: outdir/{n}best_recog
+                ibest_writer = writer[f"{n}best_recog"]
+
+                # Write the result to each file
+                ibest_writer["token_int"][key] = h["token_int"]
+                ibest_writer["score"][key] = str(score)
+                ibest_writer["asr_score"][key] = str(asr_score)
+                ibest_writer["lm_score"][key] = str(lm_score)
+                if "token" in h:
+                    ibest_writer["token"][key] = h["token"]
+                if "text" in h:
+                    ibest_writer["text"][key] = h["text"]
+
+
+def get_parser():
+    parser = config_argparse.ArgumentParser(
+        description="N-best rescoring with a neural LM",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    # Note(kamo): Use '_' instead of '-' as separator.
+    # '-' is confusing if written in yaml.
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+
+    parser.add_argument("--output_dir", type=str, required=True)
+    parser.add_argument(
+        "--ngpu",
+        type=int,
+        default=0,
+        help="The number of gpus. 0 indicates CPU mode",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--dtype",
+        default="float32",
+        choices=["float16", "float32", "float64"],
+        help="Data type",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=256,
+        help="The number of hypotheses scored in a forward pass of the LM",
+    )
+
+    group = parser.add_argument_group("Input data related")
+    group.add_argument(
+        "--nbest_dir",
+        type=str,
+        required=True,
+        help="The output directory of asr_inference.py, "
+        "which contains {n}best_recog/token_int and {n}best_recog/score",
+    )
+    group.add_argument(
+        "--nbest",
+        type=int,
+        default=None,
+        help="The number of hypotheses to be rescored for each utterance. "
+        "If not given, all the {n}best_recog directories are used",
+    )
+
+    group = parser.add_argument_group("The model configuration related")
+    group.add_argument(
+        "--lm_train_config",
+        type=str_or_none,
+        help="LM training configuration",
+    )
+    group.add_argument(
+        "--lm_file",
+        type=str_or_none,
+        help="LM parameter file",
+    )
+
+    group = parser.add_argument_group("Rescoring related")
+    group.add_argument("--lm_weight", type=float, default=1.0, help="LM weight")
+    group.add_argument("--penalty", type=float, default=0.0, help="Insertion penalty")
+
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    kwargs.pop("config", None)
+    rescore(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
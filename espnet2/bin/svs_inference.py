@@ -8,7 +8,7 @@ import shutil
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import soundfile as sf
@@ -17,11 +17,13 @@ from typeguard import check_argument_types
 
 from espnet2.fileio.npy_scp import NpyScpWriter
 from espnet2.gan_svs.vits import VITS
+from espnet2.svs.xiaoice.XiaoiceSing import XiaoiceSing
 from espnet2.tasks.svs import SVSTask
 from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.utils import config_argparse
 from espnet2.utils.types import str2bool, str2triple_str, str_or_none
+from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet.utils.cli_utils import get_commandline_args
 
 
@@ -33,6 +35,8 @@ class SingingGenerate:
         >>> svs = SingingGenerate("config.yml", "model.pth")
         >>> wav = svs("Hello World")[0]
         >>> soundfile.write("out.wav", wav.numpy(), svs.fs, "PCM_16")
+        >>> # Run batch inference (only for non-autoregressive models)
+        >>> outputs = svs.batch_inference(**padded_batch)
     """
 
     def __init__(
@@ -204,6 +208,86 @@ class SingingGenerate:
 
         return output_dict
 
+    @torch.no_grad()
+    def batch_inference(
+        self,
+        decode_conf: Optional[Dict[str, Any]] = None,
+        **batch: torch.Tensor,
+    ) -> List[Dict[str, torch.Tensor]]:
+        """Run singing voice synthesis for a batch of songs at once.
+
+        The padded scores are synthesized in a single forward pass of the model, the
+        vocoder is applied to the padded features, and then the outputs are trimmed
+        to the length of each song. The songs should have similar lengths to reduce
+        the padding.
+
+        Args:
+            decode_conf: Decoding configs to overwrite.
+            batch: Padded inputs and their "{name}_lengths", the same as the
+                mini-batch made by the collate function of SVSTask.
+
+        Returns:
+            List[Dict[str, Tensor]]: Outputs of each song, the same as __call__.
+
+        """
+        assert check_argument_types()
+
+        # check inputs
+        if not self.use_batch_inference:
+            raise NotImplementedError(
+                f"batch inference is not supported for {self.svs.__class__.__name__}"
+                f" (use_teacher_forcing={self.use_teacher_forcing})"
+            )
+        if self.use_sids and batch.get("sids") is None:
+            raise RuntimeError("Missing required argument: 'sids'")
+        if self.use_lids and batch.get("lids") is None:
+            raise RuntimeError("Missing required argument: 'lids'")
+        if self.use_spembs and batch.get("spembs") is None:
+            raise RuntimeError("Missing required argument: 'spembs'")
+        batch = to_device(batch, self.device)
+
+        cfg = self.decode_conf
+        if decode_conf is not None:
+            cfg = self.decode_conf.copy()
+            cfg.update(decode_conf)
+        output_dict = self.model.batch_inference(**batch, **cfg)
+
+        # apply vocoder (mel-to-wav) to the padded features
+        if self.vocoder is not None:
+            if (
+                self.prefer_normalized_feats
+                or output_dict.get("feat_gen_denorm") is None
+            ):
+                name = "feat_gen"
+            else:
+                name = "feat_gen_denorm"
+            feats, feats_lengths = output_dict[name], output_dict[f"{name}_lengths"]
+            if hasattr(self.vocoder, "batch_forward"):
+                wav, wav_lengths = self.vocoder.batch_forward(feats, feats_lengths)
+            else:
+                # e.g. Griffin-Lim, which can handle only a single sequence
+                wavs = [self.vocoder(f[:l]) for f, l in zip(feats, feats_lengths)]
+                wav = pad_list(wavs, 0.0)
+                wav_lengths = torch.tensor([len(w) for w in wavs])
+            output_dict.update(wav=wav, wav_lengths=wav_lengths)
+
+        # split the padded outputs into each song
+        outputs = []
+        for i in range(len(batch["text"])):
+            item = {}
+            for k, v in output_dict.items():
+                if k.endswith("_lengths"):
+                    continue
+                if f"{k}_lengths" in output_dict:
+                    item[k] = v[i, : int(output_dict[f"{k}_lengths"][i])]
+                else:
+                    item[k] = v[i]
+            # NOTE: the same as __call__, durations are not calculated yet
+            item.update(duration=None, focus_rate=None)
+            outputs.append(item)
+
+        return outputs
+
     @property
     def fs(self) -> Optional[int]:
         """Return sampling rate."""
@@ -234,6 +318,42 @@ class SingingGenerate:
         """Return spemb is needed or not in the inference."""
         return self.svs.spk_embed_dim is not None
 
+    @property
+    def use_batch_inference(self) -> bool:
+        """Return batch inference is available or not."""
+        return isinstance(self.svs, (XiaoiceSing, VITS)) and not self.use_speech
+
+
+def _synthesize(
+    singingGenerate: SingingGenerate,
+    loader: Iterator[Tuple[List[str], Dict[str, torch.Tensor]]],
+) -> Iterator[Tuple[str, int, Dict[str, torch.Tensor], float]]:
+    """Yield (key, input size, outputs, elapsed time) of each song."""
+    for keys, batch in loader:
+        assert isinstance(batch, dict), type(batch)
+        assert all(isinstance(s, str) for s in keys), keys
+        logging.info(f"keys: {keys}")
+
+        start_time = time.perf_counter()
+        if len(keys) > 1:
+            outputs = singingGenerate.batch_inference(**batch)
+            # NOTE: The elapsed time of the mini-batch is shared by the songs
+            elapsed = (time.perf_counter() - start_time) / len(keys)
+            for key, text_length, output_dict in zip(
+                keys, batch["text_lengths"].tolist(), outputs
+            ):
+                yield key, text_length + 1, output_dict, elapsed
+            continue
+
+        # Change to single sequence and remove *_length
+        # because inference() requires 1-seq, not mini-batch.
+        batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
+        logging.info(f"batch: {batch}")
+
+        output_dict = singingGenerate(**batch)
+        insize = next(iter(batch.values())).size(0) + 1
+        yield keys[0], insize, output_dict, time.perf_counter() - start_time
+
 
 def inference(
     output_dir: str,
@@ -256,8 +376,6 @@ def inference(
 ):
     """Perform SVS model decoding."""
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
     logging.basicConfig(
@@ -285,6 +403,11 @@ def inference(
         dtype=dtype,
         device=device,
     )
+    if batch_size > 1 and not singingGenerate.use_batch_inference:
+        raise NotImplementedError(
+            "batch decoding is only implemented for XiaoiceSing and VITS "
+            "without teacher forcing"
+        )
 
     # 3. Build data-iterator
     loader = SVSTask.build_streaming_iterator(
@@ -329,30 +452,13 @@ def inference(
     ) as duration_writer, open(
         output_dir / "focus_rates/focus_rates", "w"
     ) as focus_rate_writer:
-        for idx, (keys, batch) in enumerate(loader, 1):
-            assert isinstance(batch, dict), type(batch)
-            assert all(isinstance(s, str) for s in keys), keys
-            _bs = len(next(iter(batch.values())))
-            assert _bs == 1, _bs
-
-            # Change to single sequence and remove *_length
-            # because inference() requires 1-seq, not mini-batch.
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
-            logging.info(f"batch: {batch}")
-            logging.info(f"keys: {keys}")
-
-            start_time = time.perf_counter()
-            output_dict = singingGenerate(**batch)
-
-            key = keys[0]
-            insize = next(iter(batch.values())).size(0) + 1
+        for key, insize, output_dict, elapsed in _synthesize(singingGenerate, loader):
             if output_dict.get("feat_gen") is not None:
                 # standard text2mel model case
                 feat_gen = output_dict["feat_gen"]
                 logging.info(
                     "inference speed = {:.1f} frames / sec.".format(
-                        int(feat_gen.size(0)) / (time.perf_counter() - start_time)
+                        int(feat_gen.size(0)) / elapsed
                     )
                 )
                 logging.info(f"{key} (size:{insize}->{feat_gen.size(0)})")
@@ -368,7 +474,7 @@ def inference(
                 wav = output_dict["wav"]
                 logging.info(
                     "inference speed = {:.1f} points / sec.".format(
-                        int(wav.size(0)) / (time.perf_counter() - start_time)
+                        int(wav.size(0)) / elapsed
                     )
                 )
                 logging.info(f"{key} (size:{insize}->{wav.size(0)})")
@@ -3,12 +3,13 @@
 """Script to run the inference of text-to-speeech model."""
 
 import argparse
+import itertools
 import logging
 import shutil
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import soundfile as sf
@@ -17,6 +18,10 @@ from packaging.version import parse as V
 from typeguard import check_argument_types
 
 from espnet2.fileio.npy_scp import NpyScpWriter
+from espnet2.gan_tts.abs_gan_tts import AbsGANTTS
+from espnet2.gan_tts.jets import JETS
+from espnet2.gan_tts.joint import JointText2Wav
+from espnet2.gan_tts.utils import fuse_for_inference
 from espnet2.gan_tts.vits import VITS
 from espnet2.tasks.tts import TTSTask
 from espnet2.torch_utils.device_funcs import to_device
@@ -28,6 +33,7 @@ from espnet2.tts.transformer import Transformer
 from espnet2.tts.utils import DurationCalculator
 from espnet2.utils import config_argparse
 from espnet2.utils.types import str2bool, str2triple_str, str_or_none
+from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet.utils.cli_utils import get_commandline_args
 
 
@@ -60,6 +66,9 @@ class Text2Speech:
         >>> import soundfile as sf
         >>> wav = text2speech("Hello, World")["wav"]
         >>> sf.write("out.wav", wav.numpy(), text2speech.fs, "PCM_16")
+        >>> # Run batch inference (only for non-autoregressive models)
+        >>> outputs = text2speech.batch_inference(["Hello, World", "Hello"])
+        >>> wavs = [output["wav"] for output in outputs]
 
     """
 
@@ -79,6 +88,7 @@ class Text2Speech:
         noise_scale_dur: float = 0.8,
         vocoder_config: Union[Path, str] = None,
         vocoder_file: Union[Path, str] = None,
+        fuse_vocoder: bool = False,
         dtype: str = "float32",
         device: str = "cpu",
         seed: int = 777,
@@ -114,6 +124,12 @@ class Text2Speech:
             if isinstance(vocoder, torch.nn.Module):
                 vocoder.to(dtype=getattr(torch, dtype)).eval()
             self.vocoder = vocoder
+        if fuse_vocoder:
+            # Remove the training-time weight norm from the (joint) vocoders
+            if isinstance(self.vocoder, torch.nn.Module):
+                fuse_for_inference(self.vocoder)
+            if isinstance(self.tts, AbsGANTTS):
+                fuse_for_inference(self.tts)
         logging.info(f"Extractor:\n{self.feats_extract}")
         logging.info(f"Normalizer:\n{self.normalize}")
         logging.info(f"TTS:\n{self.tts}")
@@ -157,7 +173,85 @@ class Text2Speech:
     ) -> Dict[str, torch.Tensor]:
         """Run text-to-speech."""
         assert check_argument_types()
+        batch, cfg = self._prepare_inputs(
+            text, speech, durations, spembs, sids, lids, decode_conf
+        )
+
+        # inference
+        if self.always_fix_seed:
+            set_all_random_seed(self.seed)
+        output_dict = self.model.inference(**batch, **cfg)
+
+        # calculate additional metrics
+        if output_dict.get("att_w") is not None:
+            duration, focus_rate = self.duration_calculator(output_dict["att_w"])
+            output_dict.update(duration=duration, focus_rate=focus_rate)
+
+        # apply vocoder (mel-to-wav)
+        if self.vocoder is not None:
+            wav = self.vocoder(self._vocoder_input(output_dict))
+            output_dict.update(wav=wav)
+
+        return output_dict
+
+    @torch.no_grad()
+    def stream(
+        self,
+        text: Union[str, torch.Tensor, np.ndarray],
+        spembs: Union[torch.Tensor, np.ndarray] = None,
+        sids: Union[torch.Tensor, np.ndarray] = None,
+        lids: Union[torch.Tensor, np.ndarray] = None,
+        decode_conf: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 32,
+    ) -> Iterator[torch.Tensor]:
+        """Run text-to-speech and yield the waveform chunk by chunk.
+
+        The features are generated at once, and then the vocoder is applied to
+        each chunk of ``chunk_size`` frames with the context of its receptive
+        field, so the first chunk is available before the whole waveform is
+        generated and the concatenated chunks are the same as the waveform of
+        __call__ (with the same random seed). The vocoders which do not support
+        it, e.g. Griffin-Lim, and the end-to-end models except for JointText2Wav
+        yield the whole waveform at once.
+
+        Examples:
+            >>> for wav in text2speech.stream("Hello, World"):
+            ...     play(wav.numpy())
+
+        """
+        assert check_argument_types()
+        batch, cfg = self._prepare_inputs(
+            text, None, None, spembs, sids, lids, decode_conf
+        )
+        if cfg["use_teacher_forcing"]:
+            raise NotImplementedError("Teacher forcing is not supported in stream()")
 
+        if self.always_fix_seed:
+            set_all_random_seed(self.seed)
+        if isinstance(self.tts, JointText2Wav):
+            yield from self.tts.stream_inference(**batch, **cfg, chunk_size=chunk_size)
+            return
+
+        output_dict = self.model.inference(**batch, **cfg)
+        if self.vocoder is None:
+            yield output_dict["wav"]
+        elif hasattr(self.vocoder, "stream_forward"):
+            yield from self.vocoder.stream_forward(
+                self._vocoder_input(output_dict), chunk_size=chunk_size
+            )
+        else:
+            yield self.vocoder(self._vocoder_input(output_dict))
+
+    def _prepare_inputs(
+        self,
+        text: Union[str, torch.Tensor, np.ndarray],
+        speech: Union[torch.Tensor, np.ndarray, None],
+        durations: Union[torch.Tensor, np.ndarray, None],
+        spembs: Union[torch.Tensor, np.ndarray, None],
+        sids: Union[torch.Tensor, np.ndarray, None],
+        lids: Union[torch.Tensor, np.ndarray, None],
+        decode_conf: Optional[Dict[str, Any]],
+    ) -> Tuple[Dict[str, torch.Tensor], Dict[str, Any]]:
         # check inputs
         if self.use_speech and speech is None:
             raise RuntimeError("Missing required argument: 'speech'")
@@ -184,6 +278,77 @@ class Text2Speech:
             batch.update(lids=lids)
         batch = to_device(batch, self.device)
 
+        # overwrite the decode configs if provided
+        cfg = self.decode_conf
+        if decode_conf is not None:
+            cfg = self.decode_conf.copy()
+            cfg.update(decode_conf)
+
+        return batch, cfg
+
+    def _vocoder_input(self, output_dict: Dict[str, torch.Tensor]) -> torch.Tensor:
+        if self.prefer_normalized_feats or output_dict.get("feat_gen_denorm") is None:
+            return output_dict["feat_gen"]
+        return output_dict["feat_gen_denorm"]
+
+    @torch.no_grad()
+    def batch_inference(
+        self,
+        text: Sequence[Union[str, torch.Tensor, np.ndarray]],
+        spembs: Union[torch.Tensor, np.ndarray] = None,
+        sids: Union[torch.Tensor, np.ndarray] = None,
+        lids: Union[torch.Tensor, np.ndarray] = None,
+        decode_conf: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, torch.Tensor]]:
+        """Run text-to-speech for a batch of texts at once.
+
+        The texts are padded and synthesized in a single forward pass of the model,
+        the vocoder is applied to the padded features, and then the outputs are
+        trimmed to the length of each text. The texts should have similar lengths
+        to reduce the padding, e.g. by sorting them in advance.
+
+        Args:
+            text: Texts or token id sequences (B,).
+            spembs: Speaker embeddings (B, spk_embed_dim).
+            sids: Speaker IDs (B, 1).
+            lids: Language IDs (B, 1).
+            decode_conf: Decoding configs to overwrite.
+
+        Returns:
+            List[Dict[str, Tensor]]: Outputs of each text, the same as __call__.
+
+        """
+        assert check_argument_types()
+
+        # check inputs
+        if not self.use_batch_inference:
+            raise NotImplementedError(
+                f"batch inference is not supported for {self.tts.__class__.__name__}"
+                f" (use_teacher_forcing={self.use_teacher_forcing})"
+            )
+        if self.use_sids and sids is None:
+            raise RuntimeError("Missing required argument: 'sids'")
+        if self.use_lids and lids is None:
+            raise RuntimeError("Missing required argument: 'lids'")
+        if self.use_spembs and spembs is None:
+            raise RuntimeError("Missing required argument: 'spembs'")
+
+        # prepare batch
+        texts = []
+        for t in text:
+            if isinstance(t, str):
+                t = self.preprocess_fn("<dummy>", dict(text=t))["text"]
+            texts.append(torch.as_tensor(t, dtype=torch.long))
+        text_lengths = torch.tensor([len(t) for t in texts], dtype=torch.long)
+        batch = dict(text=pad_list(texts, 0), text_lengths=text_lengths)
+        if spembs is not None:
+            batch.update(spembs=torch.as_tensor(spembs))
+        if sids is not None:
+            batch.update(sids=torch.as_tensor(sids))
+        if lids is not None:
+            batch.update(lids=torch.as_tensor(lids))
+        batch = to_device(batch, self.device)
+
         # overwrite the decode configs if provided
         cfg = self.decode_conf
         if decode_conf is not None:
@@ -193,26 +358,47 @@ class Text2Speech:
         # inference
         if self.always_fix_seed:
             set_all_random_seed(self.seed)
-        output_dict = self.model.inference(**batch, **cfg)
-
-        # calculate additional metrics
-        if output_dict.get("att_w") is not None:
-            duration, focus_rate = self.duration_calculator(output_dict["att_w"])
-            output_dict.update(duration=duration, focus_rate=focus_rate)
+        output_dict = self.model.batch_inference(**batch, **cfg)
 
-        # apply vocoder (mel-to-wav)
+        # apply vocoder (mel-to-wav) to the padded features
         if self.vocoder is not None:
             if (
                 self.prefer_normalized_feats
                 or output_dict.get("feat_gen_denorm") is None
             ):
-                input_feat = output_dict["feat_gen"]
+                name = "feat_gen"
             else:
-                input_feat = output_dict["feat_gen_denorm"]
-            wav = self.vocoder(input_feat)
-            output_dict.update(wav=wav)
-
-        return output_dict
+                name = "feat_gen_denorm"
+            feats, feats_lengths = output_dict[name], output_dict[f"{name}_lengths"]
+            if hasattr(self.vocoder, "batch_forward"):
+                wav, wav_lengths = self.vocoder.batch_forward(feats, feats_lengths)
+            else:
+                # e.g. Griffin-Lim, which can handle only a single sequence
+                wavs = [self.vocoder(f[:l]) for f, l in zip(feats, feats_lengths)]
+                wav = pad_list(wavs, 0.0)
+                wav_lengths = torch.tensor([len(w) for w in wavs])
+            output_dict.update(wav=wav, wav_lengths=wav_lengths)
+
+        # split the padded outputs into each text
+        outputs = []
+        for i, text_length in enumerate(text_lengths.tolist()):
+            item = {}
+            for k, v in output_dict.items():
+                if k.endswith("_lengths"):
+                    continue
+                if f"{k}_lengths" in output_dict:
+                    item[k] = v[i, : int(output_dict[f"{k}_lengths"][i])]
+                else:
+                    item[k] = v[i]
+
+            # calculate additional metrics
+            if item.get("att_w") is not None:
+                item["att_w"] = item["att_w"][:, :text_length]
+                duration, focus_rate = self.duration_calculator(item["att_w"])
+                item.update(duration=duration, focus_rate=focus_rate)
+            outputs.append(item)
+
+        return outputs
 
     @property
     def fs(self) -> Optional[int]:
@@ -244,6 +430,14 @@ class Text2Speech:
         """Return spemb is needed or not in the inference."""
         return self.tts.spk_embed_dim is not None
 
+    @property
+    def use_batch_inference(self) -> bool:
+        """Return batch inference is available or not."""
+        return (
+            isinstance(self.tts, (FastSpeech, FastSpeech2, VITS, JETS))
+            and not self.use_speech
+        )
+
     @staticmethod
     def from_pretrained(
         model_tag: Optional[str] = None,
@@ -306,9 +500,92 @@ class Text2Speech:
         return Text2Speech(**kwargs)
 
 
+def length_bucketing(
+    iterator: Iterator[Tuple[str, Dict[str, torch.Tensor]]],
+    batch_size: int,
+    bucket_size: int,
+    length_key: str = "text",
+) -> Iterator[List[Tuple[str, Dict[str, torch.Tensor]]]]:
+    """Make mini-batches of similar lengths from a stream of samples.
+
+    The samples are buffered up to ``bucket_size``, sorted by the length of
+    ``length_key`` in descending order, and then split into mini-batches, so that
+    the padding is reduced without reading the whole data in advance.
+
+    Args:
+        iterator: Iterator of (key, data).
+        batch_size: The number of samples in a mini-batch.
+        bucket_size: The number of samples sorted at once.
+        length_key: The name of the data used as the length.
+
+    Returns:
+        Iterator of mini-batches, i.e. lists of (key, data).
+
+    """
+    bucket = []
+    for sample in itertools.chain(iterator, [None]):
+        if sample is not None:
+            bucket.append(sample)
+            if len(bucket) < max(bucket_size, batch_size):
+                continue
+        bucket.sort(key=lambda x: len(x[1][length_key]), reverse=True)
+        for i in range(0, len(bucket), batch_size):
+            yield bucket[i : i + batch_size]
+        bucket = []
+
+
+def _iterate_samples(
+    loader: Iterator[Tuple[List[str], Dict[str, torch.Tensor]]]
+) -> Iterator[Tuple[str, Dict[str, torch.Tensor]]]:
+    for keys, batch in loader:
+        assert isinstance(batch, dict), type(batch)
+        assert all(isinstance(s, str) for s in keys), keys
+        _bs = len(next(iter(batch.values())))
+        assert _bs == 1, _bs
+
+        # Change to single sequence and remove *_length
+        # because inference() requires 1-seq, not mini-batch.
+        batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
+        yield keys[0], batch
+
+
+def _synthesize(
+    text2speech: Text2Speech,
+    loader: Iterator[Tuple[List[str], Dict[str, torch.Tensor]]],
+    batch_size: int,
+    bucket_size: int,
+) -> Iterator[Tuple[str, int, Dict[str, torch.Tensor], float]]:
+    """Yield (key, input size, outputs, elapsed time) of each utterance."""
+    samples = _iterate_samples(loader)
+    if batch_size == 1:
+        for key, batch in samples:
+            start_time = time.perf_counter()
+            output_dict = text2speech(**batch)
+            insize = next(iter(batch.values())).size(0) + 1
+            yield key, insize, output_dict, time.perf_counter() - start_time
+        return
+
+    for mini_batch in length_bucketing(samples, batch_size, bucket_size):
+        keys = [key for key, _ in mini_batch]
+        text = [data["text"] for _, data in mini_batch]
+        kwargs = {
+            name: torch.stack([data[name] for _, data in mini_batch])
+            for name in ("spembs", "sids", "lids")
+            if name in mini_batch[0][1]
+        }
+
+        start_time = time.perf_counter()
+        outputs = text2speech.batch_inference(text, **kwargs)
+        # NOTE: The elapsed time of the mini-batch is shared by the utterances
+        elapsed = (time.perf_counter() - start_time) / len(keys)
+        for key, t, output_dict in zip(keys, text, outputs):
+            yield key, t.size(0) + 1, output_dict, elapsed
+
+
 def inference(
     output_dir: str,
     batch_size: int,
+    bucket_size: int,
     dtype: str,
     ngpu: int,
     seed: int,
@@ -334,11 +611,10 @@ def inference(
     vocoder_config: Optional[str],
     vocoder_file: Optional[str],
     vocoder_tag: Optional[str],
+    fuse_vocoder: bool,
 ):
     """Run text-to-speech inference."""
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
     logging.basicConfig(
@@ -370,6 +646,7 @@ def inference(
         noise_scale_dur=noise_scale_dur,
         vocoder_config=vocoder_config,
         vocoder_file=vocoder_file,
+        fuse_vocoder=fuse_vocoder,
         dtype=dtype,
         device=device,
         seed=seed,
@@ -380,16 +657,23 @@ def inference(
         vocoder_tag=vocoder_tag,
         **text2speech_kwargs,
     )
+    if batch_size > 1 and not text2speech.use_batch_inference:
+        raise NotImplementedError(
+            "batch decoding is only implemented for FastSpeech, FastSpeech2, VITS, "
+            "and JETS without teacher forcing"
+        )
 
     # 3. Build data-iterator
     if not text2speech.use_speech:
         data_path_and_name_and_type = list(
             filter(lambda x: x[1] != "speech", data_path_and_name_and_type)
         )
+    # NOTE: The samples are read one by one and then bucketed by the text length
+    #   to make mini-batches (see length_bucketing)
     loader = TTSTask.build_streaming_iterator(
         data_path_and_name_and_type,
         dtype=dtype,
-        batch_size=batch_size,
+        batch_size=1,
         key_file=key_file,
         num_workers=num_workers,
         preprocess_fn=TTSTask.build_preprocess_fn(text2speech.train_args, False),
@@ -428,27 +712,15 @@ def inference(
     ) as duration_writer, open(
         output_dir / "focus_rates/focus_rates", "w"
     ) as focus_rate_writer:
-        for idx, (keys, batch) in enumerate(loader, 1):
-            assert isinstance(batch, dict), type(batch)
-            assert all(isinstance(s, str) for s in keys), keys
-            _bs = len(next(iter(batch.values())))
-            assert _bs == 1, _bs
-
-            # Change to single sequence and remove *_length
-            # because inference() requires 1-seq, not mini-batch.
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
-            start_time = time.perf_counter()
-            output_dict = text2speech(**batch)
-
-            key = keys[0]
-            insize = next(iter(batch.values())).size(0) + 1
+        for key, insize, output_dict, elapsed in _synthesize(
+            text2speech, loader, batch_size, bucket_size
+        ):
             if output_dict.get("feat_gen") is not None:
                 # standard text2mel model case
                 feat_gen = output_dict["feat_gen"]
                 logging.info(
                     "inference speed = {:.1f} frames / sec.".format(
-                        int(feat_gen.size(0)) / (time.perf_counter() - start_time)
+                        int(feat_gen.size(0)) / elapsed
                     )
                 )
                 logging.info(f"{key} (size:{insize}->{feat_gen.size(0)})")
@@ -466,7 +738,7 @@ def inference(
                 wav = output_dict["wav"]
                 logging.info(
                     "inference speed = {:.1f} points / sec.".format(
-                        int(wav.size(0)) / (time.perf_counter() - start_time)
+                        int(wav.size(0)) / elapsed
                     )
                 )
                 logging.info(f"{key} (size:{insize}->{wav.size(0)})")
@@ -612,6 +884,13 @@ def get_parser():
         default=1,
         help="The batch size for inference",
     )
+    parser.add_argument(
+        "--bucket_size",
+        type=int,
+        default=256,
+        help="The number of utterances sorted by the text length before making "
+        "mini-batches. Used only if batch_size > 1",
+    )
 
     group = parser.add_argument_group("Input data related")
     group.add_argument(
@@ -733,6 +1012,13 @@ def get_parser():
         help="Pretrained vocoder tag. If specify this option, vocoder_config and "
         "vocoder_file will be overwritten",
     )
+    group.add_argument(
+        "--fuse_vocoder",
+        type=str2bool,
+        default=False,
+        help="Whether to remove the weight norm and precompute the upsampling "
+        "kernels of the vocoder for the faster inference",
+    )
     return parser
 
 
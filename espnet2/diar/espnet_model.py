@@ -2,13 +2,13 @@
 #  Apache 2.0  (http://www.apache.org/licenses/LICENSE-2.0)
 
 from contextlib import contextmanager
-from itertools import permutations
 from typing import Dict, Optional, Tuple
 
 import numpy as np
 import torch
 import torch.nn.functional as F
 from packaging.version import parse as V
+from scipy.optimize import linear_sum_assignment
 from typeguard import check_argument_types
 
 from espnet2.asr.encoder.abs_encoder import AbsEncoder
@@ -143,11 +143,9 @@ class ESPnetDiarizationModel(AbsESPnetModel):
 
         if self.attractor is None:
             loss_pit, loss_att = None, None
-            loss, perm_idx, perm_list, label_perm = self.pit_loss(
-                pred, spk_labels, encoder_out_lens
-            )
+            loss, perm, label_perm = self.pit_loss(pred, spk_labels, encoder_out_lens)
         else:
-            loss_pit, perm_idx, perm_list, label_perm = self.pit_loss(
+            loss_pit, perm, label_perm = self.pit_loss(
                 pred, spk_labels, encoder_out_lens
             )
             loss_att = self.attractor_loss(att_prob, spk_labels)
@@ -289,39 +287,45 @@ class ESPnetDiarizationModel(AbsESPnetModel):
             feats, feats_lengths = speech, speech_lengths
         return feats, feats_lengths
 
-    def pit_loss_single_permute(self, pred, label, length):
-        bce_loss = torch.nn.BCEWithLogitsLoss(reduction="none")
-        mask = self.create_length_mask(length, label.size(1), label.size(2))
-        loss = bce_loss(pred, label)
-        loss = loss * mask
-        loss = torch.sum(torch.mean(loss, dim=2), dim=1)
-        loss = torch.unsqueeze(loss, dim=1)
-        return loss
-
     def pit_loss(self, pred, label, lengths):
+        """Permutation invariant BCE loss.
+
+        The BCE loss of a permutation is the sum of the losses of its
+        (output, speaker) pairs, so the pairwise cost matrix is computed once
+        and the best permutation is found by the Hungarian algorithm
+        instead of enumerating all the permutations.
+
+        Args:
+            pred: (Batch, Length, num_output) logits
+            label: (Batch, Length, num_output)
+            lengths: (Batch,)
+        Returns:
+            loss: scalar
+            perm: (Batch, num_output) the speaker assigned to each output
+            label_perm: (Batch, Length, num_output) the permuted label
+        """
         # Note (jiatong): Credit to https://github.com/hitachi-speech/EEND
         num_output = label.size(2)
-        permute_list = [np.array(p) for p in permutations(range(num_output))]
-        loss_list = []
-        for p in permute_list:
-            label_perm = label[:, :, p]
-            loss_perm = self.pit_loss_single_permute(pred, label_perm, lengths)
-            loss_list.append(loss_perm)
-        loss = torch.cat(loss_list, dim=1)
-        min_loss, min_idx = torch.min(loss, dim=1)
+        mask = self.create_length_mask(lengths, label.size(1), 1)
+        label = label.to(pred.dtype)
+        # cost[b, i, j] = sum_t BCE(pred[b, t, i], label[b, t, j])
+        #               = sum_t softplus(pred[b, t, i]) - pred[b, t, i] * label[b, t, j]
+        cost = (F.softplus(pred) * mask).sum(dim=1).unsqueeze(2) - torch.bmm(
+            (pred * mask).transpose(1, 2), label
+        )
+        perm = []
+        for c in cost.detach().cpu().numpy():
+            # hungarian algorithm
+            perm.append(linear_sum_assignment(c)[1])
+        perm = torch.as_tensor(np.array(perm), dtype=torch.long, device=pred.device)
+        min_loss = cost.gather(2, perm.unsqueeze(2)).sum(dim=(1, 2)) / num_output
         loss = torch.sum(min_loss) / torch.sum(lengths.float())
-        batch_size = len(min_idx)
-        label_list = []
-        for i in range(batch_size):
-            label_list.append(label[i, :, permute_list[min_idx[i]]].data.cpu().numpy())
-        label_permute = torch.from_numpy(np.array(label_list)).float()
-        return loss, min_idx, permute_list, label_permute
+        label_perm = label.gather(2, perm.unsqueeze(1).expand_as(label))
+        return loss, perm, label_perm
 
     def create_length_mask(self, length, max_len, num_output):
-        batch_size = len(length)
-        mask = torch.zeros(batch_size, max_len, num_output)
-        for i in range(batch_size):
-            mask[i, : length[i], :] = 1
+        mask = torch.arange(max_len, device=length.device) < length.unsqueeze(1)
+        mask = mask.unsqueeze(2).expand(-1, -1, num_output).float()
         mask = to_device(self, mask)
         return mask
 
@@ -342,32 +346,30 @@ class ESPnetDiarizationModel(AbsESPnetModel):
 
         (batch_size, max_len, num_output) = label.size()
         # mask the padding part
-        mask = np.zeros((batch_size, max_len, num_output))
-        for i in range(batch_size):
-            mask[i, : length[i], :] = 1
+        mask = (
+            torch.arange(max_len, device=label.device)
+            < length.to(label.device).unsqueeze(1)
+        ).unsqueeze(2)
 
         # pred and label have the shape (batch_size, max_len, num_output)
-        label_np = label.data.cpu().numpy().astype(int)
-        pred_np = (pred.data.cpu().numpy() > 0).astype(int)
-        label_np = label_np * mask
-        pred_np = pred_np * mask
-        length = length.data.cpu().numpy()
+        label = (label > 0.5) & mask
+        pred = (pred.detach() > 0).to(label.device) & mask
 
         # compute speech activity detection error
-        n_ref = np.sum(label_np, axis=2)
-        n_sys = np.sum(pred_np, axis=2)
-        speech_scored = float(np.sum(n_ref > 0))
-        speech_miss = float(np.sum(np.logical_and(n_ref > 0, n_sys == 0)))
-        speech_falarm = float(np.sum(np.logical_and(n_ref == 0, n_sys > 0)))
+        n_ref = label.sum(dim=2)
+        n_sys = pred.sum(dim=2)
+        speech_scored = float((n_ref > 0).sum())
+        speech_miss = float(((n_ref > 0) & (n_sys == 0)).sum())
+        speech_falarm = float(((n_ref == 0) & (n_sys > 0)).sum())
 
         # compute speaker diarization error
-        speaker_scored = float(np.sum(n_ref))
-        speaker_miss = float(np.sum(np.maximum(n_ref - n_sys, 0)))
-        speaker_falarm = float(np.sum(np.maximum(n_sys - n_ref, 0)))
-        n_map = np.sum(np.logical_and(label_np == 1, pred_np == 1), axis=2)
-        speaker_error = float(np.sum(np.minimum(n_ref, n_sys) - n_map))
-        correct = float(1.0 * np.sum((label_np == pred_np) * mask) / num_output)
-        num_frames = np.sum(length)
+        speaker_scored = float(n_ref.sum())
+        speaker_miss = float((n_ref - n_sys).clamp(min=0).sum())
+        speaker_falarm = float((n_sys - n_ref).clamp(min=0).sum())
+        n_map = (label & pred).sum(dim=2)
+        speaker_error = float((torch.min(n_ref, n_sys) - n_map).sum())
+        correct = float(((label == pred) & mask).sum()) / num_output
+        num_frames = float(length.sum())
         return (
             correct,
             num_frames,
@@ -14,10 +14,10 @@ from espnet2.enh.layers.complex_utils import (
     is_complex,
     is_torch_complex_tensor,
     matmul,
-    reverse,
     solve,
     to_double,
 )
+from espnet2.enh.layers.wpe import get_tap_correlations
 
 is_torch_1_9_plus = V(torch.__version__) >= V("1.9.0")
 EPS = torch.finfo(torch.double).eps
@@ -850,10 +850,11 @@ def signal_framing(
         #  [ 2, 3, ..., frame_length2 + 1,              frame_length2 + 1 + bdelay ],
         #  ...
         #  [ T-bdelay-frame_length2, ..., T-1-bdelay,   T-1 ]]
-        indices = [
-            [*range(i, i + frame_length2), i + frame_length2 + bdelay - 1]
-            for i in range(0, signal.shape[-1] - frame_length2 - bdelay + 1, frame_step)
-        ]
+        starts = torch.arange(
+            0, signal.shape[-1] - frame_length2 - bdelay + 1, frame_step
+        )
+        offsets = torch.tensor([*range(frame_length2), frame_length2 + bdelay - 1])
+        indices = (starts[:, None] + offsets).to(signal.device)
 
     if is_complex(signal):
         real = signal_framing(
@@ -904,32 +905,28 @@ def get_covariances(
 
     Bs, Fdim, C, T = Y.shape
 
-    # (B, F, C, T - bdelay - btaps + 1, btaps + 1)
-    Psi = signal_framing(Y, btaps + 1, 1, bdelay, do_padding=False)[
-        ..., : T - bdelay - btaps + 1, :
-    ]
-    # Reverse along btaps-axis:
+    # The taps of the framed signal Psi: (B, F, C, T', btaps + 1)
+    # reversed along btaps-axis:
     # [tau, tau-bdelay, tau-bdelay-1, ..., tau-bdelay-frame_length+1]
-    Psi = reverse(Psi, dim=-1)
-    Psi_norm = Psi * inverse_power[..., None, bdelay + btaps - 1 :, None]
-
+    # are accumulated from the shifted views of Y without being materialized.
     # let T' = T - bdelay - btaps + 1
-    # (B, F, C, T', btaps + 1) x (B, F, C, T', btaps + 1)
-    #  -> (B, F, btaps + 1, C, btaps + 1, C)
-    covariance_matrix = einsum("bfdtk,bfetl->bfkdle", Psi, Psi_norm.conj())
+    correlation_matrix, correlation_vector = get_tap_correlations(
+        Y,
+        inverse_power[..., bdelay + btaps - 1 :],
+        offsets=[bdelay + btaps - 1] + [btaps - k for k in range(1, btaps + 1)],
+        target_offset=bdelay + btaps - 1,
+        length=T - bdelay - btaps + 1,
+    )
 
     # (B, F, btaps + 1, C, btaps + 1, C)
     #   -> (B, F, (btaps + 1) * C, (btaps + 1) * C)
-    covariance_matrix = covariance_matrix.view(
+    covariance_matrix = correlation_matrix.conj().reshape(
         Bs, Fdim, (btaps + 1) * C, (btaps + 1) * C
     )
 
     if get_vector:
-        # (B, F, C, T', btaps + 1) x (B, F, C, T')
-        #    --> (B, F, btaps +1, C, C)
-        covariance_vector = einsum(
-            "bfdtk,bfet->bfked", Psi_norm, Y[..., bdelay + btaps - 1 :].conj()
-        )
+        # (B, F, btaps +1, C, C)
+        covariance_vector = correlation_vector.conj()
         return covariance_matrix, covariance_vector
     else:
         return covariance_matrix
@@ -1127,15 +1124,23 @@ def perform_WPD_filtering(
     Returns:
         enhanced (torch.complex64/ComplexTensor): (B, F, T)
     """
-    # (B, F, C, T) --> (B, F, C, T, btaps + 1)
-    Ytilde = signal_framing(Y, btaps + 1, 1, bdelay, do_padding=True, pad_value=0)
-    Ytilde = reverse(Ytilde, dim=-1)
+    if isinstance(Y, ComplexTensor):
+        pad_func = FC.pad
+    else:
+        pad_func = torch.nn.functional.pad
 
     Bs, Fdim, C, T = Y.shape
-    # --> (B, F, T, btaps + 1, C) --> (B, F, T, (btaps + 1) * C)
-    Ytilde = Ytilde.permute(0, 1, 3, 4, 2).contiguous().view(Bs, Fdim, T, -1)
-    # (B, F, T, 1)
-    enhanced = einsum("...tc,...c->...t", Ytilde, filter_matrix.conj())
+    # (B, F, (btaps + 1) * C) --> (B, F, btaps + 1, C)
+    filter_matrix = filter_matrix.conj().reshape(Bs, Fdim, btaps + 1, C)
+    # Accumulate the filtered taps [tau, tau-bdelay, tau-bdelay-1, ...,
+    # tau-bdelay-btaps+1] tap by tap instead of framing Y: (B, F, T)
+    enhanced = einsum("...c,...ct->...t", filter_matrix[..., 0, :], Y)
+    for k in range(1, btaps + 1):
+        delay = bdelay + k - 1
+        if delay >= T:
+            break
+        tail = einsum("...c,...ct->...t", filter_matrix[..., k, :], Y[..., : T - delay])
+        enhanced = enhanced + pad_func(tail, (delay, 0), "constant", 0)
     return enhanced
 
 
@@ -1,4 +1,4 @@
-from typing import Tuple, Union
+from typing import Sequence, Tuple, Union
 
 import torch
 import torch.nn.functional as F
@@ -6,7 +6,7 @@ import torch_complex.functional as FC
 from packaging.version import parse as V
 from torch_complex.tensor import ComplexTensor
 
-from espnet2.enh.layers.complex_utils import einsum, matmul, reverse
+from espnet2.enh.layers.complex_utils import matmul, stack
 
 is_torch_1_9_plus = V(torch.__version__) >= V("1.9.0")
 
@@ -23,6 +23,9 @@ def signal_framing(
 ) -> Union[torch.Tensor, ComplexTensor]:
     """Expands signal into frames of frame_length.
 
+    NOTE: The frames are a strided view of the padded signal, so that
+    the memory is not multiplied by frame_length unless it is copied.
+
     Args:
         signal : (B * F, D, T)
     Returns:
@@ -32,22 +35,9 @@ def signal_framing(
         real = signal_framing(signal.real, frame_length, frame_step, pad_value)
         imag = signal_framing(signal.imag, frame_length, frame_step, pad_value)
         return ComplexTensor(real, imag)
-    elif is_torch_1_9_plus and torch.is_complex(signal):
-        real = signal_framing(signal.real, frame_length, frame_step, pad_value)
-        imag = signal_framing(signal.imag, frame_length, frame_step, pad_value)
-        return torch.complex(real, imag)
 
     signal = F.pad(signal, (0, frame_length - 1), "constant", pad_value)
-    indices = sum(
-        [
-            list(range(i, i + frame_length))
-            for i in range(0, signal.size(-1) - frame_length + 1, frame_step)
-        ],
-        [],
-    )
-
-    signal = signal[..., indices].view(*signal.size()[:-1], -1, frame_length)
-    return signal
+    return signal.unfold(-1, frame_length, frame_step)
 
 
 def get_power(signal, dim=-2) -> torch.Tensor:
@@ -66,6 +56,59 @@ def get_power(signal, dim=-2) -> torch.Tensor:
     return power
 
 
+def get_tap_correlations(
+    Y: Union[torch.Tensor, ComplexTensor],
+    weight: torch.Tensor,
+    offsets: Sequence[int],
+    target_offset: int,
+    length: int,
+) -> Tuple[Union[torch.Tensor, ComplexTensor], Union[torch.Tensor, ComplexTensor]]:
+    """Accumulates weighted correlations between the taps tap by tap
+
+    With the taps Psi[..., d, t, k] = Y[..., d, t + offsets[k]] for t < length,
+    this calculates
+
+        R[..., k, d, l, e] = sum_t Psi[d, t, k]^* weight[t] Psi[e, t, l]
+        r[..., k, e, d] = sum_t Psi[d, t, k]^* weight[t] Y[e, t + target_offset]
+
+    from the shifted views of Y without materializing Psi, so the memory does not
+    grow with the number of taps. The Hermitian symmetry of R is used to calculate
+    only the upper blocks.
+
+    Args:
+        Y : Complex-valued STFT signal with shape (..., C, T)
+        weight : Real-valued weighting factor with shape (..., length)
+        offsets : The delay of each tap
+        target_offset : The delay of the target signal
+        length : The number of the frames to accumulate
+
+    Returns:
+        Correlation matrix of shape (..., taps, C, taps, C)
+        Correlation vector of shape (..., taps, C, C)
+    """
+    taps = len(offsets)
+    Y_taps = [Y[..., o : o + length] for o in offsets]
+    blocks = [[None] * taps for _ in range(taps)]
+    vectors = []
+    for k in range(taps):
+        # (..., C, length)
+        Y_conj_norm = Y_taps[k].conj() * weight[..., None, :]
+        for m in range(k, taps):
+            # (..., C, length) x (..., length, C) -> (..., C, C)
+            blocks[k][m] = matmul(Y_conj_norm, Y_taps[m].transpose(-1, -2))
+            if m > k:
+                blocks[m][k] = blocks[k][m].conj().transpose(-1, -2)
+        target = Y[..., target_offset : target_offset + length]
+        # (..., C, length) x (..., length, C) -> (..., C, C) -> (..., C_e, C_d)
+        vectors.append(matmul(Y_conj_norm, target.transpose(-1, -2)).transpose(-1, -2))
+
+    # (..., taps, C, taps, C)
+    correlation_matrix = stack([stack(row, dim=-2) for row in blocks], dim=-4)
+    # (..., taps, C, C)
+    correlation_vector = stack(vectors, dim=-3)
+    return correlation_matrix, correlation_vector
+
+
 def get_correlations(
     Y: Union[torch.Tensor, ComplexTensor], inverse_power: torch.Tensor, taps, delay
 ) -> Tuple[Union[torch.Tensor, ComplexTensor], Union[torch.Tensor, ComplexTensor]]:
@@ -86,24 +129,17 @@ def get_correlations(
 
     F, C, T = Y.size()
 
-    # Y: (F, C, T) -> Psi: (F, C, T, taps)
-    Psi = signal_framing(Y, frame_length=taps, frame_step=1)[
-        ..., : T - delay - taps + 1, :
-    ]
-    # Reverse along taps-axis
-    Psi = reverse(Psi, dim=-1)
-    Psi_conj_norm = Psi.conj() * inverse_power[..., None, delay + taps - 1 :, None]
-
-    # (F, C, T, taps) x (F, C, T, taps) -> (F, taps, C, taps, C)
-    correlation_matrix = einsum("fdtk,fetl->fkdle", Psi_conj_norm, Psi)
+    # The taps reversed along the time: Psi[..., t, k] = Y[..., t + taps - 1 - k]
+    correlation_matrix, correlation_vector = get_tap_correlations(
+        Y,
+        inverse_power[..., delay + taps - 1 :],
+        offsets=[taps - 1 - k for k in range(taps)],
+        target_offset=delay + taps - 1,
+        length=T - delay - taps + 1,
+    )
     # (F, taps, C, taps, C) -> (F, taps * C, taps * C)
     correlation_matrix = correlation_matrix.reshape(F, taps * C, taps * C)
 
-    # (F, C, T, taps) x (F, C, T) -> (F, taps, C, C)
-    correlation_vector = einsum(
-        "fdtk,fet->fked", Psi_conj_norm, Y[..., delay + taps - 1 :]
-    )
-
     return correlation_matrix, correlation_vector
 
 
@@ -165,10 +201,8 @@ def perform_filter_operation(
         filter Matrix (F, taps, C, C)
     """
     if isinstance(Y, ComplexTensor):
-        complex_module = FC
         pad_func = FC.pad
     elif is_torch_1_9_plus and torch.is_complex(Y):
-        complex_module = torch
         pad_func = F.pad
     else:
         raise ValueError(
@@ -176,15 +210,17 @@ def perform_filter_operation(
         )
 
     T = Y.size(-1)
-    # Y_tilde: (taps, F, C, T)
-    Y_tilde = complex_module.stack(
-        [
-            pad_func(Y[:, :, : T - delay - i], (delay + i, 0), mode="constant", value=0)
-            for i in range(taps)
-        ],
-        dim=0,
-    )
-    reverb_tail = complex_module.einsum("fpde,pfdt->fet", (filter_matrix_conj, Y_tilde))
+    # Accumulate the reverberation tail tap by tap instead of stacking
+    # the delayed copies of Y: (F, C, T)
+    reverb_tail = 0
+    for i in range(taps):
+        # (F, C_d, C_e)^T x (F, C_d, T - delay - i) -> (F, C_e, T - delay - i)
+        tail = matmul(
+            filter_matrix_conj[:, i].transpose(-1, -2), Y[..., : T - delay - i]
+        )
+        reverb_tail = reverb_tail + pad_func(
+            tail, (delay + i, 0), mode="constant", value=0
+        )
     return Y - reverb_tail
 
 
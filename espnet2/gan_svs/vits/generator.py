@@ -25,6 +25,7 @@ from espnet2.gan_tts.hifigan import HiFiGANGenerator
 from espnet2.gan_tts.utils import get_random_segments
 from espnet2.gan_tts.vits.posterior_encoder import PosteriorEncoder
 from espnet2.gan_tts.vits.residual_coupling import ResidualAffineCouplingBlock
+from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet.nets.pytorch_backend.transformer.embedding import PositionalEncoding
 
 
@@ -555,7 +556,8 @@ class VITSGenerator(torch.nn.Module):
         Returns:
             Tensor: Generated waveform tensor (B, T_wav).
             Tensor: Monotonic attention weight tensor (B, T_feats, T_text).
-            Tensor: Duration tensor (B, T_text).
+            Tensor: Duration tensor (B, T_text), which is None unless the duration
+                predictor is used.
 
         """
         # encoder
@@ -567,13 +569,119 @@ class VITSGenerator(torch.nn.Module):
             x, m_p, logs_p, x_mask = self.text_encoder(
                 label, label_lengths, melody, beat
             )
+        g = self._get_global_conditioning(sids, spembs, lids)
+
+        w = None
+        if use_teacher_forcing:
+            # forward posterior encoder
+            z, m_q, logs_q, y_mask = self.posterior_encoder(feats, feats_lengths, g=g)
+
+            # forward decoder with random segments
+            wav = self.decoder(z * y_mask, g=g)
+        else:
+            z, x_mask, w = self._inference_latent(
+                x, m_p, logs_p, x_mask, label_lengths, melody, beat, g, noise_scale
+            )
+            wav = self.decoder((z * x_mask)[:, :, :max_len], g=g)
+
+        # return wav.squeeze(1), attn.squeeze(1), dur.squeeze(1)
+        return wav.squeeze(1), None, w
+        # return wav.squeeze(1)
+
+    def batch_inference(
+        self,
+        label: torch.Tensor,
+        label_lengths: torch.Tensor,
+        melody: torch.Tensor,
+        beat: torch.Tensor,
+        sids: Optional[torch.Tensor] = None,
+        spembs: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        noise_scale: float = 0.667,
+        max_len: Optional[int] = None,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Run inference for a batch of padded scores.
+
+        The convolutions of the text encoder and the prior networks read the padded
+        frames, so the latent sequences are computed song by song, which is cheap
+        compared with the decoder working at the waveform resolution. The decoder
+        runs on the whole batch and the last frames of the shorter songs, which are
+        affected by the padding, are decoded again without it. Thus, the outputs
+        are the same as those of inference for each song.
+
+        Args:
+            label (Tensor): Padded label tensor (B, T_text).
+            label_lengths (Tensor): Label length tensor (B,).
+            melody (Tensor): Padded melody tensor (B, T_text).
+            beat (Tensor): Padded beat tensor (B, T_text).
+            sids (Optional[Tensor]): Speaker index tensor (B,) or (B, 1).
+            spembs (Optional[Tensor]): Speaker embedding tensor (B, spk_embed_dim).
+            lids (Optional[Tensor]): Language index tensor (B,) or (B, 1).
+            noise_scale (float): Noise scale parameter for flow.
+            max_len (Optional[int]): Maximum length of acoustic feature sequence.
+
+        Returns:
+            Tensor: Padded waveform tensor (B, T_wav).
+            Tensor: Latent length tensor (B,).
+
+        """
+        g = self._get_global_conditioning(sids, spembs, lids)
+        zs = []
+        for i, length in enumerate(label_lengths.tolist()):
+            x, m_p, logs_p, x_mask = self.text_encoder(
+                label[i : i + 1, :length],
+                label_lengths[i : i + 1],
+                melody[i : i + 1, :length],
+                beat[i : i + 1, :length],
+            )
+            g_i = None if g is None else g[i : i + 1]
+            z, x_mask, _ = self._inference_latent(
+                x,
+                m_p,
+                logs_p,
+                x_mask,
+                label_lengths[i : i + 1],
+                melody[i : i + 1, :length],
+                beat[i : i + 1, :length],
+                g_i,
+                noise_scale,
+            )
+            zs.append((z * x_mask)[0, :, :max_len].transpose(0, 1))
+        z_lengths = torch.tensor([z.size(0) for z in zs], device=label.device)
+        z = pad_list(zs, 0.0).transpose(1, 2)
+
+        wav = self.decoder(z, g=g)
+        context = None
+        for i, length in enumerate(z_lengths.tolist()):
+            if length == z.size(2):
+                continue
+            if context is None:
+                context = self.decoder.receptive_field(g)
+            # the samples from the frame keep are affected by the padding
+            keep, start = max(length - context, 0), max(length - 2 * context, 0)
+            tail = self.decoder(
+                z[i : i + 1, :, start:length], g=None if g is None else g[i : i + 1]
+            )
+            rate = self.upsample_factor
+            wav[i, :, keep * rate : length * rate] = tail[0, :, (keep - start) * rate :]
+
+        return wav.squeeze(1), z_lengths
+
+    def _get_global_conditioning(
+        self,
+        sids: Optional[torch.Tensor] = None,
+        spembs: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+    ) -> Optional[torch.Tensor]:
         g = None
         if self.spks is not None:
             # (B, global_channels, 1)
             g = self.global_emb(sids.view(-1)).unsqueeze(-1)
         if self.spk_embed_dim is not None:
             # (B, global_channels, 1)
-            g_ = self.spemb_proj(F.normalize(spembs.unsqueeze(0))).unsqueeze(-1)
+            # NOTE: (spk_embed_dim,) is also accepted for the single inference
+            spembs = spembs.view(-1, spembs.size(-1))
+            g_ = self.spemb_proj(F.normalize(spembs)).unsqueeze(-1)
             if g is None:
                 g = g_
             else:
@@ -585,41 +693,40 @@ class VITSGenerator(torch.nn.Module):
                 g = g_
             else:
                 g = g + g_
+        return g
 
-        if use_teacher_forcing:
-            # forward posterior encoder
-            z, m_q, logs_q, y_mask = self.posterior_encoder(feats, feats_lengths, g=g)
-
-            # forward flow
-            z_p = self.flow(z, y_mask, g=g)  # (B, H, T_feats)
+    def _inference_latent(
+        self,
+        x: torch.Tensor,
+        m_p: torch.Tensor,
+        logs_p: torch.Tensor,
+        x_mask: torch.Tensor,
+        label_lengths: torch.Tensor,
+        melody: torch.Tensor,
+        beat: torch.Tensor,
+        g: Optional[torch.Tensor],
+        noise_scale: float,
+    ) -> Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor]]:
+        w = None
+        if self.use_visinger:
+            if self.use_dp:
+                logw = self.duration_predictor(x, x_mask, beat, g=g)
+                logw = torch.mul(logw.squeeze(1), beat).unsqueeze(1)
+                w = logw * x_mask
+                w = w.squeeze(1).to(torch.long)
 
-            # forward decoder with random segments
-            wav = self.decoder(z * y_mask, g=g)
-        else:
-            if self.use_visinger:
-                if self.use_dp:
-                    logw = self.duration_predictor(x, x_mask, beat, g=g)
-                    logw = torch.mul(logw.squeeze(1), beat).unsqueeze(1)
-                    w = logw * x_mask
-                    w = w.squeeze(1).to(torch.long)
-
-                    x, frame_pitch, x_lengths = self.lr(x, melody, w, label_lengths)
-                    x_mask = torch.unsqueeze(sequence_mask(x_lengths, x.size(2)), 1)
-
-                self.pos_encoder = PositionalEncoding(
-                    d_model=x.size(1), dropout_rate=0, max_len=x.size(2)
-                )
-                x = self.pos_encoder(x.transpose(1, 2)).transpose(1, 2)
+                x, frame_pitch, x_lengths = self.lr(x, melody, w, label_lengths)
+                x_mask = torch.unsqueeze(sequence_mask(x_lengths, x.size(2)), 1)
 
-                _, pitch_embedding = self.pitch_predictor(x, x_mask)
-                x = self.frame_prior_net(x, pitch_embedding, x_mask)
-                m_p, logs_p = self.project(x, x_mask)
+            self.pos_encoder = PositionalEncoding(
+                d_model=x.size(1), dropout_rate=0, max_len=x.size(2)
+            )
+            x = self.pos_encoder(x.transpose(1, 2)).transpose(1, 2)
 
-            # decoder
-            z_p = m_p + torch.randn_like(m_p) * torch.exp(logs_p) * noise_scale
-            z = self.flow(z_p, x_mask, g=g, inverse=True)
-            wav = self.decoder((z * x_mask)[:, :, :max_len], g=g)
+            _, pitch_embedding = self.pitch_predictor(x, x_mask)
+            x = self.frame_prior_net(x, pitch_embedding, x_mask)
+            m_p, logs_p = self.project(x, x_mask)
 
-        # return wav.squeeze(1), attn.squeeze(1), dur.squeeze(1)
-        return wav.squeeze(1), None, None
-        # return wav.squeeze(1)
+        z_p = m_p + torch.randn_like(m_p) * torch.exp(logs_p) * noise_scale
+        z = self.flow(z_p, x_mask, g=g, inverse=True)
+        return z, x_mask, w
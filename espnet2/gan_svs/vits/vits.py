@@ -26,7 +26,7 @@ from espnet2.gan_tts.hifigan.loss import (
     GeneratorAdversarialLoss,
     MelSpectrogramLoss,
 )
-from espnet2.gan_tts.utils import get_segments
+from espnet2.gan_tts.utils import concat_discriminator_forward, get_segments
 from espnet2.gan_tts.vits.loss import KLDivergenceLoss
 from espnet2.torch_utils.device_funcs import force_gatherable
 
@@ -192,6 +192,7 @@ class VITS(AbsGANSVS):
         lambda_pitch: float = 1.0,
         lambda_phoneme: float = 1.0,
         cache_generator_outputs: bool = True,
+        concat_discriminator_inputs: bool = False,
     ):
         """Initialize VITS module.
 
@@ -218,6 +219,8 @@ class VITS(AbsGANSVS):
             lambda_dur (float): Loss scaling coefficient for duration loss.
             lambda_kl (float): Loss scaling coefficient for KL divergence loss.
             cache_generator_outputs (bool): Whether to cache generator outputs.
+            concat_discriminator_inputs (bool): Whether to run the discriminator on
+                the concatenated fake and real samples in a single pass.
 
         """
         assert check_argument_types()
@@ -269,6 +272,7 @@ class VITS(AbsGANSVS):
 
         # cache
         self.cache_generator_outputs = cache_generator_outputs
+        self.concat_discriminator_inputs = concat_discriminator_inputs
         self._cache = None
 
         # store sampling rate for saving wav file
@@ -580,31 +584,31 @@ class VITS(AbsGANSVS):
         if self.use_visinger:
             if not self.use_dp:
                 stats = dict(
-                    generator_loss=loss.item(),
-                    generator_mel_loss=mel_loss.item(),
-                    generator_kl_loss=kl_loss.item(),
-                    generator_adv_loss=adv_loss.item(),
-                    generator_feat_match_loss=feat_match_loss.item(),
-                    pitch_loss=pitch_loss.item(),
+                    generator_loss=loss.detach(),
+                    generator_mel_loss=mel_loss.detach(),
+                    generator_kl_loss=kl_loss.detach(),
+                    generator_adv_loss=adv_loss.detach(),
+                    generator_feat_match_loss=feat_match_loss.detach(),
+                    pitch_loss=pitch_loss.detach(),
                 )
             else:
                 stats = dict(
-                    generator_loss=loss.item(),
-                    generator_mel_loss=mel_loss.item(),
-                    generator_kl_loss=kl_loss.item(),
-                    generator_dur_loss=dur_loss.item(),
-                    generator_adv_loss=adv_loss.item(),
-                    generator_feat_match_loss=feat_match_loss.item(),
-                    pitch_loss=pitch_loss.item(),
-                    ctc_loss=ctc_loss.item(),
+                    generator_loss=loss.detach(),
+                    generator_mel_loss=mel_loss.detach(),
+                    generator_kl_loss=kl_loss.detach(),
+                    generator_dur_loss=dur_loss.detach(),
+                    generator_adv_loss=adv_loss.detach(),
+                    generator_feat_match_loss=feat_match_loss.detach(),
+                    pitch_loss=pitch_loss.detach(),
+                    ctc_loss=ctc_loss.detach(),
                 )
         else:
             stats = dict(
-                generator_loss=loss.item(),
-                generator_mel_loss=mel_loss.item(),
-                generator_kl_loss=kl_loss.item(),
-                generator_adv_loss=adv_loss.item(),
-                generator_feat_match_loss=feat_match_loss.item(),
+                generator_loss=loss.detach(),
+                generator_mel_loss=mel_loss.detach(),
+                generator_kl_loss=kl_loss.detach(),
+                generator_adv_loss=adv_loss.detach(),
+                generator_feat_match_loss=feat_match_loss.detach(),
             )
 
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
@@ -730,8 +734,13 @@ class VITS(AbsGANSVS):
         )
 
         # calculate discriminator outputs
-        p_hat = self.discriminator(singing_hat_.detach())
-        p = self.discriminator(singing_)
+        if self.concat_discriminator_inputs:
+            p_hat, p = concat_discriminator_forward(
+                self.discriminator, singing_hat_.detach(), singing_
+            )
+        else:
+            p_hat = self.discriminator(singing_hat_.detach())
+            p = self.discriminator(singing_)
 
         # calculate losses
         with autocast(enabled=False):
@@ -739,9 +748,9 @@ class VITS(AbsGANSVS):
             loss = real_loss + fake_loss
 
         stats = dict(
-            discriminator_loss=loss.item(),
-            discriminator_real_loss=real_loss.item(),
-            discriminator_fake_loss=fake_loss.item(),
+            discriminator_loss=loss.detach(),
+            discriminator_real_loss=real_loss.detach(),
+            discriminator_fake_loss=fake_loss.detach(),
         )
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
 
@@ -873,3 +882,93 @@ class VITS(AbsGANSVS):
             )
         # return dict(wav=wav.view(-1), att_w=att_w[0], duration=dur[0])
         return dict(wav=wav.view(-1))
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        label: Optional[Dict[str, torch.Tensor]] = None,
+        label_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        melody: Optional[Dict[str, torch.Tensor]] = None,
+        melody_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        tempo: Optional[Dict[str, torch.Tensor]] = None,
+        tempo_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        beat: Optional[Dict[str, torch.Tensor]] = None,
+        beat_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        pitch: Optional[torch.Tensor] = None,
+        duration: Optional[Dict[str, torch.Tensor]] = None,
+        spembs: Optional[torch.Tensor] = None,
+        sids: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        noise_scale: float = 0.667,
+        noise_scale_dur: float = 0.8,
+        alpha: float = 1.0,
+        max_len: Optional[int] = None,
+        use_teacher_forcing: bool = False,
+    ) -> Dict[str, torch.Tensor]:
+        """Run inference for a batch of padded scores at once.
+
+        Args:
+            text (Tensor): Padded text index tensor (B, T_text).
+            text_lengths (Tensor): Text length tensor (B,).
+            label (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of padded label ids (B, Tmax).
+            label_lengths (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of the lengths of padded label ids (B, ).
+            melody (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of padded melody (B, Tmax).
+            melody_lengths (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of the lengths of padded melody (B, ).
+            tempo (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of padded tempo (B, Tmax).
+            tempo_lengths (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of the lengths of padded tempo (B, ).
+            beat (Optional[Dict]): key is "lab", "score_phn" or "score_syb";
+                value (LongTensor): Batch of padded beat (B, Tmax).
+            beat_lengths (Optional[Dict]): key is "lab", "score_phn" or "score_syb";
+                value (LongTensor): Batch of the lengths of padded beat (B, ).
+            pitch (FloatTensor): Batch of padded f0 (B, Tmax).
+            duration (Optional[Dict]): key is "phn", "syb";
+                value (LongTensor): Batch of padded beat (B, Tmax).
+            spembs (Optional[Tensor]): Speaker embedding tensor (B, spk_embed_dim).
+            sids (Tensor): Speaker index tensor (B, 1).
+            lids (Tensor): Language index tensor (B, 1).
+            noise_scale (float): Noise scale value for flow.
+            noise_scale_dur (float): Noise scale value for duration predictor.
+            alpha (float): Alpha parameter to control the speed of generated singing.
+            max_len (Optional[int]): Maximum length.
+            use_teacher_forcing (bool): Must be false, teacher forcing is not
+                supported in batch inference.
+
+        Returns:
+            Dict[str, Tensor]:
+                * wav (Tensor): Padded waveform tensor (B, T_wav).
+                * wav_lengths (Tensor): Waveform length tensor (B,).
+
+        """
+        if use_teacher_forcing:
+            raise NotImplementedError("teacher forcing is not supported in batch")
+        label_lengths = label_lengths["lab"]
+        label = label["lab"][:, : label_lengths.max()]
+        melody = melody["lab"][:, : label_lengths.max()]
+        beat = beat["score_syb"][:, : label_lengths.max()]
+        if sids is not None:
+            sids = sids.view(-1)
+        if lids is not None:
+            lids = lids.view(-1)
+
+        wav, feats_lengths = self.generator.batch_inference(
+            label=label,
+            label_lengths=label_lengths,
+            melody=melody,
+            beat=beat,
+            sids=sids,
+            spembs=spembs,
+            lids=lids,
+            noise_scale=noise_scale,
+            max_len=max_len,
+        )
+        return dict(
+            wav=wav,
+            wav_lengths=feats_lengths * self.generator.upsample_factor,
+        )
@@ -9,13 +9,17 @@ This code is modified from https://github.com/kan-bayashi/ParallelWaveGAN.
 
 import copy
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import numpy as np
 import torch
 import torch.nn.functional as F
 
 from espnet2.gan_tts.hifigan.residual_block import ResidualBlock
+from espnet2.gan_tts.utils.chunked_inference import (
+    chunked_inference,
+    get_receptive_field,
+)
 
 
 class HiFiGANGenerator(torch.nn.Module):
@@ -70,6 +74,8 @@ class HiFiGANGenerator(torch.nn.Module):
 
         # define modules
         self.upsample_factor = int(np.prod(upsample_scales) * out_channels)
+        # NOTE: computed on the first call of receptive_field()
+        self._receptive_field = None
         self.num_upsamples = len(upsample_kernel_sizes)
         self.num_blocks = len(resblock_kernel_sizes)
         self.input_conv = torch.nn.Conv1d(
@@ -216,6 +222,66 @@ class HiFiGANGenerator(torch.nn.Module):
         c = self.forward(c.transpose(1, 0).unsqueeze(0), g=g)
         return c.squeeze(0).transpose(1, 0)
 
+    def stream_inference(
+        self,
+        c: torch.Tensor,
+        g: Optional[torch.Tensor] = None,
+        chunk_size: int = 32,
+        context: Optional[int] = None,
+    ) -> Iterator[torch.Tensor]:
+        """Perform inference chunk by chunk.
+
+        Args:
+            c (torch.Tensor): Input tensor (T, in_channels).
+            g (Optional[Tensor]): Global conditioning tensor (global_channels, 1).
+            chunk_size (int): Number of frames in each chunk.
+            context (Optional[int]): Number of context frames in each side. If not
+                given, the receptive field is used so that the concatenated chunks
+                are the same as the output of inference().
+
+        Returns:
+            Iterator[Tensor]: Output chunks (chunk_size * upsample_factor,
+                out_channels).
+
+        """
+        if g is not None:
+            g = g.unsqueeze(0)
+
+        def _forward(c: torch.Tensor) -> torch.Tensor:
+            return self.forward(c, g=g)
+
+        if context is None:
+            context = self.receptive_field(g)
+        c = c.transpose(1, 0).unsqueeze(0)
+        for y in chunked_inference(_forward, [c], [1], chunk_size, context):
+            yield y.squeeze(0).transpose(1, 0)
+
+    def receptive_field(self, g: Optional[torch.Tensor] = None) -> int:
+        """Get the one-sided receptive field in frames.
+
+        The receptive field depends only on the architecture, so it is computed
+        on the first call and cached.
+
+        Args:
+            g (Optional[Tensor]): Global conditioning tensor (B, global_channels, 1),
+                which is required if the model uses the global conditioning.
+
+        Returns:
+            int: Number of context frames needed in each side.
+
+        """
+        if self._receptive_field is None:
+            if g is not None:
+                g = g[:1]
+            param = next(self.parameters())
+            self._receptive_field = get_receptive_field(
+                lambda c: self.forward(c, g=g),
+                [self.input_conv.in_channels],
+                device=param.device,
+                dtype=param.dtype,
+            )
+        return self._receptive_field
+
 
 class HiFiGANPeriodDiscriminator(torch.nn.Module):
     """HiFiGAN period discriminator module."""
@@ -708,6 +708,9 @@ class JETSGenerator(torch.nn.Module):
         hs = hs + e_embs + p_embs
 
         # upsampling
+        if feats_lengths is None and hs.size(0) > 1:
+            # mask the padded frames of the shorter sequences in batch inference
+            feats_lengths = d_outs.sum(dim=1).clamp(min=1)
         if feats_lengths is not None:
             h_masks = make_non_pad_mask(feats_lengths).to(hs.device)
         else:
@@ -24,7 +24,7 @@ from espnet2.gan_tts.hifigan.loss import (
 )
 from espnet2.gan_tts.jets.generator import JETSGenerator
 from espnet2.gan_tts.jets.loss import ForwardSumLoss, VarianceLoss
-from espnet2.gan_tts.utils import get_segments
+from espnet2.gan_tts.utils import concat_discriminator_forward, get_segments
 from espnet2.torch_utils.device_funcs import force_gatherable
 
 AVAILABLE_GENERATERS = {
@@ -212,6 +212,7 @@ class JETS(AbsGANTTS):
         lambda_var: float = 1.0,
         lambda_align: float = 2.0,
         cache_generator_outputs: bool = True,
+        concat_discriminator_inputs: bool = False,
     ):
         """Initialize JETS module.
 
@@ -238,6 +239,8 @@ class JETS(AbsGANTTS):
             lambda_var (float): Loss scaling coefficient for variance loss.
             lambda_align (float): Loss scaling coefficient for alignment loss.
             cache_generator_outputs (bool): Whether to cache generator outputs.
+            concat_discriminator_inputs (bool): Whether to run the discriminator on
+                the concatenated fake and real samples in a single pass.
 
         """
         assert check_argument_types()
@@ -277,6 +280,7 @@ class JETS(AbsGANTTS):
 
         # cache
         self.cache_generator_outputs = cache_generator_outputs
+        self.concat_discriminator_inputs = concat_discriminator_inputs
         self._cache = None
 
         # store sampling rate for saving wav file
@@ -465,18 +469,18 @@ class JETS(AbsGANTTS):
         loss = g_loss + var_loss + align_loss
 
         stats = dict(
-            generator_loss=loss.item(),
-            generator_g_loss=g_loss.item(),
-            generator_var_loss=var_loss.item(),
-            generator_align_loss=align_loss.item(),
-            generator_g_mel_loss=mel_loss.item(),
-            generator_g_adv_loss=adv_loss.item(),
-            generator_g_feat_match_loss=feat_match_loss.item(),
-            generator_var_dur_loss=dur_loss.item(),
-            generator_var_pitch_loss=pitch_loss.item(),
-            generator_var_energy_loss=energy_loss.item(),
-            generator_align_forwardsum_loss=forwardsum_loss.item(),
-            generator_align_bin_loss=bin_loss.item(),
+            generator_loss=loss.detach(),
+            generator_g_loss=g_loss.detach(),
+            generator_var_loss=var_loss.detach(),
+            generator_align_loss=align_loss.detach(),
+            generator_g_mel_loss=mel_loss.detach(),
+            generator_g_adv_loss=adv_loss.detach(),
+            generator_g_feat_match_loss=feat_match_loss.detach(),
+            generator_var_dur_loss=dur_loss.detach(),
+            generator_var_pitch_loss=pitch_loss.detach(),
+            generator_var_energy_loss=energy_loss.detach(),
+            generator_align_forwardsum_loss=forwardsum_loss.detach(),
+            generator_align_bin_loss=bin_loss.detach(),
         )
 
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
@@ -560,17 +564,22 @@ class JETS(AbsGANTTS):
         )
 
         # calculate discriminator outputs
-        p_hat = self.discriminator(speech_hat_.detach())
-        p = self.discriminator(speech_)
+        if self.concat_discriminator_inputs:
+            p_hat, p = concat_discriminator_forward(
+                self.discriminator, speech_hat_.detach(), speech_
+            )
+        else:
+            p_hat = self.discriminator(speech_hat_.detach())
+            p = self.discriminator(speech_)
 
         # calculate losses
         real_loss, fake_loss = self.discriminator_adv_loss(p_hat, p)
         loss = real_loss + fake_loss
 
         stats = dict(
-            discriminator_loss=loss.item(),
-            discriminator_real_loss=real_loss.item(),
-            discriminator_fake_loss=fake_loss.item(),
+            discriminator_loss=loss.detach(),
+            discriminator_real_loss=real_loss.detach(),
+            discriminator_fake_loss=fake_loss.detach(),
         )
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
 
@@ -654,3 +663,47 @@ class JETS(AbsGANTTS):
                 **kwargs,
             )
         return dict(wav=wav.view(-1), duration=dur[0])
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        use_teacher_forcing: bool = False,
+        **kwargs,
+    ) -> Dict[str, torch.Tensor]:
+        """Run inference for a batch of padded text sequences at once.
+
+        Args:
+            text (Tensor): Padded text index tensor (B, T_text).
+            text_lengths (Tensor): Text length tensor (B,).
+            use_teacher_forcing (bool): Must be false, teacher forcing is not
+                supported in batch inference.
+
+        Returns:
+            Dict[str, Tensor]:
+                * wav (Tensor): Padded waveform tensor (B, T_wav).
+                * wav_lengths (Tensor): Waveform length tensor (B,).
+                * duration (Tensor): Predicted duration tensor (B, T_text).
+                * duration_lengths (Tensor): Text length tensor (B,).
+
+        """
+        if use_teacher_forcing:
+            raise NotImplementedError("teacher forcing is not supported in batch")
+        if self.use_gst:
+            raise NotImplementedError("GST is not supported in batch inference")
+
+        wav, dur = self.generator.inference(
+            text=text,
+            text_lengths=text_lengths,
+            **kwargs,
+        )
+        # the same as the lengths of the upsampled hidden states in the generator
+        # NOTE: clamp for the case where all the predicted durations are zero
+        upsample_factor = self.generator.upsample_factor
+        feats_lengths = dur.sum(dim=1).clamp(1, wav.size(1) // upsample_factor)
+        return dict(
+            wav=wav,
+            wav_lengths=feats_lengths * upsample_factor,
+            duration=dur,
+            duration_lengths=text_lengths,
+        )
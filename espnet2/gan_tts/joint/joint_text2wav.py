@@ -3,7 +3,7 @@
 
 """Joint text-to-wav module for end-to-end training."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 
 import torch
 from typeguard import check_argument_types
@@ -30,7 +30,11 @@ from espnet2.gan_tts.parallel_wavegan import (
     ParallelWaveGANGenerator,
 )
 from espnet2.gan_tts.style_melgan import StyleMelGANDiscriminator, StyleMelGANGenerator
-from espnet2.gan_tts.utils import get_random_segments, get_segments
+from espnet2.gan_tts.utils import (
+    concat_discriminator_forward,
+    get_random_segments,
+    get_segments,
+)
 from espnet2.torch_utils.device_funcs import force_gatherable
 from espnet2.tts.fastspeech import FastSpeech
 from espnet2.tts.fastspeech2 import FastSpeech2
@@ -241,6 +245,7 @@ class JointText2Wav(AbsGANTTS):
         lambda_feat_match: float = 2.0,
         lambda_mel: float = 45.0,
         cache_generator_outputs: bool = False,
+        concat_discriminator_inputs: bool = False,
     ):
         """Initialize JointText2Wav module.
 
@@ -273,6 +278,8 @@ class JointText2Wav(AbsGANTTS):
             lambda_feat_match (float): Loss scaling coefficient for feat match loss.
             lambda_mel (float): Loss scaling coefficient for mel loss.
             cache_generator_outputs (bool): Whether to cache generator outputs.
+            concat_discriminator_inputs (bool): Whether to run the discriminator on
+                the concatenated fake and real samples in a single pass.
 
         """
         assert check_argument_types()
@@ -328,6 +335,7 @@ class JointText2Wav(AbsGANTTS):
 
         # cache
         self.cache_generator_outputs = cache_generator_outputs
+        self.concat_discriminator_inputs = concat_discriminator_inputs
         self._cache = None
 
         # store sampling rate for saving wav file
@@ -483,17 +491,17 @@ class JointText2Wav(AbsGANTTS):
             feat_match_loss = self.feat_match_loss(p_hat, p)
             feat_match_loss = feat_match_loss * self.lambda_feat_match
             loss = loss + feat_match_loss
-            stats.update(feat_match_loss=feat_match_loss.item())
+            stats.update(feat_match_loss=feat_match_loss.detach())
         if self.use_mel_loss:
             mel_loss = self.mel_loss(speech_hat_, speech_)
             mel_loss = self.lambda_mel * mel_loss
             loss = loss + mel_loss
-            stats.update(mel_loss=mel_loss.item())
+            stats.update(mel_loss=mel_loss.detach())
 
         stats.update(
-            adv_loss=adv_loss.item(),
-            text2mel_loss=text2mel_loss.item(),
-            loss=loss.item(),
+            adv_loss=adv_loss.detach(),
+            text2mel_loss=text2mel_loss.detach(),
+            loss=loss.detach(),
         )
 
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
@@ -579,17 +587,22 @@ class JointText2Wav(AbsGANTTS):
         )
 
         # calculate discriminator outputs
-        p_hat = self.discriminator(speech_hat_.detach())
-        p = self.discriminator(speech_)
+        if self.concat_discriminator_inputs:
+            p_hat, p = concat_discriminator_forward(
+                self.discriminator, speech_hat_.detach(), speech_
+            )
+        else:
+            p_hat = self.discriminator(speech_hat_.detach())
+            p = self.discriminator(speech_)
 
         # calculate losses
         real_loss, fake_loss = self.discriminator_adv_loss(p_hat, p)
         loss = real_loss + fake_loss
 
         stats = dict(
-            discriminator_loss=loss.item(),
-            real_loss=real_loss.item(),
-            fake_loss=fake_loss.item(),
+            discriminator_loss=loss.detach(),
+            real_loss=real_loss.detach(),
+            fake_loss=fake_loss.detach(),
         )
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
 
@@ -631,3 +644,35 @@ class JointText2Wav(AbsGANTTS):
         output_dict.update(wav=wav)
 
         return output_dict
+
+    def stream_inference(
+        self,
+        text: torch.Tensor,
+        chunk_size: int = 32,
+        **kwargs,
+    ) -> Iterator[torch.Tensor]:
+        """Run inference and generate the waveform chunk by chunk.
+
+        The features are generated at once, and then the vocoder is applied to
+        each chunk of ``chunk_size`` frames with the context of its receptive
+        field. If the vocoder does not support it or PQMF is used, the whole
+        waveform is generated at once.
+
+        Args:
+            text (Tensor): Input text index tensor (T_text,).
+            chunk_size (int): Number of frames in each chunk.
+
+        Returns:
+            Iterator[Tensor]: Generated waveform chunks (T_chunk,).
+
+        """
+        vocoder = self.generator["vocoder"]
+        if self.use_pqmf or not hasattr(vocoder, "stream_inference"):
+            yield self.inference(text=text, **kwargs)["wav"].view(-1)
+            return
+
+        output_dict = self.generator["text2mel"].inference(text=text, **kwargs)
+        for wav in vocoder.stream_inference(
+            output_dict["feat_gen"], chunk_size=chunk_size
+        ):
+            yield wav.view(-1)
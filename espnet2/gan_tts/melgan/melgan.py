@@ -8,12 +8,16 @@ This code is modified from https://github.com/kan-bayashi/ParallelWaveGAN.
 """
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 import numpy as np
 import torch
 
 from espnet2.gan_tts.melgan.residual_stack import ResidualStack
+from espnet2.gan_tts.utils.chunked_inference import (
+    chunked_inference,
+    get_receptive_field,
+)
 
 
 class MelGANGenerator(torch.nn.Module):
@@ -74,6 +78,8 @@ class MelGANGenerator(torch.nn.Module):
         ]
 
         self.upsample_factor = int(np.prod(upsample_scales) * out_channels)
+        # NOTE: computed on the first call of stream_inference()
+        self._receptive_field = None
         for i, upsample_scale in enumerate(upsample_scales):
             # add upsampling layer
             layers += [
@@ -195,6 +201,33 @@ class MelGANGenerator(torch.nn.Module):
         c = self.melgan(c.transpose(1, 0).unsqueeze(0))
         return c.squeeze(0).transpose(1, 0)
 
+    def stream_inference(
+        self, c: torch.Tensor, chunk_size: int = 32, context: Optional[int] = None
+    ) -> Iterator[torch.Tensor]:
+        """Perform inference chunk by chunk.
+
+        Args:
+            c (Tensor): Input tensor (T, in_channels).
+            chunk_size (int): Number of frames in each chunk.
+            context (Optional[int]): Number of context frames in each side. If not
+                given, the receptive field is used so that the concatenated chunks
+                are the same as the output of inference().
+
+        Returns:
+            Iterator[Tensor]: Output chunks (chunk_size * prod(upsample_scales),
+                out_channels).
+
+        """
+        if context is None:
+            if self._receptive_field is None:
+                self._receptive_field = get_receptive_field(
+                    self.melgan, [c.size(1)], device=c.device, dtype=c.dtype
+                )
+            context = self._receptive_field
+        c = c.transpose(1, 0).unsqueeze(0)
+        for y in chunked_inference(self.melgan, [c], [1], chunk_size, context):
+            yield y.squeeze(0).transpose(1, 0)
+
 
 class MelGANDiscriminator(torch.nn.Module):
     """MelGAN discriminator module."""
@@ -9,12 +9,16 @@ This code is modified from https://github.com/kan-bayashi/ParallelWaveGAN.
 
 import logging
 import math
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 import numpy as np
 import torch
 
 from espnet2.gan_tts.parallel_wavegan import upsample
+from espnet2.gan_tts.utils.chunked_inference import (
+    chunked_inference,
+    get_receptive_field,
+)
 from espnet2.gan_tts.wavenet.residual_block import Conv1d, Conv1d1x1, ResidualBlock
 
 
@@ -70,6 +74,8 @@ class ParallelWaveGANGenerator(torch.nn.Module):
         self.layers = layers
         self.stacks = stacks
         self.kernel_size = kernel_size
+        # NOTE: computed on the first call of stream_inference()
+        self._receptive_field = None
 
         # check the number of layers and stacks
         assert layers % stacks == 0
@@ -223,6 +229,48 @@ class ParallelWaveGANGenerator(torch.nn.Module):
         c = c.transpose(1, 0).unsqueeze(0)
         return self.forward(c, z).squeeze(0).transpose(1, 0)
 
+    def stream_inference(
+        self,
+        c: torch.Tensor,
+        z: Optional[torch.Tensor] = None,
+        chunk_size: int = 32,
+        context: Optional[int] = None,
+    ) -> Iterator[torch.Tensor]:
+        """Perform inference chunk by chunk.
+
+        The noise signal is sampled for the whole utterance beforehand so that
+        the context frames of the neighboring chunks share the same noise.
+
+        Args:
+            c (Tensor): Local conditioning auxiliary features (T_feats ,C).
+            z (Optional[Tensor]): Input noise signal (T_wav, 1).
+            chunk_size (int): Number of frames in each chunk.
+            context (Optional[int]): Number of context frames in each side. If not
+                given, the receptive field is used so that the concatenated chunks
+                are the same as the output of inference() with the same noise.
+
+        Returns:
+            Iterator[Tensor]: Output chunks (chunk_size * upsample_factor,
+                out_channels).
+
+        """
+        if z is None:
+            z = torch.randn(1, 1, c.size(0) * self.upsample_factor).to(
+                device=c.device, dtype=c.dtype
+            )
+        else:
+            z = z.transpose(1, 0).unsqueeze(0)
+        rates = [1, self.upsample_factor]
+        if context is None:
+            if self._receptive_field is None:
+                self._receptive_field = get_receptive_field(
+                    self.forward, [c.size(1), 1], rates, device=c.device, dtype=c.dtype
+                )
+            context = self._receptive_field
+        c = c.transpose(1, 0).unsqueeze(0)
+        for y in chunked_inference(self.forward, [c, z], rates, chunk_size, context):
+            yield y.squeeze(0).transpose(1, 0)
+
     def _load_state_dict_pre_hook(
         self,
         state_dict,
@@ -62,6 +62,68 @@ class Conv2d(torch.nn.Conv2d):
             torch.nn.init.constant_(self.bias, 0.0)
 
 
+class PolyphaseUpsample(torch.nn.Module):
+    """Upsampling module with a precomputed polyphase kernel.
+
+    This is equivalent to the pair of Stretch2d with the nearest interpolation and
+    Conv2d with the kernel size (1, scale * 2 + 1) in UpsampleNetwork, where each
+    output sample is a weighted sum of only three input samples.
+
+    """
+
+    def __init__(self, kernel: torch.Tensor):
+        """Initialize PolyphaseUpsample module.
+
+        Args:
+            kernel (Tensor): Polyphase kernel (3, scale) applied to the next, the
+                current and the previous input samples, respectively.
+
+        """
+        super().__init__()
+        self.register_buffer("kernel", kernel)
+
+    @classmethod
+    def from_stretch_conv(cls, stretch: Stretch2d, conv: Conv2d):
+        """Build the module from a pair of Stretch2d and Conv2d modules.
+
+        Args:
+            stretch (Stretch2d): Nearest interpolation module along the time axis.
+            conv (Conv2d): Conv module with the kernel size (1, scale * 2 + 1).
+
+        Returns:
+            PolyphaseUpsample: Module with the equivalent kernel.
+
+        """
+        scale = stretch.x_scale
+        assert stretch.mode == "nearest" and stretch.y_scale == 1
+        assert conv.kernel_size == (1, scale * 2 + 1) and conv.bias is None
+        weight = conv.weight.detach().view(-1)
+        # NOTE: The k-th tap of the conv refers to the input sample t for
+        #   the output samples n in [t * scale + scale - k, t * scale + 2 * scale - k)
+        kernel = weight.new_zeros(scale * 3)
+        for k in range(scale * 2 + 1):
+            kernel[scale * 2 - k : scale * 3 - k] += weight[k]
+        return cls(kernel.view(3, scale))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """Calculate forward propagation.
+
+        Args:
+            x (Tensor): Input tensor (B, C, F, T).
+
+        Returns:
+            Tensor: Upsampled tensor (B, C, F, T * scale).
+
+        """
+        x_pad = F.pad(x, (1, 1))
+        x = (
+            x_pad[..., 2:, None] * self.kernel[0]
+            + x[..., None] * self.kernel[1]
+            + x_pad[..., :-2, None] * self.kernel[2]
+        )
+        return x.flatten(-2)
+
+
 class UpsampleNetwork(torch.nn.Module):
     """Upsampling network module."""
 
@@ -123,6 +185,36 @@ class UpsampleNetwork(torch.nn.Module):
             c = f(c)
         return c.squeeze(1)  # (B, C, T')
 
+    def precompute_kernels(self):
+        """Replace the interpolation and conv layers with the polyphase upsampling.
+
+        The kernel of each upsampling layer is precomputed for the inference, which
+        avoids the interpolated intermediate tensor and reduces the conv taps from
+        scale * 2 + 1 to three. The layers with the frequency axis kernel or
+        the non-nearest interpolation are kept as they are.
+
+        """
+        layers = []
+        idx = 0
+        while idx < len(self.up_layers):
+            f = self.up_layers[idx]
+            if (
+                isinstance(f, Stretch2d)
+                and f.mode == "nearest"
+                and self.up_layers[idx + 1].kernel_size[0] == 1
+            ):
+                conv = self.up_layers[idx + 1]
+                try:
+                    torch.nn.utils.remove_weight_norm(conv)
+                except ValueError:  # this module didn't have weight norm
+                    pass
+                layers += [PolyphaseUpsample.from_stretch_conv(f, conv)]
+                idx += 2
+            else:
+                layers += [f]
+                idx += 1
+        self.up_layers = torch.nn.ModuleList(layers)
+
 
 class ConvInUpsampleNetwork(torch.nn.Module):
     """Convolution + upsampling network module."""
@@ -1,2 +1,9 @@
+from espnet2.gan_tts.utils.chunked_inference import chunked_inference  # NOQA
+from espnet2.gan_tts.utils.chunked_inference import get_receptive_field  # NOQA
+from espnet2.gan_tts.utils.concat_discriminator_forward import (  # NOQA
+    concat_discriminator_forward,
+)
+from espnet2.gan_tts.utils.export import fuse_for_inference  # NOQA
+from espnet2.gan_tts.utils.export import trace_for_inference  # NOQA
 from espnet2.gan_tts.utils.get_random_segments import get_random_segments  # NOQA
 from espnet2.gan_tts.utils.get_random_segments import get_segments  # NOQA
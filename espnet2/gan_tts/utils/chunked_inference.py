@@ -0,0 +1,102 @@
+"""Functions to run convolutional vocoders chunk by chunk."""
+
+from typing import Callable, Iterator, Optional, Sequence
+
+import torch
+
+
+def get_receptive_field(
+    forward_fn: Callable[..., torch.Tensor],
+    channels: Sequence[int],
+    rates: Sequence[int] = (1,),
+    device: Optional[torch.device] = None,
+    dtype: Optional[torch.dtype] = None,
+    max_frames: int = 8192,
+) -> int:
+    """Get the one-sided receptive field of a convolutional generator in frames.
+
+    The dependency of the output samples of the center frame on the inputs is
+    obtained from the gradient, which is non-zero exactly in the receptive field
+    of the convolutional networks. The input length is doubled until the receptive
+    field does not reach the edges.
+
+    Args:
+        forward_fn (Callable): Function mapping the inputs (B, channels[i],
+            T_feats * rates[i]) to the output (B, C, T_feats * upsample_factor).
+        channels (Sequence[int]): Number of channels of each input.
+        rates (Sequence[int]): Number of samples per frame of each input.
+        device (Optional[torch.device]): Device of the inputs.
+        dtype (Optional[torch.dtype]): Data type of the inputs.
+        max_frames (int): Maximum number of frames to be probed.
+
+    Returns:
+        int: Number of context frames needed in each side.
+
+    """
+    assert len(channels) == len(rates)
+    num_frames = 16
+    while num_frames <= max_frames:
+        center = num_frames // 2
+        with torch.enable_grad():
+            inputs = [
+                torch.randn(
+                    1,
+                    ch,
+                    num_frames * r,
+                    device=device,
+                    dtype=dtype,
+                    requires_grad=True,
+                )
+                for ch, r in zip(channels, rates)
+            ]
+            y = forward_fn(*inputs)
+            rate = y.size(-1) // num_frames
+            grads = torch.autograd.grad(
+                y[..., center * rate : (center + 1) * rate].sum(), inputs
+            )
+        frames = torch.cat(
+            [g.abs().sum(dim=(0, 1)).nonzero()[:, 0] // r for g, r in zip(grads, rates)]
+        )
+        first, last = int(frames.min()), int(frames.max())
+        if first > 0 and last < num_frames - 1:
+            return max(center - first, last - center)
+        num_frames *= 2
+    raise RuntimeError(f"The receptive field is larger than {max_frames} frames.")
+
+
+def chunked_inference(
+    forward_fn: Callable[..., torch.Tensor],
+    inputs: Sequence[torch.Tensor],
+    rates: Sequence[int] = (1,),
+    chunk_size: int = 32,
+    context: int = 0,
+) -> Iterator[torch.Tensor]:
+    """Run a convolutional generator chunk by chunk.
+
+    Each chunk is fed with ``context`` frames of the inputs in both sides and the
+    outputs of the context frames are discarded. If ``context`` covers the
+    receptive field (see get_receptive_field), the concatenation of the chunks is
+    the same as the output of the whole input.
+
+    Args:
+        forward_fn (Callable): Function mapping the inputs (B, C_i, T_feats * rates[i])
+            to the output (B, C, T_feats * upsample_factor).
+        inputs (Sequence[Tensor]): Inputs of the whole utterance.
+        rates (Sequence[int]): Number of samples per frame of each input.
+        chunk_size (int): Number of frames in each chunk.
+        context (int): Number of context frames in each side.
+
+    Returns:
+        Iterator[Tensor]: Output chunks (B, C, chunk_size * upsample_factor).
+            The last chunk may be shorter.
+
+    """
+    assert len(inputs) == len(rates)
+    assert chunk_size > 0 and context >= 0
+    num_frames = inputs[0].size(-1) // rates[0]
+    for start in range(0, num_frames, chunk_size):
+        end = min(start + chunk_size, num_frames)
+        lo, hi = max(start - context, 0), min(end + context, num_frames)
+        y = forward_fn(*[x[..., lo * r : hi * r] for x, r in zip(inputs, rates)])
+        rate = y.size(-1) // (hi - lo)
+        yield y[..., (start - lo) * rate : (end - lo) * rate]
@@ -0,0 +1,44 @@
+"""Function to run the discriminator on fake and real samples at once."""
+
+from typing import Any, Tuple
+
+import torch
+
+
+def concat_discriminator_forward(
+    discriminator: torch.nn.Module,
+    fake: torch.Tensor,
+    real: torch.Tensor,
+) -> Tuple[Any, Any]:
+    """Run the discriminator on fake and real samples in a single forward pass.
+
+    The fake and real samples are concatenated along the batch axis, so that
+    each sub-discriminator processes twice the batch with one kernel launch per
+    layer instead of two. The outputs must keep the batch axis first, which is
+    the case for all the discriminators in espnet2.gan_tts. Note that the
+    outputs differ from separate passes if the discriminator depends on the
+    batch, e.g., batch normalization or random windows shared in a batch.
+
+    Args:
+        discriminator (Module): Discriminator module.
+        fake (Tensor): Generated samples (B, 1, T).
+        real (Tensor): Groundtruth samples (B, 1, T).
+
+    Returns:
+        Any: Discriminator outputs of the fake samples.
+        Any: Discriminator outputs of the real samples.
+
+    """
+    outs = discriminator(torch.cat([fake, real], dim=0))
+    return _split_batch(outs, fake.size(0))
+
+
+def _split_batch(outs: Any, batch_size: int) -> Tuple[Any, Any]:
+    if isinstance(outs, torch.Tensor):
+        return outs[:batch_size], outs[batch_size:]
+    fake_outs, real_outs = [], []
+    for out in outs:
+        fake_out, real_out = _split_batch(out, batch_size)
+        fake_outs.append(fake_out)
+        real_outs.append(real_out)
+    return fake_outs, real_outs
@@ -0,0 +1,69 @@
+"""Functions to export the vocoders for the inference."""
+
+import logging
+from typing import Tuple
+
+import torch
+
+from espnet2.gan_tts.parallel_wavegan.upsample import UpsampleNetwork
+
+
+def fuse_for_inference(model: torch.nn.Module) -> torch.nn.Module:
+    """Convert the model into the inference-only form in place.
+
+    The weight normalization is removed from all of the layers so that the
+    normalized weights are not recomputed in every forward, and the upsampling
+    kernels of Parallel WaveGAN are precomputed. The model can not be trained
+    anymore but the outputs are the same as the original ones.
+
+    Args:
+        model (Module): Model including the vocoder, e.g., HiFiGANGenerator,
+            VITS and the parallel_wavegan vocoder wrapper.
+
+    Returns:
+        Module: The converted model in the evaluation mode.
+
+    """
+
+    def _remove_weight_norm(m: torch.nn.Module):
+        try:
+            torch.nn.utils.remove_weight_norm(m)
+            logging.debug(f"Weight norm is removed from {m}.")
+        except ValueError:  # this module didn't have weight norm
+            return
+
+    model.eval()
+    model.apply(_remove_weight_norm)
+    for m in model.modules():
+        if isinstance(m, UpsampleNetwork):
+            m.precompute_kernels()
+    return model
+
+
+def trace_for_inference(
+    model: torch.nn.Module,
+    example_inputs: Tuple[torch.Tensor, ...],
+    method: str = "inference",
+) -> torch.jit.ScriptModule:
+    """Trace and freeze the method of the model with TorchScript.
+
+    The python control flow is fixed with the example inputs, e.g., the optional
+    global conditioning must be given in the example if it is used. The lengths
+    of the inputs can differ from those of the example unless the model computes
+    python numbers from the input shape, which is the case of StyleMelGANGenerator.
+
+    Args:
+        model (Module): Model to be traced, e.g., HiFiGANGenerator.
+        example_inputs (Tuple[Tensor, ...]): Example inputs of the method.
+        method (str): Method name to be traced.
+
+    Returns:
+        ScriptModule: Frozen module providing the traced method.
+
+    """
+    model.eval()
+    with torch.no_grad():
+        traced = torch.jit.trace_module(
+            model, {method: example_inputs}, check_trace=False
+        )
+    return torch.jit.freeze(traced, preserved_attrs=[method])
@@ -24,7 +24,7 @@ from espnet2.gan_tts.hifigan.loss import (
     GeneratorAdversarialLoss,
     MelSpectrogramLoss,
 )
-from espnet2.gan_tts.utils import get_segments
+from espnet2.gan_tts.utils import concat_discriminator_forward, get_segments
 from espnet2.gan_tts.vits.generator import VITSGenerator
 from espnet2.gan_tts.vits.loss import KLDivergenceLoss
 from espnet2.torch_utils.device_funcs import force_gatherable
@@ -185,6 +185,7 @@ class VITS(AbsGANTTS):
         lambda_dur: float = 1.0,
         lambda_kl: float = 1.0,
         cache_generator_outputs: bool = True,
+        concat_discriminator_inputs: bool = False,
     ):
         """Initialize VITS module.
 
@@ -211,6 +212,8 @@ class VITS(AbsGANTTS):
             lambda_dur (float): Loss scaling coefficient for duration loss.
             lambda_kl (float): Loss scaling coefficient for KL divergence loss.
             cache_generator_outputs (bool): Whether to cache generator outputs.
+            concat_discriminator_inputs (bool): Whether to run the discriminator on
+                the concatenated fake and real samples in a single pass.
 
         """
         assert check_argument_types()
@@ -254,6 +257,7 @@ class VITS(AbsGANTTS):
 
         # cache
         self.cache_generator_outputs = cache_generator_outputs
+        self.concat_discriminator_inputs = concat_discriminator_inputs
         self._cache = None
 
         # store sampling rate for saving wav file
@@ -424,12 +428,12 @@ class VITS(AbsGANTTS):
             loss = mel_loss + kl_loss + dur_loss + adv_loss + feat_match_loss
 
         stats = dict(
-            generator_loss=loss.item(),
-            generator_mel_loss=mel_loss.item(),
-            generator_kl_loss=kl_loss.item(),
-            generator_dur_loss=dur_loss.item(),
-            generator_adv_loss=adv_loss.item(),
-            generator_feat_match_loss=feat_match_loss.item(),
+            generator_loss=loss.detach(),
+            generator_mel_loss=mel_loss.detach(),
+            generator_kl_loss=kl_loss.detach(),
+            generator_dur_loss=dur_loss.detach(),
+            generator_adv_loss=adv_loss.detach(),
+            generator_feat_match_loss=feat_match_loss.detach(),
         )
 
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
@@ -512,8 +516,13 @@ class VITS(AbsGANTTS):
         )
 
         # calculate discriminator outputs
-        p_hat = self.discriminator(speech_hat_.detach())
-        p = self.discriminator(speech_)
+        if self.concat_discriminator_inputs:
+            p_hat, p = concat_discriminator_forward(
+                self.discriminator, speech_hat_.detach(), speech_
+            )
+        else:
+            p_hat = self.discriminator(speech_hat_.detach())
+            p = self.discriminator(speech_)
 
         # calculate losses
         with autocast(enabled=False):
@@ -521,9 +530,9 @@ class VITS(AbsGANTTS):
             loss = real_loss + fake_loss
 
         stats = dict(
-            discriminator_loss=loss.item(),
-            discriminator_real_loss=real_loss.item(),
-            discriminator_fake_loss=fake_loss.item(),
+            discriminator_loss=loss.detach(),
+            discriminator_real_loss=real_loss.detach(),
+            discriminator_fake_loss=fake_loss.detach(),
         )
         loss, stats, weight = force_gatherable((loss, stats, batch_size), loss.device)
 
@@ -622,3 +631,73 @@ class VITS(AbsGANTTS):
                 max_len=max_len,
             )
         return dict(wav=wav.view(-1), att_w=att_w[0], duration=dur[0])
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        sids: Optional[torch.Tensor] = None,
+        spembs: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        noise_scale: float = 0.667,
+        noise_scale_dur: float = 0.8,
+        alpha: float = 1.0,
+        max_len: Optional[int] = None,
+        use_teacher_forcing: bool = False,
+    ) -> Dict[str, torch.Tensor]:
+        """Run inference for a batch of padded text sequences at once.
+
+        Args:
+            text (Tensor): Padded text index tensor (B, T_text).
+            text_lengths (Tensor): Text length tensor (B,).
+            sids (Tensor): Speaker index tensor (B, 1).
+            spembs (Optional[Tensor]): Speaker embedding tensor (B, spk_embed_dim).
+            lids (Tensor): Language index tensor (B, 1).
+            noise_scale (float): Noise scale value for flow.
+            noise_scale_dur (float): Noise scale value for duration predictor.
+            alpha (float): Alpha parameter to control the speed of generated speech.
+            max_len (Optional[int]): Maximum length.
+            use_teacher_forcing (bool): Must be false, teacher forcing is not
+                supported in batch inference.
+
+        Returns:
+            Dict[str, Tensor]:
+                * wav (Tensor): Padded waveform tensor (B, T_wav).
+                * wav_lengths (Tensor): Waveform length tensor (B,).
+                * att_w (Tensor): Monotonic attention weight tensor
+                    (B, T_feats, T_text).
+                * att_w_lengths (Tensor): Feature length tensor (B,).
+                * duration (Tensor): Predicted duration tensor (B, T_text).
+                * duration_lengths (Tensor): Text length tensor (B,).
+
+        """
+        if use_teacher_forcing:
+            raise NotImplementedError("teacher forcing is not supported in batch")
+        if sids is not None:
+            sids = sids.view(-1)
+        if lids is not None:
+            lids = lids.view(-1)
+
+        wav, att_w, dur = self.generator.inference(
+            text=text,
+            text_lengths=text_lengths,
+            sids=sids,
+            spembs=spembs,
+            lids=lids,
+            noise_scale=noise_scale,
+            noise_scale_dur=noise_scale_dur,
+            alpha=alpha,
+            max_len=max_len,
+        )
+        # the same as y_lengths in the generator
+        feats_lengths = torch.clamp_min(dur.sum(1), 1).long()
+        if max_len is not None:
+            feats_lengths = torch.clamp_max(feats_lengths, max_len)
+        return dict(
+            wav=wav,
+            wav_lengths=feats_lengths * self.generator.upsample_factor,
+            att_w=att_w,
+            att_w_lengths=feats_lengths,
+            duration=dur,
+            duration_lengths=text_lengths,
+        )
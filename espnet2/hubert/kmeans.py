@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Mini-batch k-means on the features spilled to memory-mapped shards.
+
+The features of a large corpus don't fit in memory, so they are appended to raw
+float32 files shard by shard (FeatureShardWriter) and read back as one array
+through np.memmap (FeatureShards). MiniBatchKMeans samples the mini-batches from
+the array, so only batch_size frames are loaded at once.
+"""
+
+import logging
+import math
+from pathlib import Path
+from typing import Collection, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+from typeguard import check_argument_types
+
+
+class FeatureShardWriter:
+    """Write the features of utterances to a shard.
+
+    A shard consists of two files:
+    - {prefix}.feats: The frames of all utterances in float32, row-major.
+    - {prefix}.index: The lines of "<utt_id> <start_row> <end_row>".
+
+    Examples:
+        >>> with FeatureShardWriter("dump/feats.1") as writer:
+        ...     writer["utt1"] = np.random.randn(100, 39)
+    """
+
+    def __init__(self, prefix: Union[Path, str]):
+        assert check_argument_types()
+        prefix = Path(prefix)
+        prefix.parent.mkdir(parents=True, exist_ok=True)
+        self.fout = open(f"{prefix}.feats", "wb")
+        self.fidx = open(f"{prefix}.index", "w", encoding="utf-8")
+        self.num_rows = 0
+        self.dim = None
+
+    def __setitem__(self, key: str, value: Union[np.ndarray, torch.Tensor]):
+        if isinstance(value, torch.Tensor):
+            value = value.detach().cpu().numpy()
+        assert value.ndim == 2, value.shape
+        if self.dim is None:
+            self.dim = value.shape[1]
+        elif self.dim != value.shape[1]:
+            raise RuntimeError(f"Dimension mismatch: {self.dim} != {value.shape[1]}")
+        self.fout.write(np.ascontiguousarray(value, dtype=np.float32).tobytes())
+        start, self.num_rows = self.num_rows, self.num_rows + len(value)
+        self.fidx.write(f"{key} {start} {self.num_rows}\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.fout.close()
+        self.fidx.close()
+
+
+def load_feature_shard(
+    prefix: Union[Path, str]
+) -> Tuple[np.ndarray, Dict[str, Tuple[int, int]]]:
+    """Open a shard written by FeatureShardWriter.
+
+    Returns:
+        The memory-mapped frames (N, D) and the rows of each utterance.
+    """
+    index = {}
+    with open(f"{prefix}.index", encoding="utf-8") as f:
+        for line in f:
+            key, start, end = line.split()
+            index[key] = (int(start), int(end))
+    num_rows = max((end for _, end in index.values()), default=0)
+    if num_rows == 0:
+        return np.zeros((0, 0), dtype=np.float32), index
+    size = Path(f"{prefix}.feats").stat().st_size // np.dtype(np.float32).itemsize
+    if size % num_rows != 0:
+        raise RuntimeError(f"{prefix}.feats doesn't match with {prefix}.index")
+    feats = np.memmap(
+        f"{prefix}.feats",
+        dtype=np.float32,
+        mode="r",
+        shape=(num_rows, size // num_rows),
+    )
+    return feats, index
+
+
+class FeatureShards:
+    """Read-only view of the utterances in the shards as one (N, D) array.
+
+    Args:
+        prefixes: The prefixes of the shards.
+        keys: Use only these utterances if given, e.g. a subset for k-means.
+    """
+
+    def __init__(
+        self,
+        prefixes: Sequence[Union[Path, str]],
+        keys: Optional[Collection[str]] = None,
+    ):
+        assert check_argument_types()
+        self.feats = []
+        self.utts = []
+        # The shard id, the start row in the shard, and the length of each utterance
+        shard_ids, starts, lengths = [], [], []
+        for i, prefix in enumerate(prefixes):
+            feats, index = load_feature_shard(prefix)
+            self.feats.append(feats)
+            for key, (start, end) in index.items():
+                if keys is None or key in keys:
+                    self.utts.append(key)
+                    shard_ids.append(i)
+                    starts.append(start)
+                    lengths.append(end - start)
+        self.shard_ids = np.array(shard_ids, dtype=np.int64)
+        self.starts = np.array(starts, dtype=np.int64)
+        self.lengths = np.array(lengths, dtype=np.int64)
+        # The first row of each utterance in the concatenated array
+        self.offsets = np.concatenate([[0], np.cumsum(self.lengths)])
+        dims = {f.shape[1] for f in self.feats if len(f) > 0}
+        if len(dims) > 1:
+            raise RuntimeError(f"Dimension mismatch among the shards: {dims}")
+        self.dim = dims.pop() if len(dims) > 0 else 0
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, rows: np.ndarray) -> np.ndarray:
+        """Gather the rows of the concatenated array."""
+        rows = np.asarray(rows, dtype=np.int64)
+        utt = np.searchsorted(self.offsets, rows, side="right") - 1
+        shard_rows = self.starts[utt] + rows - self.offsets[utt]
+        shard_ids = self.shard_ids[utt]
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        for i in np.unique(shard_ids):
+            mask = shard_ids == i
+            out[mask] = self.feats[i][shard_rows[mask]]
+        return out
+
+    def items(self) -> Iterator[Tuple[str, np.ndarray]]:
+        for key, i, start, length in zip(
+            self.utts, self.shard_ids, self.starts, self.lengths
+        ):
+            yield key, np.asarray(self.feats[i][start : start + length])
+
+
+class MiniBatchKMeans:
+    """Mini-batch k-means with the distances computed by torch.
+
+    The centers are initialized by k-means++ on a random subset, and updated
+    with the per-center learning rate 1 / count as in sklearn.MiniBatchKMeans.
+    Unlike sklearn, the data is not loaded at once: each step gathers batch_size
+    random rows from an array-like object, e.g. FeatureShards.
+
+    Args:
+        n_clusters: The number of clusters.
+        batch_size: The number of frames in a mini-batch.
+        max_iter: The maximum number of passes over the data.
+        max_no_improvement: Stop if the smoothed inertia is not improved for
+            this number of mini-batches. 0 disables the early stopping.
+        init_size: The number of frames used for the initialization.
+            3 * batch_size by default.
+        n_init: The number of initializations. The best one in terms of the
+            inertia on the initialization frames is used.
+        chunk_size: The number of frames for which the distances to all centers
+            are computed at once.
+        seed: The random seed.
+        device: The device for the computation.
+    """
+
+    def __init__(
+        self,
+        n_clusters: int,
+        batch_size: int = 10000,
+        max_iter: int = 100,
+        max_no_improvement: int = 100,
+        init_size: Optional[int] = None,
+        n_init: int = 3,
+        chunk_size: int = 16384,
+        seed: int = 0,
+        device: Union[str, torch.device] = "cpu",
+    ):
+        assert check_argument_types()
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.max_no_improvement = max_no_improvement
+        self.init_size = init_size if init_size is not None else 3 * batch_size
+        self.n_init = n_init
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.device = torch.device(device)
+        self.cluster_centers = None
+
+    def _to_tensor(self, x) -> torch.Tensor:
+        if not isinstance(x, torch.Tensor):
+            x = torch.from_numpy(np.asarray(x, dtype=np.float32))
+        return x.to(self.device, torch.float32)
+
+    def _assign(
+        self, x: torch.Tensor, centers: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Return the nearest centers and the squared distances to them."""
+        c_norm = (centers**2).sum(1)
+        labels, dists = [], []
+        for start in range(0, len(x), self.chunk_size):
+            chunk = x[start : start + self.chunk_size]
+            # (chunk, n_clusters): |x|^2 - 2 x.c + |c|^2 without |x|^2
+            d = c_norm - 2 * chunk @ centers.T
+            dist, label = d.min(1)
+            labels.append(label)
+            dists.append((dist + (chunk**2).sum(1)).clamp_(min=0))
+        return torch.cat(labels), torch.cat(dists)
+
+    def _kmeans_plusplus(
+        self, x: torch.Tensor, rng: np.random.Generator
+    ) -> torch.Tensor:
+        centers = x.new_empty(self.n_clusters, x.size(1))
+        centers[0] = x[rng.integers(len(x))]
+        d2 = ((x - centers[0]) ** 2).sum(1)
+        for k in range(1, self.n_clusters):
+            p = d2.double().cpu().numpy()
+            if p.sum() > 0:
+                idx = rng.choice(len(x), p=p / p.sum())
+            else:
+                idx = rng.integers(len(x))
+            centers[k] = x[idx]
+            d2 = torch.minimum(d2, ((x - centers[k]) ** 2).sum(1))
+        return centers
+
+    def fit(self, feats) -> "MiniBatchKMeans":
+        """Fit the centers.
+
+        Args:
+            feats: (N, D) array-like supporting len() and the indexing by
+                an integer array, e.g. np.ndarray, np.memmap or FeatureShards.
+        """
+        num_rows = len(feats)
+        if num_rows < self.n_clusters:
+            raise RuntimeError(
+                f"The number of frames is smaller than n_clusters: "
+                f"{num_rows} < {self.n_clusters}"
+            )
+        rng = np.random.default_rng(self.seed)
+
+        # 1. Initialization
+        init_size = max(min(self.init_size, num_rows), self.n_clusters)
+        rows = np.sort(rng.choice(num_rows, init_size, replace=False))
+        x_init = self._to_tensor(feats[rows])
+        best = None
+        for i in range(self.n_init):
+            centers = self._kmeans_plusplus(x_init, rng)
+            inertia = self._assign(x_init, centers)[1].sum().item()
+            logging.info(f"Init {i + 1}/{self.n_init}: inertia={inertia:.5f}")
+            if best is None or inertia < best[0]:
+                best = (inertia, centers)
+        centers = best[1]
+        del x_init
+
+        # 2. Mini-batch updates
+        counts = centers.new_zeros(self.n_clusters)
+        steps_per_iter = math.ceil(num_rows / self.batch_size)
+        alpha = min(self.batch_size * 2.0 / (num_rows + 1), 1.0)
+        ewa_inertia, best_inertia, no_improvement = None, math.inf, 0
+        for step in range(self.max_iter * steps_per_iter):
+            # Sorted rows make the reads from the memory-mapped files sequential
+            rows = np.sort(rng.integers(num_rows, size=self.batch_size))
+            x = self._to_tensor(feats[rows])
+            labels, dists = self._assign(x, centers)
+
+            batch_counts = torch.bincount(labels, minlength=self.n_clusters).to(x)
+            sums = torch.zeros_like(centers).index_add_(0, labels, x)
+            counts += batch_counts
+            updated = batch_counts > 0
+            centers[updated] += (
+                sums[updated] - batch_counts[updated, None] * centers[updated]
+            ) / counts[updated, None]
+
+            inertia = dists.mean().item()
+            if ewa_inertia is None:
+                ewa_inertia = inertia
+            else:
+                ewa_inertia = ewa_inertia * (1 - alpha) + inertia * alpha
+            if (step + 1) % steps_per_iter == 0:
+                logging.info(
+                    f"Iteration {(step + 1) // steps_per_iter}/{self.max_iter}: "
+                    f"ewa_inertia={ewa_inertia:.5f}"
+                )
+            if ewa_inertia < best_inertia:
+                best_inertia, no_improvement = ewa_inertia, 0
+            else:
+                no_improvement += 1
+            if 0 < self.max_no_improvement <= no_improvement:
+                logging.info(
+                    f"Converged at step {step + 1}: no improvement of the "
+                    f"smoothed inertia in {self.max_no_improvement} steps"
+                )
+                break
+
+        self.cluster_centers = centers
+        return self
+
+    @torch.no_grad()
+    def predict(self, x: Union[np.ndarray, torch.Tensor]) -> np.ndarray:
+        """Return the index of the nearest center of each frame: (N, D) -> (N,)"""
+        assert self.cluster_centers is not None, "Not fitted yet"
+        return self._assign(self._to_tensor(x), self.cluster_centers)[0].cpu().numpy()
+
+    @torch.no_grad()
+    def score(self, feats, batch_size: Optional[int] = None) -> float:
+        """Return the mean squared distance to the nearest center."""
+        assert self.cluster_centers is not None, "Not fitted yet"
+        batch_size = batch_size if batch_size is not None else self.batch_size
+        total = 0.0
+        for start in range(0, len(feats), batch_size):
+            rows = np.arange(start, min(start + batch_size, len(feats)))
+            x = self._to_tensor(feats[rows])
+            total += self._assign(x, self.cluster_centers)[1].sum().item()
+        return total / max(len(feats), 1)
+
+    def save(self, path: Union[Path, str]):
+        torch.save({"cluster_centers": self.cluster_centers.cpu()}, path)
+
+    @classmethod
+    def load(
+        cls, path: Union[Path, str], device: Union[str, torch.device] = "cpu", **kwargs
+    ) -> "MiniBatchKMeans":
+        centers = torch.load(path, map_location="cpu")["cluster_centers"]
+        model = cls(n_clusters=len(centers), device=device, **kwargs)
+        model.cluster_centers = centers.to(model.device)
+        return model
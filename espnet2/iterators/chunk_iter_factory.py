@@ -154,10 +154,12 @@ class ChunkIterFactory(AbsIterFactory):
                     cache_chunks[k] = []
                 if k in sequence_keys:
                     # Shift chunks with overlapped length for data augmentation
-                    cache_chunks[k] += [v[Z + i * S : Z + i * S + W] for i in range(N)]
+                    # chunks: (N, W, ...) as a view of v
+                    chunks = v[Z : Z + (N - 1) * S + W].unfold(0, W, S).movedim(-1, 1)
                 else:
                     # If not sequence, use whole data instead of chunk
-                    cache_chunks[k] += [v for _ in range(N)]
+                    chunks = v.unsqueeze(0).expand(N, *v.shape)
+                cache_chunks[k].append(chunks)
             cache_id_list += [id_ for _ in range(N)]
 
             if len(cache_id_list) > self.num_cache_chunks:
@@ -190,20 +192,36 @@ class ChunkIterFactory(AbsIterFactory):
         shuffle: bool,
         state: np.random.RandomState,
     ):
+        """Yield the mini-batches from the cached chunks.
+
+        Args:
+            id_list: The ids of the cached chunks.
+            batches: The chunks of each key. Each element is a tensor (N, ...)
+                containing the chunks of one or more sequences.
+        Returns:
+            The ids and the chunks left over.
+        """
+        # Copy the chunks into a buffer once and gather the mini-batches by index
+        # instead of re-slicing the lists, which is quadratic in num_cache_chunks
+        buffers = {k: torch.cat(v, 0) for k, v in batches.items()}
+        indices = np.arange(0, len(id_list))
         if shuffle:
-            indices = np.arange(0, len(id_list))
             state.shuffle(indices)
-            batches = {k: [v[i] for i in indices] for k, v in batches.items()}
-            id_list = [id_list[i] for i in indices]
 
         bs = self.batch_size
-        while len(id_list) >= bs:
+        num_batches = len(id_list) // bs
+        for i in range(num_batches):
             # Make mini-batch and yield
+            idx = indices[i * bs : (i + 1) * bs]
+            idx_tensor = torch.from_numpy(idx)
             yield (
-                id_list[:bs],
-                {k: torch.stack(v[:bs], 0) for k, v in batches.items()},
+                [id_list[j] for j in idx],
+                {k: v[idx_tensor] for k, v in buffers.items()},
             )
-            id_list = id_list[bs:]
-            batches = {k: v[bs:] for k, v in batches.items()}
 
-        return id_list, batches
+        rest = indices[num_batches * bs :]
+        rest_tensor = torch.from_numpy(rest)
+        return (
+            [id_list[j] for j in rest],
+            {k: [v[rest_tensor]] for k, v in buffers.items()},
+        )
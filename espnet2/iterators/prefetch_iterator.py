@@ -0,0 +1,115 @@
+import queue
+import threading
+from collections import deque
+from typing import Any, Iterable, Iterator
+
+import torch
+from typeguard import check_argument_types
+
+from espnet2.torch_utils.device_funcs import to_device
+
+_END = object()
+
+
+def _record_stream(data: Any, stream: "torch.cuda.Stream"):
+    if isinstance(data, dict):
+        for v in data.values():
+            _record_stream(v, stream)
+    elif isinstance(data, (list, tuple)):
+        for v in data:
+            _record_stream(v, stream)
+    elif isinstance(data, torch.Tensor) and data.is_cuda:
+        data.record_stream(stream)
+
+
+class PrefetchIterator:
+    """Wrap an iterator to transfer the next mini-batches to the device in advance.
+
+    With a CUDA device, the next num_prefetch mini-batches are copied on a side
+    stream, so that the host-to-device copies overlap with the computation on
+    the default stream. The DataLoader should use pin_memory=True to make the
+    copies asynchronous. Otherwise, a background thread fetches the mini-batches
+    from the iterator.
+
+    Examples:
+        >>> for utt_id, batch in PrefetchIterator(loader, "cuda", num_prefetch=2):
+        ...     retval = model(**batch)
+
+    """
+
+    def __init__(self, iterable: Iterable, device: str, num_prefetch: int = 2):
+        assert check_argument_types()
+        assert num_prefetch > 0, num_prefetch
+        self.iterable = iterable
+        self.device = torch.device(device)
+        self.num_prefetch = num_prefetch
+
+    def __len__(self) -> int:
+        return len(self.iterable)
+
+    def __iter__(self) -> Iterator:
+        if self.device.type == "cuda" and torch.cuda.is_available():
+            return self._iter_cuda()
+        else:
+            return self._iter_thread()
+
+    def _iter_cuda(self) -> Iterator:
+        stream = torch.cuda.Stream(device=self.device)
+        iterator = iter(self.iterable)
+        prefetched = deque()
+
+        def _prefetch():
+            try:
+                data = next(iterator)
+            except StopIteration:
+                return
+            with torch.cuda.stream(stream):
+                prefetched.append(to_device(data, self.device, non_blocking=True))
+
+        for _ in range(self.num_prefetch):
+            _prefetch()
+        while len(prefetched) > 0:
+            data = prefetched.popleft()
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(stream)
+            # Prevent the memory from being reused by the side stream
+            # while the data is used on the current stream
+            _record_stream(data, current_stream)
+            _prefetch()
+            yield data
+
+    def _iter_thread(self) -> Iterator:
+        buffer = queue.Queue(maxsize=self.num_prefetch)
+        stop = threading.Event()
+
+        def _put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _worker():
+            try:
+                for data in self.iterable:
+                    if not _put((to_device(data, self.device), None)):
+                        return
+                _put((_END, None))
+            except Exception as e:
+                _put((_END, e))
+
+        thread = threading.Thread(target=_worker, daemon=True)
+        thread.start()
+        try:
+            while True:
+                data, error = buffer.get()
+                if error is not None:
+                    raise error
+                if data is _END:
+                    break
+                yield data
+        finally:
+            # Stop the worker also when the consumer breaks the loop
+            stop.set()
@@ -39,6 +39,9 @@ class SequenceIterFactory(AbsIterFactory):
       guarantees reproducibility when resuming from middle of training process.
     - Enable to restrict the number of samples for one epoch. This features
       controls the interval number between training and evaluation.
+    - With persistent_workers=True, a DataLoader is created only once and
+      the worker processes are reused over the epochs. Note that worker_init_fn
+      is called only in the first epoch in this case.
 
     """
 
@@ -52,6 +55,8 @@ class SequenceIterFactory(AbsIterFactory):
         num_workers: int = 0,
         collate_fn=None,
         pin_memory: bool = False,
+        persistent_workers: bool = False,
+        prefetch_factor: int = 2,
     ):
         assert check_argument_types()
 
@@ -68,8 +73,22 @@ class SequenceIterFactory(AbsIterFactory):
         self.collate_fn = collate_fn
         # https://discuss.pytorch.org/t/what-is-the-disadvantage-of-using-pin-memory/1702
         self.pin_memory = pin_memory
-
-    def build_iter(self, epoch: int, shuffle: bool = None) -> DataLoader:
+        self.persistent_workers = persistent_workers
+        self.prefetch_factor = prefetch_factor
+        self._loader = None
+        self._loader_sampler = None
+
+    def build_iter(
+        self, epoch: int, shuffle: bool = None, start_iter: int = 0
+    ) -> DataLoader:
+        """Build the iterator of the epoch.
+
+        Args:
+            epoch: The epoch number.
+            shuffle: Shuffle the mini-batches. If not given, self.shuffle is used.
+            start_iter: The number of the mini-batches to be skipped from the head,
+                e.g. to resume from the middle of the epoch.
+        """
         if shuffle is None:
             shuffle = self.shuffle
 
@@ -135,13 +154,26 @@ class SequenceIterFactory(AbsIterFactory):
             if shuffle:
                 np.random.RandomState(epoch + self.seed).shuffle(batches)
 
+        batches = batches[start_iter:]
+
         # For backward compatibility for pytorch DataLoader
         if self.collate_fn is not None:
             kwargs = dict(collate_fn=self.collate_fn)
         else:
             kwargs = {}
-
-        return DataLoader(
+        if self.num_workers > 0:
+            # These options are allowed only for the multi-process loading
+            kwargs.update(prefetch_factor=self.prefetch_factor)
+            if self.persistent_workers:
+                if self._loader is not None:
+                    # The batch_sampler is iterated again at each epoch
+                    self._loader_sampler.batches = batches
+                    return self._loader
+                self._loader_sampler = RawSampler(batches)
+                batches = self._loader_sampler
+                kwargs.update(persistent_workers=True)
+
+        loader = DataLoader(
             dataset=self.dataset,
             batch_sampler=batches,
             num_workers=self.num_workers,
@@ -149,3 +181,6 @@ class SequenceIterFactory(AbsIterFactory):
             worker_init_fn=partial(worker_init_fn, base_seed=epoch + self.seed),
             **kwargs,
         )
+        if self._loader_sampler is not None:
+            self._loader = loader
+        return loader
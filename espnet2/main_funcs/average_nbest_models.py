@@ -1,14 +1,30 @@
 import logging
 import warnings
 from pathlib import Path
-from typing import Collection, Optional, Sequence, Union
+from typing import Collection, Dict, Optional, Sequence, Union
 
 import torch
+from packaging.version import parse as V
 from typeguard import check_argument_types
 
 from espnet2.train.reporter import Reporter
 
 
+def _is_int(v: torch.Tensor) -> bool:
+    return str(v.dtype).startswith("torch.int")
+
+
+def _load(path: Path) -> Dict[str, torch.Tensor]:
+    """Load the state dict memory-mapped if possible, not to hold it in RAM."""
+    if V(torch.__version__) >= V("2.1.0"):
+        try:
+            return torch.load(path, map_location="cpu", mmap=True)
+        except RuntimeError:
+            # e.g. The legacy format can't be memory-mapped
+            pass
+    return torch.load(path, map_location="cpu")
+
+
 @torch.no_grad()
 def average_nbest_models(
     output_dir: Path,
@@ -47,58 +63,81 @@ def average_nbest_models(
         if reporter.has(ph, k)
     ]
 
-    _loaded = {}
+    # The averaged model file of each set of epochs, which is shared among
+    # the criteria having the same n-best epochs
+    averaged = {}
     for ph, cr, epoch_and_values in nbest_epochs:
         _nbests = [i for i in nbests if i <= len(epoch_and_values)]
         if len(_nbests) == 0:
             _nbests = [1]
+        epochs = [e for e, _ in epoch_and_values]
+
+        if 1 in _nbests:
+            # The averaged model is same as the best model
+            op = output_dir / f"{epochs[0]}epoch.pth"
+            sym_op = output_dir / f"{ph}.{cr}.ave_1best.{suffix}pth"
+            if sym_op.is_symlink() or sym_op.exists():
+                sym_op.unlink()
+            sym_op.symlink_to(op.name)
+
+        # 2. Averaging models with a running sum over the n-best epochs,
+        #   so only the sum and the model being added are kept in memory
+        targets = sorted(set(n for n in _nbests if n >= 2))
+        sums = None
+        num_summed = 0
+        # Resume from the largest n whose epochs are already averaged
+        for n in targets:
+            if frozenset(epochs[:n]) not in averaged:
+                break
+            num_summed = n
+        if num_summed > 0:
+            sums = {
+                k: v if _is_int(v) else v * num_summed
+                for k, v in _load(averaged[frozenset(epochs[:num_summed])]).items()
+            }
 
-        for n in _nbests:
-            if n == 0:
-                continue
-            elif n == 1:
-                # The averaged model is same as the best model
-                e, _ = epoch_and_values[0]
-                op = output_dir / f"{e}epoch.pth"
-                sym_op = output_dir / f"{ph}.{cr}.ave_1best.{suffix}pth"
-                if sym_op.is_symlink() or sym_op.exists():
-                    sym_op.unlink()
-                sym_op.symlink_to(op.name)
-            else:
-                op = output_dir / f"{ph}.{cr}.ave_{n}best.{suffix}pth"
+        for n in targets:
+            op = output_dir / f"{ph}.{cr}.ave_{n}best.{suffix}pth"
+            # NOTE: Unlink first not to write through the symlink created before
+            if op.is_symlink() or op.exists():
+                op.unlink()
+            key = frozenset(epochs[:n])
+            if key in averaged:
                 logging.info(
-                    f"Averaging {n}best models: " f'criterion="{ph}.{cr}": {op}'
+                    f"Linking {n}best models: "
+                    f'criterion="{ph}.{cr}": {op} -> {averaged[key].name}'
                 )
+                op.symlink_to(averaged[key].name)
+                if n <= num_summed:
+                    continue
+
+            for e in epochs[num_summed:n]:
+                states = _load(output_dir / f"{e}epoch.pth")
+                if sums is None:
+                    sums = {k: v.clone() for k, v in states.items()}
+                else:
+                    for k in sums:
+                        sums[k] += states[k]
+                del states
+            num_summed = n
 
-                avg = None
-                # 2.a. Averaging model
-                for e, _ in epoch_and_values[:n]:
-                    if e not in _loaded:
-                        _loaded[e] = torch.load(
-                            output_dir / f"{e}epoch.pth",
-                            map_location="cpu",
-                        )
-                    states = _loaded[e]
-
-                    if avg is None:
-                        avg = states
-                    else:
-                        # Accumulated
-                        for k in avg:
-                            avg[k] = avg[k] + states[k]
-                for k in avg:
-                    if str(avg[k].dtype).startswith("torch.int"):
-                        # For int type, not averaged, but only accumulated.
-                        # e.g. BatchNorm.num_batches_tracked
-                        # (If there are any cases that requires averaging
-                        #  or the other reducing method, e.g. max/min, for integer type,
-                        #  please report.)
-                        pass
-                    else:
-                        avg[k] = avg[k] / n
-
-                # 2.b. Save the ave model and create a symlink
+            if key not in averaged:
+                logging.info(
+                    f"Averaging {n}best models: " f'criterion="{ph}.{cr}": {op}'
+                )
+                avg = {
+                    # For int type, not averaged, but only accumulated.
+                    # e.g. BatchNorm.num_batches_tracked
+                    # (If there are any cases that requires averaging
+                    #  or the other reducing method, e.g. max/min, for integer type,
+                    #  please report.)
+                    k: v.clone() if _is_int(v) else v / n
+                    for k, v in sums.items()
+                }
                 torch.save(avg, op)
+                del avg
+                averaged[key] = op
+        del sums
 
         # 3. *.*.ave.pth is a symlink to the max ave model
         op = output_dir / f"{ph}.{cr}.ave_{max(_nbests)}best.{suffix}pth"
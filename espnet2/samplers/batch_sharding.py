@@ -0,0 +1,136 @@
+"""Split mini-batches into the sub-batches of each rank in distributed training."""
+import heapq
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from typeguard import check_argument_types
+
+from espnet2.fileio.read_text import load_num_sequence_text
+
+SHARD_TYPES = ("stride", "balanced")
+SHARD_COSTS = ("length", "squared_length")
+
+
+def load_utt2cost(
+    shape_files: Sequence[str], cost_type: str = "length"
+) -> Dict[str, float]:
+    """Load the computational cost of each utterance from the shape files.
+
+    The cost is the sum of the lengths (or the squared lengths, which is closer
+    to the cost of the self-attention) of all the inputs of the utterance.
+
+    Args:
+        shape_files: The shape files, e.g. speech_shape and text_shape.
+        cost_type: "length" or "squared_length".
+    Returns:
+        The mapping from the utterance id to the cost.
+
+    """
+    assert check_argument_types()
+    if cost_type not in SHARD_COSTS:
+        raise ValueError(f"cost_type must be one of {SHARD_COSTS}: {cost_type}")
+    if len(shape_files) == 0:
+        raise RuntimeError("The shape files are required to estimate the costs")
+    power = 2 if cost_type == "squared_length" else 1
+    utt2shapes = [load_num_sequence_text(s, loader_type="csv_int") for s in shape_files]
+    return {k: float(sum(d[k][0] ** power for d in utt2shapes)) for k in utt2shapes[0]}
+
+
+def balanced_partition(costs: Sequence[float], num_parts: int) -> List[List[int]]:
+    """Partition the items into the parts with balanced total costs.
+
+    The items are assigned in the descending order of the cost to the part
+    having the smallest total cost so far (Longest Processing Time first).
+    Every part gets at least one item if len(costs) >= num_parts, and the result
+    is deterministic, so all the ranks derive the same partition.
+
+    Examples:
+        >>> balanced_partition([8, 7, 6, 5, 4], 2)
+        [[0, 3, 4], [1, 2]]
+
+    """
+    order = sorted(range(len(costs)), key=lambda i: (-costs[i], i))
+    # (total cost, number of items, part index)
+    heap = [(0.0, 0, p) for p in range(num_parts)]
+    parts = [[] for _ in range(num_parts)]
+    for i in order:
+        load, num, p = heapq.heappop(heap)
+        parts[p].append(i)
+        heapq.heappush(heap, (load + costs[i], num + 1, p))
+    # Keep the original order, e.g. sorted by length, in each part
+    return [sorted(part) for part in parts]
+
+
+def shard_batches(
+    batches: Sequence[Tuple[str, ...]],
+    world_size: int,
+    shard_type: str = "stride",
+    utt2cost: Dict[str, float] = None,
+) -> List[List[Tuple[str, ...]]]:
+    """Split each mini-batch into world_size sub-batches.
+
+    Args:
+        batches: The mini-batches over all the ranks.
+        world_size: The number of ranks.
+        shard_type: "stride" takes batch[rank::world_size], which gives the
+            longest utterance of every length-sorted batch to rank 0. "balanced"
+            balances the total cost of the sub-batches by balanced_partition().
+        utt2cost: The cost of each utterance. Required for shard_type="balanced".
+    Returns:
+        The sub-batches of each rank: (world_size, len(batches))
+
+    """
+    if shard_type not in SHARD_TYPES:
+        raise ValueError(f"shard_type must be one of {SHARD_TYPES}: {shard_type}")
+    for batch in batches:
+        if len(batch) < world_size:
+            raise RuntimeError(
+                f"The batch-size must be equal or more than world_size: "
+                f"{len(batch)} < {world_size}"
+            )
+
+    if shard_type == "stride":
+        return [
+            [batch[rank::world_size] for batch in batches] for rank in range(world_size)
+        ]
+
+    if utt2cost is None:
+        raise RuntimeError('utt2cost is required for shard_type="balanced"')
+    shards = [[] for _ in range(world_size)]
+    for batch in batches:
+        parts = balanced_partition([utt2cost[k] for k in batch], world_size)
+        for rank, part in enumerate(parts):
+            shards[rank].append(tuple(batch[i] for i in part))
+    return shards
+
+
+def load_imbalance(
+    shards: Sequence[Sequence[Tuple[str, ...]]], utt2cost: Dict[str, float]
+) -> Dict[str, float]:
+    """Summarize the load imbalance among the ranks.
+
+    As every step waits for the slowest rank, the cost of a step is the maximum
+    of the costs of the ranks, and the straggler overhead is the ratio of the
+    total of the maxima to the total of the means minus one.
+
+    Returns:
+        mean_imbalance: Mean of max / mean of the rank costs over the steps.
+        max_imbalance: Max of max / mean of the rank costs over the steps.
+        straggler_overhead: sum(max) / sum(mean) - 1 over the steps.
+
+    """
+    # loads: (world_size, num_batches)
+    loads = np.array(
+        [[sum(utt2cost[k] for k in batch) for batch in shard] for shard in shards],
+        dtype=np.float64,
+    )
+    if loads.size == 0:
+        return dict(mean_imbalance=1.0, max_imbalance=1.0, straggler_overhead=0.0)
+    max_loads = loads.max(axis=0)
+    mean_loads = np.maximum(loads.mean(axis=0), 1e-10)
+    ratios = max_loads / mean_loads
+    return dict(
+        mean_imbalance=float(ratios.mean()),
+        max_imbalance=float(ratios.max()),
+        straggler_overhead=float(max_loads.sum() / mean_loads.sum() - 1.0),
+    )
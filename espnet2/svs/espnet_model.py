@@ -1059,3 +1059,222 @@ class ESPnetSVSModel(AbsESPnetModel):
             output_dict.update(feat_gen_denorm=feat_gen_denorm)
 
         return output_dict
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        singing: Optional[torch.Tensor] = None,
+        singing_lengths: Optional[torch.Tensor] = None,
+        # label
+        label: Optional[torch.Tensor] = None,
+        label_lengths: Optional[torch.Tensor] = None,
+        label_lab: Optional[torch.Tensor] = None,
+        label_lab_lengths: Optional[torch.Tensor] = None,
+        label_score: Optional[torch.Tensor] = None,
+        label_score_lengths: Optional[torch.Tensor] = None,
+        phn_cnt: Optional[torch.Tensor] = None,
+        phn_cnt_lengths: Optional[torch.Tensor] = None,
+        # midi
+        midi: Optional[torch.Tensor] = None,
+        midi_lengths: Optional[torch.Tensor] = None,
+        midi_lab: Optional[torch.Tensor] = None,
+        midi_lab_lengths: Optional[torch.Tensor] = None,
+        midi_score: Optional[torch.Tensor] = None,
+        midi_score_lengths: Optional[torch.Tensor] = None,
+        # tempo
+        tempo_lab: Optional[torch.Tensor] = None,
+        tempo_lab_lengths: Optional[torch.Tensor] = None,
+        tempo_score: Optional[torch.Tensor] = None,
+        tempo_score_lengths: Optional[torch.Tensor] = None,
+        # beat
+        beat_phn: Optional[torch.Tensor] = None,
+        beat_phn_lengths: Optional[torch.Tensor] = None,
+        beat_ruled_phn: Optional[torch.Tensor] = None,
+        beat_ruled_phn_lengths: Optional[torch.Tensor] = None,
+        beat_syb: Optional[torch.Tensor] = None,
+        beat_syb_lengths: Optional[torch.Tensor] = None,
+        beat_lab: Optional[torch.Tensor] = None,
+        beat_lab_lengths: Optional[torch.Tensor] = None,
+        beat_score_phn: Optional[torch.Tensor] = None,
+        beat_score_phn_lengths: Optional[torch.Tensor] = None,
+        beat_score_syb: Optional[torch.Tensor] = None,
+        beat_score_syb_lengths: Optional[torch.Tensor] = None,
+        pitch: Optional[torch.Tensor] = None,
+        pitch_lengths: Optional[torch.Tensor] = None,
+        energy: Optional[torch.Tensor] = None,
+        energy_lengths: Optional[torch.Tensor] = None,
+        spembs: Optional[torch.Tensor] = None,
+        sids: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        **decode_config,
+    ) -> Dict[str, torch.Tensor]:
+        """Calculate features of a batch of scores and return them as a dict.
+
+        The inputs are the padded mini-batch made by the collate function, the same
+        as forward. This is only available for the non-autoregressive models which
+        implement ``batch_inference``, e.g. XiaoiceSing and VITS, with the syllable
+        level score features.
+
+        Args:
+            text (Tensor): Text index tensor (B, T_text).
+            text_lengths (Tensor): Text length tensor (B,).
+            singing (Optional[Tensor]): Not used in the inference.
+            singing_lengths (Optional[Tensor]): Not used in the inference.
+            label (Option[Tensor]): Label tensor (B, T_label).
+            label_lengths (Optional[Tensor]): Label length tensor (B,).
+            label_lab (Optional[Tensor]): Label tensor (B, T_wav).
+            label_lab_lengths (Optional[Tensor]): Label length tensor (B,).
+            label_score (Optional[Tensor]): Label tensor (B, T_score).
+            label_score_lengths (Optional[Tensor]): Label length tensor (B,).
+            phn_cnt (Optional[Tensor]): Number of phones in each syllable (B, T_syb)
+            phn_cnt_lengths (Optional[Tensor]): Number of syllables (B,).
+            midi (Option[Tensor]): Midi tensor (B, T_label).
+            midi_lengths (Optional[Tensor]): Midi length tensor (B,).
+            midi_lab (Optional[Tensor]): Midi tensor (B, T_wav).
+            midi_lab_lengths (Optional[Tensor]): Midi length tensor (B,).
+            midi_score (Optional[Tensor]): Midi tensor (B, T_score).
+            midi_score_lengths (Optional[Tensor]): Midi length tensor (B,).
+            tempo_lab (Optional[Tensor]): Tempo tensor (B, T_wav).
+            tempo_lab_lengths (Optional[Tensor]): Tempo length tensor (B,).
+            tempo_score (Optional[Tensor]): Tempo tensor (B, T_score).
+            tempo_score_lengths (Optional[Tensor]): Tempo length tensor (B,).
+            beat_phn (Optional[Tensor]): Beat tensor (B, T_label).
+            beat_phn_lengths (Optional[Tensor]): Beat length tensor (B,).
+            beat_ruled_phn (Optional[Tensor]): Beat tensor (B, T_phone).
+            beat_ruled_phn_lengths (Optional[Tensor]): Beat length tensor (B,).
+            beat_syb (Optional[Tensor]): Beat tensor (B, T_phone).
+            beat_syb_lengths (Optional[Tensor]): Beat length tensor (B,).
+            beat_lab (Optional[Tensor]): Beat tensor (B, T_wav).
+            beat_lab_lengths (Optional[Tensor]): Beat length tensor (B,).
+            beat_score_phn (Optional[Tensor]): Beat tensor (B, T_score).
+            beat_score_phn_lengths (Optional[Tensor]): Beat length tensor (B,).
+            beat_score_syb (Optional[Tensor]): Beat tensor (B, T_score).
+            beat_score_syb_lengths (Optional[Tensor]): Beat length tensor (B,).
+            pitch (Optional[Tensor]): Pitch tensor (B, T_wav).
+            pitch_lengths (Optional[Tensor]): Pitch length tensor (B,).
+            energy (Optional[Tensor]): Not used in the inference.
+            energy_lengths (Optional[Tensor]): Not used in the inference.
+            spembs (Optional[Tensor]): Speaker embedding tensor (B, D).
+            sids (Optional[Tensor]): Speaker ID tensor (B, 1).
+            lids (Optional[Tensor]): Language ID tensor (B, 1).
+
+        Returns:
+            Dict[str, Tensor]: Dict of padded outputs. The length of each output
+                is given as "{name}_lengths" (B,) if it is a sequence.
+
+        """
+        if not isinstance(self.score_feats_extract, SyllableScoreFeats):
+            raise NotImplementedError(
+                "batch inference is only supported for SyllableScoreFeats"
+            )
+
+        extractMethod_frame = FrameScoreFeats(
+            fs=self.score_feats_extract.fs,
+            n_fft=self.score_feats_extract.n_fft,
+            win_length=self.score_feats_extract.win_length,
+            hop_length=self.score_feats_extract.hop_length,
+            window=self.score_feats_extract.window,
+            center=self.score_feats_extract.center,
+        )
+        (
+            labelFrame_lab,
+            labelFrame_lab_lengths,
+            midiFrame_lab,
+            midiFrame_lab_lengths,
+            _,
+            _,
+            beatFrame_lab,
+            _,
+        ) = extractMethod_frame(
+            label=label_lab.unsqueeze(-1),
+            label_lengths=label_lab_lengths,
+            midi=midi_lab.unsqueeze(-1),
+            midi_lengths=midi_lab_lengths,
+            tempo=tempo_lab.unsqueeze(-1),
+            tempo_lengths=tempo_lab_lengths,
+            beat=beat_lab.unsqueeze(-1),
+            beat_lengths=beat_lab_lengths,
+        )
+
+        # calculate durations of each song, which is the only sequential part
+        ds = []
+        ds_syb = []
+        for i in range(text.size(0)):
+            frame_length = int(labelFrame_lab_lengths[i])
+            _phoneFrame = labelFrame_lab[i, :frame_length]
+            _midiFrame = midiFrame_lab[i, :frame_length]
+            _beatFrame = beatFrame_lab[i, :frame_length]
+
+            # Clean _phoneFrame & _midiFrame
+            frame_length -= int(((_phoneFrame == 0) & (_midiFrame == 0)).sum())
+
+            syllable_length = int(label_lengths[i])
+            ds_tmp = cal_ds(
+                syllable_length,
+                label[i, :syllable_length],
+                midi[i, :syllable_length],
+                beat_phn[i, :syllable_length],
+                frame_length,
+                _phoneFrame,
+                _midiFrame,
+                _beatFrame,
+            )
+            assert sum(ds_tmp) == frame_length
+            ds.append(torch.tensor(ds_tmp))
+            ds_syb.append(torch.tensor(cal_ds_syb(ds_tmp, phn_cnt[i])))
+        ds = pad_list(ds, pad_value=0).to(label_lab.device)
+        ds_syb = pad_list(ds_syb, pad_value=0).to(label_lab.device)
+
+        # Remove unused paddings at end
+        max_len = label_lengths.max()
+        label = label[:, :max_len].to(dtype=torch.long)
+        midi = midi[:, :max_len].to(dtype=torch.long)
+        input_dict = dict(
+            text=text,
+            text_lengths=text_lengths,
+            label=dict(lab=label, score=label),
+            label_lengths=dict(lab=label_lengths, score=label_lengths),
+            melody=dict(lab=midi, score=midi),
+            melody_lengths=dict(lab=midi_lengths, score=midi_lengths),
+            tempo=dict(
+                lab=tempo_lab[:, :max_len].to(dtype=torch.long),
+                score=tempo_score[:, :max_len].to(dtype=torch.long),
+            ),
+            tempo_lengths=dict(lab=label_lengths, score=label_lengths),
+            beat=dict(
+                lab=beat_phn[:, : beat_phn_lengths.max()].to(dtype=torch.long),
+                score_phn=beat_ruled_phn[:, : beat_ruled_phn_lengths.max()].to(
+                    dtype=torch.long
+                ),
+                score_syb=beat_syb[:, : beat_syb_lengths.max()].to(dtype=torch.long),
+            ),
+            beat_lengths=dict(
+                lab=beat_phn_lengths,
+                score_phn=beat_ruled_phn_lengths,
+                score_syb=beat_syb_lengths,
+            ),
+            duration=dict(phn=ds, syb=ds_syb),
+        )
+        if pitch is not None:
+            input_dict.update(pitch=pitch)
+        if spembs is not None:
+            input_dict.update(spembs=spembs)
+        if sids is not None:
+            input_dict.update(sids=sids)
+        if lids is not None:
+            input_dict.update(lids=lids)
+
+        output_dict = self.svs.batch_inference(**input_dict, **decode_config)
+
+        if self.normalize is not None and output_dict.get("feat_gen") is not None:
+            # NOTE: normalize.inverse is in-place operation
+            feat_gen_denorm, _ = self.normalize.inverse(
+                output_dict["feat_gen"].clone(), output_dict["feat_gen_lengths"]
+            )
+            output_dict.update(
+                feat_gen_denorm=feat_gen_denorm,
+                feat_gen_denorm_lengths=output_dict["feat_gen_lengths"],
+            )
+
+        return output_dict
@@ -553,6 +553,7 @@ class XiaoiceSing(AbsSVS):
         spembs: Optional[torch.Tensor] = None,
         sids: Optional[torch.Tensor] = None,
         lids: Optional[torch.Tensor] = None,
+        use_teacher_forcing: bool = False,
     ) -> Dict[str, torch.Tensor]:
         """Generate the sequence of features given the sequences of characters.
 
@@ -574,12 +575,11 @@ class XiaoiceSing(AbsSVS):
             spembs (Optional[Tensor]): Speaker embedding (spk_embed_dim,).
             sids (Optional[Tensor]): Speaker ID (1,).
             lids (Optional[Tensor]): Language ID (1,).
-            alpha (float): Alpha to control the speed.
+            use_teacher_forcing (bool): Not used, teacher forcing is not supported.
 
         Returns:
             Dict[str, Tensor]: Output dict including the following items:
                 * feat_gen (Tensor): Output sequence of features (T_feats, odim).
-                * duration (Tensor): Duration sequence (T_text + 1,).
         """
 
         label = label["score"]
@@ -635,7 +635,166 @@ class XiaoiceSing(AbsSVS):
                 before_outs.transpose(1, 2)
             ).transpose(1, 2)
 
-        return after_outs, None, None
+        return dict(
+            feat_gen=after_outs[0], prob=None, att_w=None
+        )  # outs, probs, att_ws
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        label: Optional[Dict[str, torch.Tensor]] = None,
+        label_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        melody: Optional[Dict[str, torch.Tensor]] = None,
+        melody_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        tempo: Optional[Dict[str, torch.Tensor]] = None,
+        tempo_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        beat: Optional[Dict[str, torch.Tensor]] = None,
+        beat_lengths: Optional[Dict[str, torch.Tensor]] = None,
+        pitch: Optional[torch.Tensor] = None,
+        duration: Optional[Dict[str, torch.Tensor]] = None,
+        spembs: Optional[torch.Tensor] = None,
+        sids: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        use_teacher_forcing: bool = False,
+    ) -> Dict[str, torch.Tensor]:
+        """Generate the features of a batch of padded scores at once.
+
+        Args:
+            text (LongTensor): Batch of padded character ids (B, T_text).
+            text_lengths (LongTensor): Batch of lengths of each input (B,).
+            label (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of padded label ids (B, Tmax).
+            label_lengths (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of the lengths of padded label ids (B, ).
+            melody (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of padded melody (B, Tmax).
+            melody_lengths (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of the lengths of padded melody (B, ).
+            tempo (Optional[Dict]): key is "lab" or "score";
+                value (LongTensor): Batch of padded tempo (B, Tmax).
+            tempo_lengths (Optional[Dict]):  key is "lab" or "score";
+                value (LongTensor): Batch of the lengths of padded tempo (B, ).
+            beat (Optional[Dict]): key is "lab", "score_phn" or "score_syb";
+                value (LongTensor): Batch of padded beat (B, Tmax).
+            beat_length (Optional[Dict]): key is "lab", "score_phn" or "score_syb";
+                value (LongTensor): Batch of the lengths of padded beat (B, ).
+            pitch (FloatTensor): Batch of padded f0 (B, Tmax).
+            duration (Optional[Dict]): key is "phn", "syb";
+                value (LongTensor): Batch of padded beat (B, Tmax).
+            spembs (Optional[Tensor]): Batch of speaker embeddings (B, spk_embed_dim).
+            sids (Optional[Tensor]): Batch of speaker IDs (B, 1).
+            lids (Optional[Tensor]): Batch of language IDs (B, 1).
+            use_teacher_forcing (bool): Must be false, teacher forcing is not
+                supported in batch inference.
+
+        Returns:
+            Dict[str, Tensor]: Output dict including the following items:
+                * feat_gen (Tensor): Padded output features (B, T_feats, odim).
+                * feat_gen_lengths (LongTensor): Output lengths (B,).
+                * duration (Tensor): Padded durations (B, T_text).
+                * duration_lengths (LongTensor): Input lengths (B,).
+        """
+        if use_teacher_forcing:
+            raise NotImplementedError("teacher forcing is not supported in batch")
+
+        label_lengths = label_lengths["score"]
+        label = label["score"][:, : label_lengths.max()]
+        midi = melody["score"][:, : label_lengths.max()]
+        tempo = beat["score_syb"][:, : label_lengths.max()]
+
+        label_emb = self.phone_encode_layer(label)
+        midi_emb = self.midi_encode_layer(midi)
+        tempo_emb = self.tempo_encode_layer(tempo)
+        input_emb = label_emb + midi_emb + tempo_emb
+
+        x_masks = self._source_mask(label_lengths)
+        hs, _ = self.encoder(input_emb, x_masks)  # (B, T_text, adim)
+
+        # integrate with SID and LID embeddings
+        if self.spks is not None:
+            sid_embs = self.sid_emb(sids.view(-1))
+            hs = hs + sid_embs.unsqueeze(1)
+        if self.langs is not None:
+            lid_embs = self.lid_emb(lids.view(-1))
+            hs = hs + lid_embs.unsqueeze(1)
+
+        # integrate speaker embedding
+        if self.spk_embed_dim is not None:
+            hs = self._integrate_with_spk_embed(hs, spembs)
+
+        # forward duration predictor and length regulator
+        # NOTE: The padded frames are zeroed before each convolution so that the
+        #   outputs are the same as those of inference() for each song
+        d_masks = make_pad_mask(label_lengths).to(input_emb.device)
+        d_outs = self._forward_masked_convs(
+            self.duration_predictor.conv, hs.transpose(1, 2), d_masks
+        )  # (B, C, T_text)
+        d_outs = self.duration_predictor.linear(d_outs.transpose(1, 2)).squeeze(-1)
+        d_outs = torch.clamp(
+            torch.round(d_outs.exp() - self.duration_predictor.offset), min=0
+        ).masked_fill(
+            d_masks, 0.0
+        )  # (B, T_text)
+        d_outs_int = torch.floor(d_outs + 0.5).to(dtype=torch.long)  # (B, T_text)
+        # NOTE: LengthRegulator fills the all-0 durations with 1 only if all the
+        #   songs in the batch have them, so apply it to each song here instead
+        zero_songs = d_outs_int.sum(dim=1).eq(0)
+        if zero_songs.any():
+            logging.warning(
+                "predicted durations includes all 0 sequences. "
+                "fill the elements with 1."
+            )
+            d_outs_int = d_outs_int.masked_fill(zero_songs.unsqueeze(1) & ~d_masks, 1)
+        hs = self.length_regulator(hs, d_outs_int)  # (B, T_feats, adim)
+        olens = d_outs_int.sum(dim=1)
+
+        # forward decoder with the masks of the padded frames
+        h_masks = self._source_mask(olens)
+        zs, _ = self.decoder(hs, h_masks)  # (B, T_feats, adim)
+        before_outs = self.feat_out(zs).view(
+            zs.size(0), -1, self.odim
+        )  # (B, T_feats, odim)
+        feat_gen_lengths = olens * self.reduction_factor
+        before_outs = before_outs.masked_fill(
+            make_pad_mask(feat_gen_lengths, before_outs, 1), 0.0
+        )
+
+        # postnet -> (B, Lmax//r * r, odim)
+        if self.postnet is None:
+            after_outs = before_outs
+        else:
+            after_outs = before_outs + self._forward_masked_convs(
+                self.postnet.postnet,
+                before_outs.transpose(1, 2),
+                make_pad_mask(feat_gen_lengths).to(before_outs.device),
+            ).transpose(1, 2)
+
+        return dict(
+            feat_gen=after_outs,
+            feat_gen_lengths=feat_gen_lengths,
+            duration=d_outs_int,
+            duration_lengths=label_lengths,
+        )
+
+    @staticmethod
+    def _forward_masked_convs(
+        layers: torch.nn.ModuleList, xs: torch.Tensor, masks: torch.Tensor
+    ) -> torch.Tensor:
+        """Apply the convolution layers with the padded frames zeroed.
+
+        Args:
+            layers (ModuleList): Convolution layers.
+            xs (Tensor): Batch of padded input sequences (B, C, T).
+            masks (Tensor): Batch of masks indicating padded part (B, T).
+
+        Returns:
+            Tensor: Batch of padded output sequences (B, C', T).
+        """
+        masks = masks.unsqueeze(1)
+        for f in layers:
+            xs = f(xs.masked_fill(masks, 0.0))
+        return xs
 
     def _integrate_with_spk_embed(
         self, hs: torch.Tensor, spembs: torch.Tensor
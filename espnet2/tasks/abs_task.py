@@ -27,6 +27,13 @@ from espnet2.iterators.multiple_iter_factory import MultipleIterFactory
 from espnet2.iterators.sequence_iter_factory import SequenceIterFactory
 from espnet2.main_funcs.collect_stats import collect_stats
 from espnet2.optimizers.sgd import SGD
+from espnet2.samplers.batch_sharding import (
+    SHARD_COSTS,
+    SHARD_TYPES,
+    load_imbalance,
+    load_utt2cost,
+    shard_batches,
+)
 from espnet2.samplers.build_batch_sampler import BATCH_TYPES, build_batch_sampler
 from espnet2.samplers.unsorted_batch_sampler import UnsortedBatchSampler
 from espnet2.schedulers.noam_lr import NoamLR
@@ -320,6 +327,28 @@ class AbsTask(ABC):
             default=1,
             help="The number of workers used for DataLoader",
         )
+        group.add_argument(
+            "--persistent_workers",
+            type=str2bool,
+            default=False,
+            help="Keep the workers of DataLoader alive over the epochs. "
+            "This option makes sense only when iterator_type=sequence",
+        )
+        group.add_argument(
+            "--prefetch_factor",
+            type=int,
+            default=2,
+            help="The number of mini-batches loaded in advance by each worker. "
+            "This option makes sense only when iterator_type=sequence",
+        )
+        group.add_argument(
+            "--prefetch_batches",
+            type=int,
+            default=0,
+            help="The number of mini-batches transferred to the device in advance "
+            "on a side CUDA stream (or a background thread in CPU mode). "
+            "0 indicates the mini-batches are transferred synchronously",
+        )
         group.add_argument(
             "--num_att_plot",
             type=int,
@@ -501,6 +530,20 @@ class AbsTask(ABC):
             default=0,
             help="The epoch interval to apply model averaging and save nbest models",
         )
+        group.add_argument(
+            "--snapshot_interval",
+            type=int,
+            default=0,
+            help="The iteration interval to save the intra-epoch snapshot, which is "
+            "written in a background thread and used by --resume to continue from "
+            "the middle of the epoch. 0 means no snapshot",
+        )
+        group.add_argument(
+            "--num_keep_snapshots",
+            type=int,
+            default=2,
+            help="The number of the latest intra-epoch snapshots to keep",
+        )
         group.add_argument(
             "--grad_clip",
             type=float,
@@ -726,6 +769,23 @@ class AbsTask(ABC):
             choices=["descending", "ascending"],
             help="Sort mini-batches by the sample lengths",
         )
+        group.add_argument(
+            "--batch_shard_type",
+            type=str,
+            default="stride",
+            choices=list(SHARD_TYPES),
+            help="How to split each mini-batch across the ranks in distributed "
+            'training. "stride": batch[rank::world_size]. "balanced": Balance the '
+            "total cost of the sub-batches estimated from the shape files",
+        )
+        group.add_argument(
+            "--batch_shard_cost",
+            type=str,
+            default="length",
+            choices=list(SHARD_COSTS),
+            help='The cost of an utterance for --batch_shard_type "balanced". '
+            '"squared_length" is closer to the cost of the self-attention',
+        )
         group.add_argument(
             "--multiple_iterator",
             type=str2bool,
@@ -1348,6 +1408,24 @@ class AbsTask(ABC):
             num_iters_per_epoch = args.num_iters_per_epoch
             train = True
 
+            # NOTE: The shape files have the original lengths, but the speed
+            #   perturbation on the fly makes an utterance longer by up to
+            #   1 / min(factors). Shrink the length-based batches accordingly.
+            factors = getattr(args, "speed_perturb_factors", None)
+            if factors and min(factors) < 1.0 and args.use_preprocessor:
+                if batch_type in ("numel", "length"):
+                    batch_bins = int(batch_bins * min(factors))
+                    logging.info(
+                        f"batch_bins is scaled for speed perturbation: "
+                        f"{args.batch_bins} -> {batch_bins}"
+                    )
+                elif batch_type == "folded":
+                    batch_size = max(int(batch_size * min(factors)), 1)
+                    logging.info(
+                        f"batch_size is scaled for speed perturbation: "
+                        f"{args.batch_size} -> {batch_size}"
+                    )
+
         elif mode == "valid":
             preprocess_fn = cls.build_preprocess_fn(args, train=False)
             collate_fn = cls.build_collate_fn(args, train=False)
@@ -1533,13 +1611,23 @@ class AbsTask(ABC):
         if iter_options.distributed:
             world_size = torch.distributed.get_world_size()
             rank = torch.distributed.get_rank()
-            for batch in batches:
-                if len(batch) < world_size:
-                    raise RuntimeError(
-                        f"The batch-size must be equal or more than world_size: "
-                        f"{len(batch)} < {world_size}"
+            utt2cost = None
+            if args.batch_shard_type == "balanced":
+                utt2cost = load_utt2cost(
+                    iter_options.shape_files, args.batch_shard_cost
+                )
+            shards = shard_batches(batches, world_size, args.batch_shard_type, utt2cost)
+            if utt2cost is not None:
+                for name, _shards in [
+                    ("stride", shard_batches(batches, world_size, "stride")),
+                    ("balanced", shards),
+                ]:
+                    stats = load_imbalance(_shards, utt2cost)
+                    logging.info(
+                        f"[{mode}] {name} sharding ({args.batch_shard_cost}): "
+                        + ", ".join(f"{k}={v:.3f}" for k, v in stats.items())
                     )
-            batches = [batch[rank::world_size] for batch in batches]
+            batches = shards[rank]
 
         return SequenceIterFactory(
             dataset=dataset,
@@ -1550,6 +1638,8 @@ class AbsTask(ABC):
             num_workers=args.num_workers,
             collate_fn=iter_options.collate_fn,
             pin_memory=args.ngpu > 0,
+            persistent_workers=args.persistent_workers,
+            prefetch_factor=args.prefetch_factor,
         )
 
     @classmethod
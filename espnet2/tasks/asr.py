@@ -347,6 +347,15 @@ class ASRTask(AbsTask):
             help="If len(noise) / len(speech) is smaller than this threshold during "
             "dynamic mixing, a warning will be displayed.",
         )
+        group.add_argument(
+            "--speed_perturb_factors",
+            type=float,
+            nargs="*",
+            default=None,
+            help="The speed perturbation factors applied on the fly, "
+            "e.g. --speed_perturb_factors 0.9 1.0 1.1. One of them is chosen "
+            "randomly for each utterance in training.",
+        )
 
         for class_choices in cls.class_choices_list:
             # Append --<name> and --<name>_conf.
@@ -406,6 +415,9 @@ class ASRTask(AbsTask):
                 speech_volume_normalize=args.speech_volume_normalize
                 if hasattr(args, "rir_scp")
                 else None,
+                speed_perturb_factors=args.speed_perturb_factors
+                if hasattr(args, "speed_perturb_factors")
+                else None,
                 **args.preprocessor_conf,
             )
         else:
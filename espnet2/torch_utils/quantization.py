@@ -0,0 +1,104 @@
+"""Functions for the static quantization of the models for the CPU inference."""
+
+import logging
+from typing import Sequence
+
+import torch
+import torch.nn.intrinsic as nni
+import torch.quantization
+
+# Layers that are converted into int8 and their fused counterparts with ReLU
+_FUSED_RELU = {
+    "Linear": (torch.nn.Linear, nni.LinearReLU),
+    "Conv1d": (torch.nn.Conv1d, nni.ConvReLU1d),
+    "Conv2d": (torch.nn.Conv2d, nni.ConvReLU2d),
+}
+
+
+def prepare_static_quantization(
+    model: torch.nn.Module,
+    modules: Sequence[str] = ("Linear", "Conv1d", "Conv2d"),
+    backend: str = "fbgemm",
+) -> torch.nn.Module:
+    """Insert the observers for the static quantization in place.
+
+    Each layer of the given types is wrapped with the quantization of its input
+    and the dequantization of its output, so that the layer runs in int8 with
+    the quantization parameters observed during the calibration. The other
+    operations, e.g., the attention matmuls, the normalizations and the residual
+    connections, remain in float. The layers followed by ReLU in nn.Sequential,
+    e.g., Conv2dSubsampling, are fused with ReLU beforehand.
+
+    Usage:
+        >>> prepare_static_quantization(model.encoder)
+        >>> for speech, speech_lengths in calibration_data:
+        ...     model.encode(speech, speech_lengths)
+        >>> convert_static_quantization(model.encoder)
+
+    Args:
+        model (Module): Model to be quantized.
+        modules (Sequence[str]): Names of the layer types in torch.nn to be
+            quantized, selected from "Linear", "Conv1d", and "Conv2d".
+        backend (str): Quantization backend, e.g., "fbgemm" for x86 and
+            "qnnpack" for ARM.
+
+    Returns:
+        Module: The model with the observers in the evaluation mode.
+
+    """
+    for m in modules:
+        if m not in _FUSED_RELU:
+            raise ValueError(
+                f"{m} is not supported for static quantization: {list(_FUSED_RELU)}"
+            )
+    torch.backends.quantized.engine = backend
+    model.eval()
+    layer_types = tuple(_FUSED_RELU[m][0] for m in modules)
+    for sequential in list(model.modules()):
+        if isinstance(sequential, torch.nn.Sequential):
+            _fuse_relu(sequential, layer_types)
+    qconfig = torch.quantization.get_default_qconfig(backend)
+    types = tuple(t for m in modules for t in _FUSED_RELU[m])
+    num_layers = _wrap_layers(model, types, qconfig)
+    logging.info(f"{num_layers} layers are prepared for static quantization.")
+    return torch.quantization.prepare(model, inplace=True)
+
+
+def convert_static_quantization(model: torch.nn.Module) -> torch.nn.Module:
+    """Convert the calibrated model into int8 in place.
+
+    Args:
+        model (Module): Model prepared by prepare_static_quantization and
+            calibrated with some inputs.
+
+    Returns:
+        Module: The quantized model.
+
+    """
+    return torch.quantization.convert(model, inplace=True)
+
+
+def _fuse_relu(sequential: torch.nn.Sequential, types: tuple):
+    if isinstance(sequential, nni._FusedModule):
+        return
+    names = list(sequential._modules)
+    fused = [
+        [names[i], names[i + 1]]
+        for i in range(len(names) - 1)
+        if type(sequential[i]) in types and type(sequential[i + 1]) is torch.nn.ReLU
+    ]
+    if len(fused) > 0:
+        torch.quantization.fuse_modules(sequential, fused, inplace=True)
+
+
+def _wrap_layers(module: torch.nn.Module, types: tuple, qconfig) -> int:
+    num_layers = 0
+    for name, child in module.named_children():
+        if type(child) in types:
+            wrapper = torch.quantization.QuantWrapper(child)
+            wrapper.qconfig = qconfig
+            setattr(module, name, wrapper)
+            num_layers += 1
+        else:
+            num_layers += _wrap_layers(child, types, qconfig)
+    return num_layers
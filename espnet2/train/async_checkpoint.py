@@ -0,0 +1,155 @@
+"""Intra-epoch snapshots written in a background thread."""
+import copy
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import torch
+from typeguard import check_argument_types
+
+SNAPSHOT_PATTERN = re.compile(r"snapshot\.(\d+)epoch\.(\d+)iter\.pth")
+
+
+def snapshot_to_cpu(obj: Any, pin_memory: bool = False) -> Any:
+    """Copy the tensors in the nested container to the CPU memory.
+
+    Unlike to_device(), the CPU tensors are also copied, so that the snapshot is
+    not changed by the following training steps while it is being written.
+    """
+    if isinstance(obj, torch.Tensor):
+        if pin_memory and obj.is_cuda:
+            buf = torch.empty_like(obj, device="cpu").pin_memory()
+            return buf.copy_(obj.detach(), non_blocking=True)
+        return obj.detach().to("cpu", copy=True)
+    elif isinstance(obj, dict):
+        return type(obj)((k, snapshot_to_cpu(v, pin_memory)) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)) and not hasattr(obj, "_fields"):
+        return type(obj)(snapshot_to_cpu(v, pin_memory) for v in obj)
+    else:
+        return copy.deepcopy(obj)
+
+
+def list_snapshots(snapshot_dir: Union[str, Path]) -> List[Path]:
+    """List the snapshots in the order of (epoch, iteration)."""
+    snapshot_dir = Path(snapshot_dir)
+    if not snapshot_dir.exists():
+        return []
+    snapshots = []
+    for p in snapshot_dir.iterdir():
+        m = SNAPSHOT_PATTERN.fullmatch(p.name)
+        if m is not None:
+            snapshots.append(((int(m.group(1)), int(m.group(2))), p))
+    return [p for _, p in sorted(snapshots)]
+
+
+class AsyncCheckpointSaver:
+    """Save the training states in a background thread.
+
+    save() copies the states to the (pinned) CPU memory and returns immediately,
+    and the copy is written to the disk by a background thread. At most one
+    write is in flight: save() waits for the previous write before starting a
+    new one. The old snapshots are removed so that num_keep snapshots remain.
+
+    Examples:
+        >>> saver = AsyncCheckpointSaver("exp/snapshots", num_keep=2)
+        >>> saver.save({"model": model.state_dict()}, epoch=1, iiter=1000)
+        >>> saver.wait()
+
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: Union[str, Path],
+        num_keep: int = 2,
+        pin_memory: bool = True,
+    ):
+        assert check_argument_types()
+        assert num_keep > 0, num_keep
+        self.snapshot_dir = Path(snapshot_dir)
+        self.num_keep = num_keep
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self._thread = None
+        self._error = None
+
+    def save(self, states: Dict[str, Any], epoch: int, iiter: int) -> Path:
+        self.wait()
+        states = snapshot_to_cpu(states, self.pin_memory)
+        if self.pin_memory:
+            # Wait for the non_blocking copies from the device
+            torch.cuda.synchronize()
+        path = self.snapshot_dir / f"snapshot.{epoch}epoch.{iiter}iter.pth"
+        self._thread = threading.Thread(
+            target=self._write, args=(states, path), daemon=True
+        )
+        self._thread.start()
+        return path
+
+    def _write(self, states: Dict[str, Any], path: Path):
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename it, so that an interrupted write
+            # never leaves a broken snapshot
+            tmp = path.with_name(path.name + ".tmp")
+            torch.save(states, tmp)
+            os.replace(tmp, path)
+            for p in list_snapshots(self.snapshot_dir)[: -self.num_keep]:
+                p.unlink()
+            logging.info(f"The snapshot was saved: {path}")
+        except Exception as e:
+            self._error = e
+
+    def wait(self):
+        """Wait for the write in flight and raise the error in it if any."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to save the snapshot") from error
+
+    def remove_all(self):
+        """Remove all the snapshots, e.g. after the checkpoint of the epoch."""
+        self.wait()
+        for p in list_snapshots(self.snapshot_dir):
+            p.unlink()
+
+    def iterate(
+        self,
+        iterator: Iterable,
+        get_states: Callable[[], Dict[str, Any]],
+        epoch: int,
+        interval: int,
+        start_iter: int = 0,
+        accum_grad: int = 1,
+    ) -> Iterator:
+        """Yield the mini-batches and take a snapshot every interval iterations.
+
+        When the (n + 1)-th mini-batch is requested, the n-th one has been
+        processed completely, so the snapshot taken here contains the states
+        after n iterations. The snapshot is taken only after the parameters are
+        updated, i.e. n is a multiple of accum_grad.
+
+        Args:
+            iterator: The mini-batches after start_iter iterations.
+            get_states: The function returning the states to be saved.
+            epoch: The current epoch.
+            interval: The number of iterations between the snapshots.
+            start_iter: The number of iterations which have been done.
+            accum_grad: The number of gradient accumulation.
+        """
+        iiter = start_iter
+        for batch in iterator:
+            if iiter > start_iter and iiter % interval == 0 and iiter % accum_grad == 0:
+                states = get_states()
+                states.update(epoch=epoch, iiter=iiter)
+                self.save(states, epoch, iiter)
+            yield batch
+            iiter += 1
+
+
+def find_latest_snapshot(snapshot_dir: Union[str, Path]) -> Optional[Path]:
+    snapshots = list_snapshots(snapshot_dir)
+    return snapshots[-1] if len(snapshots) > 0 else None
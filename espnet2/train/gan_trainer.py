@@ -18,7 +18,7 @@ from espnet2.schedulers.abs_scheduler import AbsBatchStepScheduler, AbsScheduler
 from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.recursive_op import recursive_average
 from espnet2.train.distributed_utils import DistributedOption
-from espnet2.train.reporter import SubReporter
+from espnet2.train.reporter import SubReporter, stats_to_host
 from espnet2.train.trainer import Trainer, TrainerOptions
 from espnet2.utils.build_dataclass import build_dataclass
 from espnet2.utils.types import str2bool
@@ -199,8 +199,6 @@ class GANTrainer(Trainer):
                         # automatically normalizes the gradient by world_size.
                         loss *= torch.distributed.get_world_size()
 
-                reporter.register(stats, weight)
-
                 with reporter.measure_time(f"{turn}_backward_time"):
                     if scaler is not None:
                         # Scales loss.  Calls backward() on scaled loss
@@ -272,6 +270,11 @@ class GANTrainer(Trainer):
                     #   the gradient of both optimizers after every update.
                     optimizer.zero_grad()
 
+                # NOTE: The stats are registered after the update and copied to the
+                #   host at once, so that the device is not synchronized for each
+                #   value before the backward
+                reporter.register(*stats_to_host(stats, weight))
+
                 # Register lr and train/load time[sec/step],
                 # where step refers to accum_grad * mini-batch
                 reporter.register(
@@ -3,8 +3,10 @@ import logging
 import random
 import re
 from abc import ABC, abstractmethod
+from fractions import Fraction
+from functools import lru_cache
 from pathlib import Path
-from typing import Collection, Dict, Iterable, List, Union
+from typing import Collection, Dict, Iterable, List, Sequence, Union
 
 import numpy as np
 import scipy.signal
@@ -122,6 +124,41 @@ def detect_non_silence(
     )
 
 
+@lru_cache(maxsize=None)
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    # The same low-pass filter as designed in scipy.signal.resample_poly()
+    max_rate = max(up, down)
+    return scipy.signal.firwin(
+        2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0)
+    )
+
+
+def speed_perturb(x: np.ndarray, factor: float, axis: int = -1) -> np.ndarray:
+    """Change the speed of the signal by the polyphase resampling.
+
+    Like "sox speed", both of the tempo and the pitch are changed and the length
+    becomes len(x) / factor. The ratio is approximated by a fraction with the
+    denominator up to 100, and the filter is designed once for each ratio.
+
+    Args:
+        x: The signal.
+        factor: The speed factor, e.g. 0.9 makes the signal slower and longer.
+        axis: The time axis.
+    >>> x = np.random.randn(16000)
+    >>> speed_perturb(x, 0.9).shape
+    (17778,)
+    """
+    ratio = Fraction(factor).limit_denominator(100)
+    if ratio == 1:
+        return x
+    up, down = ratio.denominator, ratio.numerator
+    y = scipy.signal.resample_poly(
+        x, up, down, axis=axis, window=_resample_filter(up, down)
+    )
+    # Integer signals are returned as float to avoid the truncation
+    return y.astype(x.dtype, copy=False) if x.dtype.kind == "f" else y
+
+
 class CommonPreprocessor(AbsPreprocessor):
     def __init__(
         self,
@@ -145,6 +182,7 @@ class CommonPreprocessor(AbsPreprocessor):
         speech_name: str = "speech",
         text_name: str = "text",
         fs: int = 0,
+        speed_perturb_factors: Sequence[float] = None,
     ):
         super().__init__(train)
         self.train = train
@@ -154,6 +192,16 @@ class CommonPreprocessor(AbsPreprocessor):
         self.rir_apply_prob = rir_apply_prob
         self.noise_apply_prob = noise_apply_prob
         self.short_noise_thres = short_noise_thres
+        # NOTE: One of the factors is chosen for each utterance at each epoch,
+        #   instead of augmenting the dumped data by each of them
+        if train and speed_perturb_factors is not None:
+            if len(speed_perturb_factors) == 0 or min(speed_perturb_factors) <= 0:
+                raise ValueError(
+                    f"Invalid speed_perturb_factors: {speed_perturb_factors}"
+                )
+            self.speed_perturb_factors = list(speed_perturb_factors)
+        else:
+            self.speed_perturb_factors = None
 
         if token_type is not None:
             if token_list is None:
@@ -277,6 +325,13 @@ class CommonPreprocessor(AbsPreprocessor):
     ) -> Dict[str, Union[str, np.ndarray]]:
         assert check_argument_types()
         if self.speech_name in data:
+            if self.train and self.speed_perturb_factors is not None:
+                factor = np.random.choice(self.speed_perturb_factors)
+                # Time is the first axis: (Time,) or (Time, Nmic)
+                data[self.speech_name] = speed_perturb(
+                    data[self.speech_name], factor, axis=0
+                )
+
             if self.train and (self.rirs is not None or self.noises is not None):
                 speech = data[self.speech_name]
 
@@ -439,6 +494,7 @@ class CommonPreprocessor_multi(CommonPreprocessor):
         speech_name: str = "speech",
         text_name: List[str] = ["text"],
         fs: int = 0,
+        speed_perturb_factors: Sequence[float] = None,
     ):
         super().__init__(
             train=train,
@@ -460,6 +516,7 @@ class CommonPreprocessor_multi(CommonPreprocessor):
             speech_volume_normalize=speech_volume_normalize,
             speech_name=speech_name,
             fs=fs,
+            speed_perturb_factors=speed_perturb_factors,
         )
         if isinstance(text_name, str):
             self.text_name = [text_name]
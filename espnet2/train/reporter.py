@@ -41,6 +41,42 @@ def to_reported_value(v: Num, weight: Num = None) -> "ReportedValue":
     return retval
 
 
+def stats_to_host(
+    stats: Dict[str, Optional[Num]], weight: Num = None
+) -> Tuple[Dict[str, Optional[Num]], Num]:
+    """Copy the scalar tensors of the stats and the weight to the host at once.
+
+    Calling .item() for each value synchronizes the device every time, so the
+    tensors are stacked and converted with a single .tolist() instead.
+
+    Args:
+        stats: The stats given to SubReporter.register().
+        weight: The weight given to SubReporter.register().
+
+    Returns:
+        The stats and the weight whose tensors are replaced with Python floats.
+
+    """
+    keys = [k for k, v in stats.items() if isinstance(v, torch.Tensor)]
+    tensors = [stats[k] for k in keys]
+    if isinstance(weight, torch.Tensor):
+        tensors.append(weight)
+    if len(tensors) == 0:
+        return stats, weight
+    for v in tensors:
+        if v.numel() != 1:
+            raise ValueError(f"v must be 0 or 1 dimension: {len(v.shape)}")
+
+    device = tensors[0].device
+    values = torch.stack(
+        [v.detach().reshape(()).float().to(device) for v in tensors]
+    ).tolist()
+    if isinstance(weight, torch.Tensor):
+        weight = values.pop()
+    stats = dict(stats, **dict(zip(keys, values)))
+    return stats, weight
+
+
 def aggregate(values: Sequence["ReportedValue"]) -> Num:
     assert check_argument_types()
 
@@ -1,6 +1,7 @@
 """Trainer module."""
 import argparse
 import dataclasses
+import itertools
 import logging
 import time
 from contextlib import contextmanager
@@ -17,6 +18,8 @@ from packaging.version import parse as V
 from typeguard import check_argument_types
 
 from espnet2.iterators.abs_iter_factory import AbsIterFactory
+from espnet2.iterators.prefetch_iterator import PrefetchIterator
+from espnet2.iterators.sequence_iter_factory import SequenceIterFactory
 from espnet2.main_funcs.average_nbest_models import average_nbest_models
 from espnet2.main_funcs.calculate_all_attentions import calculate_all_attentions
 from espnet2.schedulers.abs_scheduler import (
@@ -30,6 +33,7 @@ from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.recursive_op import recursive_average
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.train.abs_espnet_model import AbsESPnetModel
+from espnet2.train.async_checkpoint import AsyncCheckpointSaver, find_latest_snapshot
 from espnet2.train.distributed_utils import DistributedOption
 from espnet2.train.reporter import Reporter, SubReporter
 from espnet2.utils.build_dataclass import build_dataclass
@@ -82,6 +86,9 @@ class TrainerOptions:
     unused_parameters: bool
     wandb_model_log_interval: int
     create_graph_in_tensorboard: bool
+    snapshot_interval: int
+    num_keep_snapshots: int
+    prefetch_batches: int
 
 
 class Trainer:
@@ -130,7 +137,11 @@ class Trainer:
         schedulers: Sequence[Optional[AbsScheduler]],
         scaler: Optional[GradScaler],
         ngpu: int = 0,
-    ):
+    ) -> int:
+        """Load the states and return the number of iterations done in the epoch.
+
+        The number of iterations is non-zero only for the intra-epoch snapshots.
+        """
         states = torch.load(
             checkpoint,
             map_location=f"cuda:{torch.cuda.current_device()}" if ngpu > 0 else "cpu",
@@ -149,6 +160,7 @@ class Trainer:
                 scaler.load_state_dict(states["scaler"])
 
         logging.info(f"The training was resumed using {checkpoint}")
+        return states.get("iiter", 0)
 
     @classmethod
     def run(
@@ -194,16 +206,53 @@ class Trainer:
         else:
             scaler = None
 
-        if trainer_options.resume and (output_dir / "checkpoint.pth").exists():
-            cls.resume(
-                checkpoint=output_dir / "checkpoint.pth",
-                model=model,
-                optimizers=optimizers,
-                schedulers=schedulers,
-                reporter=reporter,
-                scaler=scaler,
-                ngpu=trainer_options.ngpu,
-            )
+        # NOTE: The snapshots are removed after saving checkpoint.pth at the end of
+        #   each epoch, so the remaining snapshots are always newer than it.
+        snapshot_dir = output_dir / "snapshots"
+        start_iter = 0
+        if trainer_options.resume:
+            checkpoint = find_latest_snapshot(snapshot_dir)
+            if checkpoint is None:
+                checkpoint = output_dir / "checkpoint.pth"
+            if checkpoint.exists():
+                start_iter = cls.resume(
+                    checkpoint=checkpoint,
+                    model=model,
+                    optimizers=optimizers,
+                    schedulers=schedulers,
+                    reporter=reporter,
+                    scaler=scaler,
+                    ngpu=trainer_options.ngpu,
+                )
+
+        def get_states() -> Dict:
+            return {
+                "model": model.state_dict(),
+                "reporter": reporter.state_dict(),
+                "optimizers": [o.state_dict() for o in optimizers],
+                "schedulers": [
+                    s.state_dict() if s is not None else None for s in schedulers
+                ],
+                "scaler": scaler.state_dict() if scaler is not None else None,
+            }
+
+        def get_snapshot_states() -> Dict:
+            states = get_states()
+            # The current epoch is not finished yet in the intra-epoch snapshot
+            states["reporter"]["epoch"] -= 1
+            return states
+
+        saver = None
+        if trainer_options.snapshot_interval > 0 and (
+            not distributed_option.distributed or distributed_option.dist_rank == 0
+        ):
+            if trainer_options.sharded_ddp:
+                # NOTE: consolidate_state_dict() of OSS requires all the ranks
+                logging.warning("The snapshots are not supported with sharded_ddp")
+            else:
+                saver = AsyncCheckpointSaver(
+                    snapshot_dir, num_keep=trainer_options.num_keep_snapshots
+                )
 
         start_epoch = reporter.get_epoch() + 1
         if start_epoch == trainer_options.max_epoch + 1:
@@ -277,13 +326,42 @@ class Trainer:
             set_all_random_seed(trainer_options.seed + iepoch)
 
             reporter.set_epoch(iepoch)
+            # Skip the mini-batches done before the snapshot
+            if start_iter > 0:
+                logging.info(f"Skipping {start_iter} iterations of the snapshot")
+            if isinstance(train_iter_factory, SequenceIterFactory):
+                train_iter = train_iter_factory.build_iter(
+                    iepoch, start_iter=start_iter
+                )
+            else:
+                train_iter = itertools.islice(
+                    train_iter_factory.build_iter(iepoch), start_iter, None
+                )
+            if trainer_options.prefetch_batches > 0:
+                # NOTE: Wrap before the saver, which counts the consumed batches
+                train_iter = PrefetchIterator(
+                    train_iter,
+                    "cuda" if trainer_options.ngpu > 0 else "cpu",
+                    num_prefetch=trainer_options.prefetch_batches,
+                )
+            if saver is not None:
+                train_iter = saver.iterate(
+                    train_iter,
+                    get_snapshot_states,
+                    epoch=iepoch,
+                    interval=trainer_options.snapshot_interval,
+                    start_iter=start_iter,
+                    accum_grad=trainer_options.accum_grad,
+                )
+            start_iter = 0
+
             # 1. Train and validation for one-epoch
             with reporter.observe("train") as sub_reporter:
                 all_steps_are_invalid = cls.train_one_epoch(
                     model=dp_model,
                     optimizers=optimizers,
                     schedulers=schedulers,
-                    iterator=train_iter_factory.build_iter(iepoch),
+                    iterator=train_iter,
                     reporter=sub_reporter,
                     scaler=scaler,
                     summary_writer=train_summary_writer,
@@ -291,10 +369,17 @@ class Trainer:
                     distributed_option=distributed_option,
                 )
 
+            valid_iter = valid_iter_factory.build_iter(iepoch)
+            if trainer_options.prefetch_batches > 0:
+                valid_iter = PrefetchIterator(
+                    valid_iter,
+                    "cuda" if trainer_options.ngpu > 0 else "cpu",
+                    num_prefetch=trainer_options.prefetch_batches,
+                )
             with reporter.observe("valid") as sub_reporter:
                 cls.validate_one_epoch(
                     model=dp_model,
-                    iterator=valid_iter_factory.build_iter(iepoch),
+                    iterator=valid_iter,
                     reporter=sub_reporter,
                     options=trainer_options,
                     distributed_option=distributed_option,
@@ -337,19 +422,9 @@ class Trainer:
                     reporter.wandb_log()
 
                 # 4. Save/Update the checkpoint
-                torch.save(
-                    {
-                        "model": model.state_dict(),
-                        "reporter": reporter.state_dict(),
-                        "optimizers": [o.state_dict() for o in optimizers],
-                        "schedulers": [
-                            s.state_dict() if s is not None else None
-                            for s in schedulers
-                        ],
-                        "scaler": scaler.state_dict() if scaler is not None else None,
-                    },
-                    output_dir / "checkpoint.pth",
-                )
+                torch.save(get_states(), output_dir / "checkpoint.pth")
+                if saver is not None:
+                    saver.remove_all()
 
                 # 5. Save and log the model and update the link to the best model
                 torch.save(model.state_dict(), output_dir / f"{iepoch}epoch.pth")
@@ -511,7 +586,10 @@ class Trainer:
 
             batch["utt_id"] = utt_id
 
-            batch = to_device(batch, "cuda" if ngpu > 0 else "cpu")
+            # NOTE: iter_time + to_device_time is the time waiting for the data.
+            #   to_device_time is almost zero if --prefetch_batches > 0
+            with reporter.measure_time("to_device_time"):
+                batch = to_device(batch, "cuda" if ngpu > 0 else "cpu")
             if no_forward_run:
                 all_steps_are_invalid = False
                 continue
@@ -306,3 +306,51 @@ class ESPnetTTSModel(AbsESPnetModel):
             output_dict.update(feat_gen_denorm=feat_gen_denorm)
 
         return output_dict
+
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        spembs: Optional[torch.Tensor] = None,
+        sids: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        **decode_config,
+    ) -> Dict[str, torch.Tensor]:
+        """Calculate features of a batch of texts and return them as a dict.
+
+        This is only available for the non-autoregressive models which implement
+        ``batch_inference``, e.g. FastSpeech, FastSpeech2, VITS, and JETS.
+
+        Args:
+            text (Tensor): Padded text index tensor (B, T_text).
+            text_lengths (Tensor): Text length tensor (B,).
+            spembs (Optional[Tensor]): Speaker embedding tensor (B, D).
+            sids (Optional[Tensor]): Speaker ID tensor (B, 1).
+            lids (Optional[Tensor]): Language ID tensor (B, 1).
+
+        Returns:
+            Dict[str, Tensor]: Dict of padded outputs. The length of each output
+                is given as "{name}_lengths" (B,) if it is a sequence.
+
+        """
+        input_dict = dict(text=text, text_lengths=text_lengths)
+        if spembs is not None:
+            input_dict.update(spembs=spembs)
+        if sids is not None:
+            input_dict.update(sids=sids)
+        if lids is not None:
+            input_dict.update(lids=lids)
+
+        output_dict = self.tts.batch_inference(**input_dict, **decode_config)
+
+        if self.normalize is not None and output_dict.get("feat_gen") is not None:
+            # NOTE: normalize.inverse is in-place operation
+            feat_gen_denorm, _ = self.normalize.inverse(
+                output_dict["feat_gen"].clone(), output_dict["feat_gen_lengths"]
+            )
+            output_dict.update(
+                feat_gen_denorm=feat_gen_denorm,
+                feat_gen_denorm_lengths=output_dict["feat_gen_lengths"],
+            )
+
+        return output_dict
@@ -442,7 +442,8 @@ class FastSpeech(AbsTTS):
         d_masks = make_pad_mask(ilens).to(xs.device)
         if is_inference:
             d_outs = self.duration_predictor.inference(hs, d_masks)  # (B, T_text)
-            hs = self.length_regulator(hs, d_outs, alpha)  # (B, T_feats, adim)
+            ds = self._regulated_durations(d_outs, d_masks, alpha)
+            hs = self.length_regulator(hs, ds)  # (B, T_feats, adim)
         else:
             d_outs = self.duration_predictor(hs, d_masks)  # (B, T_text)
             hs = self.length_regulator(hs, ds)  # (B, T_feats, adim)
@@ -454,6 +455,9 @@ class FastSpeech(AbsTTS):
             else:
                 olens_in = olens
             h_masks = self._source_mask(olens_in)
+        elif is_inference and hs.size(0) > 1:
+            # mask the padded frames of the shorter sequences in batch inference
+            h_masks = self._source_mask(ds.sum(dim=1))
         else:
             h_masks = None
         zs, _ = self.decoder(hs, h_masks)  # (B, T_feats, adim)
@@ -641,6 +645,67 @@ class FastSpeech(AbsTTS):
 
         return dict(feat_gen=outs[0], duration=d_outs[0])
 
+    def batch_inference(
+        self,
+        text: torch.Tensor,
+        text_lengths: torch.Tensor,
+        spembs: Optional[torch.Tensor] = None,
+        sids: Optional[torch.Tensor] = None,
+        lids: Optional[torch.Tensor] = None,
+        alpha: float = 1.0,
+        use_teacher_forcing: bool = False,
+    ) -> Dict[str, torch.Tensor]:
+        """Generate the features of a batch of padded text sequences at once.
+
+        Args:
+            text (LongTensor): Batch of padded character ids (B, T_text).
+            text_lengths (LongTensor): Batch of lengths of each input (B,).
+            spembs (Optional[Tensor]): Batch of speaker embeddings (B, spk_embed_dim).
+            sids (Optional[Tensor]): Batch of speaker IDs (B, 1).
+            lids (Optional[Tensor]): Batch of language IDs (B, 1).
+            alpha (float): Alpha to control the speed.
+            use_teacher_forcing (bool): Must be false, the groundtruth of duration
+                is not supported in batch inference.
+
+        Returns:
+            Dict[str, Tensor]: Output dict including the following items:
+                * feat_gen (Tensor): Padded output features (B, T_feats, odim).
+                * feat_gen_lengths (LongTensor): Output lengths (B,).
+                * duration (Tensor): Padded durations (B, T_text + 1).
+                * duration_lengths (LongTensor): Input lengths with eos (B,).
+
+        """
+        if use_teacher_forcing:
+            raise NotImplementedError("teacher forcing is not supported in batch")
+        if self.use_gst:
+            raise NotImplementedError("GST is not supported in batch inference")
+
+        # add eos at the last of each sequence
+        xs = F.pad(text, [0, 1], "constant", self.padding_idx)
+        xs[torch.arange(xs.size(0)), text_lengths] = self.eos
+        ilens = text_lengths + 1
+
+        _, outs, d_outs = self._forward(
+            xs,
+            ilens,
+            spembs=spembs,
+            sids=sids,
+            lids=lids,
+            is_inference=True,
+            alpha=alpha,
+        )  # (B, T_feats, odim)
+        ds = self._regulated_durations(
+            d_outs, make_pad_mask(ilens).to(xs.device), alpha
+        )
+        olens = ds.sum(dim=1) * self.reduction_factor
+
+        return dict(
+            feat_gen=outs,
+            feat_gen_lengths=olens,
+            duration=d_outs,
+            duration_lengths=ilens,
+        )
+
     def _integrate_with_spk_embed(
         self, hs: torch.Tensor, spembs: torch.Tensor
     ) -> torch.Tensor:
@@ -688,6 +753,29 @@ class FastSpeech(AbsTTS):
         x_masks = make_non_pad_mask(ilens).to(next(self.parameters()).device)
         return x_masks.unsqueeze(-2)
 
+    def _regulated_durations(
+        self, ds: torch.Tensor, d_masks: torch.Tensor, alpha: float
+    ) -> torch.Tensor:
+        """Calculate the durations to expand the sequences in inference.
+
+        LengthRegulator fills the all-0 durations with 1 only if all the sequences
+        in the batch have them, so they are filled for each sequence here instead.
+        The durations are filled in place if alpha is 1, the same as
+        LengthRegulator.
+
+        Args:
+            ds (LongTensor): Batch of predicted durations (B, T_text).
+            d_masks (BoolTensor): Batch of masks of the padded part (B, T_text).
+            alpha (float): Alpha to control the speed.
+
+        Returns:
+            LongTensor: Batch of durations (B, T_text).
+
+        """
+        if alpha != 1.0:
+            ds = torch.round(ds.float() * alpha).long()
+        return ds.masked_fill_(ds.sum(dim=1).eq(0).unsqueeze(1) & ~d_masks, 1)
+
     def _reset_parameters(
         self, init_type: str, init_enc_alpha: float, init_dec_alpha: float
     ):
@@ -4,6 +4,7 @@
 """F0 extractor using DIO + Stonemask algorithm."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Tuple, Union
 
 import humanfriendly
@@ -15,6 +16,7 @@ from scipy.interpolate import interp1d
 from typeguard import check_argument_types
 
 from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.tts.utils.average_by_duration import average_by_duration
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 
 
@@ -29,7 +31,10 @@ class Dio(AbsFeatsExtract):
 
     Note:
         This module is based on NumPy implementation. Therefore, the computational graph
-        is not connected.
+        is not connected. Since pyworld releases the GIL, the utterances in a batch
+        can be processed in parallel with ``num_threads > 1``. To avoid the
+        extraction during training, dump the features in the statistics collection
+        (``--write_collected_feats true``) and give them as the "pitch" input.
 
     Todo:
         Replace this module with PyTorch-based implementation.
@@ -47,6 +52,7 @@ class Dio(AbsFeatsExtract):
         use_continuous_f0: bool = True,
         use_log_f0: bool = True,
         reduction_factor: int = None,
+        num_threads: int = 1,
     ):
         assert check_argument_types()
         super().__init__()
@@ -64,6 +70,7 @@ class Dio(AbsFeatsExtract):
         if use_token_averaged_f0:
             assert reduction_factor >= 1
         self.reduction_factor = reduction_factor
+        self.num_threads = num_threads
 
     def output_size(self) -> int:
         return 1
@@ -79,6 +86,7 @@ class Dio(AbsFeatsExtract):
             use_continuous_f0=self.use_continuous_f0,
             use_log_f0=self.use_log_f0,
             reduction_factor=self.reduction_factor,
+            num_threads=self.num_threads,
         )
 
     def forward(
@@ -96,7 +104,12 @@ class Dio(AbsFeatsExtract):
             )
 
         # F0 extraction
-        pitch = [self._calculate_f0(x[:xl]) for x, xl in zip(input, input_lengths)]
+        inputs = [x[:xl] for x, xl in zip(input, input_lengths)]
+        if self.num_threads > 1 and len(inputs) > 1:
+            with ThreadPoolExecutor(min(self.num_threads, len(inputs))) as executor:
+                pitch = list(executor.map(self._calculate_f0, inputs))
+        else:
+            pitch = [self._calculate_f0(x) for x in inputs]
 
         # (Optional): Adjust length to match with the mel-spectrogram
         if feats_lengths is not None:
@@ -105,19 +118,20 @@ class Dio(AbsFeatsExtract):
                 for p, fl in zip(pitch, feats_lengths)
             ]
 
+        pitch_lengths = input.new_tensor([len(p) for p in pitch], dtype=torch.long)
+
+        # Padding
+        pitch = pad_list(pitch, 0.0)
+
         # (Optional): Average by duration to calculate token-wise f0
         if self.use_token_averaged_f0:
             durations = durations * self.reduction_factor
-            pitch = [
-                self._average_by_duration(p, d).view(-1)
-                for p, d in zip(pitch, durations)
-            ]
+            assert (
+                (0 <= pitch_lengths - durations.sum(dim=1))
+                & (pitch_lengths - durations.sum(dim=1) < self.reduction_factor)
+            ).all()
+            pitch = average_by_duration(pitch, durations, only_positive=True)
             pitch_lengths = durations_lengths
-        else:
-            pitch_lengths = input.new_tensor([len(p) for p in pitch], dtype=torch.long)
-
-        # Padding
-        pitch = pad_list(pitch, 0.0)
 
         # Return with the shape (B, T, 1)
         return pitch.unsqueeze(-1), pitch_lengths
@@ -169,14 +183,3 @@ class Dio(AbsFeatsExtract):
         f0 = interp_fn(np.arange(0, f0.shape[0]))
 
         return f0
-
-    def _average_by_duration(self, x: torch.Tensor, d: torch.Tensor) -> torch.Tensor:
-        assert 0 <= len(x) - d.sum() < self.reduction_factor
-        d_cumsum = F.pad(d.cumsum(dim=0), (1, 0))
-        x_avg = [
-            x[start:end].masked_select(x[start:end].gt(0.0)).mean(dim=0)
-            if len(x[start:end].masked_select(x[start:end].gt(0.0))) != 0
-            else x.new_tensor(0.0)
-            for start, end in zip(d_cumsum[:-1], d_cumsum[1:])
-        ]
-        return torch.stack(x_avg)
@@ -12,6 +12,7 @@ from typeguard import check_argument_types
 
 from espnet2.layers.stft import Stft
 from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.tts.utils.average_by_duration import average_by_duration
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 
 
@@ -105,31 +106,23 @@ class Energy(AbsFeatsExtract):
             ]
             energy_lengths = feats_lengths
 
+        # Padding
+        if isinstance(energy, list):
+            energy = pad_list(energy, 0.0)
+
         # (Optional): Average by duration to calculate token-wise energy
         if self.use_token_averaged_energy:
             durations = durations * self.reduction_factor
-            energy = [
-                self._average_by_duration(e[:el].view(-1), d)
-                for e, el, d in zip(energy, energy_lengths, durations)
-            ]
+            assert (
+                (0 <= energy_lengths - durations.sum(dim=1))
+                & (energy_lengths - durations.sum(dim=1) < self.reduction_factor)
+            ).all()
+            energy = average_by_duration(energy, durations)
             energy_lengths = durations_lengths
 
-        # Padding
-        if isinstance(energy, list):
-            energy = pad_list(energy, 0.0)
-
         # Return with the shape (B, T, 1)
         return energy.unsqueeze(-1), energy_lengths
 
-    def _average_by_duration(self, x: torch.Tensor, d: torch.Tensor) -> torch.Tensor:
-        assert 0 <= len(x) - d.sum() < self.reduction_factor
-        d_cumsum = F.pad(d.cumsum(dim=0), (1, 0))
-        x_avg = [
-            x[start:end].mean() if len(x[start:end]) != 0 else x.new_tensor(0.0)
-            for start, end in zip(d_cumsum[:-1], d_cumsum[1:])
-        ]
-        return torch.stack(x_avg)
-
     @staticmethod
     def _adjust_num_frames(x: torch.Tensor, num_frames: torch.Tensor) -> torch.Tensor:
         if num_frames > len(x):
@@ -0,0 +1,51 @@
+"""Token-wise averaging of frame-level features for a padded batch."""
+
+import torch
+
+
+def average_by_duration(
+    xs: torch.Tensor, ds: torch.Tensor, only_positive: bool = False
+) -> torch.Tensor:
+    """Average frame-level values over the durations of each token.
+
+    The token index of each frame is obtained by searching the cumulative sum of
+    the durations, and the values are summed up per token with scatter_add, so
+    there is no loop over tokens or utterances.
+
+    Args:
+        xs (Tensor): Batch of padded frame-level values (B, T_feats).
+        ds (LongTensor): Batch of padded durations (B, T_text).
+            The frames after sum(ds[b]) are ignored.
+        only_positive (bool): Whether to average only the positive values,
+            e.g. to ignore the unvoiced frames of F0.
+
+    Returns:
+        Tensor: Batch of token-averaged values (B, T_text). The tokens having no
+            valid frames are filled with zero.
+
+    Examples:
+        >>> xs = torch.tensor([[1.0, 2.0, 3.0, 4.0, 5.0]])
+        >>> ds = torch.tensor([[2, 0, 3]])
+        >>> average_by_duration(xs, ds)
+        tensor([[1.5000, 0.0000, 4.0000]])
+
+    """
+    assert xs.dim() == 2 and ds.dim() == 2, (xs.shape, ds.shape)
+    batch_size, t_feats = xs.shape
+    t_text = ds.size(1)
+
+    # token_idx: (B, T_feats), the frames out of the durations point to T_text
+    d_cumsum = ds.long().cumsum(dim=1)
+    frame_idx = torch.arange(t_feats, device=xs.device)
+    token_idx = torch.searchsorted(
+        d_cumsum, frame_idx.expand(batch_size, -1).contiguous(), right=True
+    )
+
+    if only_positive:
+        mask = xs.gt(0.0).to(xs.dtype)
+    else:
+        mask = torch.ones_like(xs)
+    sums = xs.new_zeros(batch_size, t_text + 1).scatter_add_(1, token_idx, xs * mask)
+    counts = xs.new_zeros(batch_size, t_text + 1).scatter_add_(1, token_idx, mask)
+    sums, counts = sums[:, :t_text], counts[:, :t_text]
+    return torch.where(counts > 0, sums / counts.clamp(min=1.0), sums.new_zeros(1))
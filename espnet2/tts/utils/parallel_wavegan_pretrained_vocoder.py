@@ -3,14 +3,21 @@
 
 """Wrapper class for the vocoder model trained with parallel_wavegan repo."""
 
+import inspect
 import logging
 import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Tuple, Union
 
 import torch
 import yaml
 
+from espnet2.gan_tts.utils.chunked_inference import (
+    chunked_inference,
+    get_receptive_field,
+)
+from espnet.nets.pytorch_backend.nets_utils import pad_list
+
 
 class ParallelWaveGANPretrainedVocoder(torch.nn.Module):
     """Wrapper class to load the vocoder trained with parallel_wavegan repo."""
@@ -42,6 +49,8 @@ class ParallelWaveGANPretrainedVocoder(torch.nn.Module):
         self.normalize_before = False
         if hasattr(self.vocoder, "mean"):
             self.normalize_before = True
+        # NOTE: computed on the first call of _get_receptive_field()
+        self._receptive_field = None
 
     @torch.no_grad()
     def forward(self, feats: torch.Tensor) -> torch.Tensor:
@@ -58,3 +67,93 @@ class ParallelWaveGANPretrainedVocoder(torch.nn.Module):
             feats,
             normalize_before=self.normalize_before,
         ).view(-1)
+
+    @torch.no_grad()
+    def batch_forward(
+        self, feats: torch.Tensor, feats_lengths: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Generate a batch of waveforms from padded features.
+
+        The padded features are fed to the vocoder at once if it is conditioned
+        only on the features, e.g. MelGAN and HiFiGAN. Otherwise, e.g. in the case
+        of ParallelWaveGAN using the noise input, they are fed one by one. The
+        outputs are the same as those of forward() for each utterance.
+
+        Args:
+            feats (Tensor): Padded feature tensor (B, T_feats, #mels).
+            feats_lengths (LongTensor): Feature length tensor (B,).
+
+        Returns:
+            Tensor: Padded waveform tensor (B, T_wav).
+            LongTensor: Waveform length tensor (B,).
+
+        """
+        if list(inspect.signature(self.vocoder.forward).parameters) != ["c"]:
+            wavs = [self(f[:l]) for f, l in zip(feats, feats_lengths)]
+            wav_lengths = torch.tensor([len(w) for w in wavs], device=feats.device)
+            return pad_list(wavs, 0.0), wav_lengths
+
+        if self.normalize_before:
+            feats = (feats - self.vocoder.mean) / self.vocoder.scale
+        c = feats.transpose(1, 2)
+        wav = self._generate(c).view(feats.size(0), -1)
+        upsample_factor = wav.size(1) // feats.size(1)
+        # NOTE: The last frames of the shorter utterances depend on the padding,
+        #   e.g., through the reflection padding of MelGAN, so they are generated
+        #   again without the padding
+        for i, length in enumerate(feats_lengths.tolist()):
+            if length == feats.size(1):
+                continue
+            context = self._get_receptive_field(c)
+            keep, start = max(length - context, 0), max(length - 2 * context, 0)
+            tail = self._generate(c[i : i + 1, :, start:length]).view(-1)
+            wav[i, keep * upsample_factor : length * upsample_factor] = tail[
+                (keep - start) * upsample_factor :
+            ]
+        return wav, feats_lengths * upsample_factor
+
+    @torch.no_grad()
+    def stream_forward(
+        self, feats: torch.Tensor, chunk_size: int = 32
+    ) -> Iterator[torch.Tensor]:
+        """Generate waveform chunk by chunk with pretrained vocoder.
+
+        Each chunk is generated with the context frames of the receptive field in
+        both sides, so the concatenated chunks are the same as the output of
+        forward(). The vocoder which is not conditioned only on the features,
+        e.g. ParallelWaveGAN, generates the whole waveform at once.
+
+        Args:
+            feats (Tensor): Feature tensor (T_feats, #mels).
+            chunk_size (int): Number of frames in each chunk.
+
+        Returns:
+            Iterator[Tensor]: Generated waveform chunks (chunk_size * hop_size,).
+
+        """
+        if list(inspect.signature(self.vocoder.forward).parameters) != ["c"]:
+            yield self(feats)
+            return
+
+        if self.normalize_before:
+            feats = (feats - self.vocoder.mean) / self.vocoder.scale
+        c = feats.transpose(0, 1).unsqueeze(0)
+        for wav in chunked_inference(
+            self._generate, [c], [1], chunk_size, self._get_receptive_field(c)
+        ):
+            yield wav.view(-1)
+
+    def _generate(self, c: torch.Tensor) -> torch.Tensor:
+        # (B, #mels, T_feats) -> (B, 1, T_wav)
+        wav = self.vocoder(c)
+        if getattr(self.vocoder, "pqmf", None) is not None:
+            # Multi-band MelGAN outputs the subbands
+            wav = self.vocoder.pqmf.synthesis(wav)
+        return wav
+
+    def _get_receptive_field(self, c: torch.Tensor) -> int:
+        if self._receptive_field is None:
+            self._receptive_field = get_receptive_field(
+                self._generate, [c.size(1)], device=c.device, dtype=c.dtype
+            )
+        return self._receptive_field
@@ -0,0 +1,149 @@
+"""Batched Levenshtein alignment with substitution/deletion/insertion counts."""
+from typing import Dict, Hashable, List, NamedTuple, Sequence
+
+import numpy as np
+
+# Upper bound of the sequence length for packing the error counts
+_SHIFT = 1 << 20
+
+
+class ErrorCounts(NamedTuple):
+    """Alignment breakdown of a (reference, hypothesis) pair."""
+
+    ref_len: int
+    hyp_len: int
+    cor: int
+    sub: int
+    dele: int
+    ins: int
+
+    @property
+    def err(self) -> int:
+        return self.sub + self.dele + self.ins
+
+
+def _encode(
+    seqs: Sequence[Sequence[Hashable]], vocab: Dict[Hashable, int], pad: int
+) -> np.ndarray:
+    max_len = max([len(s) for s in seqs] + [1])
+    ids = np.full((len(seqs), max_len), pad, dtype=np.int64)
+    for b, seq in enumerate(seqs):
+        ids[b, : len(seq)] = [vocab.setdefault(t, len(vocab)) for t in seq]
+    return ids
+
+
+def batch_edit_distance(
+    refs: Sequence[Sequence[Hashable]], hyps: Sequence[Sequence[Hashable]]
+) -> np.ndarray:
+    """Align a batch of sequence pairs with unit costs at once.
+
+    The DP table is filled row by row (one reference token at a time) for all
+    the pairs in the batch together. The insertion recursion inside a row,
+    D[i, j] = min_k (T[i, k] + j - k), is solved with a cumulative minimum,
+    so the only Python loop is over the reference length.
+
+    Ties are resolved in the order of match/substitution, deletion, insertion.
+
+    Args:
+        refs: Reference token sequences (B,)
+        hyps: Hypothesis token sequences (B,)
+    Returns:
+        Counts of (ref_len, hyp_len, cor, sub, del, ins): (B, 6)
+
+    Examples:
+        >>> batch_edit_distance([["a", "b", "c"]], [["a", "x", "c", "d"]])
+        array([[3, 4, 2, 1, 0, 1]])
+
+    """
+    if len(refs) != len(hyps):
+        raise ValueError(f"The batch sizes mismatch: {len(refs)} != {len(hyps)}")
+    batch = len(refs)
+    if batch == 0:
+        return np.zeros((0, 6), dtype=np.int64)
+
+    vocab = {}
+    ref = _encode(refs, vocab, pad=-1)
+    hyp = _encode(hyps, vocab, pad=-2)
+    ref_lens = np.array([len(r) for r in refs], dtype=np.int64)
+    hyp_lens = np.array([len(h) for h in hyps], dtype=np.int64)
+    arange = np.arange(batch)
+    cols = np.arange(hyp.shape[1] + 1, dtype=np.int64)
+
+    # The (sub, del, ins) counts of each cell are packed into one integer
+    # so that a move only needs a single add/select/gather.
+    sub_unit, del_unit, ins_unit = _SHIFT**2, _SHIFT, 1
+
+    # Row 0: insert all the hypothesis tokens
+    cost = np.broadcast_to(cols, (batch, len(cols))).copy()
+    packed = cost * ins_unit
+
+    out = np.zeros((batch, 6), dtype=np.int64)
+    out[:, 0] = ref_lens
+    out[:, 1] = hyp_lens
+
+    def _collect(i: int):
+        done = ref_lens == i
+        if done.any():
+            c = packed[arange[done], hyp_lens[done]]
+            out[done, 3] = c // sub_unit
+            out[done, 4] = c // del_unit % _SHIFT
+            out[done, 5] = c % _SHIFT
+
+    _collect(0)
+    rows = arange[:, None]
+    for i in range(1, ref.shape[1] + 1):
+        # 1. Diagonal (match or substitution) and vertical (deletion) moves
+        mismatch = (hyp != ref[:, i - 1 : i]).astype(np.int64)
+        diag = cost[:, :-1] + mismatch
+        up = cost + 1
+        use_diag = diag <= up[:, 1:]
+
+        t_cost = up
+        t_packed = packed + del_unit
+        t_cost[:, 1:] = np.where(use_diag, diag, up[:, 1:])
+        t_packed[:, 1:] = np.where(
+            use_diag, packed[:, :-1] + mismatch * sub_unit, t_packed[:, 1:]
+        )
+
+        # 2. Horizontal (insertion) moves: D[j] = j + cummin_k(T[k] - k)
+        shifted = t_cost - cols
+        running = np.minimum.accumulate(shifted, axis=1)
+        # The latest k achieving the running minimum, i.e. the fewest insertions
+        src = np.maximum.accumulate(np.where(shifted == running, cols, 0), axis=1)
+        cost = running + cols
+        packed = t_packed[rows, src] + (cols - src) * ins_unit
+
+        _collect(i)
+
+    out[:, 2] = out[:, 0] - out[:, 3] - out[:, 4]
+    return out
+
+
+def edit_distance_counts(
+    refs: Sequence[Sequence[Hashable]],
+    hyps: Sequence[Sequence[Hashable]],
+    batch_size: int = 256,
+) -> List[ErrorCounts]:
+    """Align many sequence pairs in length-sorted mini-batches.
+
+    Args:
+        refs: Reference token sequences
+        hyps: Hypothesis token sequences
+        batch_size: The number of pairs aligned at once
+    Returns:
+        The breakdown of each pair, in the input order
+
+    """
+    if len(refs) != len(hyps):
+        raise ValueError(f"The numbers mismatch: {len(refs)} != {len(hyps)}")
+    # Sort by length to minimize the padding in each mini-batch
+    order = sorted(range(len(refs)), key=lambda i: (len(refs[i]), len(hyps[i])))
+    results = [None] * len(refs)
+    for start in range(0, len(order), batch_size):
+        indices = order[start : start + batch_size]
+        counts = batch_edit_distance(
+            [refs[i] for i in indices], [hyps[i] for i in indices]
+        )
+        for i, c in zip(indices, counts.tolist()):
+            results[i] = ErrorCounts(*c)
+    return results
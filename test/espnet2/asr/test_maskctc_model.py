@@ -74,3 +74,10 @@ def test_maskctc(
             enc_out=torch.randn(2, 4),
         )
         s2t(**inputs)
+
+        # batch decoding gives the same results as the utterance-wise one
+        enc_out = torch.randn(2, 6, 4)
+        enc_lens = torch.tensor([6, 4], dtype=torch.long)
+        hyps = s2t.batch_forward(enc_out, enc_lens)
+        for hyp, x, n in zip(hyps, enc_out, enc_lens):
+            assert hyp.yseq.tolist() == s2t(x[:n]).yseq.tolist()
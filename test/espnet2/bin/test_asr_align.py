@@ -117,3 +117,26 @@ def test_CTCSegmentation(asr_config_file):
     # test the ratio estimation (result: 509)
     ratio = aligner.estimate_samples_to_frames_ratio()
     assert 500 <= ratio <= 520
+
+
+@pytest.mark.execution_timeout(10)
+@pytest.mark.parametrize("num_samples", [100000, 102400, 102911])
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_CTCSegmentation_chunks(asr_config_file, num_samples, batch_size):
+    """Test CTC segmentation with the audio split into chunks."""
+    fs = 16000
+    speech = np.random.randn(num_samples)
+    aligner = CTCSegmentation(
+        asr_train_config=asr_config_file,
+        fs=fs,
+        batch_size=batch_size,
+        kaldi_style_text=False,
+        min_window_size=10,
+    )
+    lpz = aligner.get_lpz(speech)
+    aligner.set_config(chunk_length=1.0, chunk_context=0.5)
+    assert aligner.get_frame_stride() == 512
+    chunk_lpz = aligner.get_lpz(speech)
+    assert chunk_lpz.shape == lpz.shape
+    segments = aligner(speech, ["HOTELS", "ASSETS"], fs=fs)
+    assert len(segments.segments) == 2
@@ -4,6 +4,7 @@ from pathlib import Path
 
 import numpy as np
 import pytest
+import torch
 import yaml
 
 from espnet2.bin.asr_inference import Speech2Text, get_parser, main
@@ -102,6 +103,46 @@ def test_Speech2Text_quantized(asr_config_file, lm_config_file):
         assert isinstance(hyp, Hypothesis)
 
 
+@pytest.mark.execution_timeout(10)
+def test_Speech2Text_static_quantized(asr_config_file):
+    speech2text = Speech2Text(asr_train_config=asr_config_file, beam_size=1)
+    speech2text.static_quantize(np.random.randn(100000) for _ in range(2))
+    assert isinstance(
+        speech2text.asr_model.decoder.output.module, torch.nn.quantized.Linear
+    )
+    speech = np.random.randn(100000)
+    results = speech2text(speech)
+    for text, token, token_int, hyp in results:
+        assert isinstance(text, str)
+        assert isinstance(hyp, Hypothesis)
+
+
+@pytest.mark.execution_timeout(10)
+@pytest.mark.parametrize("ctc_search", ["greedy", "prefix_beam"])
+def test_Speech2Text_ctc_search(asr_config_file, lm_config_file, tmp_path, ctc_search):
+    with (tmp_path / "hotwords.txt").open("w") as f:
+        f.write("ab\nc\n")
+    speech2text = Speech2Text(
+        asr_train_config=asr_config_file,
+        lm_train_config=lm_config_file,
+        beam_size=3,
+        nbest=2,
+        ctc_search=ctc_search,
+        hotword_list=str(tmp_path / "hotwords.txt"),
+    )
+    speech = torch.randn(2, 100000)
+    batch_results = speech2text.batch_decode(speech, torch.tensor([100000, 70000]))
+    assert len(batch_results) == 2
+    for results in batch_results:
+        for text, token, token_int, hyp in results:
+            assert isinstance(text, str)
+            assert isinstance(hyp, Hypothesis)
+
+    # The longest utterance is not affected by the padding
+    results = speech2text(speech[0])
+    assert [r[2] for r in results] == [r[2] for r in batch_results[0]]
+
+
 @pytest.fixture()
 def asr_config_file_streaming(tmp_path: Path, token_list):
     # Write default configuration file
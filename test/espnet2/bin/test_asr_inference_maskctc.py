@@ -4,6 +4,7 @@ from pathlib import Path
 
 import numpy as np
 import pytest
+import torch
 
 from espnet2.bin.asr_inference_maskctc import Speech2Text, get_parser, main
 from espnet2.tasks.asr import ASRTask
@@ -64,3 +65,16 @@ def test_Speech2Text(asr_config_file):
         assert isinstance(token[0], str)
         assert isinstance(token_int[0], int)
         assert isinstance(hyp, Hypothesis)
+
+
+@pytest.mark.execution_timeout(5)
+def test_Speech2Text_batch_decode(asr_config_file):
+    speech2text = Speech2Text(asr_train_config=asr_config_file)
+    speech = torch.randn(2, 100000)
+    speech_lengths = torch.tensor([100000, 70000], dtype=torch.long)
+    batch_results = speech2text.batch_decode(speech, speech_lengths)
+    assert len(batch_results) == 2
+    for results in batch_results:
+        for text, token, token_int, hyp in results:
+            assert isinstance(text, str)
+            assert isinstance(hyp, Hypothesis)
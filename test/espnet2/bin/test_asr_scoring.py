@@ -0,0 +1,82 @@
+from argparse import ArgumentParser
+
+import pytest
+
+from espnet2.bin.asr_scoring import get_parser, main, scoring
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.fixture
+def trn_files(tmp_path):
+    with (tmp_path / "ref.trn").open("w") as f:
+        f.write("a b c (spk1-utt1)\n")
+        f.write("d e (spk2-utt2)\n")
+    with (tmp_path / "hyp.trn").open("w") as f:
+        f.write("a x c d (spk1-utt1)\n")
+        f.write("d e (spk2-utt2)\n")
+    return tmp_path / "ref.trn", tmp_path / "hyp.trn"
+
+
+@pytest.mark.parametrize("nj", [1, 2])
+def test_scoring_trn(tmp_path, trn_files, nj):
+    ref, hyp = trn_files
+    scoring(
+        output_dir=str(tmp_path / "output"),
+        log_level="INFO",
+        ref=str(ref),
+        hyp=str(hyp),
+        input_format="trn",
+        token_type=None,
+        bpemodel=None,
+        non_linguistic_symbols=None,
+        remove_non_linguistic_symbols=False,
+        utt2spk=None,
+        nj=nj,
+        batch_size=1,
+    )
+    result = (tmp_path / "output" / "result.txt").read_text()
+    avg = [line for line in result.splitlines() if "Sum/Avg" in line][0]
+    # Snt Wrd Corr Sub Del Ins Err S.Err
+    assert avg.replace("|", " ").split()[1:] == [
+        "2",
+        "5",
+        "80.0",
+        "20.0",
+        "0.0",
+        "20.0",
+        "40.0",
+        "50.0",
+    ]
+    assert "spk1" in result and "spk2" in result
+
+
+def test_scoring_text(tmp_path):
+    with (tmp_path / "text").open("w") as f:
+        f.write("utt1 hello world\n")
+    with (tmp_path / "hyp").open("w") as f:
+        f.write("utt1 hallo world\n")
+    scoring(
+        output_dir=str(tmp_path / "output"),
+        log_level="INFO",
+        ref=str(tmp_path / "text"),
+        hyp=str(tmp_path / "hyp"),
+        input_format="text",
+        token_type="char",
+        bpemodel=None,
+        non_linguistic_symbols=None,
+        remove_non_linguistic_symbols=False,
+        utt2spk=None,
+        nj=1,
+        batch_size=256,
+    )
+    utt_errors = (tmp_path / "output" / "utt_errors").read_text()
+    # utt_id #ref #hyp #cor #sub #del #ins
+    assert utt_errors == "utt1 11 11 10 1 0 0\n"
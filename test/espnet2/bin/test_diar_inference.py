@@ -171,3 +171,18 @@ def test_DiarSepSpeech(
     )
     wav = torch.rand(batch_size, input_size)
     diarize_speech(wav, fs=8000)
+
+
+@pytest.mark.parametrize("batch_size", [1, 2])
+def test_DiarizeSpeech_permute_diar_with_silent_wave(diar_config_file, batch_size):
+    diarize_speech = DiarizeSpeech(train_config=diar_config_file, num_spk=2)
+    # the second speaker is silent, so its correlation is NaN
+    waves = [torch.rand(batch_size, 800), torch.zeros(batch_size, 800)]
+    spk_prediction = torch.randn(batch_size, 10, 2)
+    spk_prediction, interp_prediction, perm = diarize_speech.permute_diar(
+        waves, spk_prediction
+    )
+    assert spk_prediction.shape == (batch_size, 10, 2)
+    assert interp_prediction.shape == (batch_size, 800, 2)
+    assert perm.shape == (batch_size, 2)
+    assert torch.equal(perm.sort(dim=1)[0], torch.tensor([[0, 1]] * batch_size))
@@ -0,0 +1,148 @@
+import string
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from espnet2.bin.asr_inference import Speech2Text, write_results
+from espnet2.bin.lm_rescore import LMRescorer, get_parser, main, rescore
+from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.tasks.asr import ASRTask
+from espnet2.tasks.lm import LMTask
+from espnet.nets.beam_search import Hypothesis
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.fixture()
+def token_list(tmp_path: Path):
+    with (tmp_path / "tokens.txt").open("w") as f:
+        f.write("<blank>\n")
+        for c in string.ascii_letters:
+            f.write(f"{c}\n")
+        f.write("<unk>\n")
+        f.write("<sos/eos>\n")
+    return tmp_path / "tokens.txt"
+
+
+@pytest.fixture()
+def lm_config_file(tmp_path: Path, token_list):
+    # Write default configuration file
+    LMTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path / "lm"),
+            "--token_list",
+            str(token_list),
+            "--token_type",
+            "char",
+        ]
+    )
+    return tmp_path / "lm" / "config.yaml"
+
+
+@pytest.fixture()
+def asr_config_file(tmp_path: Path, token_list):
+    # Write default configuration file
+    ASRTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path / "asr"),
+            "--token_list",
+            str(token_list),
+            "--token_type",
+            "char",
+        ]
+    )
+    return tmp_path / "asr" / "config.yaml"
+
+
+@pytest.fixture()
+def nbest_dir(tmp_path: Path, asr_config_file):
+    # Decode in the same way as asr_inference.py
+    speech2text = Speech2Text(
+        asr_train_config=asr_config_file, beam_size=2, nbest=2, maxlenratio=0.1
+    )
+    with DatadirWriter(tmp_path / "decode") as writer:
+        for key in ("a", "b"):
+            results = speech2text(np.random.randn(16000))
+            write_results(writer, key, results, 2, False, False)
+    return tmp_path / "decode"
+
+
+@pytest.mark.execution_timeout(5)
+def test_LMRescorer_score_is_independent_of_batch_size(lm_config_file):
+    torch.manual_seed(0)
+    rescorer = LMRescorer(lm_train_config=lm_config_file, batch_size=100)
+    nbest = {"a": [[1, 2, 3], [1, 2], []], "b": [[4], [4, 5, 6, 7]]}
+    scores = rescorer.score(nbest)
+    rescorer.batch_size = 1
+    scores_single = rescorer.score(nbest)
+    for key in nbest:
+        assert scores[key].shape == (len(nbest[key]),)
+        np.testing.assert_allclose(scores[key], scores_single[key], rtol=1e-5)
+
+
+@pytest.mark.execution_timeout(5)
+def test_LMRescorer_call(lm_config_file):
+    rescorer = LMRescorer(lm_train_config=lm_config_file, lm_weight=0.5)
+    nbest = {
+        "a": [
+            ("ab", ["a", "b"], [1, 2], Hypothesis(yseq=torch.tensor([53, 1, 2, 53]))),
+            ("a", ["a"], [1], Hypothesis(yseq=torch.tensor([53, 1, 53]), score=-1)),
+        ]
+    }
+    rescored = rescorer(nbest)
+    assert len(rescored["a"]) == 2
+    scores = [float(hyp.score) for _, _, _, hyp in rescored["a"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.execution_timeout(5)
+def test_rescore(lm_config_file, nbest_dir, tmp_path: Path):
+    rescore(
+        output_dir=str(tmp_path / "rescored"),
+        batch_size=3,
+        dtype="float32",
+        ngpu=0,
+        seed=0,
+        log_level="INFO",
+        nbest_dir=str(nbest_dir),
+        nbest=None,
+        lm_train_config=str(lm_config_file),
+        lm_file=None,
+        lm_weight=1.0,
+        penalty=0.0,
+    )
+    for n in (1, 2):
+        for name in ("token_int", "score", "asr_score", "lm_score"):
+            assert (tmp_path / "rescored" / f"{n}best_recog" / name).exists()
+    # The ASR scores are written as "tensor(...)" by asr_inference.py
+    asr_scores = {
+        v
+        for n in (1, 2)
+        for v in read_2column_text(nbest_dir / f"{n}best_recog" / "score").values()
+    }
+    assert all(v.startswith("tensor(") for v in asr_scores)
+    rescored_asr_scores = {
+        float(v)
+        for n in (1, 2)
+        for v in read_2column_text(
+            tmp_path / "rescored" / f"{n}best_recog" / "asr_score"
+        ).values()
+    }
+    assert rescored_asr_scores == {float(v[len("tensor(") : -1]) for v in asr_scores}
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from espnet2.bin.tts_inference import Text2Speech, get_parser, main
+from espnet2.bin.tts_inference import Text2Speech, get_parser, length_bucketing, main
 from espnet2.tasks.tts import TTSTask
 
 
@@ -57,3 +57,84 @@ def test_Text2Speech(config_file):
     text2speech = Text2Speech(train_config=config_file)
     text = "aiueo"
     text2speech(text)
+
+
+@pytest.fixture()
+def fastspeech_config_file(tmp_path: Path, token_list):
+    # Write default configuration file
+    TTSTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path / "fastspeech"),
+            "--token_list",
+            str(token_list),
+            "--token_type",
+            "char",
+            "--cleaner",
+            "none",
+            "--g2p",
+            "none",
+            "--normalize",
+            "none",
+            "--tts",
+            "fastspeech",
+            "--tts_conf",
+            "adim=4",
+            "--tts_conf",
+            "aheads=2",
+            "--tts_conf",
+            "eunits=4",
+            "--tts_conf",
+            "dunits=4",
+        ]
+    )
+    return tmp_path / "fastspeech" / "config.yaml"
+
+
+@pytest.mark.execution_timeout(10)
+def test_Text2Speech_batch_inference(fastspeech_config_file):
+    text2speech = Text2Speech(train_config=fastspeech_config_file)
+    assert text2speech.use_batch_inference
+    texts = ["aiueo", "ai", "aiu"]
+    outputs = text2speech.batch_inference(texts)
+    assert len(outputs) == len(texts)
+    for text, output in zip(texts, outputs):
+        # NOTE: +1 for eos
+        assert len(output["duration"]) == len(text) + 1
+        assert output["feat_gen"].size(0) == output["duration"].sum()
+        if text2speech.vocoder is not None:
+            assert output["wav"].dim() == 1
+
+
+@pytest.mark.execution_timeout(5)
+def test_Text2Speech_batch_inference_not_supported(config_file):
+    text2speech = Text2Speech(train_config=config_file)
+    assert not text2speech.use_batch_inference
+    with pytest.raises(NotImplementedError):
+        text2speech.batch_inference(["aiueo", "ai"])
+
+
+@pytest.mark.execution_timeout(10)
+def test_Text2Speech_stream(fastspeech_config_file):
+    text2speech = Text2Speech(train_config=fastspeech_config_file)
+    wavs = list(text2speech.stream("aiueo"))
+    wav = text2speech("aiueo")["wav"]
+    # NOTE: Griffin-Lim does not support chunk-wise synthesis
+    assert len(wavs) == 1
+    assert wavs[0].shape == wav.shape
+
+
+@pytest.mark.parametrize("batch_size, bucket_size", [(2, 4), (3, 1), (4, 100)])
+def test_length_bucketing(batch_size, bucket_size):
+    lengths = [3, 1, 4, 1, 5, 9, 2, 6, 5]
+    samples = [(f"utt{i}", {"text": [0] * n}) for i, n in enumerate(lengths)]
+    batches = list(length_bucketing(iter(samples), batch_size, bucket_size))
+    assert all(len(b) <= batch_size for b in batches)
+    assert sorted(key for b in batches for key, _ in b) == sorted(
+        key for key, _ in samples
+    )
+    for b in batches:
+        batch_lengths = [len(data["text"]) for _, data in b]
+        assert batch_lengths == sorted(batch_lengths, reverse=True)
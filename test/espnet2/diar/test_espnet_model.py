@@ -1,3 +1,5 @@
+import itertools
+
 import pytest
 import torch
 
@@ -76,3 +78,39 @@ def test_single_channel_model(
         "spk_labels_lengths": ilens,
     }
     loss, stats, weight = diar_model(**kwargs)
+
+
+@pytest.mark.parametrize("num_spk", [1, 2, 4])
+def test_pit_loss(num_spk):
+    diar_model = ESPnetDiarizationModel(
+        label_aggregator=label_aggregator,
+        attractor=rnn_attractor,
+        encoder=encoder,
+        decoder=decoder,
+        frontend=frontend,
+        specaug=None,
+        normalize=None,
+    )
+    pred = torch.randn(3, 20, num_spk)
+    label = torch.randint(high=2, size=(3, 20, num_spk)).float()
+    lengths = torch.LongTensor([20, 15, 7])
+    loss, perm, label_perm = diar_model.pit_loss(pred, label, lengths)
+
+    # brute force over all the permutations
+    mask = diar_model.create_length_mask(lengths, 20, num_spk)
+    min_losses = []
+    for b in range(3):
+        losses = [
+            (
+                torch.nn.functional.binary_cross_entropy_with_logits(
+                    pred[b], label[b][:, p], reduction="none"
+                )
+                * mask[b]
+            )
+            .mean(dim=1)
+            .sum()
+            for p in itertools.permutations(range(num_spk))
+        ]
+        min_losses.append(min(losses))
+        assert torch.allclose(label_perm[b], label[b][:, perm[b]])
+    assert torch.allclose(loss, sum(min_losses) / lengths.sum(), atol=1e-5)
@@ -7,11 +7,12 @@ from torch_complex.tensor import ComplexTensor
 
 from espnet2.enh.layers.beamformer import (
     generalized_eigenvalue_decomposition,
+    get_covariances,
     get_rtf,
     gev_phase_correction,
     signal_framing,
 )
-from espnet2.enh.layers.complex_utils import solve
+from espnet2.enh.layers.complex_utils import einsum, reverse, solve
 from espnet2.layers.stft import Stft
 
 is_torch_1_1_plus = V(torch.__version__) >= V("1.1.0")
@@ -139,6 +140,31 @@ def test_signal_framing():
     assert FC.allclose(X2[..., -1], X)
 
 
+@pytest.mark.parametrize("use_torch_complex", [True, False])
+@pytest.mark.parametrize("btaps, bdelay", [(0, 1), (1, 2), (5, 3)])
+def test_get_covariances(use_torch_complex, btaps, bdelay):
+    if use_torch_complex and not is_torch_1_9_plus:
+        pytest.skip("Require torch 1.9.0+")
+    torch.random.manual_seed(0)
+    T = 20
+    X = torch.rand(2, 10, 4, T, dtype=torch.float64)
+    X = (
+        X + 1j * torch.rand_like(X)
+        if use_torch_complex
+        else ComplexTensor(X, X.flip(-1))
+    )
+    inverse_power = torch.rand(2, 10, T, dtype=torch.float64)
+    cov, vec = get_covariances(X, inverse_power, bdelay, btaps, get_vector=True)
+
+    # Reference with the framed signal materialized
+    Psi = reverse(signal_framing(X, btaps + 1, 1, bdelay), dim=-1)
+    Psi_norm = Psi * inverse_power[..., None, bdelay + btaps - 1 :, None]
+    cov_ref = einsum("bfdtk,bfetl->bfkdle", Psi, Psi_norm.conj()).reshape(cov.shape)
+    vec_ref = einsum("bfdtk,bfet->bfked", Psi_norm, X[..., bdelay + btaps - 1 :].conj())
+    assert (cov - cov_ref).abs().max() < 1e-10
+    assert (vec - vec_ref).abs().max() < 1e-10
+
+
 @pytest.mark.skipif(not is_torch_1_9_plus, reason="Require torch 1.9.0+")
 @pytest.mark.parametrize("ch", [2, 4, 6, 8])
 def test_gevd(ch):
@@ -17,6 +17,8 @@ from espnet2.gan_tts.hifigan.loss import (
     GeneratorAdversarialLoss,
     MelSpectrogramLoss,
 )
+from espnet2.gan_tts.utils import fuse_for_inference, trace_for_inference
+from espnet2.gan_tts.utils.chunked_inference import get_receptive_field
 
 
 def make_hifigan_generator_args(**kwargs):
@@ -174,6 +176,60 @@ def test_hifigan_generator_and_discriminator_and_loss(
     optimizer_d.step()
 
 
+@pytest.mark.parametrize("dict_g", [{}, {"global_channels": 4}])
+@pytest.mark.parametrize("chunk_size", [1, 4, 32])
+def test_hifigan_generator_stream_inference(dict_g, chunk_size):
+    args_g = make_hifigan_generator_args(**dict_g)
+    model_g = HiFiGANGenerator(**args_g).eval()
+    c = torch.randn(20, args_g["in_channels"])
+    g = None
+    if args_g.get("global_channels") is not None:
+        g = torch.randn(args_g["global_channels"], 1)
+    with torch.no_grad():
+        y = model_g.inference(c, g=g)
+        ys = list(model_g.stream_inference(c, g=g, chunk_size=chunk_size))
+    assert len(ys) == -(-len(c) // chunk_size)
+    torch.testing.assert_close(torch.cat(ys), y)
+
+
+def test_hifigan_generator_stream_inference_caches_receptive_field(monkeypatch):
+    calls = []
+
+    def _get_receptive_field(*args, **kwargs):
+        calls.append(args)
+        return get_receptive_field(*args, **kwargs)
+
+    monkeypatch.setattr(
+        "espnet2.gan_tts.hifigan.hifigan.get_receptive_field", _get_receptive_field
+    )
+    args_g = make_hifigan_generator_args()
+    model_g = HiFiGANGenerator(**args_g).eval()
+    c = torch.randn(20, args_g["in_channels"])
+    with torch.no_grad():
+        ys1 = list(model_g.stream_inference(c, chunk_size=4))
+        ys2 = list(model_g.stream_inference(c, chunk_size=4))
+    assert len(calls) == 1
+    assert model_g.receptive_field() == get_receptive_field(
+        model_g.forward, [args_g["in_channels"]]
+    )
+    torch.testing.assert_close(torch.cat(ys1), torch.cat(ys2))
+
+
+def test_hifigan_generator_fuse_for_inference():
+    args_g = make_hifigan_generator_args()
+    model_g = HiFiGANGenerator(**args_g).eval()
+    c = torch.randn(20, args_g["in_channels"])
+    with torch.no_grad():
+        y = model_g.inference(c)
+        fuse_for_inference(model_g)
+        assert not any(
+            name.endswith("weight_g") for name, _ in model_g.named_parameters()
+        )
+        torch.testing.assert_close(model_g.inference(c), y)
+        traced = trace_for_inference(model_g, (c[:10],))
+        torch.testing.assert_close(traced.inference(c), y)
+
+
 try:
     import parallel_wavegan  # NOQA
 
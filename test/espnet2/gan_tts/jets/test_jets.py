@@ -326,6 +326,14 @@ def test_jets_is_trainable_and_decodable(gen_dict, dis_dict, loss_dict):
         )
         model.inference(**inputs)
 
+        # check batch inference
+        output_dict = model.batch_inference(
+            text=torch.randint(0, idim, (2, 5)),
+            text_lengths=torch.tensor([5, 3], dtype=torch.long),
+        )
+        assert output_dict["wav"].size(0) == 2
+        assert output_dict["wav"].size(1) == output_dict["wav_lengths"].max()
+
         # check inference with teachder forcing
         inputs = dict(
             text=torch.randint(
@@ -542,3 +542,7 @@ def test_joint_model_is_trainable_and_decodable(
         )
         output_dict = model.inference(**inputs)
         assert len(output_dict["wav"]) == len(output_dict["feat_gen"]) * upsample_factor
+
+        # check streaming inference
+        wavs = list(model.stream_inference(**inputs, chunk_size=4))
+        assert all(wav.dim() == 1 for wav in wavs)
@@ -123,6 +123,25 @@ def test_melgan_generator_and_discriminator(dict_g, dict_d):
     optimizer_d.step()
 
 
+@pytest.mark.parametrize(
+    "dict_g",
+    [
+        {},
+        {"pad": "ReplicationPad1d"},
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 4, 32])
+def test_melgan_generator_stream_inference(dict_g, chunk_size):
+    args_g = make_melgan_generator_args(**dict_g)
+    model_g = MelGANGenerator(**args_g).eval()
+    c = torch.randn(20, args_g["in_channels"])
+    with torch.no_grad():
+        y = model_g.inference(c)
+        ys = list(model_g.stream_inference(c, chunk_size=chunk_size))
+    assert len(ys) == -(-len(c) // chunk_size)
+    torch.testing.assert_close(torch.cat(ys), y)
+
+
 try:
     import parallel_wavegan  # NOQA
 
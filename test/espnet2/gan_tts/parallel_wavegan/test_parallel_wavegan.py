@@ -15,6 +15,7 @@ from espnet2.gan_tts.parallel_wavegan import (
     ParallelWaveGANDiscriminator,
     ParallelWaveGANGenerator,
 )
+from espnet2.gan_tts.utils import fuse_for_inference, trace_for_inference
 
 
 def make_generator_args(**kwargs):
@@ -126,6 +127,55 @@ def test_parallel_wavegan_generator_and_discriminator(dict_g, dict_d):
     optimizer_d.step()
 
 
+@pytest.mark.parametrize(
+    "dict_g",
+    [
+        {},
+        {"upsample_net": "UpsampleNetwork"},
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 4, 32])
+def test_parallel_wavegan_generator_stream_inference(dict_g, chunk_size):
+    args_g = make_generator_args(**dict_g)
+    model_g = ParallelWaveGANGenerator(**args_g).eval()
+    c = torch.randn(20, args_g["aux_channels"])
+    z = torch.randn(20 * model_g.upsample_factor, 1)
+    with torch.no_grad():
+        y = model_g.inference(c, z)
+        ys = list(model_g.stream_inference(c, z, chunk_size=chunk_size))
+    assert len(ys) == -(-len(c) // chunk_size)
+    torch.testing.assert_close(torch.cat(ys), y)
+
+
+@pytest.mark.parametrize(
+    "dict_g",
+    [
+        {},
+        {"upsample_net": "UpsampleNetwork"},
+        {
+            "upsample_params": {
+                "upsample_scales": [3, 5],
+                "nonlinear_activation": "ReLU",
+            }
+        },
+        {"upsample_params": {"upsample_scales": [2, 2], "freq_axis_kernel_size": 3}},
+    ],
+)
+def test_parallel_wavegan_generator_fuse_for_inference(dict_g):
+    args_g = make_generator_args(**dict_g)
+    model_g = ParallelWaveGANGenerator(**args_g).eval()
+    c = torch.randn(20, args_g["aux_channels"])
+    z = torch.randn(20 * model_g.upsample_factor, 1)
+    with torch.no_grad():
+        y = model_g.inference(c, z)
+        fuse_for_inference(model_g)
+        torch.testing.assert_close(model_g.inference(c, z), y)
+        traced = trace_for_inference(
+            model_g, (c[:10], z[: 10 * model_g.upsample_factor])
+        )
+        torch.testing.assert_close(traced.inference(c, z), y)
+
+
 try:
     import parallel_wavegan  # NOQA
 
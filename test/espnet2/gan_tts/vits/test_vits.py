@@ -343,6 +343,35 @@ def test_vits_is_trainable_and_decodable(gen_dict, dis_dict, loss_dict):
         assert output_dict["wav"].size(0) == inputs["feats"].size(0) * upsample_factor
 
 
+def test_vits_concat_discriminator_inputs():
+    idim = 10
+    odim = 5
+    model = VITS(
+        idim=idim,
+        odim=odim,
+        **make_vits_generator_args(),
+        **make_vits_discriminator_args(),
+        **make_vits_loss_args(),
+        cache_generator_outputs=True,
+    )
+    model.train()
+    upsample_factor = model.generator.upsample_factor
+    inputs = dict(
+        text=torch.randint(0, idim, (2, 8)),
+        text_lengths=torch.tensor([8, 5], dtype=torch.long),
+        feats=torch.randn(2, 16, odim),
+        feats_lengths=torch.tensor([16, 13], dtype=torch.long),
+        speech=torch.randn(2, 16 * upsample_factor),
+        speech_lengths=torch.tensor([16, 13] * upsample_factor, dtype=torch.long),
+    )
+    # the second call reuses the cached generator outputs
+    model.concat_discriminator_inputs = False
+    dis_loss = model(forward_generator=False, **inputs)["loss"]
+    model.concat_discriminator_inputs = True
+    concat_dis_loss = model(forward_generator=False, **inputs)["loss"]
+    torch.testing.assert_close(dis_loss, concat_dis_loss)
+
+
 @pytest.mark.skipif(
     "1.6" in torch.__version__,
     reason="Group conv in pytorch 1.6 has an issue. "
@@ -537,6 +566,25 @@ def test_multi_speaker_vits_is_trainable_and_decodable(
             inputs["spembs"] = torch.randn(spk_embed_dim)
         model.inference(**inputs)
 
+        # check batch inference
+        inputs = dict(
+            text=torch.randint(0, idim, (2, 5)),
+            text_lengths=torch.tensor([5, 3], dtype=torch.long),
+        )
+        if spks > 0:
+            inputs["sids"] = torch.randint(0, spks, (2, 1))
+        if langs > 0:
+            inputs["lids"] = torch.randint(0, langs, (2, 1))
+        if spk_embed_dim > 0:
+            inputs["spembs"] = torch.randn(2, spk_embed_dim)
+        output_dict = model.batch_inference(**inputs)
+        assert output_dict["wav"].size(0) == 2
+        assert output_dict["wav"].size(1) == output_dict["wav_lengths"].max()
+        assert torch.equal(
+            output_dict["wav_lengths"],
+            output_dict["duration"].sum(1).long() * upsample_factor,
+        )
+
         # check inference with predefined duration
         inputs = dict(
             text=torch.randint(
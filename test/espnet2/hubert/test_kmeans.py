@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+import torch
+
+from espnet2.hubert.kmeans import (
+    FeatureShards,
+    FeatureShardWriter,
+    MiniBatchKMeans,
+    load_feature_shard,
+)
+
+
+@pytest.fixture()
+def blobs():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=10.0, size=(4, 3))
+    labels = rng.integers(4, size=2000)
+    feats = centers[labels] + rng.normal(scale=0.1, size=(2000, 3))
+    return feats.astype(np.float32), labels, centers
+
+
+@pytest.fixture()
+def shards(tmp_path, blobs):
+    feats, _, _ = blobs
+    prefixes = [tmp_path / "feats.1", tmp_path / "feats.2"]
+    utts = {}
+    for i, prefix in enumerate(prefixes):
+        with FeatureShardWriter(prefix) as writer:
+            for j in range(10):
+                start = (i * 10 + j) * 100
+                key = f"utt{i}_{j}"
+                writer[key] = torch.from_numpy(feats[start : start + 100])
+                utts[key] = feats[start : start + 100]
+    return prefixes, utts
+
+
+def test_load_feature_shard(shards):
+    prefixes, utts = shards
+    feats, index = load_feature_shard(prefixes[0])
+    assert isinstance(feats, np.memmap)
+    assert feats.shape == (1000, 3)
+    start, end = index["utt0_3"]
+    np.testing.assert_array_equal(feats[start:end], utts["utt0_3"])
+
+
+def test_FeatureShardWriter_dim_mismatch(tmp_path):
+    with FeatureShardWriter(tmp_path / "feats") as writer:
+        writer["a"] = np.zeros((2, 3))
+        with pytest.raises(RuntimeError):
+            writer["b"] = np.zeros((2, 4))
+
+
+def test_FeatureShards(shards, blobs):
+    prefixes, utts = shards
+    view = FeatureShards(prefixes)
+    assert len(view) == 2000
+    assert view.dim == 3
+    rows = np.array([0, 999, 1000, 1999, 5])
+    np.testing.assert_array_equal(view[rows], blobs[0][rows])
+    assert [k for k, _ in view.items()] == list(utts)
+    for key, feat in view.items():
+        np.testing.assert_array_equal(feat, utts[key])
+
+
+def test_FeatureShards_keys(shards):
+    prefixes, utts = shards
+    view = FeatureShards(prefixes, keys={"utt0_1", "utt1_5"})
+    assert len(view) == 200
+    np.testing.assert_array_equal(view[np.arange(100, 200)], utts["utt1_5"])
+
+
+@pytest.mark.parametrize("n_init", [1, 3])
+def test_MiniBatchKMeans(shards, blobs, n_init):
+    _, labels, centers = blobs
+    view = FeatureShards(shards[0])
+    km = MiniBatchKMeans(n_clusters=4, batch_size=256, max_iter=5, n_init=n_init)
+    km.fit(view)
+    pred = km.predict(view[np.arange(len(view))])
+    # The clusters are recovered up to the permutation
+    mapping = {p: lab for p, lab in zip(pred, labels)}
+    assert len(set(mapping.values())) == 4
+    assert all(mapping[p] == lab for p, lab in zip(pred, labels))
+    assert km.score(view) < 0.1
+
+
+def test_MiniBatchKMeans_deterministic(blobs):
+    feats = blobs[0]
+    km1 = MiniBatchKMeans(n_clusters=8, batch_size=100, max_iter=2, chunk_size=7)
+    km2 = MiniBatchKMeans(n_clusters=8, batch_size=100, max_iter=2)
+    torch.testing.assert_close(
+        km1.fit(feats).cluster_centers, km2.fit(feats).cluster_centers
+    )
+
+
+def test_MiniBatchKMeans_save_load(tmp_path, blobs):
+    feats = blobs[0]
+    km = MiniBatchKMeans(n_clusters=4, batch_size=100, max_iter=1).fit(feats)
+    km.save(tmp_path / "km.pth")
+    km2 = MiniBatchKMeans.load(tmp_path / "km.pth")
+    np.testing.assert_array_equal(km.predict(feats), km2.predict(feats))
+
+
+def test_MiniBatchKMeans_too_few_frames():
+    with pytest.raises(RuntimeError):
+        MiniBatchKMeans(n_clusters=10).fit(np.zeros((5, 2), dtype=np.float32))
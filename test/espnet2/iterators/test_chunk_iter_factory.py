@@ -30,3 +30,26 @@ def test_ChunkIterFactory():
     for key, batch in iter_factory.build_iter(0):
         for k, v in batch.items():
             assert v.shape == (2, 3)
+
+
+def test_ChunkIterFactory_chunks():
+    dataset = Dataset()
+    collatefn = CommonCollateFn()
+    batches = [["a"], ["b"]]
+    iter_factory = ChunkIterFactory(
+        dataset=dataset,
+        batches=batches,
+        batch_size=2,
+        chunk_length=2,
+        chunk_shift_ratio=0.5,
+        num_cache_chunks=2,
+        collate_fn=collatefn,
+    )
+
+    keys, chunks = [], []
+    for key, batch in iter_factory.build_iter(0):
+        keys += key
+        chunks += batch["dummy"].tolist()
+    # The chunks left over in the cache are carried over to the next mini-batch
+    assert keys == ["a"] * 7 + ["b"] * 7
+    assert chunks == [[i, i + 1] for i in range(7)] * 2
@@ -0,0 +1,59 @@
+import pytest
+import torch
+
+from espnet2.iterators.prefetch_iterator import PrefetchIterator
+
+
+def _batches(n):
+    for i in range(n):
+        yield [f"utt{i}"], {"x": torch.full((2, 3), i), "x_lengths": torch.tensor([3])}
+
+
+@pytest.mark.parametrize(
+    "device",
+    [
+        "cpu",
+        pytest.param(
+            "cuda",
+            marks=pytest.mark.skipif(not torch.cuda.is_available(), reason="no gpu"),
+        ),
+    ],
+)
+@pytest.mark.parametrize("num_prefetch", [1, 3, 10])
+def test_PrefetchIterator(device, num_prefetch):
+    batches = list(_batches(5))
+    iterator = PrefetchIterator(batches, device, num_prefetch=num_prefetch)
+    assert len(iterator) == 5
+    # Iterable again
+    for _ in range(2):
+        results = list(iterator)
+        assert len(results) == 5
+        for (utt_id, batch), (ref_utt_id, ref_batch) in zip(results, batches):
+            assert utt_id == ref_utt_id
+            assert batch["x"].device.type == device
+            torch.testing.assert_close(batch["x"].cpu(), ref_batch["x"])
+
+
+def test_PrefetchIterator_break():
+    iterator = PrefetchIterator(_batches(100), "cpu", num_prefetch=2)
+    for i, (utt_id, _) in enumerate(iterator):
+        if i == 3:
+            break
+    assert utt_id == ["utt3"]
+
+
+def test_PrefetchIterator_raise():
+    def _generate():
+        yield from _batches(2)
+        raise ValueError("foo")
+
+    results = []
+    with pytest.raises(ValueError, match="foo"):
+        for data in PrefetchIterator(_generate(), "cpu"):
+            results.append(data)
+    assert len(results) == 2
+
+
+def test_PrefetchIterator_no_len():
+    with pytest.raises(TypeError):
+        len(PrefetchIterator(_batches(2), "cpu"))
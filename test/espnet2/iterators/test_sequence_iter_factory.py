@@ -67,3 +67,44 @@ def test_SequenceIterFactory_deterministic(collate, num_iters_per_epoch):
     for i in range(1, 10):
         for v, v2 in zip(iter_factory.build_iter(i), iter_factory.build_iter(i)):
             assert (v == v2).all()
+
+
+@pytest.mark.parametrize("num_iters_per_epoch", [None, 3, 9])
+@pytest.mark.parametrize("start_iter", [0, 1, 2])
+def test_SequenceIterFactory_start_iter(num_iters_per_epoch, start_iter):
+    dataset = Dataset()
+    batches = [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+    iter_factory = SequenceIterFactory(
+        dataset=dataset,
+        batches=batches,
+        num_iters_per_epoch=num_iters_per_epoch,
+        shuffle=True,
+        collate_fn=collate_func,
+    )
+    for epoch in range(1, 3):
+        full = [list(map(int, it)) for it in iter_factory.build_iter(epoch)]
+        resumed = [
+            list(map(int, it))
+            for it in iter_factory.build_iter(epoch, start_iter=start_iter)
+        ]
+        assert resumed == full[start_iter:]
+
+
+def test_SequenceIterFactory_persistent_workers():
+    dataset = Dataset()
+    batches = [[0, 1], [2, 3], [4, 5], [6, 7], [8, 9]]
+    iter_factory = SequenceIterFactory(
+        dataset=dataset,
+        batches=batches,
+        num_iters_per_epoch=3,
+        num_workers=1,
+        collate_fn=collate_func,
+        persistent_workers=True,
+    )
+    loader = iter_factory.build_iter(1)
+    assert [list(map(int, it)) for it in loader] == [[0, 1], [2, 3], [4, 5]]
+    # The same DataLoader is reused with the batches of the next epoch
+    loader2 = iter_factory.build_iter(2)
+    assert loader2 is loader
+    assert len(loader2) == 3
+    assert [list(map(int, it)) for it in loader2] == [[6, 7], [8, 9], [0, 1]]
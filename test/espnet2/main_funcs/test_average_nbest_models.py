@@ -65,3 +65,75 @@ def test_average_nbest_models_0epoch_reporter(output_dir, nbest):
             best_model_criterion=[("valid", "acc", "max")],
             nbest=nbest,
         )
+
+
+def test_average_nbest_models_values(tmp_path):
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    reporter = Reporter()
+    for epoch, acc, loss in [
+        (1, 0.4, 3.0),
+        (2, 0.6, 1.0),
+        (3, 0.5, 2.0),
+        (4, 0.3, 0.5),
+    ]:
+        reporter.set_epoch(epoch)
+        with reporter.observe("valid") as sub:
+            sub.register({"acc": acc, "loss": loss})
+            sub.next()
+        torch.save(
+            {"w": torch.full((2,), float(epoch)), "n": torch.tensor(epoch)},
+            output_dir / f"{epoch}epoch.pth",
+        )
+
+    average_nbest_models(
+        reporter=reporter,
+        output_dir=output_dir,
+        best_model_criterion=[("valid", "acc", "max"), ("valid", "loss", "min")],
+        nbest=[1, 2, 3],
+    )
+    # acc: 2, 3, 1 / loss: 4, 2, 3
+    for ph_cr, n, epochs in [
+        ("valid.acc", 2, [2, 3]),
+        ("valid.acc", 3, [2, 3, 1]),
+        ("valid.loss", 2, [4, 2]),
+        ("valid.loss", 3, [4, 2, 3]),
+    ]:
+        states = torch.load(output_dir / f"{ph_cr}.ave_{n}best.pth")
+        torch.testing.assert_close(
+            states["w"], torch.full((2,), sum(epochs) / len(epochs))
+        )
+        # Integers are accumulated
+        assert states["n"] == sum(epochs)
+    assert (output_dir / "valid.acc.ave.pth").resolve().name == (
+        "valid.acc.ave_3best.pth"
+    )
+    assert (output_dir / "valid.loss.ave_1best.pth").resolve().name == "4epoch.pth"
+
+
+def test_average_nbest_models_shared_epochs(tmp_path):
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    reporter = Reporter()
+    for epoch, acc, loss in [(1, 0.4, 3.0), (2, 0.6, 1.0), (3, 0.5, 2.0)]:
+        reporter.set_epoch(epoch)
+        with reporter.observe("valid") as sub:
+            sub.register({"acc": acc, "loss": loss})
+            sub.next()
+        torch.save({"w": torch.tensor(float(epoch))}, output_dir / f"{epoch}epoch.pth")
+
+    # Repeat twice to check the case of existing symlinks
+    for _ in range(2):
+        average_nbest_models(
+            reporter=reporter,
+            output_dir=output_dir,
+            best_model_criterion=[("valid", "acc", "max"), ("valid", "loss", "min")],
+            nbest=[2, 3],
+        )
+        # The same n-best epochs are averaged only once
+        assert not (output_dir / "valid.acc.ave_2best.pth").is_symlink()
+        assert (output_dir / "valid.loss.ave_2best.pth").is_symlink()
+        for n, value in [(2, 2.5), (3, 2.0)]:
+            for ph_cr in ["valid.acc", "valid.loss"]:
+                states = torch.load(output_dir / f"{ph_cr}.ave_{n}best.pth")
+                assert states["w"] == value
@@ -0,0 +1,98 @@
+import pytest
+
+from espnet2.samplers.batch_sharding import (
+    balanced_partition,
+    load_imbalance,
+    load_utt2cost,
+    shard_batches,
+)
+from espnet2.samplers.length_batch_sampler import LengthBatchSampler
+
+
+@pytest.fixture()
+def shape_files(tmp_path):
+    p1 = tmp_path / "shape1.txt"
+    with p1.open("w") as f:
+        f.write("a 1000,80\n")
+        f.write("b 400,80\n")
+        f.write("c 800,80\n")
+        f.write("d 789,80\n")
+        f.write("e 1023,80\n")
+        f.write("f 999,80\n")
+        f.write("g 120,80\n")
+        f.write("h 300,80\n")
+
+    p2 = tmp_path / "shape2.txt"
+    with p2.open("w") as f:
+        f.write("a 30,30\n")
+        f.write("b 50,30\n")
+        f.write("c 39,30\n")
+        f.write("d 49,30\n")
+        f.write("e 44,30\n")
+        f.write("f 99,30\n")
+        f.write("g 10,30\n")
+        f.write("h 20,30\n")
+
+    return str(p1), str(p2)
+
+
+@pytest.mark.parametrize("cost_type", ["length", "squared_length"])
+def test_load_utt2cost(shape_files, cost_type):
+    utt2cost = load_utt2cost(shape_files, cost_type)
+    if cost_type == "length":
+        assert utt2cost["a"] == 1000 + 30
+    else:
+        assert utt2cost["a"] == 1000**2 + 30**2
+
+
+def test_load_utt2cost_invalid(shape_files):
+    with pytest.raises(ValueError):
+        load_utt2cost(shape_files, "foo")
+    with pytest.raises(RuntimeError):
+        load_utt2cost([], "length")
+
+
+@pytest.mark.parametrize(
+    "costs, num_parts",
+    [([8, 7, 6, 5, 4], 2), ([1, 1, 1], 3), ([5, 1, 1, 1, 1, 1], 2), ([3, 2], 1)],
+)
+def test_balanced_partition(costs, num_parts):
+    parts = balanced_partition(costs, num_parts)
+    assert len(parts) == num_parts
+    assert sorted(i for part in parts for i in part) == list(range(len(costs)))
+    assert all(len(part) > 0 for part in parts)
+    assert all(part == sorted(part) for part in parts)
+    loads = [sum(costs[i] for i in part) for part in parts]
+    # The LPT bound: max load <= mean load + max cost
+    assert max(loads) <= sum(costs) / num_parts + max(costs)
+
+
+@pytest.mark.parametrize("shard_type", ["stride", "balanced"])
+@pytest.mark.parametrize("world_size", [1, 2, 3])
+def test_shard_batches(shape_files, shard_type, world_size):
+    utt2cost = load_utt2cost(shape_files)
+    batches = list(LengthBatchSampler(4000, shape_files, min_batch_size=world_size))
+    shards = shard_batches(batches, world_size, shard_type, utt2cost)
+    assert len(shards) == world_size
+    for i, batch in enumerate(batches):
+        sub_batches = [shard[i] for shard in shards]
+        assert all(len(b) > 0 for b in sub_batches)
+        assert sorted(k for b in sub_batches for k in b) == sorted(batch)
+
+
+def test_shard_batches_balanced_is_better(shape_files):
+    utt2cost = load_utt2cost(shape_files)
+    batches = [("e", "a", "f", "c", "d", "b", "h", "g")]
+    stride = load_imbalance(shard_batches(batches, 2, "stride"), utt2cost)
+    balanced = load_imbalance(shard_batches(batches, 2, "balanced", utt2cost), utt2cost)
+    assert balanced["straggler_overhead"] < stride["straggler_overhead"]
+    assert balanced["mean_imbalance"] >= 1.0
+
+
+def test_shard_batches_invalid(shape_files):
+    with pytest.raises(ValueError):
+        shard_batches([("a", "b")], 2, "foo")
+    with pytest.raises(RuntimeError):
+        shard_batches([("a",)], 2, "stride")
+    with pytest.raises(RuntimeError):
+        shard_batches([("a", "b")], 2, "balanced")
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+import torch
+
+from espnet2.gan_svs.vits import VITS
+from espnet2.svs.espnet_model import ESPnetSVSModel
+from espnet2.svs.feats_extract.score_feats_extract import SyllableScoreFeats
+from espnet2.svs.xiaoice.XiaoiceSing import XiaoiceSing
+from espnet.nets.pytorch_backend.nets_utils import pad_list
+
+HOP_LENGTH = 16
+
+
+def make_song(rng, length):
+    phones = rng.randint(1, 9, length)
+    midis = rng.randint(1, 60, length)
+    beats = rng.randint(2, 6, length)
+
+    def lab(v):
+        return torch.tensor(np.repeat(v, beats * HOP_LENGTH))
+
+    return dict(
+        text=torch.tensor(phones),
+        label=torch.tensor(phones),
+        midi=torch.tensor(midis),
+        beat_phn=torch.tensor(beats),
+        beat_ruled_phn=torch.tensor(beats),
+        beat_syb=torch.tensor(beats),
+        phn_cnt=torch.ones(length, dtype=torch.long),
+        label_lab=lab(phones),
+        midi_lab=lab(midis),
+        tempo_lab=lab(np.full(length, 120)),
+        beat_lab=lab(beats),
+        label_score=torch.tensor(phones),
+        midi_score=torch.tensor(midis),
+        tempo_score=torch.full((length,), 120),
+        beat_score_phn=torch.tensor(beats),
+        beat_score_syb=torch.tensor(beats),
+    )
+
+
+def collate(songs):
+    batch = {}
+    for k in songs[0]:
+        batch[k] = pad_list([song[k] for song in songs], 0)
+        batch[k + "_lengths"] = torch.tensor([len(song[k]) for song in songs])
+    return batch
+
+
+def build_model(svs):
+    return ESPnetSVSModel(
+        text_extract=None,
+        feats_extract=None,
+        score_feats_extract=SyllableScoreFeats(
+            fs=16000, n_fft=64, win_length=64, hop_length=HOP_LENGTH
+        ),
+        label_extract=None,
+        pitch_extract=None,
+        tempo_extract=None,
+        beat_extract=None,
+        energy_extract=None,
+        normalize=None,
+        pitch_normalize=None,
+        energy_normalize=None,
+        svs=svs,
+    ).eval()
+
+
+@pytest.fixture
+def songs():
+    rng = np.random.RandomState(0)
+    return [make_song(rng, length) for length in (7, 4, 10)]
+
+
+@pytest.mark.parametrize("postnet_layers", [0, 2])
+@pytest.mark.parametrize("duration_bias", [1.5, -10.0])
+@torch.no_grad()
+def test_xiaoice_batch_inference(songs, postnet_layers, duration_bias):
+    torch.manual_seed(0)
+    svs = XiaoiceSing(
+        idim=10,
+        odim=5,
+        embed_dim=16,
+        adim=16,
+        aheads=2,
+        elayers=1,
+        eunits=16,
+        dlayers=1,
+        dunits=16,
+        postnet_layers=postnet_layers,
+        postnet_chans=4,
+        postnet_filts=5,
+        duration_predictor_chans=8,
+    )
+    # the negative bias makes all the predicted durations 0
+    torch.nn.init.constant_(svs.duration_predictor.linear.bias, duration_bias)
+    model = build_model(svs)
+
+    output = model.batch_inference(**collate(songs))
+    for i, song in enumerate(songs):
+        expected = model.inference(**song)["feat_gen"]
+        assert output["feat_gen_lengths"][i] == len(expected)
+        feat_gen = output["feat_gen"][i, : len(expected)]
+        torch.testing.assert_close(feat_gen, expected, rtol=0.0, atol=1e-5)
+
+
+@pytest.mark.parametrize("use_dp", [True, False])
+@torch.no_grad()
+def test_vits_batch_inference(songs, use_dp):
+    torch.manual_seed(0)
+    svs = VITS(
+        idim=10,
+        odim=5,
+        use_dp=use_dp,
+        generator_params=dict(
+            hidden_channels=16,
+            text_encoder_attention_heads=2,
+            text_encoder_blocks=1,
+            text_encoder_ffn_expand=1,
+            decoder_channels=16,
+            decoder_upsample_scales=[4, 4],
+            decoder_upsample_kernel_sizes=[8, 8],
+            decoder_resblock_kernel_sizes=[3],
+            decoder_resblock_dilations=[[1]],
+            posterior_encoder_layers=2,
+            flow_flows=1,
+            flow_layers=1,
+        ),
+    )
+    if use_dp:
+        # make the predicted durations positive
+        duration_predictor = svs.generator.duration_predictor
+        torch.nn.init.zeros_(duration_predictor.proj.weight)
+        torch.nn.init.constant_(duration_predictor.proj.bias, 1.2)
+    model = build_model(svs)
+
+    output = model.batch_inference(**collate(songs), noise_scale=0.0)
+    for i, song in enumerate(songs):
+        expected = model.inference(**song, noise_scale=0.0)["wav"]
+        assert output["wav_lengths"][i] == len(expected)
+        wav = output["wav"][i, : len(expected)]
+        torch.testing.assert_close(wav, expected, rtol=0.0, atol=1e-5)
@@ -0,0 +1,62 @@
+import pytest
+import torch
+
+from espnet2.asr.decoder.transformer_decoder import TransformerDecoder
+from espnet2.asr.encoder.conformer_encoder import ConformerEncoder
+from espnet2.asr.encoder.transformer_encoder import TransformerEncoder
+from espnet2.torch_utils.quantization import (
+    convert_static_quantization,
+    prepare_static_quantization,
+)
+
+
+@pytest.mark.parametrize(
+    "encoder_class, encoder_conf",
+    [
+        (ConformerEncoder, dict(rel_pos_type="latest", use_cnn_module=True)),
+        (TransformerEncoder, dict(input_layer="conv2d")),
+    ],
+)
+def test_static_quantization_encoder(encoder_class, encoder_conf):
+    torch.manual_seed(0)
+    encoder = encoder_class(
+        20, output_size=16, attention_heads=2, linear_units=32, **encoder_conf
+    ).eval()
+    x = torch.randn(2, 40, 20)
+    x_lens = torch.LongTensor([40, 30])
+    with torch.no_grad():
+        ref, ref_lens, _ = encoder(x, x_lens)
+
+    prepare_static_quantization(encoder)
+    with torch.no_grad():
+        for _ in range(3):
+            encoder(torch.randn(2, 40, 20), x_lens)
+    convert_static_quantization(encoder)
+    assert any(
+        isinstance(m, torch.nn.quantized.Conv2d) for m in encoder.embed.modules()
+    )
+    with torch.no_grad():
+        out, out_lens, _ = encoder(x, x_lens)
+    assert out.shape == ref.shape
+    assert torch.equal(out_lens, ref_lens)
+    assert (out - ref).abs().mean() < 0.1 * ref.abs().mean()
+
+
+def test_static_quantization_decoder():
+    torch.manual_seed(0)
+    decoder = TransformerDecoder(10, 16, attention_heads=2, linear_units=32).eval()
+    memory = torch.randn(2, 9, 16)
+    ys = torch.randint(0, 10, (2, 4))
+    prepare_static_quantization(decoder)
+    with torch.no_grad():
+        decoder.batch_score(ys, [None, None], memory)
+    convert_static_quantization(decoder)
+    assert isinstance(decoder.output_layer.module, torch.nn.quantized.Linear)
+    with torch.no_grad():
+        logp, _ = decoder.batch_score(ys, [None, None], memory)
+    assert logp.shape == (2, 10)
+
+
+def test_static_quantization_unsupported_module():
+    with pytest.raises(ValueError):
+        prepare_static_quantization(torch.nn.LSTM(2, 2), modules=["LSTM"])
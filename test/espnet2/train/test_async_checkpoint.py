@@ -0,0 +1,74 @@
+import pytest
+import torch
+
+from espnet2.train.async_checkpoint import (
+    AsyncCheckpointSaver,
+    find_latest_snapshot,
+    list_snapshots,
+    snapshot_to_cpu,
+)
+
+
+def test_snapshot_to_cpu_copies_tensors():
+    model = torch.nn.Linear(2, 2)
+    states = {"model": model.state_dict(), "epoch": 1, "list": [torch.ones(1)]}
+    snapshot = snapshot_to_cpu(states)
+    with torch.no_grad():
+        model.weight.fill_(1.0)
+    assert not torch.equal(snapshot["model"]["weight"], model.weight)
+    assert snapshot["epoch"] == 1
+    assert torch.equal(snapshot["list"][0], torch.ones(1))
+    assert type(snapshot["model"]) is type(states["model"])
+
+
+@pytest.mark.parametrize("num_keep", [1, 2])
+def test_AsyncCheckpointSaver(tmp_path, num_keep):
+    saver = AsyncCheckpointSaver(tmp_path / "snapshots", num_keep=num_keep)
+    for epoch, iiter in [(1, 10), (1, 20), (2, 10)]:
+        saver.save({"value": torch.tensor(epoch * 100 + iiter)}, epoch, iiter)
+    saver.wait()
+
+    snapshots = list_snapshots(tmp_path / "snapshots")
+    assert len(snapshots) == num_keep
+    latest = find_latest_snapshot(tmp_path / "snapshots")
+    assert latest.name == "snapshot.2epoch.10iter.pth"
+    assert torch.load(latest)["value"] == 210
+
+    saver.remove_all()
+    assert find_latest_snapshot(tmp_path / "snapshots") is None
+
+
+def test_AsyncCheckpointSaver_error(tmp_path):
+    (tmp_path / "file").write_text("")
+    saver = AsyncCheckpointSaver(tmp_path / "file" / "snapshots")
+    saver.save({"value": torch.tensor(0)}, 1, 1)
+    with pytest.raises(RuntimeError):
+        saver.wait()
+
+
+@pytest.mark.parametrize("start_iter", [0, 3])
+@pytest.mark.parametrize("accum_grad", [1, 2])
+def test_AsyncCheckpointSaver_iterate(tmp_path, start_iter, accum_grad):
+    saver = AsyncCheckpointSaver(tmp_path, num_keep=100)
+    counter = {"done": start_iter}
+
+    def get_states():
+        return {"done": counter["done"]}
+
+    batches = range(start_iter, 10)
+    for batch in saver.iterate(
+        batches, get_states, 1, interval=2, start_iter=start_iter, accum_grad=accum_grad
+    ):
+        # The snapshot is taken before the batch is processed
+        counter["done"] += 1
+    saver.wait()
+
+    for p in list_snapshots(tmp_path):
+        states = torch.load(p)
+        assert states["iiter"] == states["done"]
+        assert states["iiter"] > start_iter
+        assert states["iiter"] % 2 == 0 and states["iiter"] % accum_grad == 0
+        assert states["epoch"] == 1
+    assert len(list_snapshots(tmp_path)) == len(
+        [i for i in range(start_iter + 1, 10) if i % 2 == 0]
+    )
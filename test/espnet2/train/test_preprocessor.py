@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from espnet2.train.preprocessor import CommonPreprocessor, speed_perturb
+
+
+@pytest.mark.parametrize("factor", [0.9, 1.0, 1.1])
+@pytest.mark.parametrize("shape", [(16000,), (16000, 2)])
+def test_speed_perturb(factor, shape):
+    fs = 16000
+    t = np.arange(shape[0]) / fs
+    x = np.sin(2 * np.pi * 440 * t).astype(np.float32)
+    if len(shape) == 2:
+        x = np.stack([x] * shape[1], axis=1)
+    y = speed_perturb(x, factor, axis=0)
+    assert y.dtype == x.dtype
+    assert y.shape[1:] == x.shape[1:]
+    assert y.shape[0] == int(np.ceil(shape[0] / factor))
+
+    # The pitch is changed by the factor
+    y = y.reshape(y.shape[0], -1)[:, 0]
+    freqs = np.fft.rfftfreq(len(y), d=1 / fs)
+    peak = freqs[np.argmax(np.abs(np.fft.rfft(y)))]
+    np.testing.assert_allclose(peak, 440 * factor, atol=2.0)
+
+
+def test_CommonPreprocessor_speed_perturb():
+    preprocessor = CommonPreprocessor(train=True, speed_perturb_factors=[0.9, 1.1])
+    speech = np.random.randn(1000).astype(np.float32)
+    lengths = {
+        len(preprocessor("utt", {"speech": speech.copy()})["speech"]) for _ in range(30)
+    }
+    assert lengths == {1112, 910}
+
+
+def test_CommonPreprocessor_speed_perturb_valid():
+    preprocessor = CommonPreprocessor(train=False, speed_perturb_factors=[0.9, 1.1])
+    speech = np.random.randn(1000).astype(np.float32)
+    assert len(preprocessor("utt", {"speech": speech})["speech"]) == 1000
+
+
+def test_CommonPreprocessor_speed_perturb_invalid():
+    with pytest.raises(ValueError):
+        CommonPreprocessor(train=True, speed_perturb_factors=[0.0, 1.0])
@@ -7,7 +7,13 @@ import pytest
 import torch
 from torch.utils.tensorboard import SummaryWriter
 
-from espnet2.train.reporter import Average, ReportedValue, Reporter, aggregate
+from espnet2.train.reporter import (
+    Average,
+    ReportedValue,
+    Reporter,
+    aggregate,
+    stats_to_host,
+)
 
 
 @pytest.mark.parametrize("weight1,weight2", [(None, None), (19, np.array(9))])
@@ -456,3 +462,21 @@ def test_measure_iter_time():
     with reporter.observe("train", 2) as sub:
         for _ in sub.measure_iter_time(range(3), "foo"):
             sub.next()
+
+
+@pytest.mark.parametrize("weight", [None, 3, torch.tensor(3)])
+def test_stats_to_host(weight):
+    stats = {
+        "float": 0.5,
+        "torch": torch.tensor(0.25, requires_grad=True),
+        "torch_1dim": torch.tensor([1.5]),
+    }
+    stats, weight2 = stats_to_host(stats, weight)
+    assert stats == {"float": 0.5, "torch": 0.25, "torch_1dim": 1.5}
+    assert weight2 == (None if weight is None else 3)
+    assert not isinstance(weight2, torch.Tensor)
+
+
+def test_stats_to_host_invalid_shape():
+    with pytest.raises(ValueError):
+        stats_to_host({"torch": torch.rand(2)})
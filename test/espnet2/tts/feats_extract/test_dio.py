@@ -9,8 +9,9 @@ from espnet2.tts.feats_extract.dio import Dio
 @pytest.mark.parametrize(
     "use_token_averaged_f0, reduction_factor", [(False, 1), (True, 1), (True, 3)]
 )
+@pytest.mark.parametrize("num_threads", [1, 2])
 def test_forward(
-    use_continuous_f0, use_log_f0, use_token_averaged_f0, reduction_factor
+    use_continuous_f0, use_log_f0, use_token_averaged_f0, reduction_factor, num_threads
 ):
     layer = Dio(
         n_fft=128,
@@ -22,6 +23,7 @@ def test_forward(
         use_log_f0=use_log_f0,
         use_token_averaged_f0=use_token_averaged_f0,
         reduction_factor=reduction_factor,
+        num_threads=num_threads,
     )
     xs = torch.randn(2, 384)
     if not use_token_averaged_f0:
@@ -115,3 +115,108 @@ def test_fastspeech2(
         inputs.update(pitch=torch.tensor([2, 2, 0], dtype=torch.float).unsqueeze(-1))
         inputs.update(energy=torch.tensor([2, 2, 0], dtype=torch.float).unsqueeze(-1))
         model.inference(**inputs, use_teacher_forcing=True)
+
+
+@pytest.mark.parametrize("reduction_factor", [1, 3])
+@pytest.mark.parametrize("spk_embed_dim", [None, 2])
+@pytest.mark.parametrize("alpha", [1.0, 1.5])
+def test_fastspeech2_batch_inference(reduction_factor, spk_embed_dim, alpha):
+    model = FastSpeech2(
+        idim=10,
+        odim=5,
+        adim=4,
+        aheads=2,
+        elayers=1,
+        eunits=4,
+        dlayers=1,
+        dunits=4,
+        postnet_layers=1,
+        postnet_chans=4,
+        postnet_filts=5,
+        reduction_factor=reduction_factor,
+        duration_predictor_layers=2,
+        duration_predictor_chans=4,
+        duration_predictor_kernel_size=3,
+        energy_predictor_layers=2,
+        energy_predictor_chans=4,
+        energy_predictor_kernel_size=3,
+        pitch_predictor_layers=2,
+        pitch_predictor_chans=4,
+        pitch_predictor_kernel_size=3,
+        spk_embed_dim=spk_embed_dim,
+    )
+    model.eval()
+    # NOTE: avoid zero durations, which are filled with one only in single inference
+    torch.nn.init.constant_(model.duration_predictor.linear.bias, 3.0)
+
+    text = torch.tensor([[1, 2, 3, 4], [5, 6, 0, 0], [7, 8, 9, 0]])
+    text_lengths = torch.tensor([4, 2, 3])
+    inputs = dict(text=text, text_lengths=text_lengths, alpha=alpha)
+    if spk_embed_dim is not None:
+        inputs.update(spembs=torch.randn(3, spk_embed_dim))
+
+    with torch.no_grad():
+        outs = model.batch_inference(**inputs)
+        assert outs["feat_gen"].size(1) == outs["feat_gen_lengths"].max()
+        assert torch.equal(outs["duration_lengths"], text_lengths + 1)
+        assert outs["pitch"].shape == (3, 5, 1)
+        assert outs["energy"].shape == (3, 5, 1)
+
+        # the longest text is not padded, i.e. the same as single inference
+        single_inputs = dict(text=text[0], alpha=alpha)
+        if spk_embed_dim is not None:
+            single_inputs.update(spembs=inputs["spembs"][0])
+        single_outs = model.inference(**single_inputs)
+        assert torch.equal(outs["duration"][0], single_outs["duration"])
+        assert torch.allclose(outs["pitch"][0], single_outs["pitch"], atol=1e-5)
+        assert outs["feat_gen_lengths"][0] == len(single_outs["feat_gen"])
+
+
+@pytest.mark.parametrize("reduction_factor", [1, 3])
+@pytest.mark.parametrize("alpha", [1.0, 1.5])
+def test_fastspeech2_batch_inference_with_zero_durations(reduction_factor, alpha):
+    model = FastSpeech2(
+        idim=10,
+        odim=5,
+        adim=4,
+        aheads=2,
+        elayers=1,
+        eunits=4,
+        dlayers=1,
+        dunits=4,
+        postnet_layers=1,
+        postnet_chans=4,
+        postnet_filts=5,
+        reduction_factor=reduction_factor,
+        duration_predictor_layers=2,
+        duration_predictor_chans=4,
+        duration_predictor_kernel_size=3,
+        energy_predictor_layers=2,
+        energy_predictor_chans=4,
+        energy_predictor_kernel_size=3,
+        pitch_predictor_layers=2,
+        pitch_predictor_chans=4,
+        pitch_predictor_kernel_size=3,
+    )
+    model.eval()
+    torch.nn.init.constant_(model.duration_predictor.linear.bias, 3.0)
+    duration_predictor_inference = model.duration_predictor.inference
+
+    def inference(xs, x_masks):
+        # predict all-0 durations only for the text [5, 6] (+ eos)
+        ds = duration_predictor_inference(xs, x_masks)
+        return ds.masked_fill((~x_masks).sum(1).eq(3).unsqueeze(1), 0)
+
+    model.duration_predictor.inference = inference
+
+    text = torch.tensor([[1, 2, 3, 4], [5, 6, 0, 0], [7, 8, 9, 0]])
+    text_lengths = torch.tensor([4, 2, 3])
+    with torch.no_grad():
+        outs = model.batch_inference(text, text_lengths, alpha=alpha)
+        # compare the longest text and the one with all-0 durations
+        for i in range(2):
+            single_outs = model.inference(text[i, : text_lengths[i]], alpha=alpha)
+            ilen = int(outs["duration_lengths"][i])
+            assert torch.equal(outs["duration"][i, :ilen], single_outs["duration"])
+            assert outs["feat_gen_lengths"][i] == len(single_outs["feat_gen"])
+        assert outs["feat_gen_lengths"][1] == 3 * reduction_factor
@@ -0,0 +1,31 @@
+import pytest
+import torch
+
+from espnet2.tts.utils.average_by_duration import average_by_duration
+
+
+def _average_by_duration_loop(x, d, only_positive):
+    d_cumsum = torch.nn.functional.pad(d.cumsum(dim=0), (1, 0))
+    x_avg = []
+    for start, end in zip(d_cumsum[:-1], d_cumsum[1:]):
+        seg = x[start:end]
+        if only_positive:
+            seg = seg.masked_select(seg.gt(0.0))
+        x_avg.append(seg.mean() if len(seg) != 0 else x.new_tensor(0.0))
+    return torch.stack(x_avg)
+
+
+@pytest.mark.parametrize("only_positive", [False, True])
+def test_average_by_duration(only_positive):
+    xs = torch.randn(3, 12)
+    ds = torch.LongTensor([[3, 0, 4, 5], [2, 2, 0, 0], [1, 9, 1, 0]])
+    ys = average_by_duration(xs, ds, only_positive=only_positive)
+    assert ys.shape == ds.shape
+    for x, d, y in zip(xs, ds, ys):
+        torch.testing.assert_close(y, _average_by_duration_loop(x, d, only_positive))
+
+
+def test_average_by_duration_ignore_remainder():
+    xs = torch.tensor([[1.0, 2.0, 3.0, 100.0]])
+    ds = torch.LongTensor([[1, 2]])
+    torch.testing.assert_close(average_by_duration(xs, ds), torch.tensor([[1.0, 2.5]]))
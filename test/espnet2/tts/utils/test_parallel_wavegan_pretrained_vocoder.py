@@ -0,0 +1,88 @@
+import pytest
+import torch
+import yaml
+
+from espnet2.tts.utils.parallel_wavegan_pretrained_vocoder import (
+    ParallelWaveGANPretrainedVocoder,
+)
+
+pytest.importorskip("parallel_wavegan")
+
+
+def make_vocoder(tmp_path, generator_type, generator_params):
+    import parallel_wavegan.models
+
+    torch.manual_seed(0)
+    generator = getattr(parallel_wavegan.models, generator_type)(**generator_params)
+    config = dict(
+        sampling_rate=16000,
+        format="npy",
+        generator_type=generator_type,
+        generator_params=generator_params,
+    )
+    with open(tmp_path / "config.yml", "w") as f:
+        yaml.dump(config, f)
+    torch.save(
+        {"model": {"generator": generator.state_dict()}},
+        tmp_path / "checkpoint.pkl",
+    )
+    return ParallelWaveGANPretrainedVocoder(tmp_path / "checkpoint.pkl").eval()
+
+
+GENERATORS = [
+    (
+        "MelGANGenerator",
+        dict(
+            in_channels=5,
+            out_channels=1,
+            channels=16,
+            upsample_scales=[4, 4],
+            stacks=1,
+        ),
+    ),
+    (
+        "MelGANGenerator",
+        dict(
+            in_channels=5,
+            out_channels=4,
+            channels=16,
+            upsample_scales=[2, 2],
+            stacks=1,
+        ),
+    ),
+    (
+        "HiFiGANGenerator",
+        dict(
+            in_channels=5,
+            out_channels=1,
+            channels=16,
+            upsample_scales=[4, 4],
+            upsample_kernel_sizes=[8, 8],
+            resblock_kernel_sizes=[3],
+            resblock_dilations=[[1, 3]],
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("generator_type, generator_params", GENERATORS)
+@torch.no_grad()
+def test_batch_forward(tmp_path, generator_type, generator_params):
+    vocoder = make_vocoder(tmp_path, generator_type, generator_params)
+    feats_lengths = torch.tensor([40, 7, 25])
+    feats = torch.randn(3, 40, 5)
+    wav, wav_lengths = vocoder.batch_forward(feats, feats_lengths)
+    for i, length in enumerate(feats_lengths):
+        expected = vocoder(feats[i, :length])
+        assert wav_lengths[i] == len(expected)
+        torch.testing.assert_close(wav[i, : len(expected)], expected)
+
+
+@pytest.mark.parametrize("generator_type, generator_params", GENERATORS)
+@pytest.mark.parametrize("chunk_size", [1, 8])
+@torch.no_grad()
+def test_stream_forward(tmp_path, generator_type, generator_params, chunk_size):
+    vocoder = make_vocoder(tmp_path, generator_type, generator_params)
+    feats = torch.randn(30, 5)
+    wav = torch.cat(list(vocoder.stream_forward(feats, chunk_size=chunk_size)))
+    torch.testing.assert_close(wav, vocoder(feats))
@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+import pytest
+
+from espnet2.utils.edit_distance import batch_edit_distance, edit_distance_counts
+
+
+def _reference_edit_distance(ref, hyp):
+    d = np.arange(len(hyp) + 1)
+    for i in range(1, len(ref) + 1):
+        prev, d = d, np.zeros_like(d)
+        d[0] = i
+        for j in range(1, len(hyp) + 1):
+            d[j] = min(
+                prev[j] + 1, d[j - 1] + 1, prev[j - 1] + (ref[i - 1] != hyp[j - 1])
+            )
+    return d[-1]
+
+
+@pytest.mark.parametrize(
+    "ref, hyp, expected",
+    [
+        (["a", "b", "c"], ["a", "x", "c", "d"], [3, 4, 2, 1, 0, 1]),
+        (["a", "b"], [], [2, 0, 0, 0, 2, 0]),
+        ([], ["a", "b"], [0, 2, 0, 0, 0, 2]),
+        ([], [], [0, 0, 0, 0, 0, 0]),
+    ],
+)
+def test_batch_edit_distance(ref, hyp, expected):
+    np.testing.assert_array_equal(batch_edit_distance([ref], [hyp]), [expected])
+
+
+def test_batch_edit_distance_mismatch():
+    with pytest.raises(ValueError):
+        batch_edit_distance([["a"]], [])
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 100])
+def test_edit_distance_counts(batch_size):
+    rng = random.Random(0)
+    refs = [[rng.randint(0, 4) for _ in range(rng.randint(0, 12))] for _ in range(50)]
+    hyps = [[rng.randint(0, 4) for _ in range(rng.randint(0, 12))] for _ in range(50)]
+    for ref, hyp, c in zip(refs, hyps, edit_distance_counts(refs, hyps, batch_size)):
+        assert c.err == _reference_edit_distance(ref, hyp)
+        assert (c.ref_len, c.hyp_len) == (len(ref), len(hyp))
+        assert c.cor + c.sub + c.dele == len(ref)
+        assert c.cor + c.sub + c.ins == len(hyp)
@@ -4,6 +4,7 @@ import pytest
 import torch
 
 from espnet.nets.asr_interface import dynamic_import_asr
+from espnet.nets.batch_beam_search_timesync import BatchBeamSearchTimeSync
 from espnet.nets.beam_search_timesync import BeamSearchTimeSync
 from espnet.nets.lm_interface import dynamic_import_lm
 from espnet.nets.scorers.length_bonus import LengthBonus
@@ -204,3 +205,55 @@ def test_beam_search_equal(
 
     # just checking it is decodable
     return
+
+
+@pytest.mark.parametrize(
+    "model_class, args, ctc_weight, lm_weight",
+    [
+        (nn, args, ctc_recog, lm)
+        for nn, args in (("transformer", transformer_args), ("rnn", rnn_args))
+        for ctc_recog in (0.3, 1.0)
+        for lm in (0.0, 0.5)
+    ],
+)
+def test_batch_beam_search_timesync_equal(model_class, args, ctc_weight, lm_weight):
+    torch.manual_seed(123)
+    model, x, ilens, y, data, train_args = prepare(model_class, args, mtlalpha=0.5)
+    model.eval()
+    char_list = train_args.char_list
+    lm_args = Namespace(type="lstm", layer=1, unit=2, embed_unit=2, dropout_rate=0.0)
+    lm = dynamic_import_lm("default", backend="pytorch")(len(char_list), lm_args)
+    lm.eval()
+
+    scorers = model.scorers()
+    scorers["ctc"] = model.ctc
+    if lm_weight != 0:
+        scorers["lm"] = lm
+    weights = dict(
+        decoder=1.0 - ctc_weight, ctc=ctc_weight, lm=lm_weight, length_bonus=0.1
+    )
+    beam = BeamSearchTimeSync(
+        beam_size=3,
+        weights=weights,
+        scorers=scorers,
+        sos=model.sos,
+        token_list=char_list,
+    )
+    batch_beam = BatchBeamSearchTimeSync(
+        beam_size=3,
+        weights=weights,
+        scorers=scorers,
+        sos=model.sos,
+        token_list=char_list,
+    )
+    with torch.no_grad():
+        enc = model.encode(x[0, : ilens[0]].numpy())
+        nbest = beam(x=enc)
+        batch_nbest = batch_beam(x=enc)
+
+    assert len(batch_nbest) == len(nbest)
+    for expected, actual in zip(nbest, batch_nbest):
+        assert expected.yseq.tolist() == actual.yseq.tolist()
+        assert abs(expected.score - actual.score) < 1e-4
+    # Only the hypotheses in the beam and their parents are cached
+    assert len(batch_beam.attn_cache) <= 2 * 3
@@ -0,0 +1,98 @@
+import itertools
+
+import pytest
+import torch
+
+from espnet2.lm.seq_rnn_lm import SequentialRNNLM
+from espnet2.lm.transformer_lm import TransformerLM
+from espnet.nets.ctc_prefix_beam_search import CTCGreedySearch, CTCPrefixBeamSearch
+
+
+class LogSoftmax(torch.nn.Module):
+    def log_softmax(self, x):
+        return torch.log_softmax(x, dim=-1)
+
+
+def prefix_log_probs(lpz):
+    # Sum up the probabilities of all the alignments
+    T, V = lpz.shape
+    ret = {}
+    for path in itertools.product(range(V), repeat=T):
+        ys = tuple(c for c, _ in itertools.groupby(path) if c != 0)
+        score = lpz[torch.arange(T), torch.tensor(path)].sum()
+        ret[ys] = torch.logaddexp(ret.get(ys, torch.tensor(float("-inf"))), score)
+    return sorted(ret.items(), key=lambda x: -x[1])
+
+
+def test_prefix_beam_search_exact():
+    torch.manual_seed(0)
+    x = torch.randn(5, 4) * 2
+    expected = prefix_log_probs(torch.log_softmax(x, dim=-1))[:10]
+    search = CTCPrefixBeamSearch(LogSoftmax(), sos=3, eos=3, beam_size=100)
+    nbest = search(x)[:10]
+    assert [ys for ys, _ in expected] == [tuple(h.yseq[1:-1].tolist()) for h in nbest]
+    for (_, score), h in zip(expected, nbest):
+        assert abs(float(score) - h.score) < 1e-4
+
+
+def test_greedy_search():
+    torch.manual_seed(0)
+    xs = torch.randn(2, 20, 6) * 3
+    xlens = torch.tensor([20, 9])
+    greedy = CTCGreedySearch(LogSoftmax(), sos=5, eos=5)
+    for x, xlen, nbest in zip(xs, xlens, greedy.batch_decode(xs, xlens)):
+        ids = x[:xlen].argmax(-1)
+        ys = [int(c) for c, _ in itertools.groupby(ids.tolist()) if c != 0]
+        assert nbest[0].yseq.tolist() == [5] + ys + [5]
+
+
+@pytest.mark.parametrize("lm", [None, "rnn", "transformer"])
+@pytest.mark.parametrize("hotwords", [None, [[3, 4], [3, 4, 5], [7]]])
+def test_batch_decode_equal(lm, hotwords):
+    torch.manual_seed(0)
+    V = 10
+    xs = torch.randn(3, 30, V) * 3
+    xlens = torch.tensor([30, 17, 4])
+    scorers = dict()
+    if lm == "rnn":
+        scorers["lm"] = SequentialRNNLM(V, unit=8, nlayers=1).eval()
+    elif lm == "transformer":
+        scorers["lm"] = TransformerLM(
+            V, embed_unit=8, att_unit=8, head=2, unit=8, layer=1
+        ).eval()
+    search = CTCPrefixBeamSearch(
+        LogSoftmax(),
+        sos=V - 1,
+        eos=V - 1,
+        beam_size=4,
+        scorers=scorers,
+        weights=dict(lm=0.5),
+        penalty=0.3,
+        hotwords=hotwords,
+    )
+    with torch.no_grad():
+        batch_nbest = search.batch_decode(xs, xlens)
+        for x, xlen, nbest in zip(xs, xlens, batch_nbest):
+            expected = search(x[:xlen])
+            assert [h.yseq.tolist() for h in expected] == [
+                h.yseq.tolist() for h in nbest
+            ]
+            for e, h in zip(expected, nbest):
+                assert abs(e.score - h.score) < 1e-4
+
+
+def test_hotword_tables():
+    next_node, bonus, partial = CTCPrefixBeamSearch.build_hotword_tables(
+        [[1, 2], [1, 2, 3]], 1.0
+    )
+    node, total = 0, 0.0
+    for token in [1, 2, 3, 1, 2]:
+        total += float(bonus[node, token])
+        node = int(next_node[node, token])
+    # "1 2 3" is completed and "1 2" is completed again
+    assert total == 5.0 and float(partial[node]) == 0.0
+    total += float(bonus[node, 1])
+    node = int(next_node[node, 1])
+    total += float(bonus[node, 3])
+    # The unfinished match is canceled
+    assert total == 5.0
@@ -118,6 +118,16 @@ def test_transformer_mask():
     assert not numpy.isnan(a.attn[0, :, :3, :3].detach().numpy()).any()
 
 
+def test_transformer_encode_batch():
+    args = make_arg()
+    model, x, ilens, y, data, uttid_list = prepare("pytorch", args)
+    xs = [x[i, : ilens[i]] for i in range(len(ilens))]
+    with torch.no_grad():
+        encs = model.encode_batch(xs)
+        for x_, enc in zip(xs, encs):
+            torch.testing.assert_close(enc, model.encode(x_), rtol=1e-4, atol=1e-5)
+
+
 ldconv_lconv_args = dict(
     transformer_decoder_selfattn_layer_type="lightconv",
     transformer_encoder_selfattn_layer_type="lightconv",
@@ -66,6 +66,30 @@ def test_sortagrad(swap_io):
         prev_start_ilen = cur_start_ilen
 
 
+@pytest.mark.parametrize("shortest_first", [True, False])
+def test_make_batchset_by_frame(shortest_first):
+    dummy_json = make_dummy_json(128, [1, 100], [1, 50])
+    batchset = make_batchset(
+        dummy_json,
+        batch_frames_in=400,
+        batch_frames_inout=500,
+        shortest_first=shortest_first,
+    )
+    assert sorted(k for batch in batchset for k, _ in batch) == sorted(dummy_json)
+    if shortest_first:
+        batchset = [batch[::-1] for batch in batchset]
+    samples = [info for batch in batchset for _, info in batch]
+    start = 0
+    for batch in batchset:
+        # Each batch is filled as much as possible within the limits
+        for n in range(len(batch), len(batch) + 2):
+            ilen = max(int(x["input"][0]["shape"][0]) for x in samples[start:][:n])
+            olen = max(int(x["output"][0]["shape"][0]) for x in samples[start:][:n])
+            fits = ilen * n <= 400 and (ilen + olen) * n <= 500
+            assert fits == (n == len(batch)) or start + n > len(samples)
+        start += len(batch)
+
+
 def test_load_inputs_and_targets_legacy_format(tmpdir):
     # batch = [("F01_050C0101_PED_REAL",
     #          {"input": [{"feat": "some/path.ark:123"}],
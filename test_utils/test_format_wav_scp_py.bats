@@ -0,0 +1,88 @@
+#!/usr/bin/env bats
+
+setup() {
+    tmpdir=/tmp/espnet2-test-format-wav-scp-${RANDOM}
+    # Create dummy data
+    mkdir -p ${tmpdir}/data
+    python << EOF
+import numpy as np
+import soundfile as sf
+
+rng = np.random.RandomState(0)
+with open("${tmpdir}/data/wav.scp", "w") as fscp, \
+        open("${tmpdir}/data/segments", "w") as fseg:
+    for i in range(3):
+        wave = rng.randint(-1000, 1000, 16000 * (i + 2)).astype(np.int16)
+        sf.write(f"${tmpdir}/data/rec{i}.wav", wave, 16000, "PCM_16")
+        fscp.write(f"rec{i} ${tmpdir}/data/rec{i}.wav\n")
+        # Not sorted by the start time
+        for j, (st, et) in enumerate([(1.0, 1.5), (0.0, 0.7), (0.5, 1.2)]):
+            fseg.write(f"rec{i}-{j} rec{i} {st} {et}\n")
+EOF
+
+    cat << EOF > ${tmpdir}/compare.py
+import sys
+
+import kaldiio
+import numpy as np
+import soundfile as sf
+
+from espnet2.fileio.read_text import read_2column_text
+
+
+def load(value):
+    if ".ark:" in value:
+        return kaldiio.load_mat(value)[1]
+    return sf.read(value, dtype=np.int16)[0]
+
+
+dir1, dir2 = sys.argv[1:]
+for name in ["wav.scp", "utt2num_samples"]:
+    with open(f"{dir1}/{name}") as f1, open(f"{dir2}/{name}") as f2:
+        keys1 = [line.split()[0] for line in f1]
+        keys2 = [line.split()[0] for line in f2]
+    assert keys1 == keys2, (keys1, keys2)
+assert read_2column_text(f"{dir1}/utt2num_samples") == read_2column_text(
+    f"{dir2}/utt2num_samples"
+)
+scp1 = read_2column_text(f"{dir1}/wav.scp")
+scp2 = read_2column_text(f"{dir2}/wav.scp")
+num_samples = read_2column_text(f"{dir1}/utt2num_samples")
+for k in scp1:
+    wave1, wave2 = load(scp1[k]), load(scp2[k])
+    assert len(wave1) == int(num_samples[k]), k
+    np.testing.assert_array_equal(wave1, wave2)
+EOF
+}
+
+teardown() {
+    rm -rf $tmpdir
+}
+
+@test "format_wav_scp.py: --nj 2 is the same as --nj 1" {
+    cd egs2/mini_an4/asr1
+    for audio_format in flac wav.ark; do
+        for nj in 1 2; do
+            python pyscripts/audio/format_wav_scp.py \
+                --audio-format ${audio_format} --nj ${nj} \
+                ${tmpdir}/data/wav.scp ${tmpdir}/${audio_format}_nj${nj}
+        done
+        python ${tmpdir}/compare.py \
+            ${tmpdir}/${audio_format}_nj1 ${tmpdir}/${audio_format}_nj2
+    done
+}
+
+@test "format_wav_scp.py: --nj 2 is the same as --nj 1 with --segments" {
+    cd egs2/mini_an4/asr1
+    for audio_format in wav flac.ark; do
+        for nj in 1 2; do
+            python pyscripts/audio/format_wav_scp.py \
+                --audio-format ${audio_format} --nj ${nj} \
+                --segments ${tmpdir}/data/segments \
+                ${tmpdir}/data/wav.scp ${tmpdir}/${audio_format}_nj${nj}
+        done
+        python ${tmpdir}/compare.py \
+            ${tmpdir}/${audio_format}_nj1 ${tmpdir}/${audio_format}_nj2
+        [ "$(wc -l < ${tmpdir}/${audio_format}_nj1/wav.scp)" -eq 9 ]
+    done
+}